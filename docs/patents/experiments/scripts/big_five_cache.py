@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Binary Cache for Big Five Profile Data
+
+One-time conversion of the Big Five source files behind
+load_big_five_profiles and load_and_convert_big_five_to_spots:
+- each cache entry is keyed by the SHA-256 of its source file, so editing
+  or replacing the source builds a new entry and never serves stale data
+- numeric columns (12D personality matrix, expertise paths, expertise
+  score and level, category, location) are .npy files opened with
+  mmap_mode='r', so concurrent experiment processes share one copy through
+  the page cache
+- first-N and random-N row selections only touch the selected rows;
+  UserProfile objects / profile dicts are built for those rows only
+- entries are built in a temporary directory and renamed into place, so a
+  process never sees a half-written entry
+
+The source digest (file_digests.source_digest) is remembered per
+(path, size, mtime), so a warm start costs a stat() and a few small file
+opens instead of a JSON parse.
+
+Layout:
+    <cache_dir>/sources.json                       (digest memo)
+    <cache_dir>/<kind>-v<version>-<digest>/manifest.json
+    <cache_dir>/<kind>-v<version>-<digest>/<column>.npy
+    <cache_dir>/<kind>-v<version>-<digest>/records.jsonl  (converted kinds)
+
+Date: October 18, 2026
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import numpy as np
+
+from file_digests import SOURCES_MEMO, source_digest
+
+CACHE_VERSION = 1
+MANIFEST = 'manifest.json'
+RECORDS_FILE = 'records.jsonl'
+
+# 12D order used by UserProfile.personality_12d (matches generate_integrated_user_profile)
+DIMENSION_ORDER = [
+    'exploration_eagerness',
+    'community_orientation',
+    'adventure_seeking',
+    'social_preference',
+    'energy_preference',
+    'novelty_seeking',
+    'value_orientation',
+    'crowd_tolerance',
+    'authenticity',
+    'archetype',  # This is a derived value, but included in 12D
+    'trust_level',
+    'openness'
+]
+
+# Expertise path -> (source dimension, scale)
+EXPERTISE_PATH_SOURCES = {
+    'exploration': ('exploration_eagerness', 1.0),
+    'credentials': ('value_orientation', 1.0),
+    'influence': ('social_preference', 1.0),
+    'professional': ('authenticity', 1.0),
+    'community': ('community_orientation', 1.0),
+    'local': ('adventure_seeking', 0.5),  # Scaled down
+}
+
+# Expertise level for scores at or above each threshold
+EXPERTISE_LEVELS = ['none', 'Local', 'City', 'Regional', 'National', 'Global']
+EXPERTISE_THRESHOLDS = [0.4, 0.5, 0.6, 0.7, 0.8]
+
+CATEGORIES = ['technology', 'science', 'art', 'business', 'health']
+
+# NYC area default for profiles without a location
+DEFAULT_LAT_RANGE = (40.0, 41.0)
+DEFAULT_LNG_RANGE = (-74.0, -73.0)
+
+RowSelection = Union[slice, np.ndarray]
+
+# Writes any side files into the entry directory and returns
+# (columns, extra manifest fields)
+EntryBuilder = Callable[[Path], Tuple[Dict[str, np.ndarray], Dict[str, Any]]]
+
+
+def default_cache_dir(project_root: Path) -> Path:
+    """Cache directory for a project checkout."""
+    return Path(project_root) / 'data' / 'cache' / 'big_five'
+
+
+def profile_items(data: Any) -> List[Dict]:
+    """Profile list from the supported big_five_spots.json structures."""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict) and 'profiles' in data:
+        return data['profiles']
+    if isinstance(data, dict) and 'data' in data:
+        return data['data']
+    return [data]
+
+
+def _unit_interval(user_ids: List[str], salt: bytes) -> np.ndarray:
+    """Stable per-id uniform [0, 1) values (same on every run and process)."""
+    digests = b''.join(
+        hashlib.blake2b(user_id.encode('utf-8'), digest_size=8, salt=salt).digest() for user_id in user_ids
+    )
+    return np.frombuffer(digests, dtype='<u8').astype(np.float64) / 2.0 ** 64
+
+
+def _stable_locations(user_ids: List[str]) -> np.ndarray:
+    """(N, 2) lat/lng drawn from a per-user seed in the default area."""
+    lat = _unit_interval(user_ids, b'lat') * (DEFAULT_LAT_RANGE[1] - DEFAULT_LAT_RANGE[0]) + DEFAULT_LAT_RANGE[0]
+    lng = _unit_interval(user_ids, b'lng') * (DEFAULT_LNG_RANGE[1] - DEFAULT_LNG_RANGE[0]) + DEFAULT_LNG_RANGE[0]
+    return np.column_stack((lat, lng))
+
+
+def profile_columns(items: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Cache columns for big_five_spots.json profiles.
+
+    Missing dimensions default to 0.5; expertise fields are derived from
+    the dimensions the same way for every profile.
+    """
+    # Imported here: shared_data_model imports this module lazily
+    from shared_data_model import calculate_expertise_score
+
+    num = len(items)
+    personality = np.empty((num, len(DIMENSION_ORDER)))
+    user_ids = []
+    for i, item in enumerate(items):
+        dimensions = item.get('dimensions', {})
+        personality[i] = [dimensions.get(dim, 0.5) for dim in DIMENSION_ORDER]
+        user_ids.append(item.get('user_id', f"user_{i}"))
+
+    columns_of = {dim: personality[:, j] for j, dim in enumerate(DIMENSION_ORDER)}
+    expertise_paths = np.column_stack([columns_of[dim] * scale for dim, scale in EXPERTISE_PATH_SOURCES.values()])
+    path_names = list(EXPERTISE_PATH_SOURCES)
+    expertise_score = np.array([
+        calculate_expertise_score(dict(zip(path_names, row))) for row in expertise_paths.tolist()
+    ], dtype=np.float64)
+
+    category = np.minimum((columns_of['exploration_eagerness'] * len(CATEGORIES)).astype(np.int64),
+                          len(CATEGORIES) - 1)
+
+    return {
+        'agent_id': np.array(user_ids, dtype=str),
+        'personality': personality,
+        'expertise_paths': expertise_paths,
+        'expertise_score': expertise_score,
+        'expertise_level': np.searchsorted(EXPERTISE_THRESHOLDS, expertise_score, side='right').astype(np.int8),
+        'category': category.astype(np.int8),
+        'location': _stable_locations(user_ids),
+    }
+
+
+class _CacheEntry:
+    """One built cache entry: manifest plus memory-mapped columns."""
+
+    kind = ''
+
+    def __init__(self, entry_dir: Path, mmap_mode: Optional[str] = 'r'):
+        self.entry_dir = Path(entry_dir)
+        with open(self.entry_dir / MANIFEST, 'r') as f:
+            self.manifest = json.load(f)
+        if self.manifest['version'] != CACHE_VERSION:
+            raise ValueError(f"Unsupported cache version {self.manifest['version']} (expected {CACHE_VERSION})")
+        self.mmap_mode = mmap_mode
+        self._columns: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def entry_name(cls, digest: str) -> str:
+        return f'{cls.kind}-v{CACHE_VERSION}-{digest[:16]}'
+
+    @classmethod
+    def _write_entry(cls, entry_dir: Path, build: EntryBuilder, manifest: Dict):
+        columns, fields = build(entry_dir)
+        for name, values in columns.items():
+            np.save(entry_dir / f'{name}.npy', values)
+        manifest = dict(manifest, **fields, columns=sorted(columns), num_profiles=len(columns['agent_id']))
+        # Manifest last: an entry without one is incomplete
+        with open(entry_dir / MANIFEST, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    @classmethod
+    def _open_or_build(
+        cls,
+        source_path: Path,
+        cache_dir: Path,
+        build: EntryBuilder,
+        mmap_mode: Optional[str] = 'r',
+        **manifest_fields
+    ):
+        source_path = Path(source_path)
+        cache_dir = Path(cache_dir)
+        digest = source_digest(source_path, cache_dir)
+        entry_dir = cache_dir / cls.entry_name(digest)
+        if not (entry_dir / MANIFEST).exists():
+            tmp_dir = Path(tempfile.mkdtemp(dir=cache_dir, prefix=f'.{cls.kind}-'))
+            try:
+                cls._write_entry(tmp_dir, build, dict(
+                    manifest_fields, version=CACHE_VERSION, kind=cls.kind,
+                    source=str(source_path.resolve()), sha256=digest
+                ))
+                try:
+                    os.rename(tmp_dir, entry_dir)
+                except OSError:
+                    # Another process finished the same entry first
+                    if not (entry_dir / MANIFEST).exists():
+                        raise
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            cls._prune(cache_dir, keep=entry_dir)
+        return cls(entry_dir, mmap_mode=mmap_mode)
+
+    @classmethod
+    def _prune(cls, cache_dir: Path, keep: Path):
+        """Remove entries of this kind whose digest no longer matches any memoized source."""
+        try:
+            with open(cache_dir / SOURCES_MEMO, 'r') as f:
+                live = {entry['sha256'][:16] for entry in json.load(f).values()}
+        except (OSError, ValueError):
+            return
+        for entry_dir in cache_dir.glob(f'{cls.kind}-v*'):
+            if entry_dir != keep and entry_dir.name.rsplit('-', 1)[-1] not in live:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+
+    def __len__(self) -> int:
+        return self.manifest['num_profiles']
+
+    def column(self, name: str) -> np.ndarray:
+        """One column, memory-mapped on first access."""
+        if name not in self._columns:
+            if name not in self.manifest['columns']:
+                raise KeyError(name)
+            self._columns[name] = np.load(self.entry_dir / f'{name}.npy', mmap_mode=self.mmap_mode)
+        return self._columns[name]
+
+    def rows(
+        self,
+        n: Optional[int] = None,
+        seed: Optional[int] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> RowSelection:
+        """
+        Row selection for the first n profiles, or n random profiles.
+
+        Args:
+            n: Number of profiles (None = all; capped at the cache size)
+            seed: Sample n rows at random with this seed instead of taking the first n
+            rng: Sample with this generator instead (takes precedence over seed)
+
+        Returns:
+            A slice for first-n selections, otherwise a sorted index array
+        """
+        size = len(self)
+        n = size if n is None else min(int(n), size)
+        if rng is None and seed is None:
+            return slice(0, n)
+        rng = rng if rng is not None else np.random.default_rng(seed)
+        return np.sort(rng.choice(size, n, replace=False))
+
+    def _row_indices(self, rows: RowSelection) -> np.ndarray:
+        if isinstance(rows, slice):
+            return np.arange(*rows.indices(len(self)))
+        return np.asarray(rows, dtype=np.int64)
+
+
+class ProfileCache(_CacheEntry):
+    """Cached big_five_spots.json profiles with UserProfile fields precomputed."""
+
+    kind = 'profiles'
+
+    @classmethod
+    def open(
+        cls,
+        source_path: Path,
+        cache_dir: Path,
+        mmap_mode: Optional[str] = 'r'
+    ) -> 'ProfileCache':
+        """Open the entry for source_path, converting the source on first use."""
+        def build(entry_dir: Path):
+            with open(source_path, 'r', encoding='utf-8') as f:
+                columns = profile_columns(profile_items(json.load(f)))
+            return columns, {'dimensions': DIMENSION_ORDER, 'expertise_paths': list(EXPERTISE_PATH_SOURCES)}
+        return cls._open_or_build(source_path, cache_dir, build, mmap_mode=mmap_mode)
+
+    def profiles(self, rows: RowSelection, platform_phase: str = 'Growth') -> List:
+        """UserProfile objects for the selected rows."""
+        from shared_data_model import UserProfile
+
+        agent_ids = self.column('agent_id')[rows].tolist()
+        personality = np.array(self.column('personality')[rows])
+        paths = self.column('expertise_paths')[rows].tolist()
+        scores = self.column('expertise_score')[rows].tolist()
+        levels = self.column('expertise_level')[rows].tolist()
+        categories = self.column('category')[rows].tolist()
+        locations = self.column('location')[rows].tolist()
+        path_names = self.manifest['expertise_paths']
+        return [
+            UserProfile(
+                agent_id=agent_id,
+                personality_12d=personality[i],
+                # Dimension confidence defaults to 0.8 for real data
+                dimension_confidence=np.ones(len(DIMENSION_ORDER)) * 0.8,
+                expertise_paths=dict(zip(path_names, paths[i])),
+                expertise_score=scores[i],
+                expertise_level=EXPERTISE_LEVELS[levels[i]],
+                location={'lat': locations[i][0], 'lng': locations[i][1]},
+                platform_phase=platform_phase,
+                category=CATEGORIES[categories[i]],
+            )
+            for i, agent_id in enumerate(agent_ids)
+        ]
+
+
+class ConvertedProfileCache(_CacheEntry):
+    """
+    Cached Big Five OCEAN -> SPOTS conversions.
+
+    The converted dimensions are a (N, 12) column in the converter's key
+    order; the rest of each profile dict (created_at, source,
+    original_data) is kept verbatim in records.jsonl and read by byte
+    offset for the selected rows only.
+    """
+
+    kind = 'spots'
+
+    @classmethod
+    def open(
+        cls,
+        source_path: Path,
+        cache_dir: Path,
+        convert: Callable[[], Iterable[Dict]],
+        mmap_mode: Optional[str] = 'r'
+    ) -> 'ConvertedProfileCache':
+        """
+        Open the entry for source_path, running convert() on first use.
+
+        Args:
+            source_path: Source file (CSV or JSON) the conversion reads
+            cache_dir: Cache directory
+            convert: Yields load_and_convert_big_five_to_spots-style profile dicts
+        """
+        def build(entry_dir: Path):
+            dimension_keys: List[str] = []
+            user_ids, dimensions, offsets = [], [], [0]
+            with open(entry_dir / RECORDS_FILE, 'wb') as f:
+                for profile in convert():
+                    if not dimension_keys:
+                        dimension_keys.extend(profile['dimensions'])
+                    user_ids.append(profile['user_id'])
+                    dimensions.append([profile['dimensions'][key] for key in dimension_keys])
+                    rest = {key: value for key, value in profile.items() if key not in ('user_id', 'dimensions')}
+                    line = json.dumps(rest, separators=(',', ':')).encode('utf-8') + b'\n'
+                    f.write(line)
+                    offsets.append(offsets[-1] + len(line))
+            columns = {
+                'agent_id': np.array(user_ids, dtype=str),
+                'dimensions': np.array(dimensions, dtype=np.float64).reshape(len(user_ids), len(dimension_keys)),
+                'record_offsets': np.array(offsets, dtype=np.int64),
+            }
+            return columns, {'dimension_keys': dimension_keys}
+
+        return cls._open_or_build(source_path, cache_dir, build, mmap_mode=mmap_mode)
+
+    def _iter_records(self, rows: RowSelection) -> Iterator[Dict]:
+        offsets = self.column('record_offsets')
+        indices = self._row_indices(rows)
+        if len(indices) == 0:
+            return
+        with open(self.entry_dir / RECORDS_FILE, 'rb') as f:
+            if isinstance(rows, slice) and rows.step in (None, 1):
+                # Contiguous rows: one read
+                start, stop = int(offsets[indices[0]]), int(offsets[indices[-1] + 1])
+                f.seek(start)
+                for line in f.read(stop - start).splitlines():
+                    yield json.loads(line)
+                return
+            for row in indices.tolist():
+                f.seek(int(offsets[row]))
+                yield json.loads(f.read(int(offsets[row + 1] - offsets[row])))
+
+    def records(self, rows: RowSelection) -> List[Dict]:
+        """Profile dicts (user_id, dimensions, created_at, source, original_data) for the selected rows."""
+        keys = self.manifest['dimension_keys']
+        agent_ids = self.column('agent_id')[rows].tolist()
+        dimensions = self.column('dimensions')[rows].tolist()
+        return [
+            {'user_id': agent_id, 'dimensions': dict(zip(keys, values)), **rest}
+            for agent_id, values, rest in zip(agent_ids, dimensions, self._iter_records(rows))
+        ]
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Personality Diversity Metrics
+
+Pairwise-distance statistics used for homogenization and diversity
+tracking across the experiments (Patent #3, full ecosystem integration).
+
+- mean_pairwise_distance: exact mean Euclidean distance over all pairs,
+  computed in vectorized row blocks so memory stays at block_rows x N
+  floats instead of a Python double loop of N²/2 norm calls
+- mean_squared_pairwise_distance: exact mean squared distance in O(N·d)
+  via the variance identity
+- estimate_mean_pairwise_distance: unbiased random-pair estimator with a
+  confidence interval for very large N
+- PairwiseDistanceTracker: keeps the all-pairs distance sum up to date
+  when only some agents moved since the last call, at O(moved·N·d)
+"""
+
+import statistics
+from typing import Dict, Optional, Sequence, Union
+import numpy as np
+
+# Memory budget for one block of the distance matrix
+DEFAULT_BLOCK_BYTES = 32 * 1024 * 1024
+
+# Max distance between two points in the 12D unit cube
+MAX_DISTANCE_12D = np.sqrt(12)
+
+
+def as_points(personalities: Union[np.ndarray, Sequence[np.ndarray], Dict]) -> np.ndarray:
+    """
+    Stack personality vectors (array, list of vectors or dict of id -> vector)
+    into an (N, d) float64 array.
+    """
+    if isinstance(personalities, dict):
+        personalities = list(personalities.values())
+    if len(personalities) == 0:
+        return np.zeros((0, 0))
+    return np.asarray(np.stack(personalities) if not isinstance(personalities, np.ndarray) else personalities,
+                      dtype=np.float64)
+
+
+def _block_rows(n: int, block_bytes: int) -> int:
+    return max(1, min(n, block_bytes // (8 * max(n, 1))))
+
+
+def _distances(a: np.ndarray, b: np.ndarray, a_sq: np.ndarray, b_sq: np.ndarray) -> np.ndarray:
+    """Euclidean distance matrix from squared norms and one matrix product."""
+    squared = a_sq[:, None] + b_sq[None, :] - 2.0 * (a @ b.T)
+    np.maximum(squared, 0.0, out=squared)
+    return np.sqrt(squared, out=squared)
+
+
+def pairwise_distance_sum(points: np.ndarray, block_bytes: int = DEFAULT_BLOCK_BYTES) -> float:
+    """
+    Exact sum of Euclidean distances over all unordered pairs.
+
+    Rows are processed in blocks against the remaining rows (upper
+    triangle only), so each block is a single matrix product.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    if n < 2:
+        return 0.0
+
+    sq = np.einsum('ij,ij->i', points, points)
+    step = _block_rows(n, block_bytes)
+    total = 0.0
+    for start in range(0, n - 1, step):
+        stop = min(n, start + step)
+        block = _distances(points[start:stop], points[start:], sq[start:stop], sq[start:])
+        # Within the diagonal square keep only j > i
+        square = block[:, :stop - start]
+        square[np.tril_indices(stop - start)] = 0.0
+        total += float(block.sum())
+    return total
+
+
+def cross_distance_sum(
+    a: np.ndarray,
+    b: np.ndarray,
+    block_bytes: int = DEFAULT_BLOCK_BYTES
+) -> float:
+    """Exact sum of Euclidean distances over all (a_i, b_j) pairs."""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    if len(a) == 0 or len(b) == 0:
+        return 0.0
+
+    a_sq = np.einsum('ij,ij->i', a, a)
+    b_sq = np.einsum('ij,ij->i', b, b)
+    step = _block_rows(len(b), block_bytes)
+    total = 0.0
+    for start in range(0, len(a), step):
+        stop = start + step
+        total += float(_distances(a[start:stop], b, a_sq[start:stop], b_sq).sum())
+    return total
+
+
+def mean_pairwise_distance(
+    personalities: Union[np.ndarray, Sequence[np.ndarray], Dict],
+    block_bytes: int = DEFAULT_BLOCK_BYTES
+) -> float:
+    """Exact mean Euclidean distance over all unordered pairs (0.0 for N < 2)."""
+    points = as_points(personalities)
+    n = len(points)
+    if n < 2:
+        return 0.0
+    return pairwise_distance_sum(points, block_bytes) / (n * (n - 1) / 2)
+
+
+def mean_squared_pairwise_distance(personalities: Union[np.ndarray, Sequence[np.ndarray], Dict]) -> float:
+    """
+    Exact mean squared Euclidean distance over all pairs in O(N·d).
+
+    Uses mean_{i<j} |x_i - x_j|² = 2N/(N-1) * sum_k Var(x_k), with the
+    population variance per dimension.
+    """
+    points = as_points(personalities)
+    n = len(points)
+    if n < 2:
+        return 0.0
+    return float(2.0 * n / (n - 1) * points.var(axis=0).sum())
+
+
+def estimate_mean_pairwise_distance(
+    personalities: Union[np.ndarray, Sequence[np.ndarray], Dict],
+    n_pairs: int = 100_000,
+    confidence: float = 0.95,
+    rng: Optional[np.random.Generator] = None
+) -> Dict[str, float]:
+    """
+    Unbiased random-pair estimate of the mean pairwise distance.
+
+    Pairs (i, j), i != j, are drawn uniformly with replacement, so the
+    sample mean is unbiased for the all-pairs mean; the interval is the
+    normal approximation mean ± z * s / sqrt(n_pairs).
+
+    Returns:
+        Dict with mean, std_error, ci_low, ci_high, n_pairs, confidence
+    """
+    points = as_points(personalities)
+    n = len(points)
+    if n < 2:
+        return {'mean': 0.0, 'std_error': 0.0, 'ci_low': 0.0, 'ci_high': 0.0,
+                'n_pairs': 0, 'confidence': confidence}
+
+    rng = rng if rng is not None else np.random.default_rng()
+    first = rng.integers(0, n, n_pairs)
+    # Offset in [1, n) makes j uniform over the other n - 1 points
+    second = (first + rng.integers(1, n, n_pairs)) % n
+    distances = np.linalg.norm(points[first] - points[second], axis=1)
+
+    mean = float(distances.mean())
+    std_error = float(distances.std(ddof=1) / np.sqrt(n_pairs)) if n_pairs > 1 else 0.0
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    return {
+        'mean': mean,
+        'std_error': std_error,
+        'ci_low': mean - z * std_error,
+        'ci_high': mean + z * std_error,
+        'n_pairs': n_pairs,
+        'confidence': confidence,
+    }
+
+
+def homogenization_from_distance(avg_distance: float, max_distance: float = MAX_DISTANCE_12D) -> float:
+    """Homogenization = 1 - (average_pairwise_distance / max_possible_distance), clipped to [0, 1]."""
+    return max(0.0, min(1.0, 1.0 - avg_distance / max_distance))
+
+
+def homogenization_from_diversity(initial_diversity: float, current_diversity: float) -> float:
+    """Homogenization = 1 - (current_diversity / initial_diversity), clipped to [0, 1]."""
+    if initial_diversity == 0:
+        return 0.0
+    return max(0.0, min(1.0, 1.0 - current_diversity / initial_diversity))
+
+
+class PairwiseDistanceTracker:
+    """
+    Mean pairwise distance of a population that changes a few rows at a time.
+
+    Keeps a snapshot of the last positions and the all-pairs distance sum.
+    update() only recomputes distances involving rows that changed:
+        sum_new = sum_old - D_old(M, rest) - D_old(M, M) + D_new(M, rest) + D_new(M, M)
+    When more than recompute_fraction of the rows moved (or N changed), a
+    full blocked recomputation is cheaper and is used instead.
+    """
+
+    def __init__(
+        self,
+        personalities: Union[np.ndarray, Sequence[np.ndarray], Dict],
+        recompute_fraction: float = 0.25,
+        block_bytes: int = DEFAULT_BLOCK_BYTES
+    ):
+        self.recompute_fraction = recompute_fraction
+        self.block_bytes = block_bytes
+        self.points = np.zeros((0, 0))
+        self.distance_sum = 0.0
+        self.full_recomputes = 0
+        self.incremental_updates = 0
+        self._recompute(as_points(personalities))
+
+    @property
+    def n(self) -> int:
+        return len(self.points)
+
+    @property
+    def mean(self) -> float:
+        """Mean pairwise distance of the current snapshot."""
+        if self.n < 2:
+            return 0.0
+        return self.distance_sum / (self.n * (self.n - 1) / 2)
+
+    def _recompute(self, points: np.ndarray):
+        self.points = points.copy()
+        self.distance_sum = pairwise_distance_sum(self.points, self.block_bytes)
+        self.full_recomputes += 1
+
+    def update(
+        self,
+        personalities: Union[np.ndarray, Sequence[np.ndarray], Dict],
+        moved: Optional[np.ndarray] = None
+    ) -> float:
+        """
+        Bring the snapshot up to date and return the new mean.
+
+        Args:
+            personalities: Current positions (same row order as before)
+            moved: Optional indices of rows that may have changed; if
+                omitted, changed rows are found by comparing to the snapshot
+
+        Returns:
+            Mean pairwise distance
+        """
+        points = as_points(personalities)
+        if points.shape != self.points.shape:
+            self._recompute(points)
+            return self.mean
+
+        if moved is None:
+            moved = np.flatnonzero(np.any(points != self.points, axis=1))
+        else:
+            moved = np.unique(np.asarray(moved, dtype=np.int64))
+        if len(moved) == 0:
+            return self.mean
+        if len(moved) > self.recompute_fraction * self.n:
+            self._recompute(points)
+            return self.mean
+
+        rest = np.ones(self.n, dtype=bool)
+        rest[moved] = False
+        stationary = self.points[rest]
+
+        old_moved = self.points[moved]
+        new_moved = points[moved]
+        self.distance_sum += (
+            cross_distance_sum(new_moved, stationary, self.block_bytes)
+            - cross_distance_sum(old_moved, stationary, self.block_bytes)
+            + pairwise_distance_sum(new_moved, self.block_bytes)
+            - pairwise_distance_sum(old_moved, self.block_bytes)
+        )
+        self.points[moved] = new_moved
+        self.incremental_updates += 1
+        return self.mean
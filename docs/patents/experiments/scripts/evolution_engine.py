@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Batched Personality Evolution Engine
+
+Array version of the Patent #3 daily interaction model used by
+run_patent_3_experiments.simulate_evolution:
+- profiles live in one (N, 12) array next to the initial profiles and
+  join days
+- each day's interaction pairs are drawn at once; influence, the drift
+  limit and time-based decay are array operations over those pairs
+- monthly snapshots are written into a preallocated
+  (num_months + 1, N, 12) buffer
+
+Interactions within a day are synchronous: every pair reads the
+start-of-day profiles, and an agent's influences from all pairs where it
+is the listener are summed before the drift limit, decay and [0, 1] clip
+are applied.
+
+Date: October 18, 2026
+"""
+
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from diversity_metrics import homogenization_from_diversity, mean_pairwise_distance
+
+BASE_INFLUENCE = 0.02
+
+# Mechanism 2: Conditional Time-Based Drift Decay
+DECAY_RATE = 0.001
+DECAY_START_DAYS = 180
+DECAY_HOMOGENIZATION = 0.35
+
+# Above this many agents, homogenization is estimated on a fixed set of
+# random pairs instead of all pairs. Below it the exact mean is recomputed
+# each day: most agents move daily, so incremental updates would not pay off
+EXACT_DIVERSITY_LIMIT = 5000
+DIVERSITY_SAMPLE_PAIRS = 200_000
+
+
+class ProfileSnapshot(Mapping):
+    """Read-only agent_id -> profile view of one row of a snapshot buffer."""
+
+    def __init__(self, profiles: np.ndarray, agent_index: Dict[str, int]):
+        self._profiles = profiles
+        self._agent_index = agent_index
+
+    def __getitem__(self, agent_id: str) -> np.ndarray:
+        return self._profiles[self._agent_index[agent_id]]
+
+    def __iter__(self):
+        return iter(self._agent_index)
+
+    def __len__(self) -> int:
+        return len(self._agent_index)
+
+
+class EvolutionHistory(Sequence):
+    """Monthly snapshots as ProfileSnapshot mappings over one (months + 1, N, 12) buffer."""
+
+    def __init__(self, snapshots: np.ndarray, agent_ids: List[str]):
+        self.snapshots = snapshots
+        self.agent_ids = agent_ids
+        self._agent_index = {agent_id: row for row, agent_id in enumerate(agent_ids)}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return ProfileSnapshot(self.snapshots[index], self._agent_index)
+
+    def __len__(self) -> int:
+        return len(self.snapshots)
+
+
+class _DiversityMonitor:
+    """Mean pairwise distance: exact for small N, fixed random pairs for large N."""
+
+    def __init__(self, points: np.ndarray, rng: np.random.Generator):
+        n = len(points)
+        self.pairs = None
+        if n > EXACT_DIVERSITY_LIMIT:
+            # Offset in [1, n) makes the second index uniform over the other agents
+            first = rng.integers(0, n, DIVERSITY_SAMPLE_PAIRS)
+            self.pairs = (first, (first + rng.integers(1, n, DIVERSITY_SAMPLE_PAIRS)) % n)
+
+    def measure(self, points: np.ndarray) -> float:
+        if self.pairs is None:
+            return mean_pairwise_distance(points)
+        first, second = self.pairs
+        return float(np.linalg.norm(points[first] - points[second], axis=1).mean())
+
+
+def evolve_profiles(
+    initial: np.ndarray,
+    num_months: int = 6,
+    drift_limit: Optional[float] = None,
+    use_diversity_mechanisms: bool = False,
+    join_days: Optional[np.ndarray] = None,
+    rng: Optional[np.random.Generator] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate daily AI2AI interactions over an (N, 12) profile array.
+
+    Args:
+        initial: (N, 12) initial profiles
+        num_months: Number of 30-day months to simulate
+        drift_limit: Maximum per-dimension drift from the initial profile (None = no limit)
+        use_diversity_mechanisms: Adaptive influence, interaction frequency reduction and time-based decay
+        join_days: (N,) join day per agent (default: all 0)
+        rng: Random generator (default: fresh generator)
+
+    Returns:
+        (snapshots of shape (num_months + 1, N, 12), final (N, 12) profiles);
+        snapshot 0 is the initial state, snapshot m + 1 is taken after day 30 * m
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    initial = np.asarray(initial, dtype=np.float64)
+    num_agents = len(initial)
+    join_days = np.zeros(num_agents, dtype=np.int64) if join_days is None else np.asarray(join_days)
+
+    profiles = initial.copy()
+    snapshots = np.empty((num_months + 1,) + initial.shape)
+    snapshots[0] = initial
+    if num_agents < 2:
+        snapshots[1:] = initial
+        return snapshots, profiles
+
+    if use_diversity_mechanisms:
+        diversity = _DiversityMonitor(profiles, rng)
+        initial_diversity = diversity.measure(initial)
+    all_agents = np.arange(num_agents)
+
+    for day in range(num_months * 30):
+        # Calculate current homogenization for adaptive mechanisms
+        current_homogenization = 0.0
+        if use_diversity_mechanisms:
+            current_homogenization = homogenization_from_diversity(initial_diversity, diversity.measure(profiles))
+
+        # Mechanism 1: Adaptive Influence Reduction
+        influence_multiplier = 1.0
+        if use_diversity_mechanisms and current_homogenization > 0.45:
+            influence_multiplier = max(0.6, 1.0 - ((current_homogenization - 0.45) * 0.7))
+
+        # Mechanism 3: Interaction Frequency Reduction (new agents always interact)
+        participants = all_agents
+        if use_diversity_mechanisms:
+            days_in_system = np.maximum(0, day - join_days)
+            participants = np.flatnonzero(rng.random(num_agents) < 1.0 / (1.0 + days_in_system / 180.0))
+            if len(participants) < 2:
+                participants = all_agents  # Fallback
+        num_interactions = len(participants)
+
+        # One interaction per participant: agent a listens to a different agent b
+        a_pick = rng.integers(0, num_interactions, num_interactions)
+        b_pick = (a_pick + rng.integers(1, num_interactions, num_interactions)) % num_interactions
+        agent_a = participants[a_pick]
+        agent_b = participants[b_pick]
+
+        # Quantum-based compatibility |<a|b>|²
+        profile_a = profiles[agent_a]
+        profile_b = profiles[agent_b]
+        compatibility = np.einsum('ij,ij->i', profile_a, profile_b) ** 2
+        influence = compatibility * BASE_INFLUENCE * influence_multiplier
+        deltas = influence[:, None] * (profile_b - profile_a)
+
+        # Sum each listener's influences for the day
+        dims = profiles.shape[1]
+        flat_index = (agent_a[:, None] * dims + np.arange(dims)).ravel()
+        total_delta = np.bincount(flat_index, weights=deltas.ravel(), minlength=profiles.size).reshape(profiles.shape)
+        interaction_counts = np.bincount(agent_a, minlength=num_agents)
+        moved = np.flatnonzero(interaction_counts)
+
+        new_profiles = profiles[moved] + total_delta[moved]
+        initial_moved = initial[moved]
+
+        # Apply drift resistance if enabled
+        if drift_limit is not None:
+            new_profiles = initial_moved + np.clip(new_profiles - initial_moved, -drift_limit, drift_limit)
+
+        # Mechanism 2: Conditional Time-Based Drift Decay (once per interaction)
+        if use_diversity_mechanisms and current_homogenization > DECAY_HOMOGENIZATION:
+            decay_days = np.maximum(0, day - join_days[moved] - DECAY_START_DAYS)
+            decay_factor = np.exp(-DECAY_RATE * decay_days * interaction_counts[moved])
+            new_profiles = initial_moved + (new_profiles - initial_moved) * decay_factor[:, None]
+
+        profiles[moved] = np.clip(new_profiles, 0.0, 1.0)
+
+        # Save monthly snapshots
+        if day % 30 == 0:
+            snapshots[day // 30 + 1] = profiles
+
+    return snapshots, profiles
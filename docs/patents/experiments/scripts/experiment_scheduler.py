@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Parallel Experiment Scheduler
+
+Shared engine behind the master runners (run_all_experiments,
+run_all_focused_tests, run_all_time_intervals, run_scalability_tests):
+- every experiment is an ExperimentTask: a script (or module function)
+  plus the data it reads, the files it writes and the tasks it depends on
+- independent tasks run concurrently, each in its own Python process, up
+  to one task per CPU core; a task starts as soon as its dependencies
+  have finished
+- completed tasks are cached by a hash of their command, their source
+  files (the script and every sibling module it imports) and their input
+  files; a re-run skips a task whose hash is unchanged and whose output
+  files are still the ones it wrote
+- start / finish / skip events with timings are appended to a JSON Lines
+  log as they happen, and each task's stdout/stderr goes to its own log
+  file
+
+Tasks that write the same files must be ordered with depends_on; the
+scheduler does not detect overlapping outputs.
+
+Date: October 18, 2026
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from file_digests import source_digest
+
+SCRIPTS_DIR = Path(__file__).parent
+EXPERIMENTS_DIR = SCRIPTS_DIR.parent
+LOGS_DIR = EXPERIMENTS_DIR / 'logs'
+TASK_LOGS_DIR = LOGS_DIR / 'tasks'
+CACHE_DIR = EXPERIMENTS_DIR / '.task_cache'
+DIGEST_DIR = CACHE_DIR / 'digests'
+
+# Task statuses
+SUCCESS = 'success'
+FAILED = 'failed'
+TIMEOUT = 'timeout'
+CACHED = 'cached'
+BLOCKED = 'blocked'  # A dependency did not succeed
+
+# Thread-count variables for numerical libraries, capped in each task
+# process so concurrent tasks do not oversubscribe the cores
+THREAD_ENV_VARS = ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'NUMEXPR_NUM_THREADS']
+
+# Runs a module function inside the task process
+_CALL_BOOTSTRAP = (
+    "import json, sys; sys.path.insert(0, sys.argv[1]); "
+    "import importlib; getattr(importlib.import_module(sys.argv[2]), sys.argv[3])(**json.loads(sys.argv[4]))"
+)
+
+
+@dataclass
+class ExperimentTask:
+    """
+    One schedulable experiment.
+
+    Exactly one of script / function is set. Paths in inputs and outputs
+    are glob patterns relative to the experiments directory.
+    """
+    name: str
+    script: Optional[str] = None  # Script file in the scripts directory
+    args: List[str] = field(default_factory=list)
+    function: Optional[Tuple[str, str]] = None  # (module, function) in the scripts directory
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    depends_on: List[str] = field(default_factory=list)
+    timeout: Optional[float] = 3600
+    label: Optional[str] = None  # Display name (default: name)
+
+    def __post_init__(self):
+        if (self.script is None) == (self.function is None):
+            raise ValueError(f"Task {self.name!r} needs exactly one of script or function")
+
+    @property
+    def entry_file(self) -> Path:
+        return SCRIPTS_DIR / (self.script if self.script is not None else f'{self.function[0]}.py')
+
+    def command(self) -> List[str]:
+        if self.script is not None:
+            return [sys.executable, str(SCRIPTS_DIR / self.script)] + [str(arg) for arg in self.args]
+        module, function = self.function
+        return [sys.executable, '-c', _CALL_BOOTSTRAP, str(SCRIPTS_DIR), module, function, json.dumps(self.kwargs)]
+
+    def spec(self) -> Dict[str, Any]:
+        """Everything about the task definition that affects its results."""
+        return {
+            'script': self.script,
+            'args': [str(arg) for arg in self.args],
+            'function': list(self.function) if self.function else None,
+            'kwargs': self.kwargs,
+        }
+
+
+@dataclass
+class TaskResult:
+    name: str
+    status: str
+    duration: float = 0.0
+    returncode: Optional[int] = None
+    log_file: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (SUCCESS, CACHED)
+
+
+def local_sources(entry_file: Path) -> List[Path]:
+    """The entry file plus every scripts-directory module it imports, transitively."""
+    seen = {}
+    stack = [Path(entry_file)]
+    while stack:
+        path = stack.pop()
+        if path in seen or not path.exists():
+            continue
+        seen[path] = True
+        try:
+            tree = ast.parse(path.read_text(encoding='utf-8'))
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                candidate = SCRIPTS_DIR / f"{name.split('.')[0]}.py"
+                if candidate.exists():
+                    stack.append(candidate)
+    return sorted(seen)
+
+
+def expand_patterns(patterns: Sequence[str]) -> List[Path]:
+    """Files matching glob patterns under the experiments directory (directories expand recursively)."""
+    files = set()
+    for pattern in patterns:
+        for path in EXPERIMENTS_DIR.glob(pattern):
+            if path.is_dir():
+                files.update(p for p in path.rglob('*') if p.is_file())
+            elif path.is_file():
+                files.add(path)
+    return sorted(files)
+
+
+def fingerprint(files: Sequence[Path]) -> str:
+    """Hash of file names and contents (contents hashed once per size/mtime)."""
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(str(path.relative_to(EXPERIMENTS_DIR) if path.is_relative_to(EXPERIMENTS_DIR) else path).encode())
+        digest.update(source_digest(path, DIGEST_DIR).encode())
+    return digest.hexdigest()
+
+
+def task_key(task: ExperimentTask) -> str:
+    """Cache key: task definition, source files and input files."""
+    digest = hashlib.sha256(json.dumps(task.spec(), sort_keys=True).encode())
+    digest.update(fingerprint(local_sources(task.entry_file)).encode())
+    digest.update(fingerprint(expand_patterns(task.inputs)).encode())
+    return digest.hexdigest()
+
+
+class TaskCache:
+    """Per-task records of the last successful run: input key and output fingerprint."""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, name: str) -> Path:
+        return self.cache_dir / f'{name}.json'
+
+    def is_fresh(self, task: ExperimentTask, key: str) -> bool:
+        try:
+            with open(self._path(task.name), 'r') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return False
+        outputs = expand_patterns(task.outputs)
+        if task.outputs and not outputs:
+            return False
+        return record.get('key') == key and record.get('outputs') == fingerprint(outputs)
+
+    def store(self, task: ExperimentTask, key: str, result: TaskResult):
+        record = {
+            'key': key,
+            'outputs': fingerprint(expand_patterns(task.outputs)),
+            'duration': result.duration,
+            'finished_at': datetime.now().isoformat(),
+        }
+        with open(self._path(task.name), 'w') as f:
+            json.dump(record, f, indent=2)
+
+    def invalidate(self, name: str):
+        self._path(name).unlink(missing_ok=True)
+
+
+class EventLog:
+    """Append-only JSON Lines log of task events, flushed per event."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(self, event: str, task: str, **fields):
+        record = {'time': datetime.now().isoformat(), 'event': event, 'task': task, **fields}
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+
+def _run_task(task: ExperimentTask, threads_per_task: int) -> TaskResult:
+    """Run one task in a child process, streaming its output to a log file."""
+    TASK_LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    log_file = TASK_LOGS_DIR / f'{task.name}.log'
+    env = dict(os.environ)
+    for var in THREAD_ENV_VARS:
+        env.setdefault(var, str(threads_per_task))
+
+    start = time.time()
+    with open(log_file, 'w') as log:
+        try:
+            completed = subprocess.run(
+                task.command(),
+                cwd=str(EXPERIMENTS_DIR),
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                env=env,
+                timeout=task.timeout
+            )
+        except subprocess.TimeoutExpired:
+            return TaskResult(task.name, TIMEOUT, time.time() - start, log_file=str(log_file),
+                              error=f'timed out after {task.timeout:.0f} seconds')
+        except Exception as e:
+            return TaskResult(task.name, FAILED, time.time() - start, log_file=str(log_file), error=str(e))
+
+    duration = time.time() - start
+    if completed.returncode != 0:
+        return TaskResult(task.name, FAILED, duration, completed.returncode, str(log_file),
+                          error=_log_tail(log_file))
+    return TaskResult(task.name, SUCCESS, duration, 0, str(log_file))
+
+
+def _log_tail(log_file: Path, max_chars: int = 500) -> str:
+    try:
+        return log_file.read_text(errors='replace')[-max_chars:]
+    except OSError:
+        return ''
+
+
+def run_tasks(
+    tasks: Sequence[ExperimentTask],
+    log_name: str,
+    max_workers: Optional[int] = None,
+    use_cache: bool = True
+) -> Dict[str, TaskResult]:
+    """
+    Run tasks in dependency order, independent tasks in parallel.
+
+    Args:
+        tasks: Tasks to run (names must be unique; depends_on must name tasks in this list)
+        log_name: Event log file name in the logs directory (without .jsonl)
+        max_workers: Concurrent task processes (default: CPU count)
+        use_cache: Skip tasks whose inputs and outputs are unchanged since their last successful run
+
+    Returns:
+        TaskResult per task name, in the order given
+    """
+    by_name = {task.name: task for task in tasks}
+    if len(by_name) != len(tasks):
+        raise ValueError("Task names must be unique")
+    for task in tasks:
+        missing = [dep for dep in task.depends_on if dep not in by_name]
+        if missing:
+            raise ValueError(f"Task {task.name!r} depends on unknown tasks {missing}")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    threads_per_task = max(1, (os.cpu_count() or 1) // max_workers)
+    cache = TaskCache()
+    events = EventLog(LOGS_DIR / f'{log_name}.jsonl')
+    events.write('run_start', log_name, num_tasks=len(tasks), max_workers=max_workers, use_cache=use_cache)
+
+    results: Dict[str, TaskResult] = {}
+    keys: Dict[str, str] = {}
+    pending = list(tasks)
+    running = {}
+    run_start = time.time()
+
+    def finish(task: ExperimentTask, result: TaskResult):
+        results[task.name] = result
+        fields = {'status': result.status, 'duration': round(result.duration, 3)}
+        if result.returncode is not None:
+            fields['returncode'] = result.returncode
+        if result.log_file:
+            fields['log'] = result.log_file
+        if result.error:
+            fields['error'] = result.error
+        events.write('finish', task.name, **fields)
+        icon = {SUCCESS: '✅', CACHED: '⏭️ ', BLOCKED: '⏭️ '}.get(result.status, '❌')
+        print(f"{icon} {task.label or task.name}: {result.status} ({result.duration:.2f}s)", flush=True)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while pending or running:
+            # Start every task whose dependencies are done, while workers are free
+            progressed = False
+            for task in list(pending):
+                if len(running) >= max_workers:
+                    break
+                deps = [results.get(dep) for dep in task.depends_on]
+                if any(dep is None for dep in deps):
+                    continue
+                pending.remove(task)
+                progressed = True
+                if not all(dep.ok for dep in deps):
+                    failed = [dep.name for dep in deps if not dep.ok]
+                    finish(task, TaskResult(task.name, BLOCKED, error=f'dependencies did not succeed: {failed}'))
+                    continue
+                keys[task.name] = task_key(task)
+                if use_cache and cache.is_fresh(task, keys[task.name]):
+                    finish(task, TaskResult(task.name, CACHED))
+                    continue
+                events.write('start', task.name, key=keys[task.name])
+                print(f"🔬 Started {task.label or task.name}", flush=True)
+                running[executor.submit(_run_task, task, threads_per_task)] = task
+
+            if not running:
+                if pending and not progressed:
+                    raise ValueError(f"Dependency cycle among tasks {[task.name for task in pending]}")
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                result = future.result()
+                if result.status == SUCCESS:
+                    cache.store(task, keys[task.name], result)
+                else:
+                    cache.invalidate(task.name)
+                finish(task, result)
+
+    elapsed = time.time() - run_start
+    counts = {}
+    for result in results.values():
+        counts[result.status] = counts.get(result.status, 0) + 1
+    events.write('run_finish', log_name, duration=round(elapsed, 3), statuses=counts)
+    return {task.name: results[task.name] for task in tasks}
+
+
+def runner_argument_parser(description: str) -> argparse.ArgumentParser:
+    """Argument parser with the options shared by the master runners."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Concurrent experiment processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-run every task, ignoring cached results')
+    return parser
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+File Digests
+
+SHA-256 digests of source files, shared by the Big Five profile cache
+(cache entries are keyed by their source's digest) and the experiment
+scheduler (task cache keys hash their source and input files).
+
+source_digest remembers each file's digest per (path, size, mtime) in a
+small JSON memo, so unchanged files are not re-read on every run.
+
+Date: October 18, 2026
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+SOURCES_MEMO = 'sources.json'
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json_atomic(path: Path, data: Any):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def source_digest(path: Path, memo_dir: Path) -> str:
+    """
+    SHA-256 of a source file, memoized on (size, mtime) in memo_dir/sources.json.
+
+    The file is only re-hashed when its size or modification time changes.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    memo_path = Path(memo_dir) / SOURCES_MEMO
+    try:
+        with open(memo_path, 'r') as f:
+            memo = json.load(f)
+    except (OSError, ValueError):
+        memo = {}
+    entry = memo.get(str(path))
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry['sha256']
+
+    digest = file_digest(path)
+    memo[str(path)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+    Path(memo_dir).mkdir(parents=True, exist_ok=True)
+    _write_json_atomic(memo_path, memo)
+    return digest
@@ -319,5 +319,7 @@ def main(num_agents=None):
 
 
 if __name__ == '__main__':
-    main()
-
+    import sys
+    
+    # Optional agent count (scales all patents), e.g. for scalability tests
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
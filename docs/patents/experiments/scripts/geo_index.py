@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Geo Index for Agent Proximity Queries
+
+Spatial index over agent lat/lng positions used for proximity discovery
+and consensus location inference (Patent #24):
+- positions are stored as unit vectors on the sphere in a KD-tree; a
+  great-circle radius maps exactly to a chord length, so radius queries
+  return the same agents as a haversine scan
+- single-point radius queries, batched queries for many points, and an
+  all-agents neighbor query returning CSR neighbor lists
+- modal_codes finds the most common location code in every neighbor list
+  at once (majority consensus without per-agent dicts)
+
+Date: October 18, 2026
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+from scipy.spatial import cKDTree
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """Great-circle distance in km (broadcasts over arrays)."""
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def to_unit_vectors(lats, lngs) -> np.ndarray:
+    """(N, 3) unit vectors for lat/lng in degrees."""
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    lng = np.radians(np.asarray(lngs, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)))
+
+
+def chord_length(radius_km: float) -> float:
+    """Straight-line distance on the unit sphere for a great-circle distance."""
+    return 2.0 * np.sin(min(np.pi, radius_km / EARTH_RADIUS_KM) / 2.0)
+
+
+def locations_to_arrays(locations: Sequence[Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Split {'lat', 'lng'} dicts into lat and lng arrays."""
+    lats = np.fromiter((loc['lat'] for loc in locations), dtype=np.float64, count=len(locations))
+    lngs = np.fromiter((loc['lng'] for loc in locations), dtype=np.float64, count=len(locations))
+    return lats, lngs
+
+
+@dataclass
+class NeighborLists:
+    """
+    Variable-length neighbor lists in CSR form.
+
+    Neighbors of query i are indices[offsets[i]:offsets[i + 1]].
+    """
+    offsets: np.ndarray
+    indices: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        return self.indices[self.offsets[i]:self.offsets[i + 1]]
+
+    @property
+    def counts(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def query_ids(self) -> np.ndarray:
+        """Query index for every entry of indices."""
+        return np.repeat(np.arange(len(self)), self.counts)
+
+
+def _to_csr(query_ids: np.ndarray, indices: np.ndarray, num_queries: int) -> NeighborLists:
+    """CSR neighbor lists from (query, neighbor) pairs, neighbors sorted within each list."""
+    order = np.lexsort((indices, query_ids))
+    offsets = np.zeros(num_queries + 1, dtype=np.int64)
+    np.cumsum(np.bincount(query_ids, minlength=num_queries), out=offsets[1:])
+    return NeighborLists(offsets=offsets, indices=indices[order].astype(np.int64))
+
+
+class GeoIndex:
+    """KD-tree over agent positions on the unit sphere."""
+
+    def __init__(self, lats, lngs, leafsize: int = 32):
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lngs = np.asarray(lngs, dtype=np.float64)
+        self.tree = cKDTree(to_unit_vectors(self.lats, self.lngs), leafsize=leafsize)
+
+    @classmethod
+    def from_locations(cls, locations: Sequence[Dict[str, float]], **kwargs) -> 'GeoIndex':
+        """Build from {'lat', 'lng'} dicts."""
+        return cls(*locations_to_arrays(locations), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.lats)
+
+    def query_radius(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        """Sorted indices of agents within radius_km of one point."""
+        found = self.tree.query_ball_point(to_unit_vectors([lat], [lng])[0], chord_length(radius_km))
+        return np.sort(np.asarray(found, dtype=np.int64))
+
+    def query_radius_batch(
+        self,
+        lats,
+        lngs,
+        radius_km: float,
+        exclude: Optional[np.ndarray] = None
+    ) -> NeighborLists:
+        """
+        Neighbor lists for many query points.
+
+        The query points get their own tree and both trees are walked
+        together, so the pairs come back as arrays.
+
+        Args:
+            lats, lngs: Query positions
+            radius_km: Great-circle radius
+            exclude: Optional index per query to leave out (e.g. the agent itself; -1 for none)
+        """
+        query_tree = cKDTree(to_unit_vectors(lats, lngs))
+        pairs = query_tree.sparse_distance_matrix(self.tree, chord_length(radius_km), output_type='ndarray')
+        query_ids, indices = pairs['i'].astype(np.int64), pairs['j'].astype(np.int64)
+        if exclude is not None:
+            keep = indices != np.asarray(exclude)[query_ids]
+            query_ids, indices = query_ids[keep], indices[keep]
+        return _to_csr(query_ids, indices, query_tree.n)
+
+    def neighbors(self, radius_km: float) -> NeighborLists:
+        """Neighbor lists for every indexed agent (excluding itself)."""
+        pairs = self.tree.query_pairs(chord_length(radius_km), output_type='ndarray').astype(np.int64)
+        # query_pairs returns each pair once (i < j); lists need both directions
+        query_ids = np.concatenate((pairs[:, 0], pairs[:, 1]))
+        indices = np.concatenate((pairs[:, 1], pairs[:, 0]))
+        return _to_csr(query_ids, indices, len(self))
+
+
+def location_codes(lats, lngs) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Integer code per distinct (lat, lng) position.
+
+    Returns:
+        (codes per agent, (K, 2) array of distinct lat/lng)
+    """
+    unique, codes = np.unique(np.column_stack((lats, lngs)), axis=0, return_inverse=True)
+    return codes.reshape(-1), unique
+
+
+def modal_codes(neighbors: NeighborLists, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Most common code in every neighbor list.
+
+    Returns:
+        (modal code per query, -1 for empty lists; its count)
+    """
+    num_codes = int(codes.max()) + 1 if len(codes) else 1
+    keys = neighbors.query_ids() * num_codes + codes[neighbors.indices]
+    unique_keys, key_counts = np.unique(keys, return_counts=True)
+    query_of_key = unique_keys // num_codes
+
+    # Largest count per query: sort by (query, count) and keep each query's last key
+    order = np.lexsort((key_counts, query_of_key))
+    last = np.ones(len(order), dtype=bool)
+    last[:-1] = query_of_key[order][1:] != query_of_key[order][:-1]
+    best = order[last]
+
+    modes = np.full(len(neighbors), -1, dtype=np.int64)
+    mode_counts = np.zeros(len(neighbors), dtype=np.int64)
+    modes[query_of_key[best]] = unique_keys[best] % num_codes
+    mode_counts[query_of_key[best]] = key_counts[best]
+    return modes, mode_counts
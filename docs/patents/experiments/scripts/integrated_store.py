@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Columnar Store for Integrated Simulation Data
+
+Storage backend behind save_integrated_data / load_integrated_data:
+- user columns (personalities, confidences, expertise, preferences,
+  locations, months, flags, ids) are written as numpy arrays, either in
+  one compressed columns.npz or as one .npy per column
+  (compress=False), which can be memory-mapped
+- user histories are append-only JSON Lines logs, one per history field,
+  with one [row, entry] line per entry
+- events and partnerships are JSON Lines, one record per line
+
+IntegratedStore opens a saved store lazily: a column is only read (or
+mapped) when it is first requested, and history logs are only parsed when
+a history field is asked for.
+
+Layout:
+    <data_dir>/store.json
+    <data_dir>/users/columns.npz        (or <data_dir>/users/<column>.npy)
+    <data_dir>/users/<history_field>.jsonl
+    <data_dir>/events.jsonl
+    <data_dir>/partnerships.jsonl
+
+Date: October 18, 2026
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+
+from population import COLUMN_SPECS, HISTORY_FIELDS, MAPPING_COLUMNS, Population
+from shared_data_model import Event, Partnership
+
+STORE_VERSION = 1
+STORE_MANIFEST = 'store.json'
+USERS_DIR = 'users'
+EVENTS_FILE = 'events.jsonl'
+PARTNERSHIPS_FILE = 'partnerships.jsonl'
+
+
+def is_store(data_dir: Path) -> bool:
+    """True if data_dir holds a columnar store."""
+    return (Path(data_dir) / STORE_MANIFEST).exists()
+
+
+def _write_jsonl(path: Path, records: Iterable, mode: str = 'w') -> int:
+    count = 0
+    with open(path, mode) as f:
+        for record in records:
+            f.write(json.dumps(record, separators=(',', ':')))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def _read_jsonl(path: Path) -> Iterator:
+    if not path.exists():
+        return
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _user_columns(population: Population) -> Dict[str, np.ndarray]:
+    columns = {name: population.column(name) for name in COLUMN_SPECS}
+    columns['agent_id'] = np.array(population.agent_ids, dtype=str)
+    columns['expertise_level'] = np.array(population.expertise_level, dtype=str)
+    columns['platform_phase'] = np.array(population.platform_phase, dtype=str)
+    # None categories are stored as '' with a mask
+    columns['category'] = np.array([c or '' for c in population.category], dtype=str)
+    columns['category_set'] = np.array([c is not None for c in population.category], dtype=bool)
+    return columns
+
+
+def append_history(data_dir: Path, field: str, rows: Iterable[int], entries: Iterable[Dict]) -> int:
+    """
+    Append history entries to a store's log for one history field.
+
+    Returns:
+        Number of entries written
+    """
+    if field not in HISTORY_FIELDS:
+        raise ValueError(f"Unknown history field {field!r} (expected one of {HISTORY_FIELDS})")
+    path = Path(data_dir) / USERS_DIR / f'{field}.jsonl'
+    return _write_jsonl(path, ([int(row), entry] for row, entry in zip(rows, entries)), mode='a')
+
+
+def save_integrated_store(
+    users,
+    events: List[Event],
+    partnerships: List[Partnership],
+    data_dir: Path,
+    compress: bool = True
+) -> Path:
+    """
+    Write users, events and partnerships as a columnar store.
+
+    Args:
+        users: Population or list of UserProfile
+        events: Events
+        partnerships: Partnerships
+        data_dir: Output directory
+        compress: One compressed columns.npz (True) or one memory-mappable .npy per column (False)
+
+    Returns:
+        data_dir
+    """
+    data_dir = Path(data_dir)
+    users_dir = data_dir / USERS_DIR
+    users_dir.mkdir(parents=True, exist_ok=True)
+    population = users if isinstance(users, Population) else Population.from_profiles(users)
+
+    # Remove files from a previous save so the new layout is unambiguous
+    for stale in list(users_dir.glob('*.npy')) + list(users_dir.glob('*.npz')) + list(users_dir.glob('*.jsonl')):
+        stale.unlink()
+
+    columns = _user_columns(population)
+    if compress:
+        np.savez_compressed(users_dir / 'columns.npz', **columns)
+    else:
+        for name, values in columns.items():
+            np.save(users_dir / f'{name}.npy', values)
+
+    history_counts = {}
+    for field in HISTORY_FIELDS:
+        histories = population.histories(field)
+        history_counts[field] = _write_jsonl(
+            users_dir / f'{field}.jsonl',
+            ([row, entry] for row, history in enumerate(histories) if history for entry in history)
+        )
+
+    num_events = _write_jsonl(data_dir / EVENTS_FILE, (event.to_dict() for event in events))
+    num_partnerships = _write_jsonl(data_dir / PARTNERSHIPS_FILE, (p.to_dict() for p in partnerships))
+
+    manifest = {
+        'version': STORE_VERSION,
+        'num_users': len(population),
+        'compressed': compress,
+        'columns': {name: {'dtype': values.dtype.str, 'shape': list(values.shape[1:])}
+                    for name, values in columns.items()},
+        'mapping_keys': {name: list(keys) for name, keys in MAPPING_COLUMNS.items()},
+        'history_entries': history_counts,
+        'num_events': num_events,
+        'num_partnerships': num_partnerships,
+    }
+    with open(data_dir / STORE_MANIFEST, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return data_dir
+
+
+class IntegratedStore:
+    """Lazy reader for a store written by save_integrated_store."""
+
+    def __init__(self, data_dir: Path, mmap_mode: Optional[str] = 'r'):
+        """
+        Args:
+            data_dir: Store directory
+            mmap_mode: np.load mmap mode for uncompressed columns (None reads them into memory)
+        """
+        self.data_dir = Path(data_dir)
+        with open(self.data_dir / STORE_MANIFEST, 'r') as f:
+            self.manifest = json.load(f)
+        if self.manifest['version'] != STORE_VERSION:
+            raise ValueError(f"Unsupported store version {self.manifest['version']} (expected {STORE_VERSION})")
+        self.mmap_mode = mmap_mode
+        self._columns: Dict[str, np.ndarray] = {}
+
+    @property
+    def num_users(self) -> int:
+        return self.manifest['num_users']
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self.manifest['columns'])
+
+    def column(self, name: str) -> np.ndarray:
+        """One user column, read (or memory-mapped) on first access."""
+        if name not in self._columns:
+            if name not in self.manifest['columns']:
+                raise KeyError(name)
+            users_dir = self.data_dir / USERS_DIR
+            if self.manifest['compressed']:
+                # An npz member is decompressed in full anyway; read them all
+                # at once so the archive is closed again right away
+                with np.load(users_dir / 'columns.npz') as npz:
+                    for key in npz.files:
+                        self._columns.setdefault(key, npz[key])
+            else:
+                self._columns[name] = np.load(users_dir / f'{name}.npy', mmap_mode=self.mmap_mode)
+        return self._columns[name]
+
+    def columns(self, names: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """Several columns by name (all columns by default)."""
+        return {name: self.column(name) for name in (names if names is not None else self.column_names)}
+
+    def categories(self) -> List[Optional[str]]:
+        return [c if is_set else None
+                for c, is_set in zip(self.column('category').tolist(), self.column('category_set').tolist())]
+
+    def iter_history(self, field: str) -> Iterator[Tuple[int, Dict]]:
+        """(row, entry) pairs from one history log, in append order."""
+        for row, entry in _read_jsonl(self.data_dir / USERS_DIR / f'{field}.jsonl'):
+            yield row, entry
+
+    def history(self, field: str) -> List[Optional[List[Dict]]]:
+        """Per-row history lists for one field (None for rows without entries)."""
+        histories: List[Optional[List[Dict]]] = [None] * self.num_users
+        for row, entry in self.iter_history(field):
+            if histories[row] is None:
+                histories[row] = []
+            histories[row].append(entry)
+        return histories
+
+    def events(self) -> List[Event]:
+        return [Event.from_dict(record) for record in _read_jsonl(self.data_dir / EVENTS_FILE)]
+
+    def partnerships(self) -> List[Partnership]:
+        return [Partnership.from_dict(record) for record in _read_jsonl(self.data_dir / PARTNERSHIPS_FILE)]
+
+    def population(self, with_histories: bool = True) -> Population:
+        """Full Population (columns copied into its own arrays)."""
+        return Population.from_columns(
+            columns={name: self.column(name) for name in COLUMN_SPECS if name in self.manifest['columns']},
+            agent_ids=self.column('agent_id').tolist(),
+            expertise_level=self.column('expertise_level').tolist(),
+            platform_phase=self.column('platform_phase').tolist(),
+            category=self.categories(),
+            histories={field: self.history(field) for field in HISTORY_FIELDS} if with_histories else None
+        )
@@ -0,0 +1,795 @@
+#!/usr/bin/env python3
+"""
+Struct-of-Arrays Population Store
+
+Columnar container for the ecosystem simulation. Personalities,
+confidences, expertise, preferences, locations, join/churn months and
+simulation flags live in contiguous numpy columns with an agent_id -> row
+index, so active-user filtering, lookups and per-month updates are
+masked array operations instead of scans over UserProfile objects.
+
+Code written against UserProfile keeps working through UserView, a
+lightweight (population, row) handle exposing the same attributes:
+- personality_12d / dimension_confidence return live row views
+- dict fields (expertise_paths, preferences) are write-through mappings
+- the private simulation attributes (_original_personality, _is_anchor,
+  _diversity_immune_until, ...) raise AttributeError while unset, so the
+  existing hasattr() checks behave as before
+
+Date: October 18, 2026
+"""
+
+from collections.abc import MutableMapping, Sequence
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+
+from shared_data_model import UserProfile
+
+PERSONALITY_DIMS = 12
+
+EXPERTISE_PATHS = ('exploration', 'credentials', 'influence', 'professional', 'community', 'local')
+EVENT_CATEGORIES = ('technology', 'science', 'art', 'business', 'health')
+SPOT_TYPES = ('indoor', 'outdoor', 'urban', 'nature', 'social')
+SUGGESTION_TYPES = ('frequency', 'timing', 'format')
+LOCATION_KEYS = ('lat', 'lng')
+
+HISTORY_FIELDS = (
+    'conversation_history',
+    'recommendation_history',
+    'event_history',
+    'partnership_history',
+    'revenue_history',
+)
+
+# Sentinel for unset month columns (churn month, immunity windows)
+UNSET = -1
+
+# Dict-valued UserProfile fields stored as fixed-key float columns (NaN = key absent)
+MAPPING_COLUMNS = {
+    'expertise_paths': EXPERTISE_PATHS,
+    'event_preferences': EVENT_CATEGORIES,
+    'spot_preferences': SPOT_TYPES,
+    'suggestion_preferences': SUGGESTION_TYPES,
+    'location': LOCATION_KEYS,
+}
+_KEY_INDEX = {column: {key: i for i, key in enumerate(keys)} for column, keys in MAPPING_COLUMNS.items()}
+
+# name -> (row shape, dtype, fill value)
+COLUMN_SPECS = {
+    'personality': ((PERSONALITY_DIMS,), np.float64, np.nan),
+    'original_personality': ((PERSONALITY_DIMS,), np.float64, np.nan),
+    'has_original': ((), np.bool_, False),
+    'confidence': ((PERSONALITY_DIMS,), np.float64, np.nan),
+    'expertise_paths': ((len(EXPERTISE_PATHS),), np.float64, np.nan),
+    'expertise_score': ((), np.float64, 0.0),
+    'event_preferences': ((len(EVENT_CATEGORIES),), np.float64, np.nan),
+    'spot_preferences': ((len(SPOT_TYPES),), np.float64, np.nan),
+    'suggestion_preferences': ((len(SUGGESTION_TYPES),), np.float64, np.nan),
+    'location': ((len(LOCATION_KEYS),), np.float64, np.nan),
+    'join_month': ((), np.int64, 0),
+    'churn_month': ((), np.int64, UNSET),
+    'expert_month': ((), np.float64, np.nan),
+    'anchor': ((), np.bool_, False),
+    'diversity_injected': ((), np.int64, UNSET),
+    'diversity_immune_until': ((), np.int64, UNSET),
+    'reset_immune_until': ((), np.int64, UNSET),
+    'created_at': ((), np.float64, np.nan),
+    'last_updated': ((), np.float64, np.nan),
+}
+
+# Private UserProfile attributes with a dedicated column
+_PRIVATE_MONTH_COLUMNS = {
+    '_diversity_injected': 'diversity_injected',
+    '_diversity_immune_until': 'diversity_immune_until',
+    '_reset_immune_until': 'reset_immune_until',
+}
+_KNOWN_PRIVATE = {'_original_personality', '_is_anchor'} | set(_PRIVATE_MONTH_COLUMNS)
+
+
+def _mapping_vector(values: Optional[Dict], column: str) -> np.ndarray:
+    """Pack a dict field into its fixed-key vector (missing keys -> NaN)."""
+    index = _KEY_INDEX[column]
+    vector = np.full(len(index), np.nan)
+    for key, value in (values or {}).items():
+        if key not in index:
+            raise ValueError(f"Unknown {column} key {key!r} (expected one of {MAPPING_COLUMNS[column]})")
+        vector[index[key]] = value
+    return vector
+
+
+def _vector_mapping(vector: np.ndarray, column: str) -> Dict[str, float]:
+    """Unpack a fixed-key vector into a plain dict (NaN entries omitted)."""
+    return {key: float(value) for key, value in zip(MAPPING_COLUMNS[column], vector) if not np.isnan(value)}
+
+
+class ColumnMapping(MutableMapping):
+    """Write-through dict view of one row of a fixed-key column (NaN = key absent)."""
+
+    __slots__ = ('_population', '_column', '_row')
+
+    def __init__(self, population: 'Population', column: str, row: int):
+        self._population = population
+        self._column = column
+        self._row = row
+
+    def _values(self) -> np.ndarray:
+        return self._population._columns[self._column][self._row]
+
+    def _index(self, key: str) -> int:
+        try:
+            return _KEY_INDEX[self._column][key]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __getitem__(self, key: str) -> float:
+        value = self._values()[self._index(key)]
+        if np.isnan(value):
+            raise KeyError(key)
+        return float(value)
+
+    def __setitem__(self, key: str, value: float):
+        if key not in _KEY_INDEX[self._column]:
+            raise KeyError(f"{key!r} is not a {self._column} key")
+        self._values()[_KEY_INDEX[self._column][key]] = value
+
+    def __delitem__(self, key: str):
+        self[key]
+        self._values()[self._index(key)] = np.nan
+
+    def __iter__(self):
+        values = self._values()
+        return iter([key for key, value in zip(MAPPING_COLUMNS[self._column], values) if not np.isnan(value)])
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(~np.isnan(self._values())))
+
+    def copy(self) -> Dict[str, float]:
+        return _vector_mapping(self._values(), self._column)
+
+    def __deepcopy__(self, memo) -> Dict[str, float]:
+        return self.copy()
+
+    def __repr__(self) -> str:
+        return repr(self.copy())
+
+
+class MonthMapping(MutableMapping):
+    """
+    agent_id -> month view of a month column (UNSET entries are absent).
+
+    Drop-in for the agent_join_times / agent_churn_times dicts.
+    """
+
+    def __init__(self, population: 'Population', column: str):
+        self._population = population
+        self._column = column
+
+    def _months(self) -> np.ndarray:
+        return self._population.column(self._column)
+
+    def __getitem__(self, agent_id: str) -> int:
+        row = self._population.index.get(agent_id)
+        if row is None or self._months()[row] == UNSET:
+            raise KeyError(agent_id)
+        return int(self._months()[row])
+
+    def __setitem__(self, agent_id: str, month: int):
+        self._months()[self._population.row_of(agent_id)] = month
+
+    def __delitem__(self, agent_id: str):
+        self[agent_id]
+        self._months()[self._population.row_of(agent_id)] = UNSET
+
+    def __iter__(self):
+        agent_ids = self._population.agent_ids
+        return iter([agent_ids[row] for row in np.flatnonzero(self._months() != UNSET)])
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._months() != UNSET))
+
+
+class UserView:
+    """
+    UserProfile-compatible handle on one population row.
+
+    Array attributes are live views into the column buffers; re-read them
+    after appending users, since growth reallocates the columns. Attributes
+    without a column (e.g. _anchor_created) are kept in a per-row dict.
+    """
+
+    __slots__ = ('_population', '_row')
+
+    def __init__(self, population: 'Population', row: int):
+        object.__setattr__(self, '_population', population)
+        object.__setattr__(self, '_row', row)
+
+    def __setattr__(self, name, value):
+        if isinstance(getattr(type(self), name, None), property):
+            object.__setattr__(self, name, value)
+        else:
+            self._population._extras.setdefault(self._row, {})[name] = value
+
+    def __getattr__(self, name):
+        extras = self._population._extras.get(self._row)
+        if extras is not None and name in extras:
+            return extras[name]
+        raise AttributeError(name)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, UserView) and other._population is self._population and other._row == self._row
+
+    def __hash__(self) -> int:
+        return hash((id(self._population), self._row))
+
+    def __repr__(self) -> str:
+        return f"UserView({self.agent_id!r}, row={self._row})"
+
+    def _column(self, name: str) -> np.ndarray:
+        return self._population._columns[name]
+
+    @property
+    def row(self) -> int:
+        return self._row
+
+    @property
+    def agent_id(self) -> str:
+        return self._population.agent_ids[self._row]
+
+    # Core arrays
+
+    @property
+    def personality_12d(self) -> np.ndarray:
+        return self._population._columns['personality'][self._row]
+
+    @personality_12d.setter
+    def personality_12d(self, value):
+        self._column('personality')[self._row] = value
+
+    @property
+    def dimension_confidence(self) -> np.ndarray:
+        return self._column('confidence')[self._row]
+
+    @dimension_confidence.setter
+    def dimension_confidence(self, value):
+        self._column('confidence')[self._row] = value
+
+    # Dict fields
+
+    @property
+    def expertise_paths(self) -> ColumnMapping:
+        return ColumnMapping(self._population, 'expertise_paths', self._row)
+
+    @expertise_paths.setter
+    def expertise_paths(self, value):
+        self._column('expertise_paths')[self._row] = _mapping_vector(value, 'expertise_paths')
+
+    @property
+    def event_preferences(self) -> ColumnMapping:
+        return ColumnMapping(self._population, 'event_preferences', self._row)
+
+    @event_preferences.setter
+    def event_preferences(self, value):
+        self._column('event_preferences')[self._row] = _mapping_vector(value, 'event_preferences')
+
+    @property
+    def spot_preferences(self) -> ColumnMapping:
+        return ColumnMapping(self._population, 'spot_preferences', self._row)
+
+    @spot_preferences.setter
+    def spot_preferences(self, value):
+        self._column('spot_preferences')[self._row] = _mapping_vector(value, 'spot_preferences')
+
+    @property
+    def suggestion_preferences(self) -> ColumnMapping:
+        return ColumnMapping(self._population, 'suggestion_preferences', self._row)
+
+    @suggestion_preferences.setter
+    def suggestion_preferences(self, value):
+        self._column('suggestion_preferences')[self._row] = _mapping_vector(value, 'suggestion_preferences')
+
+    @property
+    def location(self) -> Dict[str, float]:
+        """Snapshot dict; locations are values, so events can keep them safely."""
+        lat, lng = self._population._columns['location'][self._row].tolist()
+        return {'lat': lat, 'lng': lng}
+
+    @location.setter
+    def location(self, value):
+        self._column('location')[self._row] = _mapping_vector(value, 'location')
+
+    # Scalars
+
+    @property
+    def expertise_score(self) -> float:
+        return float(self._column('expertise_score')[self._row])
+
+    @expertise_score.setter
+    def expertise_score(self, value):
+        self._column('expertise_score')[self._row] = value
+
+    @property
+    def expertise_level(self) -> str:
+        return self._population.expertise_level[self._row]
+
+    @expertise_level.setter
+    def expertise_level(self, value):
+        self._population.expertise_level[self._row] = value
+
+    @property
+    def platform_phase(self) -> str:
+        return self._population.platform_phase[self._row]
+
+    @platform_phase.setter
+    def platform_phase(self, value):
+        self._population.platform_phase[self._row] = value
+
+    @property
+    def category(self) -> Optional[str]:
+        return self._population.category[self._row]
+
+    @category.setter
+    def category(self, value):
+        self._population.category[self._row] = value
+
+    @property
+    def expert_creation_time(self) -> Optional[float]:
+        value = self._column('expert_month')[self._row]
+        return None if np.isnan(value) else float(value)
+
+    @expert_creation_time.setter
+    def expert_creation_time(self, value):
+        self._column('expert_month')[self._row] = np.nan if value is None else value
+
+    @property
+    def created_at(self) -> float:
+        return float(self._column('created_at')[self._row])
+
+    @created_at.setter
+    def created_at(self, value):
+        self._column('created_at')[self._row] = value
+
+    @property
+    def last_updated(self) -> float:
+        return float(self._column('last_updated')[self._row])
+
+    @last_updated.setter
+    def last_updated(self, value):
+        self._column('last_updated')[self._row] = value
+
+    # Membership
+
+    @property
+    def join_month(self) -> int:
+        return int(self._column('join_month')[self._row])
+
+    @join_month.setter
+    def join_month(self, value):
+        self._column('join_month')[self._row] = value
+
+    @property
+    def churn_month(self) -> Optional[int]:
+        value = self._column('churn_month')[self._row]
+        return None if value == UNSET else int(value)
+
+    @churn_month.setter
+    def churn_month(self, value):
+        self._column('churn_month')[self._row] = UNSET if value is None else value
+
+    @property
+    def is_active(self) -> bool:
+        return self._column('churn_month')[self._row] == UNSET
+
+    # Histories (allocated on first access)
+
+    def _history(self, name: str) -> List[Dict]:
+        histories = self._population._histories[name]
+        if histories[self._row] is None:
+            histories[self._row] = []
+        return histories[self._row]
+
+    @property
+    def conversation_history(self) -> List[Dict]:
+        return self._history('conversation_history')
+
+    @conversation_history.setter
+    def conversation_history(self, value):
+        self._population._histories['conversation_history'][self._row] = value
+
+    @property
+    def recommendation_history(self) -> List[Dict]:
+        return self._history('recommendation_history')
+
+    @recommendation_history.setter
+    def recommendation_history(self, value):
+        self._population._histories['recommendation_history'][self._row] = value
+
+    @property
+    def event_history(self) -> List[Dict]:
+        return self._history('event_history')
+
+    @event_history.setter
+    def event_history(self, value):
+        self._population._histories['event_history'][self._row] = value
+
+    @property
+    def partnership_history(self) -> List[Dict]:
+        return self._history('partnership_history')
+
+    @partnership_history.setter
+    def partnership_history(self, value):
+        self._population._histories['partnership_history'][self._row] = value
+
+    @property
+    def revenue_history(self) -> List[Dict]:
+        return self._history('revenue_history')
+
+    @revenue_history.setter
+    def revenue_history(self, value):
+        self._population._histories['revenue_history'][self._row] = value
+
+    # Simulation flags (AttributeError while unset, matching hasattr() checks)
+
+    @property
+    def _original_personality(self) -> np.ndarray:
+        if not self._column('has_original')[self._row]:
+            raise AttributeError('_original_personality')
+        return self._column('original_personality')[self._row]
+
+    @_original_personality.setter
+    def _original_personality(self, value):
+        self._column('original_personality')[self._row] = value
+        self._column('has_original')[self._row] = True
+
+    @property
+    def _is_anchor(self) -> bool:
+        if not self._population._columns['anchor'][self._row]:
+            raise AttributeError('_is_anchor')
+        return True
+
+    @_is_anchor.setter
+    def _is_anchor(self, value):
+        self._column('anchor')[self._row] = bool(value)
+
+    def _month_flag(self, name: str) -> int:
+        value = self._column(_PRIVATE_MONTH_COLUMNS[name])[self._row]
+        if value == UNSET:
+            raise AttributeError(name)
+        return int(value)
+
+    @property
+    def _diversity_injected(self) -> int:
+        return self._month_flag('_diversity_injected')
+
+    @_diversity_injected.setter
+    def _diversity_injected(self, value):
+        self._column('diversity_injected')[self._row] = value
+
+    @property
+    def _diversity_immune_until(self) -> int:
+        return self._month_flag('_diversity_immune_until')
+
+    @_diversity_immune_until.setter
+    def _diversity_immune_until(self, value):
+        self._column('diversity_immune_until')[self._row] = value
+
+    @property
+    def _reset_immune_until(self) -> int:
+        return self._month_flag('_reset_immune_until')
+
+    @_reset_immune_until.setter
+    def _reset_immune_until(self, value):
+        self._column('reset_immune_until')[self._row] = value
+
+    # Conversion
+
+    def to_dict(self) -> Dict:
+        """Same layout as UserProfile.to_dict()."""
+        return {
+            'agent_id': self.agent_id,
+            'personality_12d': self.personality_12d.tolist(),
+            'dimension_confidence': self.dimension_confidence.tolist(),
+            'expertise_paths': self.expertise_paths.copy(),
+            'expertise_score': self.expertise_score,
+            'expertise_level': self.expertise_level,
+            'location': self.location,
+            'platform_phase': self.platform_phase,
+            'category': self.category,
+            'event_preferences': self.event_preferences.copy(),
+            'spot_preferences': self.spot_preferences.copy(),
+            'suggestion_preferences': self.suggestion_preferences.copy(),
+            'conversation_history': list(self.conversation_history),
+            'recommendation_history': list(self.recommendation_history),
+            'event_history': list(self.event_history),
+            'partnership_history': list(self.partnership_history),
+            'revenue_history': list(self.revenue_history),
+            'created_at': self.created_at,
+            'last_updated': self.last_updated,
+            'expert_creation_time': self.expert_creation_time,
+        }
+
+    def to_profile(self) -> UserProfile:
+        """Materialize a standalone UserProfile (private flags included)."""
+        data = self.to_dict()
+        data['personality_12d'] = self.personality_12d.copy()
+        data['dimension_confidence'] = self.dimension_confidence.copy()
+        profile = UserProfile(**data)
+        for name in _KNOWN_PRIVATE:
+            if hasattr(self, name):
+                value = getattr(self, name)
+                setattr(profile, name, value.copy() if isinstance(value, np.ndarray) else value)
+        for name, value in self._population._extras.get(self._row, {}).items():
+            setattr(profile, name, value)
+        return profile
+
+
+def _column_property(name: str, doc: str) -> property:
+    def getter(self) -> np.ndarray:
+        return self._columns[name][:self._size]
+    return property(getter, doc=doc)
+
+
+class Population(Sequence):
+    """
+    Struct-of-arrays user store.
+
+    Indexing and iteration yield UserView objects over all rows (active and
+    churned), so random.choice / random.sample work as they did on lists.
+    Column properties return views of the populated rows.
+    """
+
+    personality = _column_property('personality', '(N, 12) core personality vectors')
+    original_personality = _column_property('original_personality', '(N, 12) personality at first evolution step')
+    has_original = _column_property('has_original', '(N,) original_personality is set')
+    confidence = _column_property('confidence', '(N, 12) dimension confidence')
+    expertise_paths = _column_property('expertise_paths', '(N, 6) expertise paths in EXPERTISE_PATHS order')
+    expertise_score = _column_property('expertise_score', '(N,) expertise score')
+    event_preferences = _column_property('event_preferences', '(N, 5) event preferences in EVENT_CATEGORIES order')
+    spot_preferences = _column_property('spot_preferences', '(N, 5) spot preferences in SPOT_TYPES order')
+    suggestion_preferences = _column_property('suggestion_preferences', '(N, 3) suggestion preferences')
+    location = _column_property('location', '(N, 2) lat/lng')
+    join_month = _column_property('join_month', '(N,) month the user joined')
+    churn_month = _column_property('churn_month', '(N,) month the user churned (UNSET if active)')
+    expert_month = _column_property('expert_month', '(N,) month the user became an expert (NaN if not)')
+    anchor = _column_property('anchor', '(N,) personality anchor flag')
+    diversity_injected = _column_property('diversity_injected', '(N,) injection month (UNSET if organic)')
+    diversity_immune_until = _column_property('diversity_immune_until', '(N,) evolution immunity end month')
+    reset_immune_until = _column_property('reset_immune_until', '(N,) reset immunity end month')
+    created_at = _column_property('created_at', '(N,) creation timestamp')
+    last_updated = _column_property('last_updated', '(N,) last update timestamp')
+
+    def __init__(self, capacity: int = 1024):
+        self._size = 0
+        self._capacity = 0
+        self._columns: Dict[str, np.ndarray] = {}
+        self.agent_ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.expertise_level: List[str] = []
+        self.platform_phase: List[str] = []
+        self.category: List[Optional[str]] = []
+        self._histories: Dict[str, List[Optional[List[Dict]]]] = {name: [] for name in HISTORY_FIELDS}
+        self._extras: Dict[int, Dict] = {}
+        self._reserve(capacity)
+
+        # Dict-compatible views for code that takes agent_join_times / agent_churn_times
+        self.join_months = MonthMapping(self, 'join_month')
+        self.churn_months = MonthMapping(self, 'churn_month')
+
+    @classmethod
+    def from_profiles(cls, profiles: Iterable, join_month: int = 0) -> 'Population':
+        """Build a population from UserProfile objects (or anything with the same attributes)."""
+        profiles = list(profiles)
+        population = cls(capacity=max(1024, len(profiles)))
+        population.extend(profiles, join_month=join_month)
+        return population
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Dict[str, np.ndarray],
+        agent_ids: List[str],
+        expertise_level: List[str],
+        platform_phase: List[str],
+        category: List[Optional[str]],
+        histories: Optional[Dict[str, List[Optional[List[Dict]]]]] = None
+    ) -> 'Population':
+        """
+        Build a population directly from column arrays (e.g. a saved store).
+
+        Columns missing from `columns` keep their fill value; histories
+        default to empty.
+        """
+        size = len(agent_ids)
+        population = cls(capacity=max(1024, size))
+        for name, values in columns.items():
+            population._columns[name][:size] = values
+        population._size = size
+        population.agent_ids = list(agent_ids)
+        population.index = {}
+        for row, agent_id in enumerate(population.agent_ids):
+            population.index.setdefault(agent_id, row)
+        population.expertise_level = list(expertise_level)
+        population.platform_phase = list(platform_phase)
+        population.category = list(category)
+        for name in HISTORY_FIELDS:
+            population._histories[name] = list((histories or {}).get(name) or [None] * size)
+        return population
+
+    # Sequence protocol
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [UserView(self, r) for r in range(*row.indices(self._size))]
+        row = int(row)
+        if row < 0:
+            row += self._size
+        if not 0 <= row < self._size:
+            raise IndexError('population row out of range')
+        return UserView(self, row)
+
+    def __iter__(self):
+        return (UserView(self, row) for row in range(self._size))
+
+    # Storage
+
+    def _reserve(self, capacity: int):
+        if capacity <= self._capacity:
+            return
+        capacity = max(capacity, 2 * self._capacity)
+        for name, (shape, dtype, fill) in COLUMN_SPECS.items():
+            column = np.full((capacity,) + shape, fill, dtype=dtype)
+            if name in self._columns:
+                column[:self._size] = self._columns[name][:self._size]
+            self._columns[name] = column
+        self._capacity = capacity
+
+    def column(self, name: str) -> np.ndarray:
+        """View of a column over the populated rows."""
+        return self._columns[name][:self._size]
+
+    def extend(self, profiles: Iterable, join_month: int = 0) -> np.ndarray:
+        """
+        Append profiles as new rows.
+
+        Args:
+            profiles: UserProfile objects (private simulation attributes are carried over)
+            join_month: Join month recorded for every new row
+
+        Returns:
+            Row indices of the appended users
+        """
+        profiles = list(profiles)
+        start = self._size
+        stop = start + len(profiles)
+        self._reserve(stop)
+        rows = np.arange(start, stop)
+        if not profiles:
+            return rows
+
+        columns = self._columns
+        columns['personality'][start:stop] = [p.personality_12d for p in profiles]
+        columns['confidence'][start:stop] = [p.dimension_confidence for p in profiles]
+        columns['expertise_score'][start:stop] = [p.expertise_score for p in profiles]
+        for name in MAPPING_COLUMNS:
+            columns[name][start:stop] = [_mapping_vector(getattr(p, name), name) for p in profiles]
+        columns['expert_month'][start:stop] = [
+            np.nan if p.expert_creation_time is None else p.expert_creation_time for p in profiles
+        ]
+        columns['created_at'][start:stop] = [p.created_at for p in profiles]
+        columns['last_updated'][start:stop] = [p.last_updated for p in profiles]
+        columns['join_month'][start:stop] = join_month
+
+        self._size = stop
+        for row, profile in zip(rows, profiles):
+            self.agent_ids.append(profile.agent_id)
+            self.index.setdefault(profile.agent_id, int(row))
+            self.expertise_level.append(profile.expertise_level)
+            self.platform_phase.append(profile.platform_phase)
+            self.category.append(profile.category)
+            for name in HISTORY_FIELDS:
+                history = getattr(profile, name)
+                self._histories[name].append(history if history else None)
+
+            private = {name: value for name, value in getattr(profile, '__dict__', {}).items()
+                       if name.startswith('_')}
+            if private:
+                view = UserView(self, int(row))
+                for name, value in private.items():
+                    setattr(view, name, value.copy() if isinstance(value, np.ndarray) else value)
+        return rows
+
+    def append(self, profile, join_month: int = 0) -> UserView:
+        """Append one profile and return its view."""
+        row = self.extend([profile], join_month=join_month)[0]
+        return UserView(self, int(row))
+
+    # Lookup
+
+    def row_of(self, agent_id: str) -> int:
+        """Row index of an agent (KeyError if unknown)."""
+        return self.index[agent_id]
+
+    def get(self, agent_id: str, default=None, active_only: bool = False) -> Optional[UserView]:
+        """View for an agent, or default if unknown (or churned, with active_only)."""
+        row = self.index.get(agent_id)
+        if row is None or (active_only and self._columns['churn_month'][row] != UNSET):
+            return default
+        return UserView(self, row)
+
+    def views(self, rows: Iterable[int]) -> List[UserView]:
+        """UserView objects for the given rows, in order."""
+        return [UserView(self, int(row)) for row in rows]
+
+    # Masks
+
+    def active_mask(self) -> np.ndarray:
+        """True for users that have not churned."""
+        return self.churn_month == UNSET
+
+    def active_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.active_mask())
+
+    def active_users(self) -> List[UserView]:
+        return self.views(self.active_rows())
+
+    def expert_mask(self) -> np.ndarray:
+        """True for users with an expert_creation_time."""
+        return ~np.isnan(self.expert_month)
+
+    def category_array(self) -> np.ndarray:
+        """Categories as an object array (for masked comparisons)."""
+        return np.array(self.category, dtype=object)
+
+    # Bulk updates
+
+    def history_lengths(self, name: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Length of one history field per row, without allocating empty lists."""
+        histories = self._histories[name]
+        rows = range(self._size) if rows is None else rows
+        return np.array([len(histories[row] or ()) for row in rows], dtype=np.int64)
+
+    def histories(self, name: str) -> List[Optional[List[Dict]]]:
+        """Per-row lists for one history field (None where nothing was recorded)."""
+        return self._histories[name]
+
+    def take(self, rows: Iterable[int]) -> 'Population':
+        """
+        New population holding the given rows, in order.
+
+        Columns are copied; history lists and extra attributes are shared
+        with this population, as they would be when filtering a list.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        subset = Population(capacity=max(1024, len(rows)))
+        for name in COLUMN_SPECS:
+            subset._columns[name][:len(rows)] = self._columns[name][rows]
+        subset._size = len(rows)
+        for new_row, row in enumerate(rows.tolist()):
+            agent_id = self.agent_ids[row]
+            subset.agent_ids.append(agent_id)
+            subset.index.setdefault(agent_id, new_row)
+            subset.expertise_level.append(self.expertise_level[row])
+            subset.platform_phase.append(self.platform_phase[row])
+            subset.category.append(self.category[row])
+            for name in HISTORY_FIELDS:
+                subset._histories[name].append(self._histories[name][row])
+            if row in self._extras:
+                subset._extras[new_row] = self._extras[row]
+        return subset
+
+    def mark_churned(self, rows: np.ndarray, month: int):
+        self._columns['churn_month'][np.asarray(rows, dtype=np.int64)] = month
+
+    def ensure_original(self, rows: np.ndarray):
+        """Snapshot personality as original_personality where it is not set yet."""
+        rows = np.asarray(rows, dtype=np.int64)
+        rows = rows[~self._columns['has_original'][rows]]
+        self._columns['original_personality'][rows] = self._columns['personality'][rows]
+        self._columns['has_original'][rows] = True
+
+    def to_profiles(self, rows: Optional[Iterable[int]] = None) -> List[UserProfile]:
+        """Materialize UserProfile objects (all rows by default)."""
+        rows = range(self._size) if rows is None else rows
+        return [UserView(self, int(row)).to_profile() for row in rows]
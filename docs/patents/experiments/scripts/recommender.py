@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Batched Event Recommender
+
+Array version of the multi-source recommendation step (Patents #19, #20,
+#22) used by the full ecosystem integration:
+- every event gets one persistent 12D vibe vector, so quantum compatibility
+  for a block of users is a single matrix product against all events
+- users are scored in row chunks, bounding memory at chunk_rows x events
+- each source's top-10 list comes from argpartition, and the 40/30/20/10
+  fusion is a weighted sum of masked score arrays
+- recommendations that pass the calling threshold are appended to a
+  columnar RecommendationTable instead of per-user history lists
+
+Date: October 18, 2026
+"""
+
+from typing import Dict, List, Optional
+import numpy as np
+
+from shared_data_model import Event, Recommendation, calculate_location_matches
+
+# Events taken from each source
+SOURCE_TOP_K = 10
+
+# Multi-source fusion weights (Patent #20)
+REAL_TIME_WEIGHT = 0.4
+COMMUNITY_WEIGHT = 0.3
+AI2AI_WEIGHT = 0.2
+FEDERATED_WEIGHT = 0.1
+
+# Hyper-personalization boost (Patent #20)
+PERSONALIZATION_BOOST = 1.1
+
+# Calling score (Patent #22)
+CALLING_THRESHOLD = 0.70
+
+# Rows of users scored per block
+DEFAULT_CHUNK_ROWS = 1024
+
+TABLE_COLUMNS = {
+    'user_row': np.int64,
+    'event_index': np.int64,
+    'month': np.int64,
+    'fused_score': np.float64,
+    'personalized_score': np.float64,
+    'weighted_compatibility': np.float64,
+    'calling_score': np.float64,
+    'quantum_compatibility': np.float64,
+}
+
+
+class RecommendationTable:
+    """
+    Columnar store of recommendations.
+
+    Rows reference users by population row and events by index into the
+    event list; ids are only materialized in to_records() and
+    to_recommendations().
+    """
+
+    def __init__(self, user_ids: np.ndarray, event_ids: List[str]):
+        """
+        Args:
+            user_ids: agent_id per population row
+            event_ids: event_id per event index
+        """
+        self.user_ids = np.asarray(user_ids, dtype=object)
+        self.event_ids = np.asarray(event_ids, dtype=object)
+        self._chunks = {name: [] for name in TABLE_COLUMNS}
+        self._columns = {name: np.zeros(0, dtype=dtype) for name, dtype in TABLE_COLUMNS.items()}
+
+    def append(self, **columns: np.ndarray):
+        """Append a batch of rows given as one array per column."""
+        for name in TABLE_COLUMNS:
+            self._chunks[name].append(np.asarray(columns[name], dtype=TABLE_COLUMNS[name]))
+
+    def extend(self, other: 'RecommendationTable'):
+        """Append all rows of another table over the same users and events."""
+        self.append(**{name: other.column(name) for name in TABLE_COLUMNS})
+
+    def column(self, name: str) -> np.ndarray:
+        """One column as a contiguous array."""
+        chunks = self._chunks[name]
+        if chunks:
+            self._columns[name] = np.concatenate([self._columns[name]] + chunks)
+            chunks.clear()
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return len(self.column('user_row'))
+
+    def counts_per_user(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Number of recommendations per population row (optionally only the given rows)."""
+        counts = np.bincount(self.column('user_row'), minlength=len(self.user_ids))
+        return counts if rows is None else counts[rows]
+
+    def to_columns(self) -> Dict[str, list]:
+        """Plain column lists (JSON-serializable), with user and event ids."""
+        columns = {
+            'user_id': self.user_ids[self.column('user_row')].tolist(),
+            'event_id': self.event_ids[self.column('event_index')].tolist(),
+        }
+        for name in TABLE_COLUMNS:
+            if name not in ('user_row', 'event_index'):
+                columns[name] = self.column(name).tolist()
+        return columns
+
+    def to_records(self) -> List[Dict]:
+        """One Recommendation.to_dict()-style record per row."""
+        return [rec.to_dict() for rec in self.to_recommendations()]
+
+    def to_recommendations(self) -> List[Recommendation]:
+        """Materialize Recommendation objects."""
+        columns = self.to_columns()
+        return [
+            Recommendation(
+                recommendation_id=f'rec_{user_id}_{event_id}',
+                user_id=user_id,
+                target_id=event_id,
+                target_type='event',
+                fused_score=fused,
+                personalized_score=personalized,
+                weighted_compatibility=weighted,
+                calling_score=calling,
+                meets_calling_threshold=True,
+                quantum_compatibility=vibe,
+            )
+            for user_id, event_id, fused, personalized, weighted, calling, vibe in zip(
+                columns['user_id'], columns['event_id'], columns['fused_score'],
+                columns['personalized_score'], columns['weighted_compatibility'],
+                columns['calling_score'], columns['quantum_compatibility']
+            )
+        ]
+
+
+def _top_k_mask(scores: np.ndarray, k: int) -> np.ndarray:
+    """Boolean mask of the k largest entries in each row."""
+    mask = np.zeros(scores.shape, dtype=bool)
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return mask
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    np.put_along_axis(mask, top, True, axis=1)
+    return mask
+
+
+class BatchRecommender:
+    """
+    Recommends events to a population in row chunks.
+
+    Event vibe vectors are drawn once at construction and reused every
+    month, so an event's quantum compatibility with a user only changes
+    when the user's personality does.
+    """
+
+    def __init__(
+        self,
+        events: List[Event],
+        rng: Optional[np.random.Generator] = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ):
+        self.events = events
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.chunk_rows = chunk_rows
+        self.event_ids = [event.event_id for event in events]
+        self.event_vibes = self.rng.random((len(events), 12))
+        self._unit_vibes = self.event_vibes / np.linalg.norm(self.event_vibes, axis=1, keepdims=True)
+
+    def recommend(
+        self,
+        personalities: np.ndarray,
+        locations: np.ndarray,
+        user_ids: np.ndarray,
+        month: int
+    ) -> RecommendationTable:
+        """
+        Score all users against all events and keep calls above the threshold.
+
+        Args:
+            personalities: (N, 12) user personalities
+            locations: (N, 2) user lat/lng
+            user_ids: agent_id per row
+            month: Current month (stored with each recommendation)
+
+        Returns:
+            RecommendationTable of this month's recommendations
+        """
+        table = RecommendationTable(user_ids, self.event_ids)
+        num_events = len(self.events)
+        if num_events == 0:
+            return table
+
+        # Context uses the first event's location (simplified)
+        first_location = np.array([self.events[0].location['lat'], self.events[0].location['lng']])
+
+        for start in range(0, len(personalities), self.chunk_rows):
+            stop = min(len(personalities), start + self.chunk_rows)
+            block = personalities[start:stop]
+            shape = (stop - start, num_events)
+
+            # Patent #1: quantum compatibility |<user|event>|² against every event
+            norms = np.linalg.norm(block, axis=1, keepdims=True)
+            unit_block = np.divide(block, norms, out=np.zeros_like(block), where=norms > 0)
+            vibe = (unit_block @ self._unit_vibes.T) ** 2
+
+            # Patent #19: dimension compatibility (simplified - no event personality yet)
+            weighted = (self.rng.uniform(0.5, 1.0, shape) * 0.60 +
+                        self.rng.uniform(0.5, 1.0, shape) * 0.20 +
+                        self.rng.uniform(0.5, 1.0, shape) * 0.20)
+
+            # Patent #20: Multi-source fusion, top-10 per source
+            real_time = _top_k_mask(vibe, SOURCE_TOP_K)
+            community = _top_k_mask(self.rng.random(shape), SOURCE_TOP_K)
+            ai2ai = _top_k_mask(weighted, SOURCE_TOP_K)
+            federated = _top_k_mask(self.rng.random(shape), SOURCE_TOP_K)
+
+            fused = (
+                np.where(real_time, vibe, 0.0) * REAL_TIME_WEIGHT +
+                np.where(community, self.rng.uniform(0.0, 0.3, shape), 0.0) * COMMUNITY_WEIGHT +
+                np.where(ai2ai, weighted, 0.0) * AI2AI_WEIGHT +
+                np.where(federated, self.rng.uniform(0.0, 0.1, shape), 0.0) * FEDERATED_WEIGHT
+            )
+            candidates = real_time | community | ai2ai | federated
+
+            # Patent #22: Calling score for every fused candidate
+            user_idx, event_idx = np.nonzero(candidates)
+            context = calculate_location_matches(locations[start:stop], first_location)
+            candidate_fused = fused[user_idx, event_idx]
+            calling = (
+                candidate_fused * 0.4 +
+                self.rng.uniform(0.6, 1.0, len(user_idx)) * 0.3 +     # Life betterment
+                self.rng.uniform(0.5, 1.0, len(user_idx)) * 0.15 +    # Meaningful connection
+                context[user_idx] * 0.10 +
+                self.rng.uniform(0.5, 1.0, len(user_idx)) * 0.05      # Timing
+            )
+
+            hit = calling >= CALLING_THRESHOLD
+            user_idx, event_idx = user_idx[hit], event_idx[hit]
+            table.append(
+                user_row=user_idx + start,
+                event_index=event_idx,
+                month=np.full(len(user_idx), month),
+                fused_score=candidate_fused[hit],
+                personalized_score=candidate_fused[hit] * PERSONALIZATION_BOOST,
+                weighted_compatibility=weighted[user_idx, event_idx],
+                calling_score=calling[hit],
+                quantum_compatibility=vibe[user_idx, event_idx],
+            )
+
+        return table
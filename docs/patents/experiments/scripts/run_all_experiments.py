@@ -4,38 +4,116 @@ Master Experiment Runner - All Patent Experiments
 
 Runs all 30 experiments (19 required + 11 optional) for Patents #1, #3, #21, #29, #11
 
+Each patent's experiments are one task for experiment_scheduler: patents
+run in parallel processes, unchanged patents are skipped on re-runs, and
+per-task timings stream to logs/run_all_experiments.jsonl.
+
 Date: December 21, 2025
 """
 
 import sys
 import time
 from pathlib import Path
+from typing import List, Optional, Sequence
 
 # Add scripts directory to path
 SCRIPTS_DIR = Path(__file__).parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 
-# Import individual experiment modules
-try:
-    from run_patent_1_experiments import run_patent_1_experiments
-    from run_patent_3_experiments import run_patent_3_experiments
-    from run_patent_21_experiments import run_patent_21_experiments
-    from run_patent_29_experiments import run_patent_29_experiments
-    from run_patent_11_experiments import run_patent_11_experiments
-except ImportError as e:
-    print(f"⚠️  Warning: Some experiment modules not found: {e}")
-    print("Creating individual experiment scripts...")
-    print()
-    print("Please run experiments individually:")
-    print("  python scripts/run_patent_1_experiments.py")
-    print("  python scripts/run_patent_3_experiments.py")
-    print("  python scripts/run_patent_21_experiments.py")
-    print("  python scripts/run_patent_29_experiments.py")
-    print("  python scripts/run_patent_11_experiments.py")
-    sys.exit(1)
+from experiment_scheduler import ExperimentTask, expand_patterns, run_tasks, runner_argument_parser
+
+# Data each patent's experiments read and the results they write
+# (glob patterns relative to docs/patents/experiments)
+PATENT_EXPERIMENTS = {
+    1: {
+        'inputs': ['data/patent_1_quantum_compatibility'],
+        'outputs': ['results/patent_1/*.csv'],
+    },
+    3: {
+        'inputs': ['data/patent_3_contextual_personality'],
+        'outputs': ['results/patent_3/*_{num_months}months*.csv'],
+    },
+    21: {
+        'inputs': ['data/patent_21_quantum_state_preservation'],
+        'outputs': ['results/patent_21/*.csv'],
+    },
+    29: {
+        'inputs': ['data/patent_29_multi_entity_quantum_matching'],
+        'outputs': ['results/patent_29/*.csv'],
+    },
+    11: {
+        'inputs': [],
+        'outputs': ['results/patent_11/*.csv', 'results/patent_11/*.json'],
+    },
+}
+
+# Patents whose data comes from generate_synthetic_data.py
+SYNTHETIC_DATA_PATENTS = (1, 3, 21, 29)
+SYNTHETIC_DATA_DIRS = [PATENT_EXPERIMENTS[patent]['inputs'][0] for patent in SYNTHETIC_DATA_PATENTS]
+
+
+def synthetic_data_task(
+    num_agents: Optional[int] = None,
+    name: str = 'synthetic_data',
+    depends_on: Sequence[str] = ()
+) -> ExperimentTask:
+    """Task running generate_synthetic_data.py (optionally scaled to num_agents)."""
+    return ExperimentTask(
+        name=name,
+        script='generate_synthetic_data.py',
+        args=[str(num_agents)] if num_agents else [],
+        outputs=SYNTHETIC_DATA_DIRS,
+        depends_on=list(depends_on),
+        label=f"Synthetic data ({num_agents:,} agents)" if num_agents else "Synthetic data",
+    )
+
+
+def patent_task(
+    patent: int,
+    num_months: Optional[int] = None,
+    name: Optional[str] = None,
+    depends_on: Sequence[str] = (),
+    timeout: Optional[float] = 3600
+) -> ExperimentTask:
+    """Task running run_patent_<patent>_experiments (num_months only applies to Patent #3)."""
+    module = f'run_patent_{patent}_experiments'
+    kwargs = {}
+    label = f"Patent #{patent}"
+    if patent == 3:
+        num_months = num_months or 6
+        kwargs['num_months'] = num_months
+        label += f" ({num_months} months)"
+    spec = PATENT_EXPERIMENTS[patent]
+    return ExperimentTask(
+        name=name or f'patent_{patent}' + (f'_{num_months}_months' if patent == 3 else ''),
+        function=(module, module),
+        kwargs=kwargs,
+        inputs=list(spec['inputs']),
+        outputs=[pattern.format(num_months=num_months) for pattern in spec['outputs']],
+        depends_on=list(depends_on),
+        timeout=timeout,
+        label=label,
+    )
+
+
+def experiment_tasks(regenerate_data: bool = False) -> List[ExperimentTask]:
+    """
+    Tasks for all patents.
+    
+    Synthetic data is only (re)generated when it is missing or
+    regenerate_data is set; the data-driven patents then wait for it.
+    """
+    tasks = []
+    data_deps = []
+    if regenerate_data or not all(expand_patterns([data_dir]) for data_dir in SYNTHETIC_DATA_DIRS):
+        tasks.append(synthetic_data_task())
+        data_deps = ['synthetic_data']
+    for patent in (1, 3, 21, 29, 11):
+        tasks.append(patent_task(patent, depends_on=data_deps if patent in SYNTHETIC_DATA_PATENTS else ()))
+    return tasks
 
 
-def main():
+def main(max_workers: Optional[int] = None, use_cache: bool = True, regenerate_data: bool = False):
     """Run all experiments."""
     print("=" * 70)
     print("Master Experiment Runner - All Patent Experiments")
@@ -55,61 +133,20 @@ def main():
     
     start_time = time.time()
     
-    # Run Patent #1 experiments
-    print("🔬 Running Patent #1 Experiments...")
-    print("-" * 70)
-    try:
-        run_patent_1_experiments()
-        print("✅ Patent #1 experiments completed")
-    except Exception as e:
-        print(f"❌ Patent #1 experiments failed: {e}")
-    print()
-    
-    # Run Patent #3 experiments
-    print("🔬 Running Patent #3 Experiments...")
-    print("-" * 70)
-    try:
-        run_patent_3_experiments()
-        print("✅ Patent #3 experiments completed")
-    except Exception as e:
-        print(f"❌ Patent #3 experiments failed: {e}")
-    print()
-    
-    # Run Patent #21 experiments
-    print("🔬 Running Patent #21 Experiments...")
-    print("-" * 70)
-    try:
-        run_patent_21_experiments()
-        print("✅ Patent #21 experiments completed")
-    except Exception as e:
-        print(f"❌ Patent #21 experiments failed: {e}")
-    print()
-    
-    # Run Patent #29 experiments
-    print("🔬 Running Patent #29 Experiments...")
-    print("-" * 70)
-    try:
-        run_patent_29_experiments()
-        print("✅ Patent #29 experiments completed")
-    except Exception as e:
-        print(f"❌ Patent #29 experiments failed: {e}")
-    print()
-    
-    # Run Patent #11 experiments
-    print("🔬 Running Patent #11 Experiments...")
-    print("-" * 70)
-    try:
-        run_patent_11_experiments()
-        print("✅ Patent #11 experiments completed")
-    except Exception as e:
-        print(f"❌ Patent #11 experiments failed: {e}")
-    print()
+    tasks = experiment_tasks(regenerate_data=regenerate_data)
+    results = run_tasks(tasks, 'run_all_experiments', max_workers=max_workers, use_cache=use_cache)
     
     elapsed = time.time() - start_time
     
+    print()
     print("=" * 70)
     print("✅ All Experiments Completed!")
     print("=" * 70)
+    for task in tasks:
+        result = results[task.name]
+        print(f"  {task.label}: {result.status} ({result.duration:.2f}s)")
+        if result.log_file and not result.ok:
+            print(f"    Log: {result.log_file}")
     print(f"Total Time: {elapsed:.2f} seconds ({elapsed/60:.2f} minutes)")
     print()
     print("Results saved to:")
@@ -117,8 +154,13 @@ def main():
     print("  - docs/patents/experiments/results/patent_3/")
     print("  - docs/patents/experiments/results/patent_21/")
     print("  - docs/patents/experiments/results/patent_29/")
+    print("  - docs/patents/experiments/results/patent_11/")
+    print("Task log: docs/patents/experiments/logs/run_all_experiments.jsonl")
 
 
 if __name__ == '__main__':
-    main()
-
+    parser = runner_argument_parser("Run all patent experiments in parallel")
+    parser.add_argument('--regenerate-data', action='store_true',
+                        help='Regenerate synthetic data before the experiments')
+    args = parser.parse_args()
+    main(max_workers=args.workers, use_cache=not args.force, regenerate_data=args.regenerate_data)
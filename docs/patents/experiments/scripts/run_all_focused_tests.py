@@ -9,18 +9,64 @@ Phase 1 (Critical):
 - Patent #29: Mechanism Isolation
 - Patent #21: Parameter Sensitivity (Epsilon)
 
+Each focused test runs as an experiment_scheduler task in its own
+process; unchanged tests are skipped on re-runs.
+
 Date: December 20, 2025
 """
 
 import sys
 import time
 from pathlib import Path
+from typing import List, Optional
 
 # Add scripts directory to path
 SCRIPTS_DIR = Path(__file__).parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 
-def main():
+from experiment_scheduler import ExperimentTask, run_tasks, runner_argument_parser
+
+# (phase, label, module, test function, data read, results written)
+FOCUSED_TESTS = [
+    (1, "Patent #3 - Mechanism Isolation",
+     'run_focused_tests_patent_3_mechanism_isolation', 'test_mechanism_isolation',
+     ['data/patent_3_contextual_personality'], ['results/patent_3/focused_tests/mechanism_isolation_*']),
+    (1, "Patent #29 - Mechanism Isolation",
+     'run_focused_tests_patent_29_mechanism_isolation', 'test_mechanism_isolation',
+     ['data/patent_29_multi_entity_quantum_matching'], ['results/patent_29/focused_tests/mechanism_isolation_*']),
+    (1, "Patent #21 - Epsilon Parameter Sensitivity",
+     'run_focused_tests_patent_21_epsilon_sensitivity', 'test_epsilon_sensitivity',
+     ['data/patent_21_quantum_state_preservation'], ['results/patent_21/focused_tests/epsilon_sensitivity_*']),
+    (2, "Patent #3 - Parameter Sensitivity (Thresholds)",
+     'run_focused_tests_patent_3_parameter_sensitivity', 'test_threshold_sensitivity',
+     ['data/patent_3_contextual_personality'], ['results/patent_3/focused_tests/threshold_sensitivity_*']),
+    (2, "Patent #3 - Alternative Comparisons",
+     'run_focused_tests_patent_3_alternative_comparisons', 'test_alternative_comparisons',
+     ['data/patent_3_contextual_personality'], ['results/patent_3/focused_tests/alternative_comparisons_*']),
+    (2, "Patent #29 - Parameter Sensitivity (Decoherence)",
+     'run_focused_tests_patent_29_parameter_sensitivity', 'test_decoherence_sensitivity',
+     ['data/patent_29_multi_entity_quantum_matching'], ['results/patent_29/focused_tests/decoherence_sensitivity_*']),
+    (2, "Patent #21 - Mechanism Isolation",
+     'run_focused_tests_patent_21_mechanism_isolation', 'test_mechanism_isolation',
+     ['data/patent_21_quantum_state_preservation'], ['results/patent_21/focused_tests/mechanism_isolation_*']),
+]
+
+
+def focused_test_tasks() -> List[ExperimentTask]:
+    """One task per focused test; the tests are independent of each other."""
+    return [
+        ExperimentTask(
+            name=module.replace('run_focused_tests_', 'focused_'),
+            function=(module, function),
+            inputs=inputs,
+            outputs=outputs,
+            label=label,
+        )
+        for phase, label, module, function, inputs, outputs in FOCUSED_TESTS
+    ]
+
+
+def main(max_workers: Optional[int] = None, use_cache: bool = True):
     """Run all focused tests."""
     print("=" * 70)
     print("MASTER FOCUSED TEST RUNNER")
@@ -28,137 +74,43 @@ def main():
     print()
     print("Running Phase 1 Critical Tests + Phase 2 High-Value Tests")
     print()
-    print("Phase 1:")
-    print("  1. Patent #3: Mechanism Isolation")
-    print("  2. Patent #29: Mechanism Isolation")
-    print("  3. Patent #21: Parameter Sensitivity (Epsilon)")
-    print()
-    print("Phase 2:")
-    print("  4. Patent #3: Parameter Sensitivity (Thresholds)")
-    print("  5. Patent #3: Alternative Comparisons")
-    print("  6. Patent #29: Parameter Sensitivity (Decoherence)")
-    print("  7. Patent #21: Mechanism Isolation")
-    print()
+    test_number = 0
+    for phase in (1, 2):
+        print(f"Phase {phase}:")
+        for test_phase, label, *_ in FOCUSED_TESTS:
+            if test_phase == phase:
+                test_number += 1
+                print(f"  {test_number}. {label}")
+        print()
     print("=" * 70)
     print()
     
     start_time = time.time()
     
-    # Phase 1: Critical Tests
-    print("PHASE 1: CRITICAL TESTS")
-    print("=" * 70)
-    print()
-    
-    # Test 1: Patent #3 Mechanism Isolation
-    print("🔬 Test 1: Patent #3 - Mechanism Isolation")
-    print("-" * 70)
-    try:
-        from run_focused_tests_patent_3_mechanism_isolation import test_mechanism_isolation
-        test_mechanism_isolation()
-        print("✅ Patent #3 mechanism isolation test completed")
-    except Exception as e:
-        print(f"❌ Patent #3 mechanism isolation test failed: {e}")
-        import traceback
-        traceback.print_exc()
-    print()
-    
-    # Test 2: Patent #29 Mechanism Isolation
-    print("🔬 Test 2: Patent #29 - Mechanism Isolation")
-    print("-" * 70)
-    try:
-        from run_focused_tests_patent_29_mechanism_isolation import test_mechanism_isolation
-        test_mechanism_isolation()
-        print("✅ Patent #29 mechanism isolation test completed")
-    except Exception as e:
-        print(f"❌ Patent #29 mechanism isolation test failed: {e}")
-        import traceback
-        traceback.print_exc()
-    print()
-    
-    # Test 3: Patent #21 Epsilon Sensitivity
-    print("🔬 Test 3: Patent #21 - Epsilon Parameter Sensitivity")
-    print("-" * 70)
-    try:
-        from run_focused_tests_patent_21_epsilon_sensitivity import test_epsilon_sensitivity
-        test_epsilon_sensitivity()
-        print("✅ Patent #21 epsilon sensitivity test completed")
-    except Exception as e:
-        print(f"❌ Patent #21 epsilon sensitivity test failed: {e}")
-        import traceback
-        traceback.print_exc()
-    print()
-    
-    # Phase 2: High-Value Tests
-    print("PHASE 2: HIGH-VALUE TESTS")
-    print("=" * 70)
-    print()
-    
-    # Test 4: Patent #3 Parameter Sensitivity
-    print("🔬 Test 4: Patent #3 - Parameter Sensitivity (Thresholds)")
-    print("-" * 70)
-    try:
-        from run_focused_tests_patent_3_parameter_sensitivity import test_threshold_sensitivity
-        test_threshold_sensitivity()
-        print("✅ Patent #3 threshold sensitivity test completed")
-    except Exception as e:
-        print(f"❌ Patent #3 threshold sensitivity test failed: {e}")
-        import traceback
-        traceback.print_exc()
-    print()
-    
-    # Test 5: Patent #3 Alternative Comparisons
-    print("🔬 Test 5: Patent #3 - Alternative Comparisons")
-    print("-" * 70)
-    try:
-        from run_focused_tests_patent_3_alternative_comparisons import test_alternative_comparisons
-        test_alternative_comparisons()
-        print("✅ Patent #3 alternative comparisons test completed")
-    except Exception as e:
-        print(f"❌ Patent #3 alternative comparisons test failed: {e}")
-        import traceback
-        traceback.print_exc()
-    print()
-    
-    # Test 6: Patent #29 Parameter Sensitivity
-    print("🔬 Test 6: Patent #29 - Parameter Sensitivity (Decoherence)")
-    print("-" * 70)
-    try:
-        from run_focused_tests_patent_29_parameter_sensitivity import test_decoherence_sensitivity
-        test_decoherence_sensitivity()
-        print("✅ Patent #29 decoherence sensitivity test completed")
-    except Exception as e:
-        print(f"❌ Patent #29 decoherence sensitivity test failed: {e}")
-        import traceback
-        traceback.print_exc()
-    print()
-    
-    # Test 7: Patent #21 Mechanism Isolation
-    print("🔬 Test 7: Patent #21 - Mechanism Isolation")
-    print("-" * 70)
-    try:
-        from run_focused_tests_patent_21_mechanism_isolation import test_mechanism_isolation
-        test_mechanism_isolation()
-        print("✅ Patent #21 mechanism isolation test completed")
-    except Exception as e:
-        print(f"❌ Patent #21 mechanism isolation test failed: {e}")
-        import traceback
-        traceback.print_exc()
-    print()
+    tasks = focused_test_tasks()
+    results = run_tasks(tasks, 'run_all_focused_tests', max_workers=max_workers, use_cache=use_cache)
     
     elapsed = time.time() - start_time
     
+    print()
     print("=" * 70)
     print("✅ ALL FOCUSED TESTS COMPLETE")
     print("=" * 70)
+    for task in tasks:
+        result = results[task.name]
+        print(f"  {task.label}: {result.status} ({result.duration:.2f}s)")
+        if result.log_file and not result.ok:
+            print(f"    Log: {result.log_file}")
     print(f"Total Time: {elapsed:.2f} seconds ({elapsed/60:.2f} minutes)")
     print()
     print("Results saved to:")
     print("  - docs/patents/experiments/results/patent_3/focused_tests/")
     print("  - docs/patents/experiments/results/patent_29/focused_tests/")
     print("  - docs/patents/experiments/results/patent_21/focused_tests/")
+    print("Task log: docs/patents/experiments/logs/run_all_focused_tests.jsonl")
     print()
 
 
 if __name__ == '__main__':
-    main()
-
+    args = runner_argument_parser("Run all focused tests in parallel").parse_args()
+    main(max_workers=args.workers, use_cache=not args.force)
@@ -9,6 +9,10 @@ Runs all experiments for multiple time intervals:
 - 5 years (60 months)
 - 10 years (120 months)
 
+Patents #1, #21 and #29 are not time-dependent, so they run once and their
+results are shared by every interval; the Patent #3 runs for the five
+intervals are independent experiment_scheduler tasks that run in parallel.
+
 Date: December 19, 2025
 """
 
@@ -16,21 +20,14 @@ import sys
 import time
 from pathlib import Path
 from datetime import datetime
-import json
+from typing import Dict, List, Optional
 
 # Add scripts directory to path
 SCRIPTS_DIR = Path(__file__).parent
 sys.path.insert(0, str(SCRIPTS_DIR))
 
-# Import individual experiment modules
-try:
-    from run_patent_1_experiments import run_patent_1_experiments
-    from run_patent_3_experiments import run_patent_3_experiments
-    from run_patent_21_experiments import run_patent_21_experiments
-    from run_patent_29_experiments import run_patent_29_experiments
-except ImportError as e:
-    print(f"⚠️  Warning: Some experiment modules not found: {e}")
-    sys.exit(1)
+from experiment_scheduler import CACHED, ExperimentTask, TaskResult, run_tasks, runner_argument_parser
+from run_all_experiments import patent_task
 
 # Time intervals in months
 TIME_INTERVALS = {
@@ -126,7 +123,7 @@ def create_time_interval_log(interval_name, num_months):
 
 **Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
-    
+
     with open(log_file, 'w') as f:
         f.write(log_content)
     
@@ -165,8 +162,9 @@ def update_time_interval_log(log_file, patent_num, status, duration, results_sum
         content = '\n'.join(updated_lines)
     
     # Update last updated timestamp
+    last_updated = content.split('**Last Updated:**')[-1].split('\n')[0] if '**Last Updated:**' in content else ''
     content = content.replace(
-        f"**Last Updated:** {content.split('**Last Updated:**')[-1].split('\\n')[0] if '**Last Updated:**' in content else ''}",
+        f"**Last Updated:** {last_updated}",
         f"**Last Updated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
     )
     
@@ -174,99 +172,48 @@ def update_time_interval_log(log_file, patent_num, status, duration, results_sum
         f.write(content)
 
 
-def run_experiments_for_interval(interval_name, num_months):
-    """Run all experiments for a specific time interval."""
+# Patents that do not depend on the time interval
+SHARED_PATENTS = (1, 21, 29)
+
+
+def time_interval_tasks() -> List[ExperimentTask]:
+    """Shared tasks for the time-independent patents plus one Patent #3 task per interval."""
+    tasks = [patent_task(patent) for patent in SHARED_PATENTS]
+    tasks += [patent_task(3, num_months=num_months) for num_months in TIME_INTERVALS.values()]
+    return tasks
+
+
+def report_interval(interval_name, num_months, results: Dict[str, TaskResult]):
+    """Write the log for one interval from the task results."""
     print("=" * 70)
     print(f"TIME INTERVAL: {interval_name.replace('_', ' ').title()} ({num_months} months)")
     print("=" * 70)
-    print()
     
     # Create log file
     log_file = create_time_interval_log(interval_name, num_months)
     
-    overall_start = time.time()
     results_summary = {}
-    
-    # Run Patent #1 (not time-dependent, but run for consistency)
-    print("🔬 Running Patent #1 Experiments...")
-    print("-" * 70)
-    try:
-        start_time = time.time()
-        run_patent_1_experiments()
-        duration = time.time() - start_time
-        status = "✅ Complete"
-        results_summary['patent_1'] = f"Complete in {duration:.2f}s"
-        update_time_interval_log(log_file, 1, status, duration, f"Complete - {duration:.2f}s")
-        print(f"✅ Patent #1 completed in {duration:.2f} seconds")
-    except Exception as e:
-        status = f"❌ Failed: {e}"
-        results_summary['patent_1'] = f"Failed: {str(e)}"
-        print(f"❌ Patent #1 failed: {e}")
-    print()
-    
-    # Run Patent #3 (time-dependent)
-    print(f"🔬 Running Patent #3 Experiments ({num_months} months)...")
-    print("-" * 70)
-    try:
-        start_time = time.time()
-        run_patent_3_experiments(num_months=num_months)
-        duration = time.time() - start_time
-        status = "✅ Complete"
-        results_summary['patent_3'] = f"Complete in {duration:.2f}s ({num_months} months)"
-        update_time_interval_log(log_file, 3, status, duration, f"Complete - {duration:.2f}s ({num_months} months)")
-        print(f"✅ Patent #3 ({num_months} months) completed in {duration:.2f} seconds")
-    except Exception as e:
-        status = f"❌ Failed: {e}"
-        results_summary['patent_3'] = f"Failed: {str(e)}"
-        print(f"❌ Patent #3 failed: {e}")
-    print()
-    
-    # Run Patent #21 (not time-dependent)
-    print("🔬 Running Patent #21 Experiments...")
-    print("-" * 70)
-    try:
-        start_time = time.time()
-        run_patent_21_experiments()
-        duration = time.time() - start_time
-        status = "✅ Complete"
-        results_summary['patent_21'] = f"Complete in {duration:.2f}s"
-        update_time_interval_log(log_file, 21, status, duration, f"Complete - {duration:.2f}s")
-        print(f"✅ Patent #21 completed in {duration:.2f} seconds")
-    except Exception as e:
-        status = f"❌ Failed: {e}"
-        results_summary['patent_21'] = f"Failed: {str(e)}"
-        print(f"❌ Patent #21 failed: {e}")
-    print()
-    
-    # Run Patent #29 (not time-dependent)
-    print("🔬 Running Patent #29 Experiments...")
-    print("-" * 70)
-    try:
-        start_time = time.time()
-        run_patent_29_experiments()
-        duration = time.time() - start_time
-        status = "✅ Complete"
-        results_summary['patent_29'] = f"Complete in {duration:.2f}s"
-        update_time_interval_log(log_file, 29, status, duration, f"Complete - {duration:.2f}s")
-        print(f"✅ Patent #29 completed in {duration:.2f} seconds")
-    except Exception as e:
-        status = f"❌ Failed: {e}"
-        results_summary['patent_29'] = f"Failed: {str(e)}"
-        print(f"❌ Patent #29 failed: {e}")
+    interval_duration = 0.0
+    for patent in (1, 3, 21, 29):
+        time_dependent = patent == 3
+        result = results[f'patent_3_{num_months}_months' if time_dependent else f'patent_{patent}']
+        suffix = f" ({num_months} months)" if time_dependent else " (shared across intervals)"
+        if result.ok:
+            status = "✅ Complete (cached)" if result.status == CACHED else "✅ Complete"
+            summary = f"Complete in {result.duration:.2f}s{suffix}"
+        else:
+            status = f"❌ Failed ({result.status}, see {result.log_file})" if result.log_file else f"❌ {result.status}"
+            summary = f"Failed: {result.status}{suffix}"
+        results_summary[f'patent_{patent}'] = summary
+        update_time_interval_log(log_file, patent, status, result.duration, summary)
+        interval_duration += result.duration
+        print(f"  Patent #{patent}: {summary}")
     print()
     
-    overall_duration = time.time() - overall_start
-    
-    print("=" * 70)
-    print(f"✅ {interval_name.replace('_', ' ').title()} ({num_months} months) COMPLETE")
-    print("=" * 70)
-    print(f"Total Duration: {overall_duration:.2f} seconds ({overall_duration/60:.2f} minutes)")
-    print()
-    
-    return results_summary, overall_duration
+    return results_summary, interval_duration
 
 
-def main():
+def main(max_workers: Optional[int] = None, use_cache: bool = True):
     """Run all experiments for all time intervals."""
     print("=" * 70)
     print("TIME-INTERVAL EXPERIMENT RUNNER")
@@ -280,17 +227,18 @@ def main():
     print()
     
     master_start = time.time()
-    all_results = {}
     
-    # Run for each time interval
+    results = run_tasks(time_interval_tasks(), 'run_all_time_intervals', max_workers=max_workers, use_cache=use_cache)
+    print()
+    
+    all_results = {}
     for interval_name, num_months in TIME_INTERVALS.items():
-        results, duration = run_experiments_for_interval(interval_name, num_months)
+        interval_results, duration = report_interval(interval_name, num_months, results)
         all_results[interval_name] = {
             'months': num_months,
             'duration': duration,
-            'results': results
+            'results': interval_results
         }
-        print()
     
     master_duration = time.time() - master_start
     
@@ -308,7 +256,7 @@ def main():
 ## 📊 **Summary by Time Interval**
 
 """)
-        
+
         for interval_name, data in all_results.items():
             f.write(f"""### **{interval_name.replace('_', ' ').title()} ({data['months']} months)**
 - **Duration:** {data['duration']:.2f} seconds ({data['duration']/60:.2f} minutes)
@@ -318,7 +266,7 @@ def main():
 - **Patent #29:** {data['results'].get('patent_29', 'N/A')}
 
 """)
-        
+
         f.write(f"""
 ---
 
@@ -341,7 +289,7 @@ Individual time interval logs:
 
 **Completed:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """)
-    
+
     print("=" * 70)
     print("✅ ALL TIME INTERVALS COMPLETE")
     print("=" * 70)
@@ -352,5 +300,6 @@ Individual time interval logs:
 
 
 if __name__ == '__main__':
-    main()
+    args = runner_argument_parser("Run all experiments for every time interval in parallel").parse_args()
+    main(max_workers=args.workers, use_cache=not args.force)
 
@@ -31,14 +31,17 @@ warnings.filterwarnings('ignore')
 import sys
 sys.path.append(str(Path(__file__).parent))
 from shared_data_model import (
-    UserProfile, Event, Partnership, Recommendation,
+    UserProfile, Event, Partnership,
     quantum_compatibility, calculate_expertise_score,
     get_dynamic_threshold, calculate_location_match,
     generate_integrated_user_profile, generate_integrated_event,
     generate_integrated_partnership, save_integrated_data, load_integrated_data,
-    hybrid_learning_function, create_personality_anchors, is_anchor,
+    hybrid_learning_function, create_personality_anchors,
     calculate_homogenization_rate, load_profiles_with_fallback,
 )
+from diversity_metrics import MAX_DISTANCE_12D, homogenization_from_distance, mean_pairwise_distance
+from population import Population, UserView
+from recommender import BatchRecommender, RecommendationTable
 
 # Import individual patent functions (simplified versions for integration)
 # Note: In full implementation, these would import from actual patent modules
@@ -69,7 +72,7 @@ def phase_1_setup():
     
     print(f"Loading {NUM_USERS} users from Big Five data (with synthetic fallback)...")
     project_root = Path(__file__).parent.parent.parent.parent.parent
-    users = load_profiles_with_fallback(
+    profiles = load_profiles_with_fallback(
         num_profiles=NUM_USERS,
         use_big_five=True,
         project_root=project_root,
@@ -79,6 +82,7 @@ def phase_1_setup():
             random_seed=RANDOM_SEED + hash(agent_id) % (2**32)
         )
     )
+    users = Population.from_profiles(profiles)
     
     print(f"Creating {NUM_EVENTS} multi-entity events...")
     events = []
@@ -123,8 +127,7 @@ def phase_1_setup():
     
     # Calculate initial homogenization
     if len(users) > 1:
-        personalities = [u.personality_12d for u in users]
-        initial_homogenization = calculate_homogenization_rate(personalities)
+        initial_homogenization = calculate_homogenization_rate(users.personality)
         print(f"📊 Initial homogenization: {initial_homogenization:.2%}")
     
     print(f"✅ Setup complete: {len(users)} users, {len(events)} events")
@@ -137,15 +140,217 @@ def phase_1_setup():
 # PHASE 2: PERSONALITY EVOLUTION (Months 1-6)
 # ============================================================================
 
+def sample_distinct_pair(users: List[UserView]) -> tuple:
+    """
+    Pick two different users.
+    
+    Index-based equivalent of random.choice(users) followed by
+    random.choice over the remaining users (same random draws).
+    """
+    idx_a = random.randrange(len(users))
+    idx_b = random.randrange(len(users) - 1)
+    if idx_b >= idx_a:
+        idx_b += 1
+    return users[idx_a], users[idx_b]
+
+
+class PartnerIndex:
+    """
+    Partner-sampling index for one month of hybrid learning.
+    
+    Non-anchor users (anchors don't evolve, so nobody learns from them)
+    are sorted by cluster, making each cluster a contiguous segment of
+    `members`. Drawing from a cluster, or from everyone outside it, is
+    then index arithmetic on uniform draws instead of a list rebuild per
+    evolving user.
+    """
+
+    def __init__(self, rows: np.ndarray, clusters: np.ndarray, is_anchor: np.ndarray, num_clusters: int):
+        """
+        Args:
+            rows: Population rows of the active users
+            clusters: Cluster id per active user (0 .. num_clusters - 1)
+            is_anchor: Anchor flag per active user
+            num_clusters: Number of cluster ids
+        """
+        eligible = ~is_anchor
+        order = np.argsort(clusters[eligible], kind='stable')
+        self.members = rows[eligible][order]
+        self.sizes = np.bincount(clusters[eligible], minlength=num_clusters)
+        self.starts = np.concatenate(([0], np.cumsum(self.sizes)[:-1]))
+        
+        # Position of each population row within members (-1 for non-members)
+        self.position = np.full(int(rows.max()) + 1 if len(rows) else 0, -1, dtype=np.int64)
+        self.position[self.members] = np.arange(len(self.members))
+
+    def sample_other_clusters(self, clusters: np.ndarray, tries: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Draw `tries` members (with replacement) outside each user's cluster.
+        
+        Returns:
+            (len(clusters), tries) population rows, -1 where the pool is empty
+        """
+        if len(self.members) == 0:
+            return np.full((len(clusters), tries), -1, dtype=np.int64)
+        pool_sizes = len(self.members) - self.sizes[clusters]
+        draws = (rng.random((len(clusters), tries)) * pool_sizes[:, None]).astype(np.int64)
+        # Skip over the user's own cluster segment
+        starts = self.starts[clusters][:, None]
+        draws += np.where(draws >= starts, self.sizes[clusters][:, None], 0)
+        return np.where(pool_sizes[:, None] > 0, self.members[np.minimum(draws, len(self.members) - 1)], -1)
+
+    def sample_same_cluster(
+        self,
+        rows: np.ndarray,
+        clusters: np.ndarray,
+        tries: int,
+        rng: np.random.Generator
+    ) -> np.ndarray:
+        """
+        Draw `tries` members (with replacement) from each user's own cluster,
+        excluding the user.
+        
+        Returns:
+            (len(rows), tries) population rows, -1 where the pool is empty
+        """
+        if len(self.members) == 0:
+            return np.full((len(rows), tries), -1, dtype=np.int64)
+        starts = self.starts[clusters]
+        own = self.position[rows]
+        is_member = own >= 0
+        pool_sizes = self.sizes[clusters] - is_member
+        draws = (rng.random((len(rows), tries)) * pool_sizes[:, None]).astype(np.int64)
+        # Skip over the user's own slot
+        draws += is_member[:, None] & (draws >= (own - starts)[:, None])
+        return np.where(pool_sizes[:, None] > 0, self.members[np.minimum(starts[:, None] + draws, len(self.members) - 1)], -1)
+
+
+def first_compatible(
+    unit_personalities: np.ndarray,
+    rows: np.ndarray,
+    candidates: np.ndarray,
+    threshold: float
+) -> np.ndarray:
+    """
+    First candidate per user whose quantum compatibility reaches threshold.
+    
+    Args:
+        unit_personalities: Normalized personalities for the whole population
+        rows: (K,) users
+        candidates: (K, T) candidate rows, -1 for no candidate
+        threshold: Minimum compatibility
+    
+    Returns:
+        (K,) partner rows, -1 where no candidate qualifies
+    """
+    if candidates.shape[1] == 0:
+        return np.full(len(rows), -1, dtype=np.int64)
+    # |<a|b>|² for all K x T pairs as one batched matrix product
+    overlaps = np.matmul(unit_personalities[np.maximum(candidates, 0)], unit_personalities[rows][:, :, None])[:, :, 0]
+    qualifies = (candidates >= 0) & (overlaps ** 2 >= threshold)
+    first = qualifies.argmax(axis=1)
+    return np.where(qualifies.any(axis=1), candidates[np.arange(len(rows)), first], -1)
+
+
+# Base churn for users in their first month: (max days since join, low, high)
+CHURN_AGE_BUCKETS = (
+    (3, 0.70, 0.80),    # Day 1-3: very high early churn
+    (7, 0.50, 0.60),    # Day 4-7
+    (14, 0.30, 0.40),   # Day 8-14
+    (30, 0.15, 0.25),   # Day 15-30
+)
+
+# Expertise tiers used by the churn model and its reporting
+CHURN_TIER_NEW = 0
+CHURN_TIER_BUILDING = 1
+CHURN_TIER_EXPERT = 2
+
+
+def churn_step(
+    join_month: np.ndarray,
+    month: int,
+    is_expert: np.ndarray,
+    expertise_score: np.ndarray,
+    personality: np.ndarray,
+    original_personality: np.ndarray,
+    has_original: np.ndarray,
+    rng: np.random.Generator
+) -> tuple:
+    """
+    Expertise- and age-based churn model for one month, over population arrays.
+    
+    - Base churn by days since join: CHURN_AGE_BUCKETS in the first month,
+      then 0.10 * exp(-months / 3) + 0.05 clamped to 5-10% per month
+    - Experts keep 10-20% of the base rate; users building expertise
+      (score > 0.3) get a 30-50% reduction scaled by progress
+    - Drift from the original personality raises churn by up to 20%
+    
+    Args:
+        join_month: (N,) join month per user
+        month: Current month
+        is_expert: (N,) expert flags
+        expertise_score: (N,) expertise scores
+        personality: (N, 12) current personalities
+        original_personality: (N, 12) original personalities
+        has_original: (N,) whether original_personality is set
+        rng: Random generator for the churn draws
+    
+    Returns:
+        (churn mask, tier per user as CHURN_TIER_* codes)
+    """
+    num_users = len(join_month)
+    days_since_join = (month - join_month) * 30  # Approximate days
+    
+    # Month 2+: Exponential decay to 5-10% per month
+    months_after_first = (days_since_join - 30) / 30.0
+    base_churn_prob = np.clip(0.10 * np.exp(-months_after_first / 3.0) + 0.05, 0.05, 0.10)
+    
+    # First month: uniform draw within the user's day bucket
+    bucket_draws = rng.random(num_users)
+    assigned = np.zeros(num_users, dtype=bool)
+    for max_days, low, high in CHURN_AGE_BUCKETS:
+        in_bucket = (days_since_join <= max_days) & ~assigned
+        base_churn_prob[in_bucket] = low + (high - low) * bucket_draws[in_bucket]
+        assigned |= in_bucket
+    
+    # Users building expertise (score > 0.3) but not yet expert are on the path
+    is_building = (expertise_score > 0.3) & ~is_expert
+    tiers = np.full(num_users, CHURN_TIER_NEW, dtype=np.int64)
+    tiers[is_building] = CHURN_TIER_BUILDING
+    tiers[is_expert] = CHURN_TIER_EXPERT
+    
+    # Apply expertise-based churn reduction
+    expertise_reduction = np.zeros(num_users)
+    expertise_reduction[is_expert] = rng.uniform(0.80, 0.90, np.count_nonzero(is_expert))
+    progress_factor = np.minimum(1.0, expertise_score / 0.9)
+    expertise_reduction[is_building] = 0.30 + progress_factor[is_building] * 0.20
+    churn_prob = base_churn_prob * (1.0 - expertise_reduction)
+    
+    # Adjust for homogenization (more homogenized users churn slightly more)
+    drift = np.abs(personality[has_original] - original_personality[has_original]).mean(axis=1)
+    churn_prob[has_original] *= 1.0 + drift * 0.2
+    
+    churn_prob = np.clip(churn_prob, 0.0, 1.0)
+    return rng.random(num_users) < churn_prob, tiers
+
+
 def phase_2_personality_evolution(
-    users: List[UserProfile], 
-    network_monitor: Dict, 
+    users: Population,
+    network_monitor: Dict,
     months: int = 6,
-    agent_join_times: Dict = None,
-    agent_churn_times: Dict = None,
-    next_agent_id: int = None
+    next_agent_id: int = None,
+    rng: Optional[np.random.Generator] = None
 ):
-    """Phase 2: Personality evolution through AI2AI learning with agent creation and churn."""
+    """
+    Phase 2: Personality evolution through AI2AI learning with agent creation and churn.
+    
+    Join and churn months are recorded in the population's join_month /
+    churn_month columns. Churn draws come from rng (seeded from
+    RANDOM_SEED by default).
+    """
+    if rng is None:
+        rng = np.random.default_rng(RANDOM_SEED)
+    
     print("=" * 70)
     print(f"Phase 2: Personality Evolution (Months 1-{months})")
     print("=" * 70)
@@ -157,7 +362,8 @@ def phase_2_personality_evolution(
         print(f"Month {month}...")
         
         # Get current active users before any changes
-        active_users = [u for u in users if agent_churn_times.get(u.agent_id) is None]
+        num_active = int(np.count_nonzero(users.active_mask()))
+        num_churned = 0
         
         # Agent Creation: Add new users (realistic and random)
         # Growth rate decreases over time as platform matures
@@ -169,16 +375,17 @@ def phase_2_personality_evolution(
         else:
             growth_rate = random.uniform(0.01, 0.03)  # 1-3% in later months
         
-        num_new_users = max(1, int(len(active_users) * growth_rate))
+        num_new_users = max(1, int(num_active * growth_rate))
         new_users_this_month = []
         for _ in range(num_new_users):
-            new_user = generate_integrated_user_profile(
-                agent_id=f'user_{next_agent_id:04d}',
-                platform_phase=random.choice(['Early', 'Growth', 'Mature']),
-                random_seed=RANDOM_SEED + next_agent_id
+            new_user = users.append(
+                generate_integrated_user_profile(
+                    agent_id=f'user_{next_agent_id:04d}',
+                    platform_phase=random.choice(['Early', 'Growth', 'Mature']),
+                    random_seed=RANDOM_SEED + next_agent_id
+                ),
+                join_month=month
             )
-            users.append(new_user)
-            agent_join_times[new_user.agent_id] = month
             new_users_this_month.append(new_user)
             next_agent_id += 1
         
@@ -188,139 +395,57 @@ def phase_2_personality_evolution(
         # Agent Churn: Expertise-based churn model
         # Experts are less likely to churn (they benefit most from the application)
         # New users (non-experts) are most likely to churn
-        # Churn rate based on expertise level and time to become expert (0-360 days)
-        # Update active users list (after new users joined)
-        active_users = [u for u in users if agent_churn_times.get(u.agent_id) is None]
-        if len(active_users) > 0:
-            users_to_churn = []
-            
-            # Calculate churn probability for each user based on expertise and time
-            for user in active_users:
-                join_month = agent_join_times.get(user.agent_id, 0)
-                days_since_join = (month - join_month) * 30  # Approximate days
-                
-                # Determine if user is an expert
-                is_expert = user.expert_creation_time is not None
-                
-                # Determine if user is "on the path" to becoming expert
-                # Users building expertise (score > 0.3) but not yet expert are on the path
-                is_building_expertise = user.expertise_score > 0.3 and not is_expert
-                
-                # Calculate days to become expert (if expert)
-                days_to_become_expert = None
-                if is_expert and user.expert_creation_time is not None:
-                    days_to_become_expert = (user.expert_creation_time - join_month) * 30
-                elif is_building_expertise:
-                    # Estimate days to become expert based on current progress
-                    # Assume linear progression: if at 0.5 expertise, halfway to threshold
-                    # Threshold is typically 0.85-0.95, so estimate based on progress
-                    phase_thresholds = {'Early': 0.85, 'Growth': 0.90, 'Mature': 0.95}
-                    threshold = phase_thresholds.get(user.platform_phase, 0.90)
-                    progress_ratio = user.expertise_score / threshold if threshold > 0 else 0.0
-                    # Estimate: if 50% progress, assume 50% of max time (360 days)
-                    estimated_days_remaining = (1.0 - progress_ratio) * 360
-                    days_to_become_expert = days_since_join + estimated_days_remaining
-                
-                # Base churn probability based on age (for non-experts)
-                # Day 1-3: 70-80% churn (very high early churn)
-                # Day 4-7: 50-60% churn
-                # Day 8-14: 30-40% churn
-                # Day 15-30: 15-25% churn
-                # Month 2+: 5-10% churn per month (decreasing)
-                
-                if days_since_join <= 3:
-                    base_churn_prob = random.uniform(0.70, 0.80)
-                elif days_since_join <= 7:
-                    base_churn_prob = random.uniform(0.50, 0.60)
-                elif days_since_join <= 14:
-                    base_churn_prob = random.uniform(0.30, 0.40)
-                elif days_since_join <= 30:
-                    base_churn_prob = random.uniform(0.15, 0.25)
-                else:
-                    # Month 2+: Exponential decay to 5-10% per month
-                    months_since_join = (days_since_join - 30) / 30.0
-                    base_churn_prob = 0.10 * np.exp(-months_since_join / 3.0) + 0.05
-                    base_churn_prob = min(0.10, max(0.05, base_churn_prob))
-                
-                # Apply expertise-based churn reduction
-                if is_expert:
-                    # Experts have much lower churn (they benefit most)
-                    # Reduce churn by 80-90% (experts churn at 10-20% of base rate)
-                    expertise_reduction = random.uniform(0.80, 0.90)
-                    churn_prob = base_churn_prob * (1.0 - expertise_reduction)
-                elif is_building_expertise:
-                    # Users building expertise have intermediate churn
-                    # Reduce churn by 30-50% (they're engaged and progressing)
-                    # More progress = less churn
-                    progress_factor = min(1.0, user.expertise_score / 0.9)  # Normalize to 0-1
-                    expertise_reduction = 0.30 + (progress_factor * 0.20)  # 30-50% reduction
-                    churn_prob = base_churn_prob * (1.0 - expertise_reduction)
-                else:
-                    # New users (non-experts, not building) have full base churn
-                    churn_prob = base_churn_prob
-                
-                # Adjust for homogenization (more homogenized users churn slightly more)
-                if hasattr(user, '_original_personality'):
-                    drift = np.mean(np.abs(user.personality_12d - user._original_personality))
-                    homogenization_factor = 1.0 + (drift * 0.2)  # Up to 20% increase
-                    churn_prob = churn_prob * homogenization_factor
-                
-                # Clamp to reasonable range (0-1)
-                churn_prob = min(1.0, max(0.0, churn_prob))
-                
-                # Apply churn based on probability
-                if random.random() < churn_prob:
-                    users_to_churn.append(user)
+        # Churn rate based on expertise level and time since join
+        # Active users after new users joined
+        active_rows = users.active_rows()
+        if len(active_rows) > 0:
+            churned, tiers = churn_step(
+                join_month=users.join_month[active_rows],
+                month=month,
+                is_expert=users.expert_mask()[active_rows],
+                expertise_score=users.expertise_score[active_rows],
+                personality=users.personality[active_rows],
+                original_personality=users.original_personality[active_rows],
+                has_original=users.has_original[active_rows],
+                rng=rng
+            )
             
             # Mark users as churned
-            for user in users_to_churn:
-                agent_churn_times[user.agent_id] = month
+            churned_rows = active_rows[churned]
+            users.mark_churned(churned_rows, month)
+            num_churned = len(churned_rows)
             
-            if users_to_churn:
+            if num_churned:
                 # Calculate actual churn rate for reporting
-                actual_churn_rate = len(users_to_churn) / len(active_users) * 100
+                actual_churn_rate = num_churned / len(active_rows) * 100
+                print(f"  {num_churned} users churned ({actual_churn_rate:.1f}% of active users)")
                 
-                # Calculate churn by expertise level for reporting
-                expert_churn = sum(1 for u in users_to_churn if u.expert_creation_time is not None)
-                building_churn = sum(1 for u in users_to_churn if u.expertise_score > 0.3 and u.expert_creation_time is None)
-                new_user_churn = len(users_to_churn) - expert_churn - building_churn
-                
-                total_experts = sum(1 for u in active_users if u.expert_creation_time is not None)
-                total_building = sum(1 for u in active_users if u.expertise_score > 0.3 and u.expert_creation_time is None)
-                total_new = len(active_users) - total_experts - total_building
-                
-                print(f"  {len(users_to_churn)} users churned ({actual_churn_rate:.1f}% of active users)")
-                if total_experts > 0:
-                    expert_churn_rate = (expert_churn / total_experts * 100) if total_experts > 0 else 0
-                    print(f"    - Experts: {expert_churn}/{total_experts} ({expert_churn_rate:.1f}%)")
-                if total_building > 0:
-                    building_churn_rate = (building_churn / total_building * 100) if total_building > 0 else 0
-                    print(f"    - Building expertise: {building_churn}/{total_building} ({building_churn_rate:.1f}%)")
-                if total_new > 0:
-                    new_churn_rate = (new_user_churn / total_new * 100) if total_new > 0 else 0
-                    print(f"    - New users: {new_user_churn}/{total_new} ({new_churn_rate:.1f}%)")
+                # Churn by expertise tier for reporting
+                tier_totals = np.bincount(tiers, minlength=3)
+                tier_churn = np.bincount(tiers[churned], minlength=3)
+                for tier, label in ((CHURN_TIER_EXPERT, 'Experts'),
+                                    (CHURN_TIER_BUILDING, 'Building expertise'),
+                                    (CHURN_TIER_NEW, 'New users')):
+                    if tier_totals[tier] > 0:
+                        tier_rate = tier_churn[tier] / tier_totals[tier] * 100
+                        print(f"    - {label}: {tier_churn[tier]}/{tier_totals[tier]} ({tier_rate:.1f}%)")
         
         # Filter to only active users for evolution
-        active_users = [u for u in users if agent_churn_times.get(u.agent_id) is None]
+        active_rows = users.active_rows()
+        active_users = users.views(active_rows)
         
         # Patent #3: Personality evolution with diversity mechanisms
         # CRITICAL: Per-user early protection - each user gets 6 months of protection from their join date
         # This ensures every new user gets protection regardless of when they join
         
-        # Count users in early protection period
-        users_in_early_protection = 0
-        if agent_join_times is not None:
-            for user in active_users:
-                join_month = agent_join_times.get(user.agent_id, 0)
-                months_since_join = month - join_month
-                if months_since_join <= 3:  # 3 months protection period
-                    users_in_early_protection += 1
+        # Count users in early protection period (3 months protection period)
+        months_since_join = month - users.join_month[active_rows]
+        users_in_early_protection = int(np.count_nonzero(months_since_join <= 3))
         
         # Still track conversations even during early protection (for metrics)
         conversations = []
         for _ in range(len(active_users) // 15):
-            user_a = random.choice(active_users)
-            user_b = random.choice([u for u in active_users if u.agent_id != user_a.agent_id])
+            user_a, user_b = sample_distinct_pair(active_users)
             vibe_compatibility = quantum_compatibility(
                 user_a.personality_12d,
                 user_b.personality_12d
@@ -338,8 +463,7 @@ def phase_2_personality_evolution(
         
         # Calculate current homogenization for adaptive mechanisms (only active users)
         if len(active_users) > 1:
-            personalities = [u.personality_12d for u in active_users]
-            current_homogenization = calculate_homogenization_rate(personalities)
+            current_homogenization = calculate_homogenization_rate(users.personality[active_rows])
         else:
             current_homogenization = 0.0
         
@@ -376,94 +500,76 @@ def phase_2_personality_evolution(
         
         # Mechanism 5: Contextual Routing - Route users to diverse clusters
         # Group users by personality similarity and route to different clusters
-        personality_clusters = {}
-        cluster_assignments = {}
+        cluster_ids = np.zeros(len(active_rows), dtype=np.int64)
+        num_cluster_ids = 1
         if len(active_users) > 10:
             # Better clustering: use k-means-like approach with multiple dimensions
             num_clusters = min(10, len(active_users) // 10)  # 10 clusters or 1 per 10 users
-            for user in active_users:
-                # Use first 3 dimensions for clustering (more stable)
-                cluster_key = tuple(int(user.personality_12d[i] * num_clusters) for i in range(3))
-                if cluster_key not in personality_clusters:
-                    personality_clusters[cluster_key] = []
-                personality_clusters[cluster_key].append(user)
-                cluster_assignments[user.agent_id] = cluster_key
+            # Use first 3 dimensions for clustering (more stable)
+            cluster_keys = (users.personality[active_rows, :3] * num_clusters).astype(np.int64)
+            unique_keys, cluster_ids = np.unique(cluster_keys, axis=0, return_inverse=True)
+            cluster_ids = cluster_ids.reshape(-1)
+            num_cluster_ids = len(unique_keys)
         
         # Create personality anchors (first month only, or if not created)
-        if month == 1 or not any(hasattr(u, '_is_anchor') for u in active_users):
+        if month == 1 or not users.anchor[active_rows].any():
             anchors = create_personality_anchors(active_users, anchor_percentage=0.25)  # Increased to 25% (more permanent diversity)
             if anchors:
                 print(f"  🔒 Created {len(anchors)} personality anchors (permanent diversity)")
         
+        # Store original personality if not stored
+        users.ensure_original(active_rows)
+        
+        # PER-USER EARLY PROTECTION: Each user gets 3 months of protection from their join date
+        # Diversity-injected and personality-reset users are immune until their immune month
+        immune = (
+            (users.diversity_immune_until[active_rows] > month) |
+            (users.reset_immune_until[active_rows] > month)
+        )
+        evolving = (months_since_join > 3) & ~immune
+        
+        # Apply interaction frequency reduction
+        evolving &= rng.random(len(active_rows)) <= interaction_probability
+        evolving_rows = active_rows[evolving]
+        evolving_clusters = cluster_ids[evolving]
+        
+        # HYBRID LEARNING: Find a partner for learning
+        # Candidates are drawn from the partner index (anchors excluded) and
+        # scored against the meaningful-encounter threshold in one batch
+        partner_index = PartnerIndex(active_rows, cluster_ids, users.anchor[active_rows], num_cluster_ids)
+        norms = np.linalg.norm(users.personality, axis=1, keepdims=True)
+        unit_personalities = np.divide(users.personality, norms, out=np.zeros_like(users.personality), where=norms > 0)
+        
+        # Prefer diverse partners (different cluster) for better diversity preservation
+        partner_rows = first_compatible(
+            unit_personalities, evolving_rows,
+            partner_index.sample_other_clusters(evolving_clusters, 15, rng),  # Try more times for diverse partner
+            meaningful_encounter_threshold
+        )
+        
+        # Fallback: same cluster if no diverse partner found
+        fallback = partner_rows < 0
+        partner_rows[fallback] = first_compatible(
+            unit_personalities, evolving_rows[fallback],
+            partner_index.sample_same_cluster(evolving_rows[fallback], evolving_clusters[fallback], 10, rng),  # Try fewer times
+            meaningful_encounter_threshold
+        )
+        
+        # Only evolve if meaningful encounter found
+        has_partner = partner_rows >= 0
+        evolved_rows = evolving_rows[has_partner].tolist()
+        
         # Simulate personality evolution with HYBRID LEARNING (only active users)
-        for user in active_users:
-            # Store original personality if not stored
-            if not hasattr(user, '_original_personality'):
-                user._original_personality = user.personality_12d.copy()
-            
-            # PER-USER EARLY PROTECTION: Each user gets 3 months of protection from their join date
-            if agent_join_times is not None:
-                join_month = agent_join_times.get(user.agent_id, 0)
-                months_since_join = month - join_month
-                if months_since_join <= 3:  # 3 months protection period
-                    continue  # Skip evolution for this user (early protection period)
-            
-            # Skip evolution for diversity-injected users (immune period)
-            if hasattr(user, '_diversity_immune_until') and month < user._diversity_immune_until:
-                continue  # Skip evolution for diversity-injected users during immune period
-            
-            # Skip evolution for personality-reset users (immune period)
-            if hasattr(user, '_reset_immune_until') and month < user._reset_immune_until:
-                continue  # Skip evolution for reset users during immune period
-            
-            # Apply interaction frequency reduction
-            if random.random() > interaction_probability:
-                continue  # Skip evolution for this user this month
-            
-            # HYBRID LEARNING: Find a partner for learning
-            # Prefer diverse partners (different cluster) for better diversity preservation
-            meaningful_partner = None
-            user_cluster = cluster_assignments.get(user.agent_id)
-            
-            # Try to find partner from different cluster first (diversity injection)
-            diverse_partners = [u for u in active_users 
-                              if u.agent_id != user.agent_id 
-                              and cluster_assignments.get(u.agent_id) != user_cluster
-                              and not is_anchor(u)]  # Don't learn from anchors (they don't evolve)
-            
-            if len(diverse_partners) > 0:
-                # Prefer diverse partners (different cluster)
-                for _ in range(15):  # Try more times for diverse partner
-                    partner = random.choice(diverse_partners)
-                    compatibility = quantum_compatibility(user.personality_12d, partner.personality_12d)
-                    if compatibility >= meaningful_encounter_threshold:
-                        meaningful_partner = partner
-                        break
-            
-            # Fallback: same cluster if no diverse partner found
-            if meaningful_partner is None:
-                same_cluster_partners = [u for u in active_users 
-                                       if u.agent_id != user.agent_id 
-                                       and cluster_assignments.get(u.agent_id) == user_cluster
-                                       and not is_anchor(u)]  # Don't learn from anchors
-                for _ in range(10):  # Try fewer times for same-cluster partner
-                    if len(same_cluster_partners) > 0:
-                        partner = random.choice(same_cluster_partners)
-                        compatibility = quantum_compatibility(user.personality_12d, partner.personality_12d)
-                        if compatibility >= meaningful_encounter_threshold:
-                            meaningful_partner = partner
-                            break
-            
-            # Only evolve if meaningful encounter found
-            if meaningful_partner is None:
-                continue  # Skip evolution if no meaningful encounter
+        for row, partner_row in zip(evolved_rows, partner_rows[has_partner].tolist()):
+            user = UserView(users, row)
+            meaningful_partner = UserView(users, partner_row)
             
             # HYBRID LEARNING FUNCTION: Convergence on preferences, preserve core personality
             new_personality, new_event_prefs, new_spot_prefs, new_suggestion_prefs = hybrid_learning_function(
                 user=user,
                 partner=meaningful_partner,
                 all_users=active_users,
-                agent_join_times=agent_join_times,
+                agent_join_times=users.join_months,
                 current_month=month,
                 current_homogenization=current_homogenization
             )
@@ -475,12 +581,14 @@ def phase_2_personality_evolution(
             user.event_preferences = new_event_prefs
             user.spot_preferences = new_spot_prefs
             user.suggestion_preferences = new_suggestion_prefs
-            
-            user.dimension_confidence = np.clip(
-                user.dimension_confidence + np.random.uniform(0.0, 0.01, 12),
+        
+        # Confidence grows for every user that evolved this month
+        if evolved_rows:
+            users.confidence[evolved_rows] = np.clip(
+                users.confidence[evolved_rows] + np.random.uniform(0.0, 0.01, (len(evolved_rows), 12)),
                 0.6, 1.0
             )
-            user.last_updated = time.time()
+            users.last_updated[evolved_rows] = time.time()
         
         # Mechanism 6: Diversity Injection + Personality Reset
         # NOTE: With new approach, we should NOT modify core personality
@@ -491,15 +599,18 @@ def phase_2_personality_evolution(
             # More aggressive injection: 3-5% of active users (was 2%)
             injection_rate = min(0.05, 0.02 + (current_homogenization - 0.30) * 0.1)  # Scale with homogenization
             num_diversity_injections = max(1, int(len(active_users) * injection_rate))
+            avg_personality = users.personality[active_rows].mean(axis=0)
             for _ in range(num_diversity_injections):
                 # Create a user with opposite personality (diversity injection)
-                diverse_user = generate_integrated_user_profile(
-                    agent_id=f'diversity_{next_agent_id:04d}',
-                    platform_phase=random.choice(['Early', 'Growth', 'Mature']),
-                    random_seed=RANDOM_SEED + next_agent_id + 10000  # Different seed for diversity
+                diverse_user = users.append(
+                    generate_integrated_user_profile(
+                        agent_id=f'diversity_{next_agent_id:04d}',
+                        platform_phase=random.choice(['Early', 'Growth', 'Mature']),
+                        random_seed=RANDOM_SEED + next_agent_id + 10000  # Different seed for diversity
+                    ),
+                    join_month=month
                 )
                 # Make personality more diverse (opposite of average, with some randomness)
-                avg_personality = np.mean([u.personality_12d for u in active_users], axis=0)
                 # Use opposite + random variation for more diversity
                 diverse_user.personality_12d = np.clip(
                     1.0 - avg_personality + np.random.uniform(-0.2, 0.2, 12),
@@ -509,8 +620,6 @@ def phase_2_personality_evolution(
                 # Mark as diversity-injected user (immune to evolution for first 3 months)
                 diverse_user._diversity_injected = month
                 diverse_user._diversity_immune_until = month + 3  # Immune for 3 months
-                users.append(diverse_user)
-                agent_join_times[diverse_user.agent_id] = month
                 next_agent_id += 1
             
             # Mechanism 7: Personality Reset - DISABLED
@@ -519,14 +628,14 @@ def phase_2_personality_evolution(
             # (Personality reset code removed - core personality should not be modified)
         
         # Update active_users after diversity injection
-        active_users = [u for u in users if agent_churn_times.get(u.agent_id) is None]
+        active_rows = users.active_rows()
+        active_users = users.views(active_rows)
         
         # Patent #10: AI2AI chat learning (simplified)
         # Simulate conversations and extract insights (only active users)
         conversations = []
         for _ in range(len(active_users) // 15):  # Reduced from 10% to ~6.7% (fewer conversations)
-            user_a = random.choice(active_users)
-            user_b = random.choice([u for u in active_users if u.agent_id != user_a.agent_id])
+            user_a, user_b = sample_distinct_pair(active_users)
             
             # Analyze conversation pattern
             vibe_compatibility = quantum_compatibility(
@@ -546,10 +655,8 @@ def phase_2_personality_evolution(
                 
                 # Update personalities from conversation with drift limit
                 # Check per-user early protection for both users
-                user_a_join_month = agent_join_times.get(user_a.agent_id, 0) if agent_join_times else 0
-                user_b_join_month = agent_join_times.get(user_b.agent_id, 0) if agent_join_times else 0
-                user_a_months_since_join = month - user_a_join_month
-                user_b_months_since_join = month - user_b_join_month
+                user_a_months_since_join = month - user_a.join_month
+                user_b_months_since_join = month - user_b.join_month
                 
                 # Skip learning if either user is in early protection period (3 months)
                 if user_a_months_since_join <= 3 or user_b_months_since_join <= 3:
@@ -579,14 +686,15 @@ def phase_2_personality_evolution(
                     user_b.personality_12d = np.clip(proposed_b, 0.0, 1.0)
         
         # Track evolution (Patent #11) - only active users
-        avg_personality = np.mean([u.personality_12d for u in active_users], axis=0)
-        personality_variance = np.var([u.personality_12d for u in active_users], axis=0)
+        active_personalities = users.personality[active_rows]
+        avg_personality = active_personalities.mean(axis=0)
+        personality_variance = active_personalities.var(axis=0)
         
         evolution_results.append({
             'month': month,
             'active_users': len(active_users),
             'new_users': len(new_users_this_month),
-            'churned_users': len(users_to_churn) if 'users_to_churn' in locals() else 0,
+            'churned_users': num_churned,
             'avg_personality': avg_personality.tolist(),
             'personality_variance': personality_variance.tolist(),
             'conversations': len(conversations),
@@ -605,98 +713,43 @@ def phase_2_personality_evolution(
     
     print()
     print(f"✅ Personality evolution complete: {months} months")
-    print(f"   Final active users: {len([u for u in users if agent_churn_times.get(u.agent_id) is None])}")
+    print(f"   Final active users: {np.count_nonzero(users.active_mask())}")
     print()
     
-    return evolution_results, agent_join_times, agent_churn_times, next_agent_id
+    return evolution_results, next_agent_id
 
 
 # ============================================================================
 # PHASE 3: RECOMMENDATIONS & DISCOVERY (Months 1-6)
 # ============================================================================
 
-def phase_3_recommendations_discovery(users: List[UserProfile], events: List[Event], month: int):
-    """Phase 3: Generate recommendations using multiple patents."""
+def phase_3_recommendations_discovery(
+    users: Population,
+    events: List[Event],
+    month: int,
+    recommender: Optional[BatchRecommender] = None
+) -> RecommendationTable:
+    """
+    Phase 3: Generate recommendations using multiple patents.
+    
+    Scoring runs through a BatchRecommender (Patent #19 compatibility,
+    Patent #20 fusion, Patent #22 calling score); pass the same recommender
+    every month so event vibe vectors stay fixed.
+    """
     print("=" * 70)
     print(f"Phase 3: Recommendations & Discovery (Month {month})")
     print("=" * 70)
     print()
     
-    recommendations = []
+    if recommender is None:
+        recommender = BatchRecommender(events, np.random.default_rng(RANDOM_SEED))
     
-    for user in users:
-        # Patent #19: 12D personality recommendations
-        # Find compatible events based on personality
-        event_scores = []
-        for event in events:
-            # Use quantum compatibility (Patent #1)
-            vibe = quantum_compatibility(user.personality_12d, np.random.rand(12))  # Simplified
-            
-            # Calculate dimension compatibility (Patent #19)
-            # Simplified version - in full would use actual event personality
-            dimension_compatibility = random.uniform(0.5, 1.0)
-            energy_compatibility = random.uniform(0.5, 1.0)
-            exploration_compatibility = random.uniform(0.5, 1.0)
-            weighted_compatibility = (dimension_compatibility * 0.60 +
-                                    energy_compatibility * 0.20 +
-                                    exploration_compatibility * 0.20)
-            
-            event_scores.append({
-                'event_id': event.event_id,
-                'vibe': vibe,
-                'weighted_compatibility': weighted_compatibility,
-            })
-        
-        # Patent #20: Multi-source fusion
-        # Generate recommendations from 4 sources
-        real_time_recs = sorted(event_scores, key=lambda x: x['vibe'], reverse=True)[:10]
-        community_recs = sorted(event_scores, key=lambda x: random.random(), reverse=True)[:10]
-        ai2ai_recs = sorted(event_scores, key=lambda x: x['weighted_compatibility'], reverse=True)[:10]
-        federated_recs = sorted(event_scores, key=lambda x: random.random(), reverse=True)[:10]
-        
-        # Fuse recommendations (40% + 30% + 20% + 10%)
-        fused_scores = {}
-        for rec in real_time_recs:
-            fused_scores[rec['event_id']] = rec.get('vibe', 0.0) * 0.4
-        for rec in community_recs:
-            fused_scores[rec['event_id']] = fused_scores.get(rec['event_id'], 0.0) + random.uniform(0, 0.3) * 0.3
-        for rec in ai2ai_recs:
-            fused_scores[rec['event_id']] = fused_scores.get(rec['event_id'], 0.0) + rec['weighted_compatibility'] * 0.2
-        for rec in federated_recs:
-            fused_scores[rec['event_id']] = fused_scores.get(rec['event_id'], 0.0) + random.uniform(0, 0.1) * 0.1
-        
-        # Apply hyper-personalization (Patent #20)
-        personalized_scores = {k: v * 1.1 for k, v in fused_scores.items()}  # 10% boost
-        
-        # Patent #22: Calling score
-        for event_id, fused_score in personalized_scores.items():
-            # Calculate calling score components
-            vibe_score = fused_scores.get(event_id, 0.0) * 0.4
-            life_betterment = random.uniform(0.6, 1.0) * 0.3
-            meaningful_connection = random.uniform(0.5, 1.0) * 0.15
-            context = calculate_location_match(user.location, events[0].location) * 0.10  # Simplified
-            timing = random.uniform(0.5, 1.0) * 0.05
-            
-            calling_score = vibe_score + life_betterment + meaningful_connection + context + timing
-            
-            if calling_score >= 0.70:  # Calling threshold
-                recommendation = Recommendation(
-                    recommendation_id=f'rec_{user.agent_id}_{event_id}',
-                    user_id=user.agent_id,
-                    target_id=event_id,
-                    target_type='event',
-                    fused_score=fused_scores.get(event_id, 0.0),
-                    personalized_score=personalized_scores.get(event_id, 0.0),
-                    weighted_compatibility=weighted_compatibility,
-                    calling_score=calling_score,
-                    meets_calling_threshold=True,
-                    quantum_compatibility=vibe,
-                )
-                recommendations.append(recommendation)
-                user.recommendation_history.append(recommendation.to_dict())
+    recommendations = recommender.recommend(
+        users.personality, users.column('location'), users.agent_ids, month
+    )
     
     print(f"✅ Generated {len(recommendations)} recommendations")
-    print(f"   Recommendations above 0.70 threshold: {sum(1 for r in recommendations if r.meets_calling_threshold)}")
+    print(f"   Recommendations above 0.70 threshold: {len(recommendations)}")
     print()
     
     return recommendations
@@ -706,7 +759,7 @@ def phase_3_recommendations_discovery(users: List[UserProfile], events: List[Eve
 # PHASE 4: EVENT MATCHING (Months 3-6)
 # ============================================================================
 
-def phase_4_event_matching(users: List[UserProfile], events: List[Event], month: int):
+def phase_4_event_matching(users: Population, events: List[Event], month: int):
     """Phase 4: Match users to events using multi-entity matching."""
     print("=" * 70)
     print(f"Phase 4: Event Matching (Month {month})")
@@ -722,7 +775,7 @@ def phase_4_event_matching(users: List[UserProfile], events: List[Event], month:
         for entity in event.entities:
             if entity.get('user_id'):
                 # User entity - match using quantum compatibility
-                user = next((u for u in users if u.agent_id == entity['user_id']), None)
+                user = users.get(entity['user_id'])
                 if user:
                     compatibility = quantum_compatibility(
                         user.personality_12d,
@@ -743,7 +796,7 @@ def phase_4_event_matching(users: List[UserProfile], events: List[Event], month:
             
             # Track in user history
             for match in entity_matches:
-                user = next((u for u in users if u.agent_id == match['user_id']), None)
+                user = users.get(match['user_id'])
                 if user:
                     user.event_history.append({
                         'event_id': event.event_id,
@@ -846,7 +899,7 @@ def create_experts_randomly(users: List[UserProfile], target_percentage: float =
     return 0
 
 
-def phase_5_expertise_progression(users: List[UserProfile], events: List[Event], month: int, agent_join_times: Dict = None):
+def phase_5_expertise_progression(users: Population, events: List[Event], month: int, agent_join_times: Dict = None):
     """Phase 5: Randomly create experts to maintain ~2% expert percentage."""
     print("=" * 70)
     print(f"Phase 5: Expertise Progression (Month {month})")
@@ -857,55 +910,52 @@ def phase_5_expertise_progression(users: List[UserProfile], events: List[Event],
     # Once an expert, always an expert (permanent status)
     new_experts = create_experts_randomly(users, target_percentage=0.02, agent_join_times=agent_join_times, month=month)
     
-    # Count total experts
-    experts_count = sum(1 for u in users if u.expert_creation_time is not None)
-    
     # Note: Experts can still grow their expertise paths, but they can't lose expert status
     # Allow experts to continue growing expertise (optional - for realism)
-    for user in users:
-        if user.expert_creation_time is not None:  # Is expert
-            # Experts can still grow expertise paths (but can't lose expert status)
-            if random.random() < 0.1:  # 10% chance of growth activity
-                if random.random() < 0.4:
-                    user.expertise_paths['exploration'] = min(1.0, user.expertise_paths['exploration'] + 0.01)
-                if random.random() < 0.3:
-                    user.expertise_paths['community'] = min(1.0, user.expertise_paths['community'] + 0.01)
-                if random.random() < 0.2:
-                    user.expertise_paths['professional'] = min(1.0, user.expertise_paths['professional'] + 0.01)
-                
-                # Recalculate expertise score
-                user.expertise_score = calculate_expertise_score(user.expertise_paths)
-                
-                # Update expertise level (but keep expert status)
-                if user.expertise_score >= 0.8:
-                    user.expertise_level = 'Global'
-                elif user.expertise_score >= 0.7:
-                    user.expertise_level = 'National'
-                elif user.expertise_score >= 0.6:
-                    user.expertise_level = 'Regional'
-                elif user.expertise_score >= 0.5:
-                    user.expertise_level = 'City'
-                elif user.expertise_score >= 0.4:
-                    user.expertise_level = 'Local'
+    expert_rows = np.flatnonzero(users.expert_mask())
+    for user in users.views(expert_rows):
+        # Experts can still grow expertise paths (but can't lose expert status)
+        if random.random() < 0.1:  # 10% chance of growth activity
+            if random.random() < 0.4:
+                user.expertise_paths['exploration'] = min(1.0, user.expertise_paths['exploration'] + 0.01)
+            if random.random() < 0.3:
+                user.expertise_paths['community'] = min(1.0, user.expertise_paths['community'] + 0.01)
+            if random.random() < 0.2:
+                user.expertise_paths['professional'] = min(1.0, user.expertise_paths['professional'] + 0.01)
+            
+            # Recalculate expertise score
+            user.expertise_score = calculate_expertise_score(user.expertise_paths)
+            
+            # Update expertise level (but keep expert status)
+            if user.expertise_score >= 0.8:
+                user.expertise_level = 'Global'
+            elif user.expertise_score >= 0.7:
+                user.expertise_level = 'National'
+            elif user.expertise_score >= 0.6:
+                user.expertise_level = 'Regional'
+            elif user.expertise_score >= 0.5:
+                user.expertise_level = 'City'
+            elif user.expertise_score >= 0.4:
+                user.expertise_level = 'Local'
     
     # Patent #18: Saturation adjustment (simplified)
     # Calculate category saturation (use actual experts, not just score)
+    categories = users.category_array()
     category_experts = defaultdict(int)
-    for user in users:
-        if user.expert_creation_time is not None:  # Actual expert
-            category_experts[user.category] += 1
+    for category in categories[expert_rows]:
+        category_experts[category] += 1
     
     # Adjust thresholds based on saturation (simplified)
     saturation_adjustments = {}
     for category, expert_count in category_experts.items():
-        saturation = expert_count / len([u for u in users if u.category == category])
+        saturation = expert_count / np.count_nonzero(categories == category)
         if saturation > 0.02:  # Above 2% target
             saturation_adjustments[category] = 1.2  # Increase threshold
         else:
             saturation_adjustments[category] = 1.0  # Normal threshold
     
     # Count experts based on expert_creation_time (actual experts, not just score)
-    experts_count = sum(1 for u in users if u.expert_creation_time is not None)
+    experts_count = len(expert_rows)
     print(f"✅ Expertise progression: {experts_count} experts ({experts_count/len(users)*100:.1f}%)")
     print()
     
@@ -917,7 +967,7 @@ def phase_5_expertise_progression(users: List[UserProfile], events: List[Event],
 # ============================================================================
 
 def phase_6_partnership_formation(
-    users: List[UserProfile],
+    users: Population,
     events: List[Event],
     partnerships: List[Partnership],
     month: int
@@ -929,7 +979,7 @@ def phase_6_partnership_formation(
     print()
     
     # Filter experts (use actual experts, not just score)
-    experts = [u for u in users if u.expert_creation_time is not None]
+    experts = users.views(np.flatnonzero(users.expert_mask()))
     
     # Generate businesses
     businesses = []
@@ -1000,7 +1050,7 @@ def phase_6_partnership_formation(
     exclusivity_checks = []
     for event in events:
         if event.host_id:
-            host = next((u for u in users if u.agent_id == event.host_id), None)
+            host = users.get(event.host_id)
             if host:
                 # Check if event violates any active partnerships
                 active_partnerships = [p for p in partnerships
@@ -1031,7 +1081,7 @@ def phase_6_partnership_formation(
 # ============================================================================
 
 def phase_7_event_hosting_revenue(
-    users: List[UserProfile],
+    users: Population,
     events: List[Event],
     partnerships: List[Partnership],
     month: int
@@ -1042,15 +1092,12 @@ def phase_7_event_hosting_revenue(
     print("=" * 70)
     print()
     
-    # Filter experts who can host
-    experts = [u for u in users if u.expertise_score >= 0.7]
-    
     revenue_distributions = []
     
     # Patent #15: N-way revenue distribution
     for event in events:
         if event.host_id and event.total_revenue > 0:
-            host = next((u for u in users if u.agent_id == event.host_id), None)
+            host = users.get(event.host_id)
             if host and host.expertise_score >= 0.7:
                 # Get event parties (entities)
                 parties = []
@@ -1125,12 +1172,12 @@ def phase_7_event_hosting_revenue(
 # ============================================================================
 
 def phase_8_system_monitoring(
-    users: List[UserProfile],
+    users: Population,
     events: List[Event],
     partnerships: List[Partnership],
     network_monitor: Dict,
     month: int,
-    agent_churn_times: Dict = None
+    recommendations: Optional[RecommendationTable] = None
 ):
     """Phase 8: Monitor system health and activity."""
     print("=" * 70)
@@ -1141,12 +1188,11 @@ def phase_8_system_monitoring(
     # Patent #11: Network monitoring (simplified)
     
     # Filter to only active users
-    if agent_churn_times is None:
-        agent_churn_times = {}
-    active_users = [u for u in users if agent_churn_times.get(u.agent_id) is None]
+    active_rows = users.active_rows()
+    active_users = users.views(active_rows)
     
     # Calculate network health metrics (only active users)
-    experts_count = sum(1 for u in active_users if u.expertise_score >= 0.7)
+    experts_count = int(np.count_nonzero(users.expertise_score[active_rows] >= 0.7))
     # Count active partnerships (end_date is in seconds since epoch, compare correctly)
     current_time = time.time()
     active_partnerships = sum(1 for p in partnerships if p.end_date > current_time)
@@ -1155,23 +1201,12 @@ def phase_8_system_monitoring(
     
     # Personality diversity (homogenization check) - only active users
     # Use pairwise distance metric (more accurate than variance)
+    max_possible_distance = MAX_DISTANCE_12D
     if len(active_users) > 1:
-        personalities = np.array([u.personality_12d for u in active_users])
-        # Calculate pairwise Euclidean distances
-        pairwise_distances = []
-        for i in range(len(personalities)):
-            for j in range(i + 1, len(personalities)):
-                dist = np.linalg.norm(personalities[i] - personalities[j])
-                pairwise_distances.append(dist)
-        
-        if len(pairwise_distances) > 0:
-            avg_distance = np.mean(pairwise_distances)
-            max_possible_distance = np.sqrt(12)  # Max distance in 12D space (0 to 1)
-            # Homogenization = 1 - (normalized average distance)
-            homogenization_rate = 1.0 - (avg_distance / max_possible_distance)
-        else:
-            homogenization_rate = 0.0
+        avg_distance = mean_pairwise_distance(users.personality[active_rows])
+        homogenization_rate = homogenization_from_distance(avg_distance, max_possible_distance)
     else:
+        avg_distance = 0.0
         homogenization_rate = 0.0
     
     network_health = {
@@ -1281,13 +1316,13 @@ def phase_8_system_monitoring(
         personality_diversity = max(0.0, 1.0 - (homogenization_rate - diversity_target) / (1.0 - diversity_target))
     
     # Expertise diversity (variance in expertise levels)
-    expertise_levels = [u.expertise_level for u in active_users]
+    expertise_levels = [users.expertise_level[row] for row in active_rows]
     unique_levels = len(set(expertise_levels))
     max_levels = 6  # none, Local, City, Regional, National, Global
     expertise_diversity = min(1.0, unique_levels / max_levels)
     
     # Category diversity (variance in categories)
-    categories = [u.category for u in active_users if u.category]
+    categories = [users.category[row] for row in active_rows if users.category[row]]
     unique_categories = len(set(categories))
     max_categories = 5  # technology, science, art, business, health
     category_diversity = min(1.0, unique_categories / max_categories)
@@ -1303,8 +1338,8 @@ def phase_8_system_monitoring(
     
     # Activity indicators (simplified - would track actual activity)
     conversations_count = len(network_monitor.get('personality_evolution_tracking', []))
-    recommendations_count = sum(len(u.recommendation_history) for u in active_users)
-    events_attended = sum(len(u.event_history) for u in active_users)
+    recommendations_count = int(recommendations.counts_per_user(active_rows).sum()) if recommendations is not None else 0
+    events_attended = int(users.history_lengths('event_history', active_rows).sum())
     
     # Normalize activity (simplified thresholds)
     activity_score = min(1.0, (
@@ -1382,43 +1417,39 @@ def run_full_ecosystem_integration():
     all_results = {}
     
     # Phase 1: Setup
-    users, events, network_monitor = phase_1_setup()
+    # Agent creation and churn are tracked in the population's join_month / churn_month columns
+    population, events, network_monitor = phase_1_setup()
     partnerships = []
-    
-    # Track agent creation and churn
-    agent_join_times = {user.agent_id: 0 for user in users}  # All start at month 0
-    agent_churn_times = {}  # Track when agents left (None if still active)
-    next_agent_id = len(users)
+    next_agent_id = len(population)
     
     # Phase 2: Personality Evolution (Months 1-12) - Back to 12 months with tuned parameters
-    evolution_results, agent_join_times, agent_churn_times, next_agent_id = phase_2_personality_evolution(
-        users, network_monitor, months=12, 
-        agent_join_times=agent_join_times,
-        agent_churn_times=agent_churn_times,
+    evolution_results, next_agent_id = phase_2_personality_evolution(
+        population, network_monitor, months=12,
         next_agent_id=next_agent_id
     )
     all_results['evolution'] = evolution_results
     
     # Filter to only active users for remaining phases
-    users = [u for u in users if agent_churn_times.get(u.agent_id) is None]
+    users = population.take(population.active_rows())
     
     # Phase 3-4: Recommendations & Matching (Months 1-12)
-    all_recommendations = []
+    recommender = BatchRecommender(events, np.random.default_rng(RANDOM_SEED))
+    all_recommendations = RecommendationTable(users.agent_ids, recommender.event_ids)
     all_matches = []
     for month in range(1, 13):
-        recommendations = phase_3_recommendations_discovery(users, events, month)
+        recommendations = phase_3_recommendations_discovery(users, events, month, recommender)
         matches, privacy_matches = phase_4_event_matching(users, events, month)
         all_recommendations.extend(recommendations)
         all_matches.extend(matches)
         network_monitor['matching_activity'].extend(matches)
     
-    all_results['recommendations'] = all_recommendations
+    all_results['recommendations'] = all_recommendations.to_columns()
     all_results['matches'] = all_matches
     
     # Phase 5: Expertise Progression (Months 1-12)
     expertise_results = []
     for month in range(1, 13):
-        experts_count, saturation = phase_5_expertise_progression(users, events, month, agent_join_times)
+        experts_count, saturation = phase_5_expertise_progression(users, events, month, users.join_months)
         expertise_results.append({
             'month': month,
             'experts_count': experts_count,
@@ -1458,7 +1489,7 @@ def run_full_ecosystem_integration():
     # Phase 8: System Monitoring (All Phases)
     monitoring_results = []
     for month in range(1, 13):
-        health = phase_8_system_monitoring(users, events, partnerships, network_monitor, month, agent_churn_times)
+        health = phase_8_system_monitoring(users, events, partnerships, network_monitor, month, all_recommendations)
         monitoring_results.append(health)
     all_results['monitoring'] = monitoring_results
     
@@ -1479,17 +1510,18 @@ def run_full_ecosystem_integration():
     final_health = monitoring_results[-1] if monitoring_results else {}
     
     # Filter to final active users
-    final_active_users = [u for u in users if agent_churn_times.get(u.agent_id) is None]
+    final_active_rows = users.active_rows()
+    final_active_users = users.views(final_active_rows)
     
     # Count experts directly from final_active_users (more reliable than final_health)
-    final_experts_count = sum(1 for u in final_active_users if u.expert_creation_time is not None)
+    final_experts_count = int(np.count_nonzero(users.expert_mask()[final_active_rows]))
     final_expert_percentage = (final_experts_count / len(final_active_users) * 100) if len(final_active_users) > 0 else 0.0
     
     print("Final System Metrics:")
     print("-" * 70)
-    print(f"Total Users Ever: {len(agent_join_times)}")
+    print(f"Total Users Ever: {len(population)}")
     print(f"Active Users: {len(final_active_users)}")
-    print(f"Churned Users: {len(agent_churn_times)}")
+    print(f"Churned Users: {len(population.churn_months)}")
     print(f"Experts: {final_experts_count} ({final_expert_percentage:.1f}%)")
     print(f"Active Partnerships: {final_health.get('active_partnerships', 0)}")
     print(f"Events Hosted: {final_health.get('events_hosted', 0)}")
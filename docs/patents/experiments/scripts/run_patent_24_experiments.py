@@ -19,9 +19,13 @@ import time
 from scipy.stats import pearsonr
 from sklearn.metrics import mean_absolute_error, mean_squared_error, accuracy_score
 import random
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(str(Path(__file__).parent))
+from geo_index import GeoIndex, NeighborLists, location_codes, locations_to_arrays, modal_codes
+
 # Configuration
 PATENT_NUMBER = "24"
 PATENT_NAME = "Location Inference from Agent Network Consensus"
@@ -101,46 +105,72 @@ def detect_vpn_proxy(agent):
     return agent.get('has_vpn', False) or agent.get('has_proxy', False)
 
 
-def discover_nearby_agents(target_agent, all_agents, max_distance_km=0.1):
-    """Discover nearby agents via proximity (Bluetooth/WiFi range ~100m)."""
-    nearby = []
-    target_lat = target_agent['true_location']['lat']
-    target_lng = target_agent['true_location']['lng']
-    
-    for agent in all_agents:
-        if agent['agent_id'] == target_agent.get('agent_id'):
-            continue
-        
-        agent_lat = agent['obfuscated_location']['lat']
-        agent_lng = agent['obfuscated_location']['lng']
-        
-        # Calculate distance (simplified Haversine)
-        distance = np.sqrt((target_lat - agent_lat)**2 + (target_lng - agent_lng)**2) * 111  # km
-        
-        if distance <= max_distance_km:
-            nearby.append(agent)
-    
-    return nearby
+def build_agent_index(agents, location_field='obfuscated_location'):
+    """Geo index over one location field of all agents (row i = agents[i])."""
+    return GeoIndex.from_locations([agent[location_field] for agent in agents])
 
 
-def majority_consensus(nearby_agents, threshold=CONSENSUS_THRESHOLD):
-    """Calculate majority consensus location with 60% threshold."""
-    if not nearby_agents:
-        return None
-    
-    # Group by obfuscated location
-    location_counts = {}
-    for agent in nearby_agents:
-        loc_key = (agent['obfuscated_location']['lat'], agent['obfuscated_location']['lng'])
-        location_counts[loc_key] = location_counts.get(loc_key, 0) + 1
-    
-    # Find location with majority (>= threshold)
-    total = len(nearby_agents)
-    for loc_key, count in location_counts.items():
-        if count / total >= threshold:
-            return {'lat': loc_key[0], 'lng': loc_key[1]}
-    
-    return None
+def agent_rows(target_agents, all_agents):
+    """Row of each target agent in all_agents (-1 if it isn't one of them)."""
+    row_of = {agent['agent_id']: row for row, agent in enumerate(all_agents)}
+    return np.array([row_of.get(target.get('agent_id'), -1) for target in target_agents], dtype=np.int64)
+
+
+def discover_nearby_agents(target_agent, all_agents, max_distance_km=0.1, index=None):
+    """
+    Discover nearby agents via proximity (Bluetooth/WiFi range ~100m).
+    
+    Radius query on a geo index over the agents' obfuscated locations
+    (haversine distance); pass a prebuilt index when calling repeatedly.
+    """
+    if index is None:
+        index = build_agent_index(all_agents)
+    
+    rows = index.query_radius(
+        target_agent['true_location']['lat'],
+        target_agent['true_location']['lng'],
+        max_distance_km
+    )
+    return [all_agents[row] for row in rows if all_agents[row]['agent_id'] != target_agent.get('agent_id')]
+
+
+def discover_nearby_agents_batch(target_agents, all_agents, index, max_distance_km=0.1):
+    """
+    Nearby agents for every target agent at once.
+    
+    Returns:
+        NeighborLists of rows into all_agents (each target excluding itself)
+    """
+    lats, lngs = locations_to_arrays([target['true_location'] for target in target_agents])
+    return index.query_radius_batch(lats, lngs, max_distance_km, exclude=agent_rows(target_agents, all_agents))
+
+
+def majority_consensus(nearby: NeighborLists, index: GeoIndex, threshold=CONSENSUS_THRESHOLD):
+    """
+    Calculate majority consensus location with 60% threshold.
+    
+    Agents are grouped by obfuscated location (the positions in index) and
+    the most common location of each neighbor list is accepted if it holds
+    at least `threshold` of the list. With a threshold above 50% at most
+    one location can qualify.
+    
+    Args:
+        nearby: Neighbor lists (rows into index)
+        index: Geo index over the agents' obfuscated locations
+        threshold: Minimum share for the consensus location
+    
+    Returns:
+        List with a {'lat', 'lng'} dict or None per neighbor list
+    """
+    codes, unique_locations = location_codes(index.lats, index.lngs)
+    modes, mode_counts = modal_codes(nearby, codes)
+    totals = nearby.counts
+    has_consensus = (totals > 0) & (mode_counts / np.maximum(totals, 1) >= threshold)
+    
+    return [
+        {'lat': float(unique_locations[mode, 0]), 'lng': float(unique_locations[mode, 1])} if found else None
+        for mode, found in zip(modes.tolist(), has_consensus.tolist())
+    ]
 
 
 def experiment_1_vpn_proxy_detection():
@@ -212,31 +242,22 @@ def experiment_2_proximity_discovery():
     results = []
     print(f"Discovering nearby agents for {len(target_agents)} target agents...")
     
-    for target_agent in target_agents:
-        nearby = discover_nearby_agents(target_agent, agents)
-        
-        # Ground truth: agents within 100m
-        ground_truth_nearby = []
-        target_lat = target_agent['true_location']['lat']
-        target_lng = target_agent['true_location']['lng']
-        
-        for agent in agents:
-            if agent['agent_id'] == target_agent.get('agent_id'):
-                continue
-            
-            agent_lat = agent['true_location']['lat']
-            agent_lng = agent['true_location']['lng']
-            distance = np.sqrt((target_lat - agent_lat)**2 + (target_lng - agent_lng)**2) * 111  # km
-            
-            if distance <= 0.1:  # 100m
-                ground_truth_nearby.append(agent)
-        
-        discovery_accuracy = len(nearby) / len(ground_truth_nearby) if ground_truth_nearby else 0.0
+    nearby = discover_nearby_agents_batch(target_agents, agents, build_agent_index(agents))
+    
+    # Ground truth: agents within 100m of the target's true location
+    ground_truth_nearby = discover_nearby_agents_batch(
+        target_agents, agents, build_agent_index(agents, 'true_location')
+    )
+    
+    for target_agent, nearby_count, ground_truth_count in zip(
+        target_agents, nearby.counts.tolist(), ground_truth_nearby.counts.tolist()
+    ):
+        discovery_accuracy = nearby_count / ground_truth_count if ground_truth_count else 0.0
         
         results.append({
             'target_agent_id': target_agent['target_agent_id'],
-            'nearby_count': len(nearby),
-            'ground_truth_count': len(ground_truth_nearby),
+            'nearby_count': nearby_count,
+            'ground_truth_count': ground_truth_count,
             'discovery_accuracy': discovery_accuracy,
         })
     
@@ -276,12 +297,14 @@ def experiment_3_majority_consensus():
     results = []
     print(f"Calculating majority consensus for {len(target_agents)} target agents...")
     
-    for target_agent in target_agents:
-        nearby = discover_nearby_agents(target_agent, agents)
-        
-        if nearby:
-            consensus_location = majority_consensus(nearby, threshold=CONSENSUS_THRESHOLD)
-            
+    index = build_agent_index(agents)
+    nearby = discover_nearby_agents_batch(target_agents, agents, index)
+    consensus_locations = majority_consensus(nearby, index, threshold=CONSENSUS_THRESHOLD)
+    
+    for target_agent, nearby_count, consensus_location in zip(
+        target_agents, nearby.counts.tolist(), consensus_locations
+    ):
+        if nearby_count:
             if consensus_location:
                 # Compare with true location (obfuscated)
                 true_obfuscated = target_agent['obfuscated_location']
@@ -301,7 +324,7 @@ def experiment_3_majority_consensus():
         
         results.append({
             'target_agent_id': target_agent['target_agent_id'],
-            'nearby_count': len(nearby) if nearby else 0,
+            'nearby_count': nearby_count,
             'consensus_found': consensus_location is not None,
             'consensus_success': consensus_success,
             'distance_error_km': distance_error if distance_error != float('inf') else None,
@@ -343,14 +366,18 @@ def experiment_4_location_inference():
     results = []
     print(f"Inferring location for {len(target_agents)} target agents...")
     
-    for target_agent in target_agents:
+    # Agent network consensus for every target at once (used for VPN/proxy targets)
+    index = build_agent_index(agents)
+    nearby = discover_nearby_agents_batch(target_agents, agents, index)
+    consensus_locations = majority_consensus(nearby, index, threshold=CONSENSUS_THRESHOLD)
+    
+    for target_agent, consensus_location in zip(target_agents, consensus_locations):
         # Check if VPN/proxy detected
         use_agent_network = detect_vpn_proxy(target_agent)
         
         if use_agent_network:
             # Use agent network consensus
-            nearby = discover_nearby_agents(target_agent, agents)
-            inferred_location = majority_consensus(nearby, threshold=CONSENSUS_THRESHOLD)
+            inferred_location = consensus_location
             
             if inferred_location:
                 # Compare with true obfuscated location
@@ -17,6 +17,11 @@ import pandas as pd
 import json
 from pathlib import Path
 import time
+import sys
+
+sys.path.append(str(Path(__file__).parent))
+from diversity_metrics import homogenization_from_diversity, mean_pairwise_distance
+from evolution_engine import EvolutionHistory, evolve_profiles
 
 # Configuration
 DATA_DIR = Path(__file__).parent.parent / 'data' / 'patent_3_contextual_personality'
@@ -34,152 +39,60 @@ def load_data():
     return profiles
 
 
-def simulate_evolution(profiles, num_months=6, drift_limit=None, use_diversity_mechanisms=False, agent_join_times=None):
+def simulate_evolution(profiles, num_months=6, drift_limit=None, use_diversity_mechanisms=False, agent_join_times=None,
+                       rng=None):
     """
     Simulate personality evolution over time with optional diversity mechanisms.
     
+    Runs the batched engine (evolution_engine.evolve_profiles) over the
+    profiles stacked into an (N, 12) array.
+    
     Args:
         profiles: Initial personality profiles
         num_months: Number of months to simulate
         drift_limit: Maximum drift allowed (None = no limit)
         use_diversity_mechanisms: Whether to use dynamic diversity maintenance mechanisms
         agent_join_times: Optional dict mapping agent_id -> join_day. If None, all agents start at day 0.
-    """
-    num_days = num_months * 30
-    evolution_history = []
+        rng: Optional np.random.Generator (default: seeded from the global numpy random state)
     
-    current_profiles = {k: v.copy() for k, v in profiles.items()}
-    initial_profiles = {k: v.copy() for k, v in profiles.items()}
-    
-    # Save initial state (month 0)
-    evolution_history.append({k: v.copy() for k, v in current_profiles.items()})
+    Returns:
+        (evolution_history, final_profiles): an EvolutionHistory of
+        num_months + 1 agent_id -> profile snapshots, and a dict of final profiles
+    """
+    agent_ids = list(profiles.keys())
+    initial = np.array([profiles[agent_id] for agent_id in agent_ids], dtype=np.float64).reshape(len(agent_ids), -1)
     
     # Initialize join times if not provided (all agents start at day 0)
     if agent_join_times is None:
-        agent_join_times = {agent_id: 0 for agent_id in profiles.keys()}
-    else:
-        # Ensure all current agents have join times
-        for agent_id in profiles.keys():
-            if agent_id not in agent_join_times:
-                agent_join_times[agent_id] = 0
-    
-    for day in range(num_days):
-        agent_ids = list(current_profiles.keys())
-        
-        # Calculate current homogenization for adaptive mechanisms
-        if use_diversity_mechanisms and len(agent_ids) > 1:
-            current_homogenization = calculate_homogenization_rate(
-                initial_profiles,
-                current_profiles
-            )
-        else:
-            current_homogenization = 0.0
-        
-        # Mechanism 1: Adaptive Influence Reduction
-        base_influence = 0.02
-        if use_diversity_mechanisms:
-            if current_homogenization > 0.45:
-                influence_multiplier = 1.0 - ((current_homogenization - 0.45) * 0.7)
-                influence_multiplier = max(0.6, influence_multiplier)
-            else:
-                influence_multiplier = 1.0
-        else:
-            influence_multiplier = 1.0
-        
-        # Mechanism 3: Interaction Frequency Reduction
-        interactions_this_day = []
-        if use_diversity_mechanisms:
-            for agent_id in agent_ids:
-                # Account for different join times
-                days_in_system = max(0, day - agent_join_times.get(agent_id, 0))  # Ensure non-negative
-                # Avoid division by zero and handle edge cases
-                if days_in_system == 0:
-                    interaction_probability = 1.0  # New users always interact
-                else:
-                    interaction_probability = 1.0 / (1.0 + days_in_system / 180.0)
-                if np.random.random() < interaction_probability:
-                    interactions_this_day.append(agent_id)
-        else:
-            interactions_this_day = agent_ids
-        
-        if len(interactions_this_day) < 2:
-            interactions_this_day = agent_ids  # Fallback
-        
-        # Perform interactions
-        num_interactions = len(interactions_this_day)
-        for i in range(num_interactions):
-            idx_a, idx_b = np.random.choice(len(interactions_this_day), 2, replace=False)
-            agent_a = interactions_this_day[idx_a]
-            agent_b = interactions_this_day[idx_b]
-            
-            profile_a = current_profiles[agent_a]
-            profile_b = current_profiles[agent_b]
-            
-            # Calculate compatibility (quantum-based for consistency)
-            inner_product = np.abs(np.dot(profile_a, profile_b))
-            compatibility = inner_product ** 2
-            influence = compatibility * base_influence * influence_multiplier
-            
-            # Apply influence
-            new_profile_a = profile_a + influence * (profile_b - profile_a)
-            
-            # Apply drift resistance if enabled
-            if drift_limit is not None:
-                initial_profile_a = initial_profiles[agent_a]
-                drift = np.abs(new_profile_a - initial_profile_a)
-                for dim in range(12):
-                    if drift[dim] > drift_limit:
-                        new_profile_a[dim] = initial_profile_a[dim] + np.sign(new_profile_a[dim] - initial_profile_a[dim]) * drift_limit
-            
-            # Mechanism 2: Conditional Time-Based Drift Decay
-            if use_diversity_mechanisms:
-                # Account for different join times
-                days_in_system_a = day - agent_join_times.get(agent_a, 0)
-                decay_rate = 0.001
-                decay_start_days = 180
-                apply_decay = current_homogenization > 0.35
-                
-                if days_in_system_a > decay_start_days and apply_decay:
-                    decay_days = days_in_system_a - decay_start_days
-                    decay_factor = np.exp(-decay_rate * decay_days)
-                    new_profile_a = initial_profile_a + (new_profile_a - initial_profile_a) * decay_factor
-            
-            new_profile_a = np.clip(new_profile_a, 0.0, 1.0)
-            current_profiles[agent_a] = new_profile_a
-        
-        # Save monthly snapshots
-        if day % 30 == 0:
-            evolution_history.append({k: v.copy() for k, v in current_profiles.items()})
+        agent_join_times = {}
+    join_days = np.array([agent_join_times.get(agent_id, 0) for agent_id in agent_ids], dtype=np.int64)
+    
+    if rng is None:
+        rng = np.random.default_rng(np.random.randint(0, 2**31 - 1))
+    
+    snapshots, final = evolve_profiles(
+        initial,
+        num_months=num_months,
+        drift_limit=drift_limit,
+        use_diversity_mechanisms=use_diversity_mechanisms,
+        join_days=join_days,
+        rng=rng
+    )
     
-    return evolution_history, current_profiles
+    return EvolutionHistory(snapshots, agent_ids), dict(zip(agent_ids, final))
 
 
 def calculate_diversity(profiles):
-    """Calculate personality diversity."""
-    profile_list = list(profiles.values())
-    if len(profile_list) < 2:
-        return 0.0
-    
-    diversity = 0.0
-    count = 0
-    for i in range(len(profile_list)):
-        for j in range(i + 1, len(profile_list)):
-            diversity += np.linalg.norm(profile_list[i] - profile_list[j])
-            count += 1
-    
-    return diversity / count if count > 0 else 0.0
+    """Calculate personality diversity (mean pairwise distance)."""
+    return mean_pairwise_distance(profiles)
 
 
 def calculate_homogenization_rate(initial_profiles, current_profiles):
     """Calculate homogenization rate."""
-    initial_diversity = calculate_diversity(initial_profiles)
-    current_diversity = calculate_diversity(current_profiles)
-    
-    if initial_diversity == 0:
-        return 0.0
-    
-    homogenization = 1 - (current_diversity / initial_diversity)
-    return max(0.0, min(1.0, homogenization))
+    return homogenization_from_diversity(
+        calculate_diversity(initial_profiles),
+        calculate_diversity(current_profiles)
+    )
 
 
 def experiment_1_threshold_testing(num_months=6, use_mechanisms=False):
@@ -8,191 +8,93 @@ Runs all patent experiments with large agent counts:
 - 500,000 agents
 - 1,000,000 agents
 
+Experiments for one agent count run in parallel as experiment_scheduler
+tasks once that count's data has been generated.
+
 Date: December 19, 2025
 """
 
 import sys
-import time
-import subprocess
+import json
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Optional
 
 # Configuration
 SCRIPTS_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPTS_DIR))
 RESULTS_DIR = Path(__file__).parent.parent / 'results' / 'scalability'
 RESULTS_DIR.mkdir(parents=True, exist_ok=True)
 LOGS_DIR = Path(__file__).parent.parent / 'logs'
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
+from experiment_scheduler import BLOCKED, CACHED, FAILED, SUCCESS, ExperimentTask, TaskResult, run_tasks, runner_argument_parser
+from run_all_experiments import patent_task, synthetic_data_task
+
 # Agent counts to test
 AGENT_COUNTS = [10000, 100000, 500000, 1000000]
 
-
-def run_experiments_for_agent_count(num_agents):
-    """Run all experiments for a specific agent count."""
-    print("=" * 70)
-    print(f"SCALABILITY TEST: {num_agents:,} AGENTS")
-    print("=" * 70)
-    print()
-    
-    start_time = time.time()
-    results = {}
-    
-    # Step 1: Generate data
-    print(f"📊 Step 1: Generating data for {num_agents:,} agents...")
-    print("-" * 70)
-    try:
-        data_start = time.time()
-        result = subprocess.run(
-            ['python3', str(SCRIPTS_DIR / 'generate_synthetic_data.py'), str(num_agents)],
-            cwd=str(SCRIPTS_DIR.parent),
-            capture_output=True,
-            text=True,
-            timeout=3600  # 1 hour timeout
-        )
-        data_duration = time.time() - data_start
-        
-        if result.returncode == 0:
-            print(f"✅ Data generation completed in {data_duration:.2f} seconds")
-            results['data_generation'] = {'duration': data_duration, 'status': 'success'}
-        else:
-            print(f"❌ Data generation failed: {result.stderr}")
-            results['data_generation'] = {'duration': data_duration, 'status': 'failed', 'error': result.stderr}
-            return results
-    except subprocess.TimeoutExpired:
-        print(f"❌ Data generation timed out after 1 hour")
-        results['data_generation'] = {'status': 'timeout'}
-        return results
-    except Exception as e:
-        print(f"❌ Data generation error: {e}")
-        results['data_generation'] = {'status': 'error', 'error': str(e)}
-        return results
-    
-    print()
-    
-    # Step 2: Run Patent #1 experiments (sample pairs for large N)
-    print(f"🔬 Step 2: Running Patent #1 experiments...")
-    print("-" * 70)
-    try:
-        exp_start = time.time()
-        result = subprocess.run(
-            ['python3', str(SCRIPTS_DIR / 'run_patent_1_experiments.py')],
-            cwd=str(SCRIPTS_DIR.parent),
-            capture_output=True,
-            text=True,
-            timeout=3600
-        )
-        exp_duration = time.time() - exp_start
-        
-        if result.returncode == 0:
-            print(f"✅ Patent #1 completed in {exp_duration:.2f} seconds")
-            results['patent_1'] = {'duration': exp_duration, 'status': 'success'}
-        else:
-            print(f"⚠️  Patent #1 had issues: {result.stderr[:200]}")
-            results['patent_1'] = {'duration': exp_duration, 'status': 'partial'}
-    except Exception as e:
-        print(f"❌ Patent #1 error: {e}")
-        results['patent_1'] = {'status': 'error', 'error': str(e)}
-    
-    print()
-    
-    # Step 3: Run Patent #3 experiments (most time-consuming, may need to skip for very large N)
-    if num_agents <= 100000:
-        print(f"🔬 Step 3: Running Patent #3 experiments (6 months)...")
-        print("-" * 70)
-        try:
-            exp_start = time.time()
-            result = subprocess.run(
-                ['python3', str(SCRIPTS_DIR / 'run_patent_3_experiments.py'), '6'],
-                cwd=str(SCRIPTS_DIR.parent),
-                capture_output=True,
-                text=True,
-                timeout=7200  # 2 hour timeout
-            )
-            exp_duration = time.time() - exp_start
-            
-            if result.returncode == 0:
-                print(f"✅ Patent #3 completed in {exp_duration:.2f} seconds")
-                results['patent_3'] = {'duration': exp_duration, 'status': 'success'}
-            else:
-                print(f"⚠️  Patent #3 had issues: {result.stderr[:200]}")
-                results['patent_3'] = {'duration': exp_duration, 'status': 'partial'}
-        except Exception as e:
-            print(f"❌ Patent #3 error: {e}")
-            results['patent_3'] = {'status': 'error', 'error': str(e)}
-    else:
-        print(f"⏭️  Step 3: Skipping Patent #3 (too many agents for time-based simulation)")
-        results['patent_3'] = {'status': 'skipped', 'reason': 'too_many_agents'}
-    
-    print()
-    
-    # Step 4: Run Patent #21 experiments
-    print(f"🔬 Step 4: Running Patent #21 experiments...")
-    print("-" * 70)
-    try:
-        exp_start = time.time()
-        result = subprocess.run(
-            ['python3', str(SCRIPTS_DIR / 'run_patent_21_experiments.py')],
-            cwd=str(SCRIPTS_DIR.parent),
-            capture_output=True,
-            text=True,
-            timeout=3600
-        )
-        exp_duration = time.time() - exp_start
-        
-        if result.returncode == 0:
-            print(f"✅ Patent #21 completed in {exp_duration:.2f} seconds")
-            results['patent_21'] = {'duration': exp_duration, 'status': 'success'}
-        else:
-            print(f"⚠️  Patent #21 had issues: {result.stderr[:200]}")
-            results['patent_21'] = {'duration': exp_duration, 'status': 'partial'}
-    except Exception as e:
-        print(f"❌ Patent #21 error: {e}")
-        results['patent_21'] = {'status': 'error', 'error': str(e)}
-    
-    print()
-    
-    # Step 5: Run Patent #29 experiments
-    print(f"🔬 Step 5: Running Patent #29 experiments...")
-    print("-" * 70)
-    try:
-        exp_start = time.time()
-        result = subprocess.run(
-            ['python3', str(SCRIPTS_DIR / 'run_patent_29_experiments.py')],
-            cwd=str(SCRIPTS_DIR.parent),
-            capture_output=True,
-            text=True,
-            timeout=3600
-        )
-        exp_duration = time.time() - exp_start
-        
-        if result.returncode == 0:
-            print(f"✅ Patent #29 completed in {exp_duration:.2f} seconds")
-            results['patent_29'] = {'duration': exp_duration, 'status': 'success'}
+# Patent #3 (time-based simulation) is skipped above this many agents
+PATENT_3_MAX_AGENTS = 100000
+
+
+def scalability_tasks(agent_counts: List[int] = AGENT_COUNTS) -> List[ExperimentTask]:
+    """
+    Tasks for all agent counts.
+    
+    Every agent count regenerates the shared synthetic data directories, so
+    each count's data generation waits until the previous count's
+    experiments are done; the experiments within one count run in parallel.
+    """
+    tasks = []
+    previous = []
+    for num_agents in agent_counts:
+        data_task = synthetic_data_task(num_agents, name=f'synthetic_data_{num_agents}_agents', depends_on=previous)
+        tasks.append(data_task)
+        experiments = [
+            patent_task(1, name=f'patent_1_{num_agents}_agents', depends_on=[data_task.name]),
+            patent_task(21, name=f'patent_21_{num_agents}_agents', depends_on=[data_task.name]),
+            patent_task(29, name=f'patent_29_{num_agents}_agents', depends_on=[data_task.name]),
+        ]
+        if num_agents <= PATENT_3_MAX_AGENTS:
+            experiments.append(patent_task(3, num_months=6, name=f'patent_3_{num_agents}_agents',
+                                           depends_on=[data_task.name], timeout=7200))  # 2 hour timeout
+        for task in experiments:
+            task.label = f"{task.label} ({num_agents:,} agents)"
+        tasks.extend(experiments)
+        previous = [task.name for task in experiments]
+    return tasks
+
+
+def _step_result(result: TaskResult, failure_status: str) -> Dict:
+    """Result entry in the scalability_<N>_agents.json format."""
+    if result.status in (SUCCESS, CACHED):
+        entry = {'duration': result.duration, 'status': 'success'}
+        if result.status == CACHED:
+            entry['cached'] = True
+        return entry
+    if result.status == BLOCKED:
+        return {'status': 'skipped', 'reason': 'data_generation_failed'}
+    if result.status == FAILED:
+        return {'duration': result.duration, 'status': failure_status, 'error': result.error}
+    return {'duration': result.duration, 'status': result.status, 'error': result.error}
+
+
+def agent_count_results(num_agents: int, results: Dict[str, TaskResult]) -> Dict:
+    """Results for one agent count from the task results."""
+    entries = {'data_generation': _step_result(results[f'synthetic_data_{num_agents}_agents'], 'failed')}
+    for patent in (1, 3, 21, 29):
+        name = f'patent_{patent}_{num_agents}_agents'
+        if name in results:
+            entries[f'patent_{patent}'] = _step_result(results[name], 'partial')
         else:
-            print(f"⚠️  Patent #29 had issues: {result.stderr[:200]}")
-            results['patent_29'] = {'duration': exp_duration, 'status': 'partial'}
-    except Exception as e:
-        print(f"❌ Patent #29 error: {e}")
-        results['patent_29'] = {'status': 'error', 'error': str(e)}
-    
-    print()
-    
-    total_duration = time.time() - start_time
-    
-    print("=" * 70)
-    print(f"✅ {num_agents:,} AGENTS TEST COMPLETE")
-    print("=" * 70)
-    print(f"Total Duration: {total_duration:.2f} seconds ({total_duration/60:.2f} minutes)")
-    print()
-    
-    results['total_duration'] = total_duration
-    results['num_agents'] = num_agents
-    
-    return results
+            entries[f'patent_{patent}'] = {'status': 'skipped', 'reason': 'too_many_agents'}
+    entries['total_duration'] = sum(entry.get('duration', 0.0) for entry in entries.values())
+    entries['num_agents'] = num_agents
+    return entries
 
 
-def main():
+def main(max_workers: Optional[int] = None, use_cache: bool = True):
     """Run scalability tests for all agent counts."""
     print("=" * 70)
     print("SCALABILITY TESTS - LARGE AGENT COUNTS")
@@ -205,21 +107,20 @@ def main():
     print("=" * 70)
     print()
     
-    all_results = {}
+    results = run_tasks(scalability_tasks(), 'run_scalability_tests', max_workers=max_workers, use_cache=use_cache)
     
+    all_results = {}
     for num_agents in AGENT_COUNTS:
-        results = run_experiments_for_agent_count(num_agents)
-        all_results[num_agents] = results
+        all_results[num_agents] = agent_count_results(num_agents, results)
         
         # Save results
-        import json
         results_file = RESULTS_DIR / f'scalability_{num_agents}_agents.json'
         with open(results_file, 'w') as f:
-            json.dump(results, f, indent=2)
+            json.dump(all_results[num_agents], f, indent=2)
         
         print()
         print(f"📄 Results saved to: {results_file}")
-        print()
+    print()
     
     # Create summary
     summary_file = RESULTS_DIR / 'scalability_summary.md'
@@ -234,7 +135,7 @@ def main():
 ## 📊 **Results by Agent Count**
 
 """)
-        
+
         for num_agents in AGENT_COUNTS:
             results = all_results[num_agents]
             f.write(f"""### **{num_agents:,} Agents**
@@ -247,7 +148,7 @@ def main():
 - **Patent #29:** {results.get('patent_29', {}).get('duration', 0):.2f}s - {results.get('patent_29', {}).get('status', 'unknown')}
 
 """)
-        
+
         f.write(f"""
 ---
 
@@ -259,7 +160,7 @@ def main():
 
 **Completed:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """)
-    
+
     print("=" * 70)
     print("✅ ALL SCALABILITY TESTS COMPLETE")
     print("=" * 70)
@@ -268,5 +169,6 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    args = runner_argument_parser("Run scalability tests with parallel experiments per agent count").parse_args()
+    main(max_workers=args.workers, use_cache=not args.force)
 
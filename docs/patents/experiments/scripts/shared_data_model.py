@@ -11,12 +11,14 @@ Date: December 21, 2025
 import numpy as np
 import json
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import time
 import random
 
+from diversity_metrics import homogenization_from_distance, mean_pairwise_distance
+
 # ============================================================================
 # SHARED DATA STRUCTURES
 # ============================================================================
@@ -276,20 +278,7 @@ def calculate_homogenization_rate(personalities: List[np.ndarray]) -> float:
     if len(personalities) < 2:
         return 0.0
 
-    personalities_array = np.array(personalities)
-    pairwise_distances = []
-    for i in range(len(personalities_array)):
-        for j in range(i + 1, len(personalities_array)):
-            dist = np.linalg.norm(personalities_array[i] - personalities_array[j])
-            pairwise_distances.append(dist)
-
-    if len(pairwise_distances) > 0:
-        avg_distance = np.mean(pairwise_distances)
-        max_possible_distance = np.sqrt(12)  # Max distance in 12D space (0 to 1)
-        homogenization = 1.0 - (avg_distance / max_possible_distance)
-    else:
-        homogenization = 0.0
-    return max(0.0, min(1.0, homogenization))
+    return homogenization_from_distance(mean_pairwise_distance(personalities))
 
 
 def calculate_expertise_score(expertise_paths: Dict[str, float]) -> float:
@@ -319,15 +308,27 @@ def get_dynamic_threshold(platform_phase: str, base_threshold: float = 0.7) -> f
     return phase_thresholds.get(platform_phase, 0.7)
 
 
+METERS_PER_DEGREE = 111000  # flat-earth approximation
+LOCATION_MATCH_MAX_DISTANCE = 20000  # 20km max
+
+
 def calculate_location_match(loc1: Dict[str, float], loc2: Dict[str, float]) -> float:
     """
     Calculate location match (0-1 scale).
     Used by: Patent #17, #20, #22
     """
-    distance = np.sqrt((loc1['lat'] - loc2['lat'])**2 + 
-                      (loc1['lng'] - loc2['lng'])**2) * 111000  # meters
-    max_distance = 20000  # 20km max
-    return max(0.0, 1.0 - (distance / max_distance))
+    return float(calculate_location_matches(
+        np.array([loc1['lat'], loc1['lng']]), np.array([loc2['lat'], loc2['lng']])
+    ))
+
+
+def calculate_location_matches(locations: np.ndarray, location: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_location_match: (..., 2) lat/lng rows against a lat/lng point.
+    """
+    delta = np.asarray(locations, dtype=float) - location
+    distance = np.sqrt(delta[..., 0]**2 + delta[..., 1]**2) * METERS_PER_DEGREE  # meters
+    return np.maximum(0.0, 1.0 - (distance / LOCATION_MATCH_MAX_DISTANCE))
 
 
 # ============================================================================
@@ -465,133 +466,46 @@ def generate_integrated_partnership(
 def load_big_five_profiles(
     data_path: Optional[Path] = None,
     max_profiles: Optional[int] = None,
-    project_root: Optional[Path] = None
+    project_root: Optional[Path] = None,
+    sample_seed: Optional[int] = None,
+    cache_dir: Optional[Path] = None
 ) -> Optional[List[UserProfile]]:
     """
     Load Big Five converted profiles from JSON file.
     
+    The JSON is converted once into a binary cache (big_five_cache.py)
+    keyed by the file's hash; later calls memory-map the cache and only
+    build UserProfile objects for the requested profiles.
+    
     Args:
         data_path: Path to big_five_spots.json file. If None, uses default location.
         max_profiles: Maximum number of profiles to load. If None, loads all.
         project_root: Project root path. If None, attempts to detect from file location.
+        sample_seed: If set, load a random max_profiles profiles (seeded) instead of the first ones.
+        cache_dir: Cache directory. If None, uses data/cache/big_five under the project root.
     
     Returns:
         List of UserProfile objects, or None if file not found.
     """
+    # Imported here: big_five_cache depends on this module
+    from big_five_cache import ProfileCache, default_cache_dir
+    
+    if project_root is None:
+        # Try to detect project root from current file location
+        current_file = Path(__file__)
+        # Go up from docs/patents/experiments/scripts/shared_data_model.py
+        project_root = current_file.parent.parent.parent.parent.parent
+    
     # Default path: data/raw/big_five_spots.json relative to project root
     if data_path is None:
-        if project_root is None:
-            # Try to detect project root from current file location
-            current_file = Path(__file__)
-            # Go up from docs/patents/experiments/scripts/shared_data_model.py
-            project_root = current_file.parent.parent.parent.parent.parent
         data_path = project_root / 'data' / 'raw' / 'big_five_spots.json'
     
     if not data_path.exists():
         return None
     
     try:
-        with open(data_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Handle different JSON structures
-        if isinstance(data, list):
-            profiles_data = data
-        elif isinstance(data, dict) and 'profiles' in data:
-            profiles_data = data['profiles']
-        elif isinstance(data, dict) and 'data' in data:
-            profiles_data = data['data']
-        else:
-            profiles_data = [data]
-        
-        # Limit number of profiles if specified
-        if max_profiles:
-            profiles_data = profiles_data[:max_profiles]
-        
-        # Convert to UserProfile objects
-        users = []
-        for i, item in enumerate(profiles_data):
-            dimensions = item.get('dimensions', {})
-            
-            # Convert dimensions dict to 12D numpy array
-            # Map to correct order for UserProfile (matching generate_integrated_user_profile)
-            dimension_order = [
-                'exploration_eagerness',
-                'community_orientation', 
-                'adventure_seeking',
-                'social_preference',
-                'energy_preference',
-                'novelty_seeking',
-                'value_orientation',
-                'crowd_tolerance',
-                'authenticity',
-                'archetype',  # This is a derived value, but included in 12D
-                'trust_level',
-                'openness'
-            ]
-            
-            personality_12d = np.array([
-                dimensions.get(dim, 0.5) for dim in dimension_order
-            ])
-            
-            # Generate dimension confidence (default to 0.8 for real data)
-            dimension_confidence = np.ones(12) * 0.8
-            
-            # Generate expertise paths from personality dimensions
-            expertise_paths = {
-                'exploration': dimensions.get('exploration_eagerness', 0.5),
-                'credentials': dimensions.get('value_orientation', 0.5),
-                'influence': dimensions.get('social_preference', 0.5),
-                'professional': dimensions.get('authenticity', 0.5),
-                'community': dimensions.get('community_orientation', 0.5),
-                'local': dimensions.get('adventure_seeking', 0.5) * 0.5,  # Scaled down
-            }
-            
-            expertise_score = calculate_expertise_score(expertise_paths)
-            
-            # Determine expertise level
-            if expertise_score >= 0.8:
-                expertise_level = 'Global'
-            elif expertise_score >= 0.7:
-                expertise_level = 'National'
-            elif expertise_score >= 0.6:
-                expertise_level = 'Regional'
-            elif expertise_score >= 0.5:
-                expertise_level = 'City'
-            elif expertise_score >= 0.4:
-                expertise_level = 'Local'
-            else:
-                expertise_level = 'none'
-            
-            # Generate location (random if not available, but use consistent seed per user)
-            user_id = item.get('user_id', f"user_{i}")
-            np.random.seed(hash(user_id) % (2**32))
-            location = {
-                'lat': np.random.uniform(40.0, 41.0),  # NYC area default
-                'lng': np.random.uniform(-74.0, -73.0)
-            }
-            
-            # Select category based on personality
-            categories = ['technology', 'science', 'art', 'business', 'health']
-            # Use exploration_eagerness to determine category preference
-            category_idx = int(dimensions.get('exploration_eagerness', 0.5) * len(categories))
-            category_idx = min(category_idx, len(categories) - 1)
-            category = categories[category_idx]
-            
-            user = UserProfile(
-                agent_id=user_id,
-                personality_12d=personality_12d,
-                dimension_confidence=dimension_confidence,
-                expertise_paths=expertise_paths,
-                expertise_score=expertise_score,
-                expertise_level=expertise_level,
-                location=location,
-                platform_phase='Growth',
-                category=category,
-            )
-            users.append(user)
-        
-        return users
+        cache = ProfileCache.open(data_path, cache_dir or default_cache_dir(project_root))
+        return cache.profiles(cache.rows(max_profiles or None, seed=sample_seed))
     except Exception as e:
         print(f"⚠️  Error loading Big Five data from {data_path}: {e}")
         return None
@@ -602,7 +516,8 @@ def load_profiles_with_fallback(
     use_big_five: bool = True,
     data_path: Optional[Path] = None,
     project_root: Optional[Path] = None,
-    fallback_generator: Optional[callable] = None
+    fallback_generator: Optional[callable] = None,
+    sample_seed: Optional[int] = None
 ) -> List[UserProfile]:
     """
     Load profiles with automatic fallback to synthetic generation.
@@ -614,6 +529,7 @@ def load_profiles_with_fallback(
         project_root: Project root path (optional)
         fallback_generator: Function to generate synthetic profiles if Big Five unavailable
                            Should accept (agent_id: str) and return UserProfile
+        sample_seed: If set, use a random (seeded) subset of the Big Five profiles instead of the first ones
     
     Returns:
         List of UserProfile objects (from Big Five if available, otherwise synthetic)
@@ -625,7 +541,8 @@ def load_profiles_with_fallback(
         big_five_users = load_big_five_profiles(
             data_path=data_path,
             max_profiles=num_profiles,
-            project_root=project_root
+            project_root=project_root,
+            sample_seed=sample_seed
         )
         
         if big_five_users and len(big_five_users) >= num_profiles:
@@ -657,10 +574,117 @@ def load_profiles_with_fallback(
 # RAW BIG FIVE TO SPOTS CONVERSION (FOR ALL EXPERIMENTS)
 # ============================================================================
 
+def _big_five_to_spots_converter(project_root: Path):
+    """BigFiveToSpotsConverter for 1-5 scale Big Five scores."""
+    import sys
+    
+    # Import converter
+    sys.path.insert(0, str(project_root))
+    from scripts.personality_data.registry.converter_registry import get_converter
+    
+    converter_class = get_converter('big_five_to_spots')
+    if converter_class is None:
+        raise ValueError("BigFiveToSpotsConverter not found. Check converter registry.")
+    
+    return converter_class(scale='1-5')  # Big Five is typically 1-5 scale
+
+
+def _convert_big_five_csv(csv_path: Path, converter) -> Iterator[Dict[str, Any]]:
+    """SPOTS profiles for every valid row of the raw Big Five CSV."""
+    import csv
+    
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        count = 0
+        
+        for row in reader:
+            # Extract Big Five OCEAN scores
+            try:
+                big_five_data = {
+                    'openness': float(row.get('openness', 0)),
+                    'conscientiousness': float(row.get('conscientiousness', 0)),
+                    'extraversion': float(row.get('extraversion', 0)),
+                    'agreeableness': float(row.get('agreeableness', 0)),
+                    'neuroticism': float(row.get('neuroticism', 0)),
+                }
+            except (ValueError, TypeError) as e:
+                print(f"⚠️  Skipping row {count + 1}: Invalid Big Five data: {e}")
+                continue
+            
+            # Validate Big Five data
+            if not all(1 <= v <= 5 for v in big_five_data.values()):
+                print(f"⚠️  Skipping row {count + 1}: Big Five scores out of range (expected 1-5)")
+                continue
+            
+            # Convert to SPOTS 12 dimensions
+            spots_dimensions = converter.convert(big_five_data)
+            
+            # Create profile
+            user_id = row.get('user_id', f"user_{count + 1}")
+            yield {
+                'user_id': user_id,
+                'dimensions': spots_dimensions,
+                'created_at': None,
+                'source': 'big_five_conversion',
+                'original_data': {
+                    'big_five': big_five_data,
+                    'raw_profile': dict(row)
+                }
+            }
+            count += 1
+
+
+def _convert_big_five_json(json_path: Path, converter) -> Iterator[Dict[str, Any]]:
+    """SPOTS profiles re-converted from the original_data of every big_five_spots.json entry."""
+    from big_five_cache import profile_items
+    
+    with open(json_path, 'r', encoding='utf-8') as f:
+        profiles_data = profile_items(json.load(f))
+    
+    count = 0
+    for item in profiles_data:
+        # Extract original Big Five OCEAN data
+        original_data = item.get('original_data', {})
+        big_five_data = original_data.get('big_five', {})
+        
+        if not big_five_data:
+            # Try raw_profile
+            raw_profile = original_data.get('raw_profile', {})
+            if raw_profile:
+                try:
+                    big_five_data = {
+                        'openness': float(raw_profile.get('openness', 0)),
+                        'conscientiousness': float(raw_profile.get('conscientiousness', 0)),
+                        'extraversion': float(raw_profile.get('extraversion', 0)),
+                        'agreeableness': float(raw_profile.get('agreeableness', 0)),
+                        'neuroticism': float(raw_profile.get('neuroticism', 0)),
+                    }
+                except (ValueError, TypeError):
+                    continue
+        
+        if big_five_data and all(isinstance(v, (int, float)) for v in big_five_data.values()):
+            # Convert to SPOTS 12 dimensions
+            spots_dimensions = converter.convert(big_five_data)
+            
+            yield {
+                'user_id': item.get('user_id', f"user_{count + 1}"),
+                'dimensions': spots_dimensions,
+                'created_at': item.get('created_at'),
+                'source': 'big_five_conversion',
+                'original_data': {
+                    'big_five': big_five_data,
+                    'raw_profile': original_data.get('raw_profile', {})
+                }
+            }
+            count += 1
+
+
 def load_and_convert_big_five_to_spots(
     max_profiles: Optional[int] = None,
     data_source: str = 'auto',  # 'csv', 'json', or 'auto'
-    project_root: Optional[Path] = None
+    project_root: Optional[Path] = None,
+    sample_seed: Optional[int] = None,
+    cache_dir: Optional[Path] = None
 ) -> List[Dict[str, Any]]:
     """
     Load raw Big Five OCEAN data and convert to SPOTS 12 dimensions.
@@ -672,10 +696,16 @@ def load_and_convert_big_five_to_spots(
     **IMPORTANT:** Experiments completed before December 30, 2025 used synthetic data.
     All new experiments must use real Big Five data via this function.
     
+    The full source is converted once into a binary cache (big_five_cache.py)
+    keyed by the source file's hash; later calls only read the requested
+    profiles from the cache.
+    
     Args:
         max_profiles: Maximum number of profiles to load. If None, loads all available.
         data_source: Source to load from ('csv', 'json', or 'auto' to try both)
         project_root: Project root path. If None, auto-detects.
+        sample_seed: If set, load a random max_profiles profiles (seeded) instead of the first ones.
+        cache_dir: Cache directory. If None, uses data/cache/big_five under the project root.
     
     Returns:
         List of SPOTS profiles with 12 dimensions (converted from Big Five OCEAN)
@@ -687,26 +717,14 @@ def load_and_convert_big_five_to_spots(
         - original_data.big_five: Original OCEAN scores
         - original_data.raw_profile: Raw profile data
     """
-    import sys
-    import csv
-    from pathlib import Path
+    # Imported here: big_five_cache depends on this module
+    from big_five_cache import ConvertedProfileCache, default_cache_dir
     
     # Detect project root if not provided
     if project_root is None:
         current_file = Path(__file__)
         project_root = current_file.parent.parent.parent.parent.parent
-    
-    # Import converter
-    sys.path.insert(0, str(project_root))
-    from scripts.personality_data.registry.converter_registry import get_converter
-    
-    converter_class = get_converter('big_five_to_spots')
-    if converter_class is None:
-        raise ValueError("BigFiveToSpotsConverter not found. Check converter registry.")
-    
-    converter = converter_class(scale='1-5')  # Big Five is typically 1-5 scale
-    
-    profiles = []
+    cache_dir = cache_dir or default_cache_dir(project_root)
     
     # Try CSV first (raw Big Five data)
     csv_path = project_root / 'data' / 'raw' / 'big_five.csv'
@@ -714,54 +732,14 @@ def load_and_convert_big_five_to_spots(
         try:
             print(f"📊 Loading raw Big Five OCEAN data from CSV: {csv_path}")
             
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                count = 0
-                
-                for row in reader:
-                    if max_profiles and count >= max_profiles:
-                        break
-                    
-                    # Extract Big Five OCEAN scores
-                    try:
-                        big_five_data = {
-                            'openness': float(row.get('openness', 0)),
-                            'conscientiousness': float(row.get('conscientiousness', 0)),
-                            'extraversion': float(row.get('extraversion', 0)),
-                            'agreeableness': float(row.get('agreeableness', 0)),
-                            'neuroticism': float(row.get('neuroticism', 0)),
-                        }
-                    except (ValueError, TypeError) as e:
-                        print(f"⚠️  Skipping row {count + 1}: Invalid Big Five data: {e}")
-                        continue
-                    
-                    # Validate Big Five data
-                    if not all(1 <= v <= 5 for v in big_five_data.values()):
-                        print(f"⚠️  Skipping row {count + 1}: Big Five scores out of range (expected 1-5)")
-                        continue
-                    
-                    # Convert to SPOTS 12 dimensions
-                    spots_dimensions = converter.convert(big_five_data)
-                    
-                    # Create profile
-                    user_id = row.get('user_id', f"user_{count + 1}")
-                    profile = {
-                        'user_id': user_id,
-                        'dimensions': spots_dimensions,
-                        'created_at': None,
-                        'source': 'big_five_conversion',
-                        'original_data': {
-                            'big_five': big_five_data,
-                            'raw_profile': dict(row)
-                        }
-                    }
-                    
-                    profiles.append(profile)
-                    count += 1
-                
-                if profiles:
-                    print(f"✅ Converted {len(profiles)} profiles from CSV to SPOTS 12 dimensions")
-                    return profiles
+            cache = ConvertedProfileCache.open(
+                csv_path, cache_dir,
+                convert=lambda: _convert_big_five_csv(csv_path, _big_five_to_spots_converter(project_root))
+            )
+            profiles = cache.records(cache.rows(max_profiles or None, seed=sample_seed))
+            if profiles:
+                print(f"✅ Converted {len(profiles)} profiles from CSV to SPOTS 12 dimensions")
+                return profiles
                 
         except Exception as e:
             print(f"⚠️  Error loading from CSV: {e}")
@@ -774,61 +752,11 @@ def load_and_convert_big_five_to_spots(
         try:
             print(f"📊 Loading Big Five OCEAN data from JSON original_data: {json_path}")
             
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Handle different JSON structures
-            if isinstance(data, list):
-                profiles_data = data
-            elif isinstance(data, dict) and 'profiles' in data:
-                profiles_data = data['profiles']
-            elif isinstance(data, dict) and 'data' in data:
-                profiles_data = data['data']
-            else:
-                profiles_data = [data]
-            
-            count = 0
-            for item in profiles_data:
-                if max_profiles and count >= max_profiles:
-                    break
-                
-                # Extract original Big Five OCEAN data
-                original_data = item.get('original_data', {})
-                big_five_data = original_data.get('big_five', {})
-                
-                if not big_five_data:
-                    # Try raw_profile
-                    raw_profile = original_data.get('raw_profile', {})
-                    if raw_profile:
-                        try:
-                            big_five_data = {
-                                'openness': float(raw_profile.get('openness', 0)),
-                                'conscientiousness': float(raw_profile.get('conscientiousness', 0)),
-                                'extraversion': float(raw_profile.get('extraversion', 0)),
-                                'agreeableness': float(raw_profile.get('agreeableness', 0)),
-                                'neuroticism': float(raw_profile.get('neuroticism', 0)),
-                            }
-                        except (ValueError, TypeError):
-                            continue
-                
-                if big_five_data and all(isinstance(v, (int, float)) for v in big_five_data.values()):
-                    # Convert to SPOTS 12 dimensions
-                    spots_dimensions = converter.convert(big_five_data)
-                    
-                    profile = {
-                        'user_id': item.get('user_id', f"user_{count + 1}"),
-                        'dimensions': spots_dimensions,
-                        'created_at': item.get('created_at'),
-                        'source': 'big_five_conversion',
-                        'original_data': {
-                            'big_five': big_five_data,
-                            'raw_profile': original_data.get('raw_profile', {})
-                        }
-                    }
-                    
-                    profiles.append(profile)
-                    count += 1
-            
+            cache = ConvertedProfileCache.open(
+                json_path, cache_dir,
+                convert=lambda: _convert_big_five_json(json_path, _big_five_to_spots_converter(project_root))
+            )
+            profiles = cache.records(cache.rows(max_profiles or None, seed=sample_seed))
             if profiles:
                 print(f"✅ Converted {len(profiles)} profiles from JSON to SPOTS 12 dimensions")
                 return profiles
@@ -855,11 +783,34 @@ def save_integrated_data(
     users: List[UserProfile],
     events: List[Event],
     partnerships: List[Partnership],
-    data_dir: Path
+    data_dir: Path,
+    columnar: bool = True,
+    compress: bool = True
 ):
-    """Save integrated data to JSON files."""
+    """
+    Save integrated data.
+    
+    By default writes the columnar store (integrated_store.py): numeric
+    user columns as .npz/.npy, histories as append-only JSON Lines logs.
+    columnar=False writes the legacy pretty-printed JSON files.
+    
+    Args:
+        users: Users (list of UserProfile or a Population)
+        events: Events
+        partnerships: Partnerships
+        data_dir: Output directory
+        columnar: Write the columnar store instead of JSON
+        compress: Compressed columns.npz (True) or memory-mappable .npy per column (False)
+    """
     data_dir.mkdir(parents=True, exist_ok=True)
     
+    if columnar:
+        # Imported here: integrated_store depends on this module
+        from integrated_store import save_integrated_store
+        save_integrated_store(users, events, partnerships, data_dir, compress=compress)
+        print(f"✅ Saved integrated data to {data_dir}")
+        return
+    
     # Save users
     users_data = [user.to_dict() for user in users]
     with open(data_dir / 'integrated_users.json', 'w') as f:
@@ -879,7 +830,20 @@ def save_integrated_data(
 
 
 def load_integrated_data(data_dir: Path) -> tuple:
-    """Load integrated data from JSON files."""
+    """
+    Load integrated data.
+    
+    Columnar stores load users as a Population (columns copied from the
+    store); use integrated_store.IntegratedStore directly to read or
+    memory-map individual columns without loading everything. Legacy JSON
+    directories load users as a list of UserProfile.
+    """
+    # Imported here: integrated_store depends on this module
+    from integrated_store import IntegratedStore, is_store
+    if is_store(data_dir):
+        store = IntegratedStore(data_dir)
+        return store.population(), store.events(), store.partnerships()
+    
     with open(data_dir / 'integrated_users.json', 'r') as f:
         users_data = json.load(f)
     users = [UserProfile.from_dict(u) for u in users_data]
@@ -144,18 +144,6 @@ def test_exponential_growth_scenario(target_users=100000, num_months=12, sample_
         print(f"Initial diversity: {initial_diversity:.4f}")
     print()
     
-    # For very large user bases, we'll need to optimize
-    # For now, let's start with a smaller test to verify it works
-    if len(profiles) > 50000:
-        print(f"⚠️  Warning: {len(profiles):,} users is very large. This may take a long time.")
-        print(f"   Consider starting with a smaller test (e.g., 10k users)")
-        print(f"   Or we can optimize the simulation further.")
-        print()
-        response = input("Continue anyway? (y/n): ")
-        if response.lower() != 'y':
-            print("Test cancelled. Try with fewer users first.")
-            return None
-    
     # Scenario 1: Without mechanisms
     print("Scenario 1: Without mechanisms (baseline)...")
     print("-" * 70)
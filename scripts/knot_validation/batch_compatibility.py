@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Batch Compatibility Engine
+
+Purpose: Vectorized all-pairs version of the per-pair compatibility
+calculations in compare_matching_accuracy.py.
+
+Profiles are packed into an (N, D) float array once. Phases, archetype
+codes and value dimensions are precomputed per profile, and quantum,
+archetype and value compatibility are evaluated as blocked matrix
+operations. Scores match MatchingAccuracyComparator's per-pair path
+(up to floating-point summation order).
+
+Part of Phase 0 validation for Patent #31.
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Dict, Any, Tuple, Optional, Iterator, Union
+from dataclasses import dataclass
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.knot_validation.compare_matching_accuracy import (
+    _calculate_archetype_compatibility,
+    _has_polynomial,
+    _polynomial_coefficients,
+    knot_alexander,
+)
+from scripts.knot_validation.ground_truth_store import GroundTruthPairs, align_ground_truth
+
+# Canonical SPOTS dimension order (extra dimensions are appended after these)
+DIMENSION_ORDER = [
+    'exploration_eagerness', 'community_orientation', 'adventure_seeking',
+    'social_preference', 'energy_preference', 'novelty_seeking',
+    'value_orientation', 'crowd_tolerance', 'authenticity',
+    'archetype', 'trust_level', 'openness'
+]
+
+VALUE_DIMENSIONS = ['value_orientation', 'authenticity', 'trust_level']
+
+# Order matches the branches of _infer_archetype
+ARCHETYPE_NAMES = [
+    'Explorer', 'Community Builder', 'Solo Seeker',
+    'Social Butterfly', 'Deep Thinker', 'Balanced'
+]
+
+# Default weights used by MatchingAccuracyComparator.calculate_quantum_compatibility
+DEFAULT_COMPONENT_WEIGHTS = (0.50, 0.25, 0.25)
+
+def archetype_compatibility_table() -> np.ndarray:
+    """Build the (A, A) archetype compatibility lookup table."""
+    size = len(ARCHETYPE_NAMES)
+    table = np.empty((size, size), dtype=np.float64)
+    for a, name_a in enumerate(ARCHETYPE_NAMES):
+        for b, name_b in enumerate(ARCHETYPE_NAMES):
+            table[a, b] = _calculate_archetype_compatibility(name_a, name_b)
+    return table
+
+def infer_archetype_codes(
+    exploration: np.ndarray,
+    community: np.ndarray,
+    social: np.ndarray,
+    value_orientation: np.ndarray
+) -> np.ndarray:
+    """Vectorized _infer_archetype returning indices into ARCHETYPE_NAMES."""
+    conditions = [
+        (exploration > 0.7) & (community < 0.5),
+        (community > 0.7) & (social > 0.7),
+        (social < 0.4) & (exploration > 0.6),
+        social > 0.8,
+        value_orientation > 0.8,
+    ]
+    codes = np.select(conditions, [0, 1, 2, 3, 4], default=5)
+    return codes.astype(np.int8)
+
+@dataclass
+class ProfileArrays:
+    """Profiles packed into contiguous arrays."""
+    user_ids: List[str]
+    dimension_names: List[str]
+    values: np.ndarray  # (N, D), 0.0 where a dimension is missing
+    mask: np.ndarray  # (N, D), True where a dimension is present
+    phases: np.ndarray  # (N, D), 0.0 where a dimension is missing
+    archetype_codes: np.ndarray  # (N,) indices into ARCHETYPE_NAMES
+    value_dims: np.ndarray  # (N, 3) VALUE_DIMENSIONS with 0.5 default
+
+    @property
+    def size(self) -> int:
+        return len(self.user_ids)
+
+def pack_profiles(
+    profiles: List[Dict],
+    dimension_names: Optional[List[str]] = None
+) -> ProfileArrays:
+    """Pack profile dicts into arrays and precompute per-profile terms."""
+    if dimension_names is None:
+        dimension_names = list(DIMENSION_ORDER)
+        known = set(dimension_names)
+        for profile in profiles:
+            for dim in profile.get('dimensions', {}):
+                if dim not in known:
+                    known.add(dim)
+                    dimension_names.append(dim)
+
+    column = {dim: idx for idx, dim in enumerate(dimension_names)}
+    n = len(profiles)
+    values = np.zeros((n, len(dimension_names)), dtype=np.float64)
+    mask = np.zeros((n, len(dimension_names)), dtype=bool)
+
+    for row, profile in enumerate(profiles):
+        for dim, value in profile.get('dimensions', {}).items():
+            col = column[dim]
+            values[row, col] = value
+            mask[row, col] = True
+
+    # Phase: (value - mean of the profile's other dimensions) * 0.5,
+    # with 0.5 as the mean when a profile has a single dimension
+    counts = mask.sum(axis=1, keepdims=True)
+    totals = values.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_other = np.where(counts > 1, (totals - values) / (counts - 1), 0.5)
+    phases = np.where(mask, (values - avg_other) * 0.5, 0.0)
+
+    def _column_or_default(dim: str) -> np.ndarray:
+        if dim not in column:
+            return np.full(n, 0.5)
+        col = column[dim]
+        return np.where(mask[:, col], values[:, col], 0.5)
+
+    archetype_codes = infer_archetype_codes(
+        _column_or_default('exploration_eagerness'),
+        _column_or_default('community_orientation'),
+        _column_or_default('social_preference'),
+        _column_or_default('value_orientation'),
+    )
+    value_dims = np.stack([_column_or_default(dim) for dim in VALUE_DIMENSIONS], axis=1)
+
+    return ProfileArrays(
+        user_ids=[p['user_id'] for p in profiles],
+        dimension_names=dimension_names,
+        values=values,
+        mask=mask,
+        phases=phases,
+        archetype_codes=archetype_codes,
+        value_dims=value_dims,
+    )
+
+@dataclass
+class KnotArrays:
+    """Knot fields used by the baseline topological compatibility."""
+    has_knot: np.ndarray  # (N,) bool
+    type_codes: np.ndarray  # (N,) int, index into type_names
+    is_complex: np.ndarray  # (N,) bool, knot_type starts with 'complex'
+    complexity: np.ndarray  # (N,)
+    crossing_number: np.ndarray  # (N,)
+    type_names: List[str]
+    writhe: np.ndarray  # (N,), 0 when unavailable
+    jones: np.ndarray  # (N, L) zero-padded polynomial coefficients
+    has_jones: np.ndarray  # (N,) bool
+    alexander: np.ndarray  # (N, L) zero-padded polynomial coefficients
+    has_alexander: np.ndarray  # (N,) bool
+
+def _pack_polynomials(polys: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Parse polynomials once into a zero-padded coefficient matrix."""
+    present = np.array([_has_polynomial(poly) for poly in polys], dtype=bool)
+    coefficients = [
+        _polynomial_coefficients(poly) if has else []
+        for poly, has in zip(polys, present.tolist())
+    ]
+    width = max([len(c) for c in coefficients] + [1])
+    packed = np.zeros((len(polys), width))
+    for row, coeffs in enumerate(coefficients):
+        packed[row, :len(coeffs)] = coeffs
+    return packed, present
+
+def pack_knots(user_ids: List[str], knots: List[Dict]) -> KnotArrays:
+    """Align knot fields with profile rows (missing knots are flagged)."""
+    knot_map = {k['user_id']: k for k in knots}
+    n = len(user_ids)
+    has_knot = np.zeros(n, dtype=bool)
+    type_codes = np.zeros(n, dtype=np.int32)
+    complexity = np.full(n, 0.5)
+    crossing_number = np.zeros(n)
+    writhe = np.zeros(n)
+    jones_polys: List[Any] = [None] * n
+    alexander_polys: List[Any] = [None] * n
+    type_index: Dict[str, int] = {}
+
+    for row, user_id in enumerate(user_ids):
+        knot = knot_map.get(user_id)
+        if not knot:
+            continue
+        has_knot[row] = True
+        knot_type = knot.get('knot_type', 'unknown')
+        type_codes[row] = type_index.setdefault(knot_type, len(type_index))
+        complexity[row] = knot.get('complexity', 0.5)
+        crossing_number[row] = knot.get('crossing_number', 0)
+        writhe[row] = knot.get('writhe', 0)
+        jones_polys[row] = knot.get('jones_polynomial')
+        alexander_polys[row] = knot_alexander(knot)
+
+    jones, has_jones = _pack_polynomials(jones_polys)
+    alexander, has_alexander = _pack_polynomials(alexander_polys)
+
+    type_names = list(type_index)
+    complex_types = np.array([name.startswith('complex') for name in type_names] or [False])
+
+    return KnotArrays(
+        has_knot=has_knot,
+        type_codes=type_codes,
+        is_complex=complex_types[type_codes] & has_knot,
+        complexity=complexity,
+        crossing_number=crossing_number,
+        type_names=type_names,
+        writhe=writhe,
+        jones=jones,
+        has_jones=has_jones,
+        alexander=alexander,
+        has_alexander=has_alexander,
+    )
+
+class BatchCompatibilityEngine:
+    """Computes compatibility components for many profile pairs at once."""
+
+    def __init__(
+        self,
+        profiles: List[Dict],
+        knots: Optional[List[Dict]] = None,
+        block_size: int = 512
+    ):
+        self.arrays = pack_profiles(profiles)
+        self.knots = pack_knots(self.arrays.user_ids, knots) if knots is not None else None
+        self.block_size = max(1, block_size)
+        self.archetype_table = archetype_compatibility_table()
+        self.index = {user_id: row for row, user_id in enumerate(self.arrays.user_ids)}
+
+    def component_block(
+        self,
+        rows: slice,
+        cols: slice = slice(None)
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Quantum-dimension, archetype and value matrices for a block of pairs."""
+        arrays = self.arrays
+        values_r, values_c = arrays.values[rows], arrays.values[cols]
+        phases_r, phases_c = arrays.phases[rows], arrays.phases[cols]
+        counts = arrays.mask[rows].astype(np.float64) @ arrays.mask[cols].T.astype(np.float64)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            real = (values_r @ values_c.T) / counts
+            imag = (phases_r @ phases_c.T) / counts
+        quantum_dim = np.where(counts > 0, real * real + imag * imag, 0.0)
+
+        codes_r, codes_c = arrays.archetype_codes[rows], arrays.archetype_codes[cols]
+        archetype = self.archetype_table[codes_r[:, None], codes_c[None, :]]
+
+        value_r, value_c = arrays.value_dims[rows], arrays.value_dims[cols]
+        value = np.zeros_like(quantum_dim)
+        for k in range(value_r.shape[1]):
+            value += 1.0 - np.abs(value_r[:, k, None] - value_c[None, :, k])
+        value /= value_r.shape[1]
+
+        return quantum_dim, archetype, value
+
+    def pair_components(
+        self,
+        idx_a: np.ndarray,
+        idx_b: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Quantum-dimension, archetype and value scores for explicit index pairs."""
+        arrays = self.arrays
+        counts = (arrays.mask[idx_a] & arrays.mask[idx_b]).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            real = (arrays.values[idx_a] * arrays.values[idx_b]).sum(axis=1) / counts
+            imag = (arrays.phases[idx_a] * arrays.phases[idx_b]).sum(axis=1) / counts
+        quantum_dim = np.where(counts > 0, real * real + imag * imag, 0.0)
+        archetype = self.archetype_table[arrays.archetype_codes[idx_a], arrays.archetype_codes[idx_b]]
+        value = (1.0 - np.abs(arrays.value_dims[idx_a] - arrays.value_dims[idx_b])).mean(axis=1)
+        return quantum_dim, archetype, value
+
+    @staticmethod
+    def combine(
+        quantum_dim: np.ndarray,
+        archetype: np.ndarray,
+        value: np.ndarray,
+        weights: Tuple[float, float, float] = DEFAULT_COMPONENT_WEIGHTS
+    ) -> np.ndarray:
+        """Weighted enhanced quantum compatibility, clipped to [0, 1]."""
+        combined = weights[0] * quantum_dim + weights[1] * archetype + weights[2] * value
+        return np.clip(combined, 0.0, 1.0)
+
+    def topological_block(self, rows: slice, cols: slice = slice(None)) -> Tuple[np.ndarray, np.ndarray]:
+        """Baseline topological compatibility and both-knots-present mask for a block."""
+        knots = self.knots
+        if knots is None:
+            raise ValueError("BatchCompatibilityEngine was created without knots")
+        return self._topological(
+            (knots.type_codes[rows][:, None], knots.type_codes[cols][None, :]),
+            (knots.is_complex[rows][:, None], knots.is_complex[cols][None, :]),
+            (knots.complexity[rows][:, None], knots.complexity[cols][None, :]),
+            (knots.crossing_number[rows][:, None], knots.crossing_number[cols][None, :]),
+            (knots.has_knot[rows][:, None], knots.has_knot[cols][None, :]),
+        )
+
+    def pair_topological(self, idx_a: np.ndarray, idx_b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Baseline topological compatibility and both-knots-present mask for index pairs."""
+        knots = self.knots
+        if knots is None:
+            raise ValueError("BatchCompatibilityEngine was created without knots")
+        return self._topological(
+            (knots.type_codes[idx_a], knots.type_codes[idx_b]),
+            (knots.is_complex[idx_a], knots.is_complex[idx_b]),
+            (knots.complexity[idx_a], knots.complexity[idx_b]),
+            (knots.crossing_number[idx_a], knots.crossing_number[idx_b]),
+            (knots.has_knot[idx_a], knots.has_knot[idx_b]),
+        )
+
+    def pair_topological_components(
+        self,
+        idx_a: np.ndarray,
+        idx_b: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Component similarities of calculate_topological_compatibility_improved.
+
+        Returns (jones, alexander, crossing, writhe, has_knots) for index
+        pairs; weighting them reproduces the improved topological score.
+        """
+        knots = self.knots
+        if knots is None:
+            raise ValueError("BatchCompatibilityEngine was created without knots")
+
+        type_similarity, complexity_similarity, crossing_similarity = self._baseline_similarities(
+            (knots.type_codes[idx_a], knots.type_codes[idx_b]),
+            (knots.is_complex[idx_a], knots.is_complex[idx_b]),
+            (knots.complexity[idx_a], knots.complexity[idx_b]),
+            (knots.crossing_number[idx_a], knots.crossing_number[idx_b]),
+        )
+
+        jones = np.where(
+            knots.has_jones[idx_a] & knots.has_jones[idx_b],
+            1.0 - self._polynomial_distance(knots.jones[idx_a], knots.jones[idx_b]),
+            type_similarity
+        )
+        alexander = np.where(
+            knots.has_alexander[idx_a] & knots.has_alexander[idx_b],
+            1.0 - self._polynomial_distance(knots.alexander[idx_a], knots.alexander[idx_b]),
+            complexity_similarity
+        )
+
+        writhe_a, writhe_b = knots.writhe[idx_a], knots.writhe[idx_b]
+        max_writhe = np.maximum(np.maximum(np.abs(writhe_a), np.abs(writhe_b)), 1)
+        writhe = np.where(
+            (writhe_a != 0) | (writhe_b != 0),
+            1.0 - np.abs(writhe_a - writhe_b) / max_writhe,
+            0.5
+        )
+
+        return jones, alexander, crossing_similarity, writhe, knots.has_knot[idx_a] & knots.has_knot[idx_b]
+
+    @staticmethod
+    def _polynomial_distance(coeffs_a: np.ndarray, coeffs_b: np.ndarray) -> np.ndarray:
+        """Row-wise MatchingAccuracyComparator._polynomial_distance on padded coefficients."""
+        distance = np.sqrt(((coeffs_a - coeffs_b) ** 2).sum(axis=-1))
+        max_coeff = np.maximum(
+            np.maximum(np.abs(coeffs_a).max(axis=-1), np.abs(coeffs_b).max(axis=-1)),
+            1.0
+        )
+        return np.minimum(distance / max_coeff, 1.0)
+
+    @staticmethod
+    def _baseline_similarities(types, is_complex, complexity, crossings) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Type, complexity and crossing-number similarities."""
+        type_similarity = np.where(
+            types[0] == types[1], 1.0,
+            np.where(is_complex[0] & is_complex[1], 0.7, 0.3)
+        )
+        complexity_similarity = 1.0 - np.abs(complexity[0] - complexity[1])
+        max_crossings = np.maximum(np.maximum(crossings[0], crossings[1]), 1)
+        crossing_similarity = 1.0 - np.abs(crossings[0] - crossings[1]) / max_crossings
+        return type_similarity, complexity_similarity, crossing_similarity
+
+    @staticmethod
+    def _topological(types, is_complex, complexity, crossings, has_knot) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized MatchingAccuracyComparator.calculate_topological_compatibility."""
+        type_similarity, complexity_similarity, crossing_similarity = (
+            BatchCompatibilityEngine._baseline_similarities(types, is_complex, complexity, crossings)
+        )
+        topological = (
+            0.4 * type_similarity +
+            0.3 * complexity_similarity +
+            0.3 * crossing_similarity
+        )
+        return topological, has_knot[0] & has_knot[1]
+
+    def iter_blocks(self) -> Iterator[Tuple[int, int, np.ndarray, np.ndarray, np.ndarray]]:
+        """Yield (start, stop, quantum_dim, archetype, value) row blocks against all profiles."""
+        n = self.arrays.size
+        for start in range(0, n, self.block_size):
+            stop = min(start + self.block_size, n)
+            quantum_dim, archetype, value = self.component_block(slice(start, stop))
+            yield start, stop, quantum_dim, archetype, value
+
+    def index_pairs(
+        self,
+        ground_truth: Union[List[Dict], GroundTruthPairs]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Map ground truth (dicts or a store) to sorted (idx_a, idx_b, label) arrays."""
+        return align_ground_truth(ground_truth, self.arrays.user_ids)
+
+    def dimension_similarity_block(self, rows: slice, cols: slice = slice(None)) -> np.ndarray:
+        """Mean 1 - |a - b| over shared dimensions (0.5 when none are shared)."""
+        arrays = self.arrays
+        values_r, values_c = arrays.values[rows], arrays.values[cols]
+        mask_r, mask_c = arrays.mask[rows], arrays.mask[cols]
+        total = np.zeros((values_r.shape[0], values_c.shape[0]))
+        counts = np.zeros_like(total)
+        for d in range(values_r.shape[1]):
+            shared = mask_r[:, d, None] & mask_c[None, :, d]
+            total += np.where(shared, 1.0 - np.abs(values_r[:, d, None] - values_c[None, :, d]), 0.0)
+            counts += shared
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(counts > 0, total / counts, 0.5)
+
+    def iter_upper_triangle(self) -> Iterator[Tuple[np.ndarray, np.ndarray, slice, np.ndarray, np.ndarray]]:
+        """Yield (idx_a, idx_b, rows, block_rows, block_cols) for i < j pairs, row block by row block.
+
+        block_rows/block_cols index into matrices returned for rows by the
+        *_block methods; idx_a/idx_b are the global profile indices.
+        """
+        n = self.arrays.size
+        for start in range(0, n, self.block_size):
+            stop = min(start + self.block_size, n)
+            block_rows, block_cols = np.nonzero(
+                np.arange(n)[None, :] > np.arange(start, stop)[:, None]
+            )
+            yield block_rows + start, block_cols, slice(start, stop), block_rows, block_cols
+
+    def score_pairs(
+        self,
+        idx_a: np.ndarray,
+        idx_b: np.ndarray,
+        weights: Tuple[float, float, float] = DEFAULT_COMPONENT_WEIGHTS
+    ) -> Tuple[np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+        """Score sorted index pairs block by block.
+
+        Returns (quantum, topological, has_knots). Pairs must be sorted by
+        idx_a (as returned by index_pairs); each row block is evaluated as
+        dense matrices and the requested pairs are gathered from it.
+        """
+        quantum = np.empty(len(idx_a))
+        topological = np.empty(len(idx_a)) if self.knots is not None else None
+        has_knots = np.empty(len(idx_a), dtype=bool) if self.knots is not None else None
+        if len(idx_a) == 0:
+            return quantum, topological, has_knots
+
+        n = self.arrays.size
+        block_starts = np.arange(0, n, self.block_size)
+        bounds = np.searchsorted(idx_a, np.append(block_starts, n))
+
+        for b, start in enumerate(block_starts):
+            lo, hi = bounds[b], bounds[b + 1]
+            if lo == hi:
+                continue
+            stop = min(start + self.block_size, n)
+            rows = idx_a[lo:hi] - start
+            cols = idx_b[lo:hi]
+            quantum_dim, archetype, value = self.component_block(slice(start, stop))
+            quantum[lo:hi] = self.combine(
+                quantum_dim[rows, cols], archetype[rows, cols], value[rows, cols], weights
+            )
+            if self.knots is not None:
+                topo_block, present_block = self.topological_block(slice(start, stop))
+                topological[lo:hi] = topo_block[rows, cols]
+                has_knots[lo:hi] = present_block[rows, cols]
+
+        return quantum, topological, has_knots
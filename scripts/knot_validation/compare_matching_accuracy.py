@@ -15,22 +15,30 @@ import random
 import math
 import numpy as np
 from pathlib import Path
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Union, Iterator
 from dataclasses import dataclass
 import statistics
 import ast
 try:
     from scipy import stats
-    from sklearn.metrics import roc_curve, auc
     SCIPY_AVAILABLE = True
 except ImportError:
     SCIPY_AVAILABLE = False
-    print("Warning: scipy/sklearn not available. Some features will be disabled.")
+    print("Warning: scipy not available. Significance testing will be disabled.")
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.knot_validation.ground_truth_store import (
+    GroundTruthPairs,
+    GroundTruthWriter,
+    PAIR_DTYPE,
+    is_ground_truth_store,
+    open_ground_truth,
+)
+from scripts.knot_validation.threshold_search import sweep_thresholds, accuracy_at_threshold
+
 @dataclass
 class CompatibilityScore:
     """Represents a compatibility score."""
@@ -191,38 +199,24 @@ class MatchingAccuracyComparator:
         return topological
     
     def _polynomial_distance(self, poly_a: Any, poly_b: Any) -> float:
-        """Calculate distance between two polynomials."""
-        # Handle string representations
-        if isinstance(poly_a, str):
-            try:
-                # Try to parse as list of coefficients
-                import ast
-                poly_a = ast.literal_eval(poly_a) if poly_a.startswith('[') else [1.0]
-            except:
-                poly_a = [1.0]
-        if isinstance(poly_b, str):
-            try:
-                import ast
-                poly_b = ast.literal_eval(poly_b) if poly_b.startswith('[') else [1.0]
-            except:
-                poly_b = [1.0]
-        
-        # Convert to lists if needed
-        if not isinstance(poly_a, list):
-            poly_a = [float(poly_a)] if poly_a else [1.0]
-        if not isinstance(poly_b, list):
-            poly_b = [float(poly_b)] if poly_b else [1.0]
+        """Calculate distance between two polynomials.
+        
+        Coefficient vectors (e.g. alexander_coefficients) are compared
+        directly; legacy string representations are parsed first.
+        """
+        poly_a = np.asarray(_polynomial_coefficients(poly_a), dtype=np.float64)
+        poly_b = np.asarray(_polynomial_coefficients(poly_b), dtype=np.float64)
         
         # Normalize lengths
         max_len = max(len(poly_a), len(poly_b))
-        poly_a = list(poly_a) + [0.0] * (max_len - len(poly_a))
-        poly_b = list(poly_b) + [0.0] * (max_len - len(poly_b))
+        poly_a = np.pad(poly_a, (0, max_len - len(poly_a)))
+        poly_b = np.pad(poly_b, (0, max_len - len(poly_b)))
         
         # Calculate Euclidean distance
-        distance = math.sqrt(sum((a - b) ** 2 for a, b in zip(poly_a, poly_b)))
+        distance = float(np.sqrt(np.sum((poly_a - poly_b) ** 2)))
         
         # Normalize by max coefficient magnitude
-        max_coeff = max(max(abs(c) for c in poly_a), max(abs(c) for c in poly_b), 1.0)
+        max_coeff = max(float(np.abs(poly_a).max()), float(np.abs(poly_b).max()), 1.0)
         return min(distance / max_coeff, 1.0)
     
     def _type_similarity(self, knot_a: Dict, knot_b: Dict) -> float:
@@ -260,11 +254,11 @@ class MatchingAccuracyComparator:
         writhe_weight: float = 0.15
     ) -> float:
         """Calculate topological compatibility using actual polynomial distances."""
-        # Get polynomial coefficients if available
+        # Get polynomial coefficients if available (numeric vectors preferred)
         jones_a = knot_a.get('jones_polynomial', None)
         jones_b = knot_b.get('jones_polynomial', None)
-        alexander_a = knot_a.get('alexander_polynomial', None)
-        alexander_b = knot_b.get('alexander_polynomial', None)
+        alexander_a = knot_alexander(knot_a)
+        alexander_b = knot_alexander(knot_b)
         
         # Calculate polynomial distances (if available)
         if jones_a and jones_b:
@@ -274,7 +268,7 @@ class MatchingAccuracyComparator:
             # Fallback to type similarity
             jones_similarity = self._type_similarity(knot_a, knot_b)
         
-        if alexander_a and alexander_b:
+        if _has_polynomial(alexander_a) and _has_polynomial(alexander_b):
             alexander_distance = self._polynomial_distance(alexander_a, alexander_b)
             alexander_similarity = 1.0 - min(alexander_distance, 1.0)
         else:
@@ -377,10 +371,20 @@ class MatchingAccuracyComparator:
         self,
         profiles: List[Dict],
         knots: List[Dict],
-        ground_truth: List[Dict]  # Known compatible/incompatible pairs
+        ground_truth: Union[List[Dict], GroundTruthPairs],  # Known compatible/incompatible pairs
+        batch: bool = False,
+        block_size: int = 512
     ) -> MatchingResult:
-        """Compare matching accuracy between quantum-only and integrated."""
-        
+        """Compare matching accuracy between quantum-only and integrated.
+
+        With batch=True, scores are computed by BatchCompatibilityEngine as
+        blocked matrix operations instead of the per-pair Python loop.
+        Ground truth given as GroundTruthPairs (see ground_truth_store.py)
+        always uses the batch path, so pairs are never turned into dicts.
+        """
+        if batch or isinstance(ground_truth, GroundTruthPairs):
+            return self._compare_matching_batch(profiles, knots, ground_truth, block_size)
+
         quantum_scores = []
         integrated_scores = []
         ground_truth_map = {
@@ -438,7 +442,56 @@ class MatchingAccuracyComparator:
         quantum_scores_list = [score for score, _ in quantum_scores]
         integrated_scores_list = [score for score, _ in integrated_scores]
         ground_truth_list = [gt for _, gt in quantum_scores]
-        
+
+        return self._summarize_matching(
+            quantum_scores_list,
+            integrated_scores_list,
+            ground_truth_list,
+            total_pairs,
+            compatible_pairs,
+            incompatible_pairs
+        )
+
+    def _compare_matching_batch(
+        self,
+        profiles: List[Dict],
+        knots: List[Dict],
+        ground_truth: Union[List[Dict], GroundTruthPairs],
+        block_size: int
+    ) -> MatchingResult:
+        """Batch version of compare_matching using BatchCompatibilityEngine."""
+        from scripts.knot_validation.batch_compatibility import BatchCompatibilityEngine
+
+        engine = BatchCompatibilityEngine(profiles, knots or [], block_size=block_size)
+        idx_a, idx_b, labels = engine.index_pairs(ground_truth)
+        quantum, topological, has_knots = engine.score_pairs(idx_a, idx_b)
+
+        integrated = np.where(
+            has_knots,
+            self.quantum_weight * quantum + self.topological_weight * topological,
+            quantum
+        )
+        compatible_pairs = int(labels.sum())
+
+        return self._summarize_matching(
+            quantum,
+            integrated,
+            labels,
+            len(labels),
+            compatible_pairs,
+            len(labels) - compatible_pairs
+        )
+
+    def _summarize_matching(
+        self,
+        quantum_scores_list: Union[List[float], np.ndarray],
+        integrated_scores_list: Union[List[float], np.ndarray],
+        ground_truth_list: Union[List[bool], np.ndarray],
+        total_pairs: int,
+        compatible_pairs: int,
+        incompatible_pairs: int
+    ) -> MatchingResult:
+        """Find optimal thresholds and significance for scored pairs."""
         # Find optimal thresholds
         quantum_optimal = self.find_optimal_threshold(quantum_scores_list, ground_truth_list)
         integrated_optimal = self.find_optimal_threshold(integrated_scores_list, ground_truth_list)
@@ -451,7 +504,9 @@ class MatchingAccuracyComparator:
         statistical_results = self.calculate_statistical_significance(
             quantum_scores_list,
             integrated_scores_list,
-            ground_truth_list
+            ground_truth_list,
+            quantum_optimal=quantum_optimal,
+            integrated_optimal=integrated_optimal
         )
         
         improvement = ((integrated_accuracy - quantum_accuracy) / quantum_accuracy * 100) if quantum_accuracy > 0 else 0
@@ -477,66 +532,46 @@ class MatchingAccuracyComparator:
         if threshold is None:
             threshold = 0.6
         
-        correct = 0
-        for score, is_compatible in scores:
-            predicted_compatible = score >= threshold
-            if predicted_compatible == is_compatible:
-                correct += 1
-        
-        return correct / len(scores) if scores else 0.0
+        return accuracy_at_threshold(
+            [score for score, _ in scores],
+            [is_compatible for _, is_compatible in scores],
+            threshold
+        )
     
     def find_optimal_threshold(self, scores: List[float], ground_truth: List[bool]) -> Dict[str, Any]:
-        """Find optimal threshold using ROC curve."""
-        if not SCIPY_AVAILABLE:
-            # Fallback: try different thresholds
-            best_threshold = 0.6
-            best_accuracy = 0.0
-            for threshold in np.arange(0.3, 0.9, 0.05):
-                accuracy = self._calculate_accuracy(
-                    list(zip(scores, ground_truth)),
-                    threshold=threshold
-                )
-                if accuracy > best_accuracy:
-                    best_accuracy = accuracy
-                    best_threshold = threshold
-            return {
-                'optimal_threshold': best_threshold,
-                'accuracy': best_accuracy,
-                'roc_auc': 0.0  # Can't calculate without scipy
-            }
-        
-        # Calculate ROC curve
-        fpr, tpr, thresholds = roc_curve(ground_truth, scores)
-        
-        # Find optimal threshold (Youden's J statistic: max(tpr - fpr))
-        optimal_idx = np.argmax(tpr - fpr)
-        optimal_threshold = thresholds[optimal_idx]
+        """Find the accuracy-maximizing threshold with a single sorted sweep.
         
-        # Calculate AUC
-        roc_auc = auc(fpr, tpr)
-        
-        # Calculate accuracy with optimal threshold
-        accuracy = self._calculate_accuracy(
-            list(zip(scores, ground_truth)),
-            threshold=optimal_threshold
-        )
+        Every unique score is a candidate threshold, so the result is exact
+        and identical with or without scipy/sklearn. Youden's J threshold,
+        AUC and the full ROC curve (numpy arrays) come from the same pass.
+        """
+        sweep = sweep_thresholds(scores, ground_truth)
         
         return {
-            'optimal_threshold': float(optimal_threshold),
-            'accuracy': accuracy,
-            'roc_auc': float(roc_auc),
-            'fpr': fpr.tolist(),
-            'tpr': tpr.tolist(),
-            'thresholds': thresholds.tolist()
+            'optimal_threshold': sweep['accuracy_threshold'],
+            'accuracy': sweep['accuracy'],
+            'roc_auc': sweep['roc_auc'],
+            'youden_j': sweep['youden_j'],
+            'youden_threshold': sweep['youden_threshold'],
+            'youden_accuracy': sweep['youden_accuracy'],
+            'fpr': sweep['fpr'],
+            'tpr': sweep['tpr'],
+            'thresholds': sweep['thresholds']
         }
     
     def calculate_statistical_significance(
         self,
         quantum_scores: List[float],
         integrated_scores: List[float],
-        ground_truth: List[bool]
+        ground_truth: List[bool],
+        quantum_optimal: Optional[Dict[str, Any]] = None,
+        integrated_optimal: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Calculate statistical significance of improvement."""
+        """Calculate statistical significance of improvement.
+        
+        quantum_optimal / integrated_optimal are find_optimal_threshold
+        results for the same scores, if the caller already has them.
+        """
         if not SCIPY_AVAILABLE:
             # Fallback: basic statistics
             quantum_accuracy = self._calculate_accuracy(list(zip(quantum_scores, ground_truth)))
@@ -555,18 +590,17 @@ class MatchingAccuracyComparator:
             }
         
         # Convert to binary predictions with optimal thresholds
-        quantum_optimal = self.find_optimal_threshold(quantum_scores, ground_truth)
-        integrated_optimal = self.find_optimal_threshold(integrated_scores, ground_truth)
-        
-        quantum_predictions = [s >= quantum_optimal['optimal_threshold'] for s in quantum_scores]
-        integrated_predictions = [s >= integrated_optimal['optimal_threshold'] for s in integrated_scores]
+        if quantum_optimal is None:
+            quantum_optimal = self.find_optimal_threshold(quantum_scores, ground_truth)
+        if integrated_optimal is None:
+            integrated_optimal = self.find_optimal_threshold(integrated_scores, ground_truth)
         
         # Calculate accuracy
-        quantum_accuracy = sum(q == gt for q, gt in zip(quantum_predictions, ground_truth)) / len(ground_truth)
-        integrated_accuracy = sum(i == gt for i, gt in zip(integrated_predictions, ground_truth)) / len(ground_truth)
+        quantum_accuracy = quantum_optimal['accuracy']
+        integrated_accuracy = integrated_optimal['accuracy']
         
         # Perform paired t-test on score differences
-        differences = [i - q for i, q in zip(integrated_scores, quantum_scores)]
+        differences = np.asarray(integrated_scores, dtype=float) - np.asarray(quantum_scores, dtype=float)
         t_stat, p_value = stats.ttest_1samp(differences, 0)
         
         # Calculate confidence interval
@@ -597,8 +631,16 @@ class MatchingAccuracyComparator:
             'integrated_auc': integrated_optimal['roc_auc']
         }
 
-def load_data(profiles_path: str, knots_path: str, ground_truth_path: str) -> Tuple[List[Dict], List[Dict], List[Dict]]:
-    """Load profiles, knots, and ground truth data."""
+def load_data(
+    profiles_path: str,
+    knots_path: str,
+    ground_truth_path: str
+) -> Tuple[List[Dict], List[Dict], Union[List[Dict], GroundTruthPairs]]:
+    """Load profiles, knots, and ground truth data.
+
+    ground_truth_path may be a JSON file or a ground-truth store directory;
+    stores are opened lazily as memory-mapped GroundTruthPairs.
+    """
     # Load knots first (this should exist from step 1)
     if not os.path.exists(knots_path):
         print(f"Error: Knots file not found: {knots_path}")
@@ -637,7 +679,9 @@ def load_data(profiles_path: str, knots_path: str, ground_truth_path: str) -> Tu
             })
     
     # Load ground truth if available, otherwise create sample
-    if os.path.exists(ground_truth_path):
+    if is_ground_truth_store(ground_truth_path):
+        ground_truth = open_ground_truth(ground_truth_path)
+    elif os.path.exists(ground_truth_path):
         with open(ground_truth_path, 'r') as f:
             ground_truth = json.load(f)
     else:
@@ -708,6 +752,101 @@ def create_sample_ground_truth(profiles: List[Dict]) -> List[Dict]:
     
     return ground_truth
 
+def _iter_sample_ground_truth(
+    profiles: List[Dict],
+    seed: Optional[int],
+    block_size: int
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Yield (idx_a, idx_b, compatibility) blocks of the sample ground-truth model."""
+    from scripts.knot_validation.batch_compatibility import BatchCompatibilityEngine
+
+    engine = BatchCompatibilityEngine(profiles, block_size=block_size)
+    rng = np.random.default_rng(seed)
+
+    for idx_a, idx_b, rows, block_rows, block_cols in engine.iter_upper_triangle():
+        _, archetype, value = engine.component_block(rows)
+        dimension_similarity = engine.dimension_similarity_block(rows)
+        compatibility = (
+            0.50 * dimension_similarity[block_rows, block_cols] +
+            0.25 * archetype[block_rows, block_cols] +
+            0.25 * value[block_rows, block_cols]
+        )
+        compatibility = np.clip(compatibility + rng.normal(0, 0.05, len(compatibility)), 0.0, 1.0)
+        yield idx_a, idx_b, compatibility
+
+def write_sample_ground_truth(
+    profiles: List[Dict],
+    output_path: Union[str, Path],
+    seed: Optional[int] = None,
+    block_size: int = 512
+) -> GroundTruthPairs:
+    """Stream create_sample_ground_truth's all-pairs model into a ground-truth store.
+
+    Same factors and weights as create_sample_ground_truth, computed one row
+    block at a time; noise is drawn from a seeded numpy Generator, so labels
+    are reproducible but not identical to the random.gauss-based version.
+    """
+    user_ids = [p['user_id'] for p in profiles]
+    metadata = {'generator': 'create_sample_ground_truth', 'seed': seed, 'threshold': 0.50}
+
+    with GroundTruthWriter(output_path, user_ids, metadata) as writer:
+        for idx_a, idx_b, compatibility in _iter_sample_ground_truth(profiles, seed, block_size):
+            writer.write(idx_a, idx_b, compatibility, compatibility > 0.50)
+
+    return open_ground_truth(output_path)
+
+def sample_ground_truth_pairs(
+    profiles: List[Dict],
+    seed: Optional[int] = None,
+    block_size: int = 512
+) -> GroundTruthPairs:
+    """In-memory counterpart of write_sample_ground_truth (no dict per pair)."""
+    user_ids = [p['user_id'] for p in profiles]
+    blocks = []
+    for idx_a, idx_b, compatibility in _iter_sample_ground_truth(profiles, seed, block_size):
+        records = np.empty(len(idx_a), dtype=PAIR_DTYPE)
+        records['user_a'] = idx_a
+        records['user_b'] = idx_b
+        records['score'] = compatibility
+        records['label'] = compatibility > 0.50
+        blocks.append(records)
+    records = np.concatenate(blocks) if blocks else np.zeros(0, dtype=PAIR_DTYPE)
+    metadata = {'generator': 'create_sample_ground_truth', 'seed': seed, 'threshold': 0.50}
+    return GroundTruthPairs(user_ids, records, metadata)
+
+def knot_alexander(knot: Dict) -> Any:
+    """Alexander coefficient vector of a knot, or its legacy polynomial string."""
+    coefficients = knot.get('alexander_coefficients')
+    if coefficients is not None:
+        return coefficients
+    return knot.get('alexander_polynomial', None)
+
+def _has_polynomial(poly: Any) -> bool:
+    """Whether a stored polynomial is present (coefficient arrays or truthy values)."""
+    if isinstance(poly, np.ndarray):
+        return poly.size > 0
+    return bool(poly)
+
+def _polynomial_coefficients(poly: Any) -> List[float]:
+    """Parse a stored polynomial into a coefficient list ([1.0] if unparseable)."""
+    # Numeric coefficient vectors are used as-is
+    if isinstance(poly, (np.ndarray, tuple)):
+        return [float(c) for c in np.ravel(poly)]
+    
+    # Handle string representations
+    if isinstance(poly, str):
+        try:
+            # Try to parse as list of coefficients
+            poly = ast.literal_eval(poly) if poly.startswith('[') else [1.0]
+        except:
+            poly = [1.0]
+    
+    # Convert to lists if needed
+    if not isinstance(poly, list):
+        poly = [float(poly)] if poly else [1.0]
+    
+    return list(poly)
+
 def _infer_archetype(dimensions: Dict[str, float]) -> str:
     """Infer archetype from dimensions."""
     exploration = dimensions.get('exploration_eagerness', 0.5)
@@ -771,6 +910,10 @@ def main():
     parser.add_argument('--output', type=str,
                        default="docs/plans/knot_theory/validation/matching_accuracy_results.json",
                        help='Output JSON file path')
+    parser.add_argument('--no-batch', action='store_true',
+                       help='Use the per-pair scoring loop instead of the batch engine')
+    parser.add_argument('--block-size', type=int, default=512,
+                       help='Profiles per row block in batch mode')
     
     args = parser.parse_args()
     
@@ -817,7 +960,11 @@ def main():
         print(f"   Using default weights: Quantum={quantum_weight:.1%}, Topological={topological_weight:.1%}")
     
     comparator = MatchingAccuracyComparator(quantum_weight=quantum_weight, topological_weight=topological_weight)
-    result = comparator.compare_matching(profiles, knots, ground_truth)
+    result = comparator.compare_matching(
+        profiles, knots, ground_truth,
+        batch=not args.no_batch,
+        block_size=args.block_size
+    )
     
     print(f"\n   Results:")
     print(f"     Total pairs analyzed: {result.total_pairs}")
@@ -3,15 +3,25 @@
 Cross-Validation for Knot Validation
 
 Performs k-fold cross-validation for more robust results.
+
+Pair scores do not depend on the split, so quantum and integrated scores
+are computed once for every ground-truth pair (BatchCompatibilityEngine)
+and written to memory-mapped arrays. Each (repeat, fold) task then only
+masks the pairs whose users both fall in the test fold and runs the exact
+threshold sweep; tasks run in a process pool that maps the same arrays.
+Repeated and stratified k-fold give confidence intervals across repeats.
 """
 
 import json
 import sys
 import os
 import random
+import statistics
+import tempfile
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 
 # Add project root to path
@@ -22,8 +32,16 @@ from scripts.knot_validation.generate_knots_from_profiles import (
     load_personality_profiles, create_sample_profiles, KnotGenerator
 )
 from scripts.knot_validation.compare_matching_accuracy import (
-    MatchingAccuracyComparator, create_sample_ground_truth, load_data
+    MatchingAccuracyComparator, SCIPY_AVAILABLE, sample_ground_truth_pairs
+)
+from scripts.knot_validation.batch_compatibility import BatchCompatibilityEngine
+from scripts.knot_validation.ground_truth_store import (
+    GroundTruthPairs, is_ground_truth_store, open_ground_truth
 )
+from scripts.knot_validation.threshold_search import best_accuracy_threshold
+
+if SCIPY_AVAILABLE:
+    from scipy import stats
 
 @dataclass
 class CrossValidationResult:
@@ -36,6 +54,12 @@ class CrossValidationResult:
     improvement_mean: float
     improvement_std: float
     fold_results: List[Dict[str, Any]]
+    n_repeats: int = 1
+    stratified: bool = False
+    confidence_level: float = 0.95
+    quantum_accuracy_ci: Tuple[float, float] = (0.0, 0.0)
+    integrated_accuracy_ci: Tuple[float, float] = (0.0, 0.0)
+    improvement_ci: Tuple[float, float] = (0.0, 0.0)
 
 def k_fold_split(data: List[Any], k: int, shuffle: bool = True) -> List[tuple]:
     """Split data into k folds."""
@@ -50,72 +74,195 @@ def k_fold_split(data: List[Any], k: int, shuffle: bool = True) -> List[tuple]:
         start_idx = i * fold_size
         end_idx = (i + 1) * fold_size if i < k - 1 else len(data)
         test_indices = list(range(start_idx, end_idx))
-        train_indices = [j for j in range(len(data)) if j not in test_indices]
+        train_indices = list(range(0, start_idx)) + list(range(end_idx, len(data)))
         folds.append((train_indices, test_indices))
     
     return folds
 
+def assign_folds(
+    n: int,
+    k: int,
+    rng: np.random.Generator,
+    strata: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Fold id (0..k-1) for each of n profiles.
+
+    Without strata, profiles are shuffled and cut into k contiguous folds
+    like k_fold_split. With strata (one value per profile), profiles are
+    sorted by stratum value and each consecutive group of k is spread over
+    the k folds in random order, so every fold sees the same distribution.
+    """
+    folds = np.empty(n, dtype=np.int32)
+    if strata is None:
+        order = rng.permutation(n)
+        fold_size = n // k
+        position = np.arange(n)
+        folds[order] = np.minimum(position // max(fold_size, 1), k - 1)
+        return folds
+
+    # Random tie-break so equal strata do not keep input order
+    order = np.lexsort((rng.random(n), np.asarray(strata)))
+    for start in range(0, n, k):
+        group = order[start:start + k]
+        folds[group] = rng.permutation(k)[:len(group)]
+    return folds
+
+def compatibility_rate_strata(n: int, idx_a: np.ndarray, idx_b: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """Per-profile share of compatible ground-truth pairs (pair labels -> user strata)."""
+    pairs = np.bincount(idx_a, minlength=n) + np.bincount(idx_b, minlength=n)
+    compatible = (
+        np.bincount(idx_a, weights=labels, minlength=n) +
+        np.bincount(idx_b, weights=labels, minlength=n)
+    )
+    return np.divide(compatible, pairs, out=np.full(n, 0.5), where=pairs > 0)
+
+def confidence_interval(values: List[float], confidence_level: float = 0.95) -> Tuple[float, float]:
+    """Two-sided CI for the mean (Student t with scipy, normal approximation without)."""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) < 2:
+        mean = float(values.mean()) if len(values) else 0.0
+        return (mean, mean)
+    mean = values.mean()
+    sem = values.std(ddof=1) / np.sqrt(len(values))
+    if SCIPY_AVAILABLE:
+        critical = stats.t.ppf(0.5 + confidence_level / 2, len(values) - 1)
+    else:
+        critical = statistics.NormalDist().inv_cdf(0.5 + confidence_level / 2)
+    return (float(mean - critical * sem), float(mean + critical * sem))
+
+def score_ground_truth_pairs(
+    profiles: List[Dict],
+    knots: List[Dict],
+    ground_truth: Union[List[Dict], GroundTruthPairs],
+    comparator: Optional[MatchingAccuracyComparator] = None
+) -> Dict[str, np.ndarray]:
+    """Quantum and integrated scores for every ground-truth pair, computed once."""
+    comparator = comparator or MatchingAccuracyComparator()
+    engine = BatchCompatibilityEngine(profiles, knots or [])
+    idx_a, idx_b, labels = engine.index_pairs(ground_truth)
+    quantum, topological, has_knots = engine.score_pairs(idx_a, idx_b)
+    integrated = np.where(
+        has_knots,
+        comparator.quantum_weight * quantum + comparator.topological_weight * topological,
+        quantum
+    )
+    return {
+        'idx_a': idx_a.astype(np.int32),
+        'idx_b': idx_b.astype(np.int32),
+        'labels': labels,
+        'quantum': quantum,
+        'integrated': integrated,
+    }
+
+def _evaluate_fold(
+    arrays: Dict[str, np.ndarray],
+    repeat: int,
+    fold: int,
+    fold_of: np.ndarray
+) -> Optional[Dict[str, Any]]:
+    """Accuracy on the pairs whose users are both in the test fold."""
+    in_fold = (fold_of[arrays['idx_a']] == fold) & (fold_of[arrays['idx_b']] == fold)
+    labels = arrays['labels'][in_fold]
+    if len(labels) == 0:
+        return None
+
+    quantum_accuracy, _ = best_accuracy_threshold(arrays['quantum'][in_fold], labels)
+    integrated_accuracy, _ = best_accuracy_threshold(arrays['integrated'][in_fold], labels)
+    improvement = (
+        (integrated_accuracy - quantum_accuracy) / quantum_accuracy * 100
+        if quantum_accuracy > 0 else 0
+    )
+    return {
+        'repeat': repeat + 1,
+        'fold': fold + 1,
+        'quantum_accuracy': quantum_accuracy,
+        'integrated_accuracy': integrated_accuracy,
+        'improvement': improvement,
+        'total_pairs': int(len(labels))
+    }
+
+# Score arrays memory-mapped by each pool worker (set by _attach_score_arrays)
+_SHARED_ARRAYS: Dict[str, np.ndarray] = {}
+
+def _attach_score_arrays(directory: str):
+    """Pool initializer: map the score arrays written by the parent process."""
+    for path in Path(directory).glob('*.npy'):
+        _SHARED_ARRAYS[path.stem] = np.load(path, mmap_mode='r')
+
+def _evaluate_shared_fold(task: Tuple[int, int, np.ndarray]) -> Optional[Dict[str, Any]]:
+    repeat, fold, fold_of = task
+    return _evaluate_fold(_SHARED_ARRAYS, repeat, fold, fold_of)
+
+def _run_fold_tasks(
+    arrays: Dict[str, np.ndarray],
+    tasks: List[Tuple[int, int, np.ndarray]],
+    workers: int
+) -> List[Optional[Dict[str, Any]]]:
+    """Evaluate (repeat, fold, fold_of) tasks inline or in a process pool."""
+    if workers <= 1 or len(tasks) <= 1:
+        return [_evaluate_fold(arrays, *task) for task in tasks]
+
+    # Memory-mapped files in /dev/shm (when available) are shared by every
+    # worker instead of being pickled into each task
+    shm_root = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    with tempfile.TemporaryDirectory(prefix='cross_validate_', dir=shm_root) as directory:
+        for name, array in arrays.items():
+            np.save(Path(directory) / f'{name}.npy', array)
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            initializer=_attach_score_arrays,
+            initargs=(directory,)
+        ) as pool:
+            return list(pool.map(_evaluate_shared_fold, tasks))
+
 def cross_validate(
     profiles: List[Dict],
     knots: List[Dict],
-    k_folds: int = 5
+    k_folds: int = 5,
+    ground_truth: Optional[Union[List[Dict], GroundTruthPairs]] = None,
+    n_repeats: int = 1,
+    stratified: bool = False,
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    confidence_level: float = 0.95
 ) -> CrossValidationResult:
-    """Perform k-fold cross-validation."""
-    
-    # Create ground truth for all pairs
-    ground_truth = create_sample_ground_truth(profiles)
+    """Perform (repeated, optionally stratified) k-fold cross-validation.
     
-    # Split profiles into folds
-    folds = k_fold_split(profiles, k_folds, shuffle=True)
+    ground_truth defaults to sample_ground_truth_pairs(profiles); dict lists
+    and GroundTruthPairs stores are both accepted. Scores are computed once;
+    folds are evaluated by `workers` processes (default: all cores).
+    Stratified folds balance each profile's compatible-pair rate.
+    CIs are over per-repeat means (over folds when n_repeats is 1).
+    """
     
-    fold_results = []
-    quantum_accuracies = []
-    integrated_accuracies = []
-    improvements = []
+    # Create ground truth for all pairs
+    if ground_truth is None:
+        ground_truth = sample_ground_truth_pairs(profiles, seed=seed)
     
     comparator = MatchingAccuracyComparator()
+    arrays = score_ground_truth_pairs(profiles, knots, ground_truth, comparator)
     
-    for fold_idx, (train_indices, test_indices) in enumerate(folds):
-        print(f"  Processing fold {fold_idx + 1}/{k_folds}...")
-        
-        # Get train and test sets
-        train_profiles = [profiles[i] for i in train_indices]
-        test_profiles = [profiles[i] for i in test_indices]
-        
-        # Get corresponding knots
-        train_user_ids = {p['user_id'] for p in train_profiles}
-        test_user_ids = {p['user_id'] for p in test_profiles}
-        
-        train_knots = [k for k in knots if k['user_id'] in train_user_ids]
-        test_knots = [k for k in knots if k['user_id'] in test_user_ids]
-        
-        # Filter ground truth to test pairs only
-        test_ground_truth = [
-            gt for gt in ground_truth
-            if gt['user_a'] in test_user_ids and gt['user_b'] in test_user_ids
-        ]
-        
-        if not test_ground_truth:
-            continue
-        
-        # Compare matching accuracy on test set
-        result = comparator.compare_matching(
-            test_profiles,
-            test_knots,
-            test_ground_truth
+    strata = None
+    if stratified:
+        strata = compatibility_rate_strata(
+            len(profiles), arrays['idx_a'], arrays['idx_b'], arrays['labels']
         )
-        
-        fold_results.append({
-            'fold': fold_idx + 1,
-            'quantum_accuracy': result.quantum_only_accuracy,
-            'integrated_accuracy': result.integrated_accuracy,
-            'improvement': result.improvement_percentage,
-            'total_pairs': result.total_pairs
-        })
-        
-        quantum_accuracies.append(result.quantum_only_accuracy)
-        integrated_accuracies.append(result.integrated_accuracy)
-        improvements.append(result.improvement_percentage)
+    
+    # Split profiles into folds (one assignment per repeat)
+    rng = np.random.default_rng(seed)
+    tasks = []
+    for repeat in range(n_repeats):
+        fold_of = assign_folds(len(profiles), k_folds, rng, strata)
+        tasks.extend((repeat, fold, fold_of) for fold in range(k_folds))
+    
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    print(f"  Evaluating {len(tasks)} folds over {len(arrays['labels'])} scored pairs "
+          f"({min(workers, len(tasks))} worker(s))...")
+    fold_results = [r for r in _run_fold_tasks(arrays, tasks, workers) if r is not None]
+    
+    quantum_accuracies = [r['quantum_accuracy'] for r in fold_results]
+    integrated_accuracies = [r['integrated_accuracy'] for r in fold_results]
+    improvements = [r['improvement'] for r in fold_results]
     
     # Calculate statistics
     quantum_mean = np.mean(quantum_accuracies) if quantum_accuracies else 0.0
@@ -125,6 +272,18 @@ def cross_validate(
     improvement_mean = np.mean(improvements) if improvements else 0.0
     improvement_std = np.std(improvements) if len(improvements) > 1 else 0.0
     
+    # Folds of one repeat share profiles, so CIs use per-repeat means
+    def ci(metric: str) -> Tuple[float, float]:
+        if n_repeats > 1:
+            samples = [
+                np.mean([r[metric] for r in fold_results if r['repeat'] == repeat + 1])
+                for repeat in range(n_repeats)
+                if any(r['repeat'] == repeat + 1 for r in fold_results)
+            ]
+        else:
+            samples = [r[metric] for r in fold_results]
+        return confidence_interval(samples, confidence_level)
+    
     return CrossValidationResult(
         k_folds=k_folds,
         quantum_accuracy_mean=float(quantum_mean),
@@ -133,11 +292,32 @@ def cross_validate(
         integrated_accuracy_std=float(integrated_std),
         improvement_mean=float(improvement_mean),
         improvement_std=float(improvement_std),
-        fold_results=fold_results
+        fold_results=fold_results,
+        n_repeats=n_repeats,
+        stratified=stratified,
+        confidence_level=confidence_level,
+        quantum_accuracy_ci=ci('quantum_accuracy'),
+        integrated_accuracy_ci=ci('integrated_accuracy'),
+        improvement_ci=ci('improvement')
     )
 
 def main():
     """Main cross-validation script."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='K-fold cross-validation of matching accuracy')
+    parser.add_argument('--k-folds', type=int, default=5, help='Number of folds')
+    parser.add_argument('--repeats', type=int, default=1, help='Repeat k-fold with fresh splits')
+    parser.add_argument('--stratified', action='store_true',
+                       help='Balance per-profile compatible-pair rates across folds')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes for fold evaluation (default: all cores)')
+    parser.add_argument('--seed', type=int, default=None, help='Seed for splits and sample ground truth')
+    parser.add_argument('--ground-truth', type=str, default=None,
+                       help='Ground truth JSON file or .gtstore (default: generated sample)')
+    
+    args = parser.parse_args()
+    
     print("=" * 80)
     print("Cross-Validation - Knot Validation")
     print("Phase 0: Patent #31 Validation")
@@ -147,7 +327,7 @@ def main():
     profiles_path = "test/fixtures/personality_profiles.json"
     knots_path = "docs/plans/knot_theory/validation/knot_generation_results.json"
     output_path = "docs/plans/knot_theory/validation/cross_validation_results.json"
-    k_folds = 5
+    k_folds = args.k_folds
     
     # Load data
     print("\n1. Loading data...")
@@ -173,21 +353,43 @@ def main():
         knots_data = json.load(f)
         knots = knots_data.get('knots', [])
     
+    ground_truth = None
+    if args.ground_truth:
+        if is_ground_truth_store(args.ground_truth):
+            ground_truth = open_ground_truth(args.ground_truth)
+        else:
+            with open(args.ground_truth, 'r') as f:
+                ground_truth = json.load(f)
+    
     print(f"   Loaded {len(profiles)} profiles")
     print(f"   Loaded {len(knots)} knots")
     
     # Perform cross-validation
-    print(f"\n2. Performing {k_folds}-fold cross-validation...")
-    result = cross_validate(profiles, knots, k_folds=k_folds)
+    repeats_label = f" x {args.repeats} repeats" if args.repeats > 1 else ""
+    print(f"\n2. Performing {k_folds}-fold cross-validation{repeats_label}...")
+    result = cross_validate(
+        profiles, knots, k_folds=k_folds,
+        ground_truth=ground_truth,
+        n_repeats=args.repeats,
+        stratified=args.stratified,
+        workers=args.workers,
+        seed=args.seed
+    )
     
     print(f"\n   Cross-Validation Results:")
     print(f"     Quantum-only accuracy: {result.quantum_accuracy_mean*100:.2f}% ± {result.quantum_accuracy_std*100:.2f}%")
     print(f"     Integrated accuracy: {result.integrated_accuracy_mean*100:.2f}% ± {result.integrated_accuracy_std*100:.2f}%")
     print(f"     Improvement: {result.improvement_mean:+.2f}% ± {result.improvement_std:.2f}%")
+    ci_label = f"{result.confidence_level:.0%} CI"
+    print(f"     Integrated accuracy {ci_label}: "
+          f"[{result.integrated_accuracy_ci[0]*100:.2f}%, {result.integrated_accuracy_ci[1]*100:.2f}%]")
+    print(f"     Improvement {ci_label}: "
+          f"[{result.improvement_ci[0]:+.2f}%, {result.improvement_ci[1]:+.2f}%]")
     
     print(f"\n   Per-Fold Results:")
     for fold_result in result.fold_results:
-        print(f"     Fold {fold_result['fold']}: "
+        repeat_label = f"Repeat {fold_result['repeat']} " if result.n_repeats > 1 else ""
+        print(f"     {repeat_label}Fold {fold_result['fold']}: "
               f"Quantum={fold_result['quantum_accuracy']*100:.2f}%, "
               f"Integrated={fold_result['integrated_accuracy']*100:.2f}%, "
               f"Improvement={fold_result['improvement']:+.2f}%")
@@ -198,17 +400,23 @@ def main():
     
     results = {
         'k_folds': result.k_folds,
+        'n_repeats': result.n_repeats,
+        'stratified': result.stratified,
+        'confidence_level': result.confidence_level,
         'quantum_accuracy': {
             'mean': result.quantum_accuracy_mean,
-            'std': result.quantum_accuracy_std
+            'std': result.quantum_accuracy_std,
+            'ci': list(result.quantum_accuracy_ci)
         },
         'integrated_accuracy': {
             'mean': result.integrated_accuracy_mean,
-            'std': result.integrated_accuracy_std
+            'std': result.integrated_accuracy_std,
+            'ci': list(result.integrated_accuracy_ci)
         },
         'improvement': {
             'mean': result.improvement_mean,
-            'std': result.improvement_std
+            'std': result.improvement_std,
+            'ci': list(result.improvement_ci)
         },
         'fold_results': result.fold_results
     }
@@ -12,15 +12,23 @@ import json
 import sys
 import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Sequence
 from dataclasses import dataclass
 from collections import defaultdict
 import statistics
+import numpy as np
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.knot_validation.knot_invariants import (
+    BraidInvariantEngine,
+    braid_word_from_crossings,
+    default_engine,
+    format_polynomial,
+)
+
 @dataclass
 class PersonalityProfile:
     """Represents a personality profile with 12 dimensions."""
@@ -47,9 +55,11 @@ class BraidSequence:
 class KnotInvariant:
     """Represents knot invariants."""
     jones_polynomial: str  # Simplified representation
-    alexander_polynomial: str  # Simplified representation
+    alexander_polynomial: str  # Readable form of alexander_coefficients
     crossing_number: int
     unknotting_number: int
+    writhe: int = 0
+    alexander_coefficients: Optional[np.ndarray] = None  # Fixed length, lowest degree first
     
 @dataclass
 class PersonalityKnot:
@@ -63,11 +73,94 @@ class PersonalityKnot:
     dimension_to_strand: Dict[str, int]
     created_at: str
 
+@dataclass
+class KnotBatch:
+    """Knots for many profiles as arrays (one row per profile).
+
+    Produced by KnotGenerator.generate_knots_batch. Crossing masks, counts,
+    types and complexity are kept as arrays; PersonalityKnot dataclasses
+    are only built on demand via knot(i) / iter_knots().
+    """
+    generator: 'KnotGenerator'
+    user_ids: List[str]
+    values: np.ndarray  # (N, 12) dimension values, missing -> 0.5
+    crossing_mask: np.ndarray  # (N, 66) bool, upper-triangle dimension pairs
+    crossing_counts: np.ndarray  # (N,) crossings per knot
+    knot_type_codes: np.ndarray  # (N,) index into knot_type_table
+    knot_type_table: List[str]
+    complexity: np.ndarray  # (N,)
+    created_at: Optional[List[Optional[str]]] = None
+    crossing_signs: Optional[np.ndarray] = None  # (N, 66) int8: +1 over, -1 under, 0 none
+    writhe: Optional[np.ndarray] = None  # (N,)
+    alexander: Optional[np.ndarray] = None  # (N, ALEXANDER_LENGTH) coefficients
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    @property
+    def knot_types(self) -> List[str]:
+        table = self.knot_type_table
+        return [table[code] for code in self.knot_type_codes.tolist()]
+
+    def knot(self, i: int) -> PersonalityKnot:
+        """Materialize the PersonalityKnot for row i."""
+        profile = PersonalityProfile(
+            user_id=self.user_ids[i],
+            dimensions=dict(zip(self.generator.dimension_names, self.values[i].tolist())),
+            created_at=self.created_at[i] if self.created_at else None
+        )
+        return self.generator.generate_knot(profile)
+
+    def iter_knots(self) -> Iterator[PersonalityKnot]:
+        for i in range(len(self)):
+            yield self.knot(i)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Knot summaries in the knot_generation_results.json format."""
+        records = [
+            {
+                'user_id': user_id,
+                'knot_type': self.knot_type_table[code],
+                'crossing_number': count,
+                'complexity': complexity,
+                'jones_polynomial': jones_placeholder(count),
+            }
+            for user_id, code, count, complexity in zip(
+                self.user_ids,
+                self.knot_type_codes.tolist(),
+                self.crossing_counts.tolist(),
+                self.complexity.tolist()
+            )
+        ]
+        if self.alexander is None:
+            return records
+        
+        # Many profiles share a polynomial; format each distinct one once
+        formatted: Dict[bytes, tuple] = {}
+        for record, writhe, coefficients in zip(records, self.writhe.tolist(), self.alexander):
+            key = coefficients.tobytes()
+            if key not in formatted:
+                trimmed = np.trim_zeros(coefficients, 'b')
+                formatted[key] = (format_polynomial(trimmed), trimmed.tolist())
+            record['writhe'] = writhe
+            record['alexander_polynomial'], record['alexander_coefficients'] = formatted[key]
+        return records
+
+def jones_placeholder(crossing_count: int) -> str:
+    """Simplified Jones polynomial label (not a computed invariant)."""
+    return f"q^{crossing_count}" if crossing_count > 0 else "1"
+
 class KnotGenerator:
     """Generates knots from personality profiles."""
     
-    def __init__(self, correlation_threshold: float = 0.3):
+    def __init__(
+        self,
+        correlation_threshold: float = 0.3,
+        invariant_engine: Optional[BraidInvariantEngine] = None
+    ):
         self.correlation_threshold = correlation_threshold
+        # Shared by default so invariants are memoized across generators
+        self.invariant_engine = invariant_engine or default_engine
         self.dimension_names = [
             'exploration_eagerness', 'community_orientation', 'adventure_seeking',
             'social_preference', 'energy_preference', 'novelty_seeking',
@@ -121,19 +214,27 @@ class KnotGenerator:
         )
     
     def calculate_knot_invariants(self, braid: BraidSequence) -> KnotInvariant:
-        """Calculate knot invariants (simplified version)."""
+        """Calculate knot invariants from the braid word.
+        
+        Alexander polynomial (Burau) and writhe come from the invariant
+        engine, memoized by canonical braid word. Jones stays simplified.
+        """
         crossing_count = len(braid.crossings)
         
-        # Simplified invariant calculation
-        # In real implementation, would use actual Jones/Alexander polynomial algorithms
-        jones_poly = f"q^{crossing_count}" if crossing_count > 0 else "1"
-        alexander_poly = f"t^{crossing_count}" if crossing_count > 0 else "1"
+        braid_word = braid_word_from_crossings(
+            [c.strand1 for c in braid.crossings],
+            [c.strand2 for c in braid.crossings],
+            [c.is_over for c in braid.crossings]
+        )
+        invariants = self.invariant_engine.invariants(braid_word)
         
         return KnotInvariant(
-            jones_polynomial=jones_poly,
-            alexander_polynomial=alexander_poly,
+            jones_polynomial=jones_placeholder(crossing_count),
+            alexander_polynomial=invariants.alexander_polynomial(),
             crossing_number=crossing_count,
-            unknotting_number=max(0, crossing_count - 3)  # Simplified
+            unknotting_number=max(0, crossing_count - 3),  # Simplified
+            writhe=invariants.writhe,
+            alexander_coefficients=invariants.alexander_coefficients
         )
     
     def identify_knot_type(self, invariants: KnotInvariant) -> str:
@@ -202,6 +303,91 @@ class KnotGenerator:
             created_at=profile.created_at or "unknown"
         )
 
+    def profiles_to_array(self, profiles: Sequence[Any]) -> np.ndarray:
+        """Pack PersonalityProfile objects or profile dicts into an (N, 12) array."""
+        values = np.full((len(profiles), len(self.dimension_names)), 0.5)
+        for row, profile in enumerate(profiles):
+            dims = profile.dimensions if isinstance(profile, PersonalityProfile) else profile.get('dimensions', {})
+            for col, dim in enumerate(self.dimension_names):
+                if dim in dims:
+                    values[row, col] = dims[dim]
+        return values
+    
+    def knot_type_table(self) -> List[str]:
+        """Knot type for every possible crossing count (0..66)."""
+        max_crossings = len(self.dimension_names) * (len(self.dimension_names) - 1) // 2
+        return [
+            self.identify_knot_type(KnotInvariant(
+                jones_polynomial=jones_placeholder(count),
+                alexander_polynomial="",
+                crossing_number=count,
+                unknotting_number=max(0, count - 3)
+            ))
+            for count in range(max_crossings + 1)
+        ]
+    
+    def generate_knots_batch(
+        self,
+        profiles_array: np.ndarray,
+        user_ids: Optional[List[str]] = None,
+        created_at: Optional[List[Optional[str]]] = None,
+        chunk_size: int = 65536,
+        compute_invariants: bool = False
+    ) -> KnotBatch:
+        """Generate knots for an (N, 12) array of dimension values at once.
+
+        Same correlations, crossings, types and complexity as generate_knot,
+        computed for all profiles as array operations in row chunks (bounding
+        the (chunk, 66) correlation temporaries).
+
+        compute_invariants=True also fills writhe and Alexander
+        coefficients, computed once per distinct crossing pattern. Random
+        profiles rarely share a 66-crossing pattern, so this costs roughly
+        one Burau determinant per profile (~0.17 ms each, about 50x the rest
+        of the batch); only enable it when the invariants are used.
+        """
+        values = np.asarray(profiles_array, dtype=np.float64)
+        n = len(values)
+        if user_ids is None:
+            user_ids = [f"user_{i}" for i in range(n)]
+        
+        # Upper triangle in the same (i, j) order as calculate_correlations
+        rows_i, rows_j = np.triu_indices(len(self.dimension_names), k=1)
+        max_crossings = len(rows_i)
+        crossing_signs = np.empty((n, max_crossings), dtype=np.int8)
+        
+        for start in range(0, n, chunk_size):
+            centered = values[start:start + chunk_size] - 0.5
+            correlations = centered[:, rows_i] * centered[:, rows_j] * 4
+            crossing_signs[start:start + chunk_size] = np.where(
+                np.abs(correlations) > self.correlation_threshold,
+                np.where(correlations > 0, 1, -1),
+                0
+            )
+        
+        crossing_mask = crossing_signs != 0
+        crossing_counts = crossing_mask.sum(axis=1)
+        complexity = np.minimum(1.0, crossing_counts / float(max_crossings))
+        
+        writhe = alexander = None
+        if compute_invariants:
+            writhe, alexander = self.invariant_engine.invariants_for_patterns(crossing_signs)
+        
+        return KnotBatch(
+            generator=self,
+            user_ids=list(user_ids),
+            values=values,
+            crossing_mask=crossing_mask,
+            crossing_counts=crossing_counts,
+            knot_type_codes=crossing_counts.astype(np.int16),
+            knot_type_table=self.knot_type_table(),
+            complexity=complexity,
+            created_at=created_at,
+            crossing_signs=crossing_signs,
+            writhe=writhe,
+            alexander=alexander
+        )
+
 def load_personality_profiles(data_path: str) -> List[PersonalityProfile]:
     """Load personality profiles from data file."""
     profiles = []
@@ -360,6 +546,27 @@ def create_sample_profiles() -> List[PersonalityProfile]:
     
     return profiles
 
+def analyze_knot_batch(batch: KnotBatch) -> Dict[str, Any]:
+    """analyze_knot_distribution for a KnotBatch, computed from its arrays."""
+    counts = np.bincount(batch.knot_type_codes, minlength=len(batch.knot_type_table))
+    complexities = batch.complexity
+    has_knots = len(complexities) > 0
+    
+    return {
+        'knot_type_distribution': {
+            batch.knot_type_table[code]: int(count)
+            for code, count in enumerate(counts.tolist()) if count
+        },
+        'total_knots': len(batch),
+        'complexity_stats': {
+            'mean': float(complexities.mean()) if has_knots else 0,
+            'median': float(np.median(complexities)) if has_knots else 0,
+            'std_dev': float(complexities.std(ddof=1)) if len(complexities) > 1 else 0,
+            'min': float(complexities.min()) if has_knots else 0,
+            'max': float(complexities.max()) if has_knots else 0,
+        }
+    }
+
 def analyze_knot_distribution(knots: List[PersonalityKnot]) -> Dict[str, Any]:
     """Analyze distribution of knot types."""
     distribution = defaultdict(int)
@@ -381,97 +588,6 @@ def analyze_knot_distribution(knots: List[PersonalityKnot]) -> Dict[str, Any]:
         }
     }
 
-def main():
-    """Main validation script."""
-    print("=" * 80)
-    print("Knot Generation Validation Script")
-    print("Phase 0: Patent #31 Validation")
-    print("=" * 80)
-    
-    # Configuration
-    data_path = "test/fixtures/personality_profiles.json"
-    output_path = "docs/plans/knot_theory/validation/knot_generation_results.json"
-    
-    # Load profiles
-    print("\n1. Loading personality profiles...")
-    profiles = load_profiles(input_path)
-    print(f"   Loaded {len(profiles)} profiles")
-    
-    # Generate knots
-    print("\n2. Generating knots from profiles...")
-    generator = KnotGenerator(correlation_threshold=0.3)
-    knots = []
-    
-    for i, profile in enumerate(profiles):
-        if i % 10 == 0:
-            print(f"   Processing profile {i+1}/{len(profiles)}...")
-        
-        try:
-            knot = generator.generate_knot(profile)
-            knots.append(knot)
-        except Exception as e:
-            print(f"   Error generating knot for {profile.user_id}: {e}")
-            continue
-    
-    print(f"   Generated {len(knots)} knots successfully")
-    
-    # Analyze distribution
-    print("\n3. Analyzing knot distribution...")
-    analysis = analyze_knot_distribution(knots)
-    
-    print("\n   Knot Type Distribution:")
-    for knot_type, count in sorted(analysis['knot_type_distribution'].items()):
-        percentage = (count / len(knots)) * 100
-        print(f"     {knot_type}: {count} ({percentage:.1f}%)")
-    
-    print("\n   Complexity Statistics:")
-    stats = analysis['complexity_stats']
-    print(f"     Mean: {stats['mean']:.3f}")
-    print(f"     Median: {stats['median']:.3f}")
-    print(f"     Std Dev: {stats['std_dev']:.3f}")
-    print(f"     Range: [{stats['min']:.3f}, {stats['max']:.3f}]")
-    
-    # Save results
-    print("\n4. Saving results...")
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    results = {
-        'total_profiles': len(profiles),
-        'total_knots_generated': len(knots),
-        'success_rate': len(knots) / len(profiles) if profiles else 0,
-        'analysis': analysis,
-        'knots': [
-            {
-                'user_id': knot.user_id,
-                'knot_type': knot.knot_type,
-                'crossing_number': knot.invariants.crossing_number,
-                'complexity': knot.complexity,
-                'jones_polynomial': knot.invariants.jones_polynomial,
-                'alexander_polynomial': knot.invariants.alexander_polynomial,
-            }
-            for knot in knots
-        ]
-    }
-    
-    with open(output_path, 'w') as f:
-        json.dump(results, f, indent=2)
-    
-    print(f"   Results saved to: {output_path}")
-    
-    # Validation summary
-    print("\n" + "=" * 80)
-    print("VALIDATION SUMMARY")
-    print("=" * 80)
-    print(f"✓ Generated {len(knots)} knots from {len(profiles)} profiles")
-    print(f"✓ Success rate: {results['success_rate']*100:.1f}%")
-    print(f"✓ Knot types identified: {len(analysis['knot_type_distribution'])}")
-    print(f"✓ Results saved to: {output_path}")
-    print("\nNext Steps:")
-    print("  1. Review knot type distribution")
-    print("  2. Validate knot types match personality archetypes")
-    print("  3. Run matching accuracy comparison script")
-    print("=" * 80)
-
 def main():
     """Main validation script."""
     import argparse
@@ -496,30 +612,24 @@ def main():
     
     # Load profiles
     print("\n1. Loading profiles...")
-    profiles = load_profiles(input_path)
+    profiles = load_personality_profiles(input_path)
     print(f"   Loaded {len(profiles)} profiles")
     
-    # Generate knots
+    # Generate knots (all profiles at once as arrays)
     print("\n2. Generating knots from profiles...")
     generator = KnotGenerator(correlation_threshold=0.3)
-    knots = []
-    
-    for i, profile in enumerate(profiles):
-        if i % 10 == 0:
-            print(f"   Processing profile {i+1}/{len(profiles)}...")
-        
-        try:
-            knot = generator.generate_knot(profile)
-            knots.append(knot)
-        except Exception as e:
-            print(f"   Error generating knot for {profile.user_id}: {e}")
-            continue
+    knots = generator.generate_knots_batch(
+        generator.profiles_to_array(profiles),
+        user_ids=[profile.user_id for profile in profiles],
+        created_at=[profile.created_at for profile in profiles],
+        compute_invariants=True
+    )
     
     print(f"   Generated {len(knots)} knots successfully")
     
     # Analyze distribution
     print("\n3. Analyzing knot distribution...")
-    analysis = analyze_knot_distribution(knots)
+    analysis = analyze_knot_batch(knots)
     
     print("\n   Knot Type Distribution:")
     for knot_type, count in sorted(analysis['knot_type_distribution'].items()):
@@ -542,17 +652,7 @@ def main():
         'total_knots_generated': len(knots),
         'success_rate': len(knots) / len(profiles) if profiles else 0,
         'analysis': analysis,
-        'knots': [
-            {
-                'user_id': knot.user_id,
-                'knot_type': knot.knot_type,
-                'crossing_number': knot.invariants.crossing_number,
-                'complexity': knot.complexity,
-                'jones_polynomial': knot.invariants.jones_polynomial,
-                'alexander_polynomial': knot.invariants.alexander_polynomial,
-            }
-            for knot in knots
-        ]
+        'knots': knots.to_records()
     }
     
     with open(output_path, 'w') as f:
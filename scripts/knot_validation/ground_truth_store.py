@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Columnar Ground-Truth Store
+
+Purpose: Store ground-truth compatibility pairs as packed index arrays
+(user_a index, user_b index, score, label) in a memory-mapped file
+instead of one JSON dict per pair.
+
+A store is a directory (conventionally ``*.gtstore``) holding:
+- pairs.bin: raw PAIR_DTYPE records, appended by GroundTruthWriter
+- meta.json: user_ids (index -> user_id), pair count and metadata
+
+GroundTruthWriter streams records to disk block by block, and
+open_ground_truth() memory-maps them lazily, so N²/2 pairs never have
+to exist as Python objects.
+
+Part of Phase 0 validation for Patent #31.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import List, Dict, Any, Tuple, Optional, Iterator, Union
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+PAIR_DTYPE = np.dtype([
+    ('user_a', '<u4'),
+    ('user_b', '<u4'),
+    ('score', '<f4'),
+    ('label', 'u1'),
+])
+
+STORE_SUFFIX = '.gtstore'
+PAIRS_FILE = 'pairs.bin'
+META_FILE = 'meta.json'
+FORMAT_VERSION = 1
+
+class GroundTruthPairs:
+    """Ground-truth pairs backed by a structured array or a memory map."""
+
+    def __init__(
+        self,
+        user_ids: List[str],
+        records: np.ndarray,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        self.user_ids = list(user_ids)
+        self.records = records
+        self.metadata = metadata or {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def user_a(self) -> np.ndarray:
+        return self.records['user_a']
+
+    @property
+    def user_b(self) -> np.ndarray:
+        return self.records['user_b']
+
+    @property
+    def score(self) -> np.ndarray:
+        return self.records['score']
+
+    @property
+    def label(self) -> np.ndarray:
+        return self.records['label'].view(bool)
+
+    @property
+    def compatible_count(self) -> int:
+        return int(sum(int(chunk['label'].sum()) for chunk in self.iter_chunks()))
+
+    def iter_chunks(self, chunk_size: int = 1_000_000) -> Iterator[np.ndarray]:
+        """Yield consecutive record slices (views into the memory map)."""
+        for start in range(0, len(self.records), chunk_size):
+            yield self.records[start:start + chunk_size]
+
+    def iter_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Yield pairs in the legacy dict format (for small stores / debugging)."""
+        for chunk in self.iter_chunks():
+            for user_a, user_b, score, label in chunk.tolist():
+                yield {
+                    'user_a': self.user_ids[user_a],
+                    'user_b': self.user_ids[user_b],
+                    'is_compatible': bool(label),
+                    'compatibility': score,
+                }
+
+    def select(self, mask: np.ndarray) -> 'GroundTruthPairs':
+        """Return an in-memory subset of pairs (same user index)."""
+        return GroundTruthPairs(self.user_ids, np.asarray(self.records[mask]), self.metadata)
+
+    def select_users(self, user_rows: np.ndarray) -> 'GroundTruthPairs':
+        """Return pairs whose users are both in user_rows (indices into user_ids)."""
+        member = np.zeros(len(self.user_ids), dtype=bool)
+        member[user_rows] = True
+        selected = [
+            chunk[member[chunk['user_a']] & member[chunk['user_b']]]
+            for chunk in self.iter_chunks()
+        ]
+        records = np.concatenate(selected) if selected else np.zeros(0, dtype=PAIR_DTYPE)
+        return GroundTruthPairs(self.user_ids, records, self.metadata)
+
+    def save(self, path: Union[str, Path]) -> 'GroundTruthPairs':
+        """Write pairs to a store directory and return the memory-mapped copy."""
+        with GroundTruthWriter(path, self.user_ids, self.metadata) as writer:
+            for chunk in self.iter_chunks():
+                writer.write_records(chunk)
+        return open_ground_truth(path)
+
+    @classmethod
+    def from_dicts(
+        cls,
+        ground_truth: List[Dict],
+        user_ids: Optional[List[str]] = None
+    ) -> 'GroundTruthPairs':
+        """Pack legacy ground-truth dicts into arrays."""
+        if user_ids is None:
+            user_ids = []
+            seen = set()
+            for gt in ground_truth:
+                for key in ('user_a', 'user_b'):
+                    if gt[key] not in seen:
+                        seen.add(gt[key])
+                        user_ids.append(gt[key])
+        index = {user_id: row for row, user_id in enumerate(user_ids)}
+
+        known = [gt for gt in ground_truth if gt['user_a'] in index and gt['user_b'] in index]
+        records = np.zeros(len(known), dtype=PAIR_DTYPE)
+        records['user_a'] = [index[gt['user_a']] for gt in known]
+        records['user_b'] = [index[gt['user_b']] for gt in known]
+        records['score'] = [
+            gt.get('compatibility', gt.get('compatibility_score', 0.0)) for gt in known
+        ]
+        records['label'] = [bool(gt['is_compatible']) for gt in known]
+        return cls(user_ids, records)
+
+class GroundTruthWriter:
+    """Streams ground-truth pairs into a store directory."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        user_ids: List[str],
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        if len(user_ids) > np.iinfo(np.uint32).max:
+            raise ValueError(f"Too many users for uint32 indices: {len(user_ids)}")
+        self.path = Path(path)
+        self.user_ids = list(user_ids)
+        self.metadata = dict(metadata or {})
+        self.count = 0
+        self.compatible_count = 0
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path / PAIRS_FILE, 'wb')
+
+    def write(
+        self,
+        user_a: np.ndarray,
+        user_b: np.ndarray,
+        score: np.ndarray,
+        label: np.ndarray
+    ):
+        """Append a block of pairs given as index/score/label arrays."""
+        records = np.empty(len(user_a), dtype=PAIR_DTYPE)
+        records['user_a'] = user_a
+        records['user_b'] = user_b
+        records['score'] = score
+        records['label'] = label
+        self.write_records(records)
+
+    def write_records(self, records: np.ndarray):
+        """Append a block of PAIR_DTYPE records."""
+        records = np.ascontiguousarray(records, dtype=PAIR_DTYPE)
+        records.tofile(self._file)
+        self.count += len(records)
+        self.compatible_count += int(records['label'].sum())
+
+    def close(self) -> GroundTruthPairs:
+        """Flush pairs, write metadata and return the memory-mapped store."""
+        if not self._file.closed:
+            self._file.close()
+            meta = {
+                'format_version': FORMAT_VERSION,
+                'dtype': PAIR_DTYPE.descr,
+                'count': self.count,
+                'compatible_count': self.compatible_count,
+                'user_ids': self.user_ids,
+                'metadata': self.metadata,
+            }
+            with open(self.path / META_FILE, 'w') as f:
+                json.dump(meta, f)
+        return open_ground_truth(self.path)
+
+    def __enter__(self) -> 'GroundTruthWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Leave no meta.json so a partial store is never opened as complete
+            self._file.close()
+
+def is_ground_truth_store(path: Union[str, Path]) -> bool:
+    """Check whether path is a ground-truth store directory."""
+    return (Path(path) / META_FILE).exists()
+
+def open_ground_truth(path: Union[str, Path]) -> GroundTruthPairs:
+    """Open a store lazily; pair columns are memory-mapped, not loaded."""
+    path = Path(path)
+    with open(path / META_FILE, 'r') as f:
+        meta = json.load(f)
+
+    count = meta['count']
+    if count == 0:
+        records = np.zeros(0, dtype=PAIR_DTYPE)
+    else:
+        records = np.memmap(path / PAIRS_FILE, dtype=PAIR_DTYPE, mode='r', shape=(count,))
+    return GroundTruthPairs(meta['user_ids'], records, meta.get('metadata', {}))
+
+def align_ground_truth(
+    ground_truth: Union[List[Dict], GroundTruthPairs],
+    user_ids: List[str],
+    chunk_size: int = 1_000_000
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Map ground truth onto profile rows as sorted (idx_a, idx_b, label) arrays.
+
+    Mirrors the per-pair comparison loops: only pairs whose first user comes
+    before the second in user_ids are kept, and duplicates resolve to the
+    last entry. Accepts legacy dict lists or GroundTruthPairs.
+    """
+    index = {user_id: row for row, user_id in enumerate(user_ids)}
+
+    if isinstance(ground_truth, GroundTruthPairs):
+        remap = np.array([index.get(u, -1) for u in ground_truth.user_ids], dtype=np.int64)
+        parts_a, parts_b, parts_label = [], [], []
+        for chunk in ground_truth.iter_chunks(chunk_size):
+            rows_a = remap[chunk['user_a']]
+            rows_b = remap[chunk['user_b']]
+            keep = (rows_a >= 0) & (rows_b >= 0) & (rows_a < rows_b)
+            parts_a.append(rows_a[keep])
+            parts_b.append(rows_b[keep])
+            parts_label.append(chunk['label'][keep].astype(bool))
+        idx_a = np.concatenate(parts_a) if parts_a else np.zeros(0, dtype=np.int64)
+        idx_b = np.concatenate(parts_b) if parts_b else np.zeros(0, dtype=np.int64)
+        labels = np.concatenate(parts_label) if parts_label else np.zeros(0, dtype=bool)
+    else:
+        labels_by_pair: Dict[Tuple[int, int], bool] = {}
+        for gt in ground_truth:
+            row_a = index.get(gt['user_a'])
+            row_b = index.get(gt['user_b'])
+            if row_a is None or row_b is None or row_a >= row_b:
+                continue
+            labels_by_pair[(row_a, row_b)] = gt['is_compatible']
+        if not labels_by_pair:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0, dtype=bool)
+        pairs = np.array(list(labels_by_pair.keys()), dtype=np.int64)
+        idx_a, idx_b = pairs[:, 0], pairs[:, 1]
+        labels = np.fromiter(labels_by_pair.values(), dtype=bool, count=len(pairs))
+
+    if len(idx_a) == 0:
+        return idx_a, idx_b, labels
+
+    # Sort by (idx_a, idx_b); stable so the last duplicate stays last
+    order = np.lexsort((idx_b, idx_a))
+    idx_a, idx_b, labels = idx_a[order], idx_b[order], labels[order]
+    if isinstance(ground_truth, GroundTruthPairs):
+        last = np.ones(len(idx_a), dtype=bool)
+        last[:-1] = (idx_a[1:] != idx_a[:-1]) | (idx_b[1:] != idx_b[:-1])
+        idx_a, idx_b, labels = idx_a[last], idx_b[last], labels[last]
+    return idx_a, idx_b, labels
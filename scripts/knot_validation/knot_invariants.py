@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Braid-Word Knot Invariants
+
+Purpose: Compute real invariants of the closed braids built from
+personality crossings, replacing the "t^{n}" placeholder strings.
+
+- Braid word: one signed generator per crossing. Following the app's
+  braid encoding, a crossing between dimensions i < j uses generator
+  sigma_{i+1} (the lower strand), positive for over-crossings.
+- Writhe: sum of crossing signs.
+- Alexander polynomial: from the reduced Burau representation,
+  det(I - psi(beta)) = (1 + t + ... + t^(n-1)) * Delta(t). The
+  determinant is evaluated at M-th roots of unity and turned back into
+  integer coefficients with an FFT.
+
+A braid word on 12 strands usually does not touch every generator, and
+its closure is then a split link (Alexander polynomial 0). Generators
+on either side of an unused index commute, so the word is split into
+independent blocks; the reported polynomial is the product of the block
+polynomials (the connected sum), which keeps the invariant informative.
+
+Invariants are memoized by canonical braid word (freely and cyclically
+reduced, minimal rotation), since conjugate words have the same closure
+and many profiles share a crossing pattern.
+
+Part of Phase 0 validation for Patent #31.
+"""
+
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Dict, Iterable, Sequence, Tuple
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+NUMBER_OF_STRANDS = 12
+# Upper bound on crossings: one per dimension pair
+MAX_CROSSINGS = NUMBER_OF_STRANDS * (NUMBER_OF_STRANDS - 1) // 2
+# Alexander span is at most the crossing count, so this length always fits
+ALEXANDER_LENGTH = MAX_CROSSINGS + 1
+# Memo bounds (least recently used entries are evicted); each cached
+# BraidInvariants holds an ALEXANDER_LENGTH float array plus its word
+INVARIANT_CACHE_SIZE = 65536
+BLOCK_CACHE_SIZE = 65536
+
+BraidWord = Tuple[int, ...]
+
+@dataclass(frozen=True)
+class BraidInvariants:
+    """Invariants of a closed braid."""
+    braid_word: BraidWord  # canonical word
+    writhe: int
+    alexander_coefficients: np.ndarray  # (ALEXANDER_LENGTH,), lowest degree first
+
+    @property
+    def alexander_degree(self) -> int:
+        nonzero = np.flatnonzero(self.alexander_coefficients)
+        return int(nonzero[-1]) if len(nonzero) else 0
+
+    def alexander_polynomial(self) -> str:
+        """Readable form, e.g. '1 - t + t^2'."""
+        return format_polynomial(self.alexander_coefficients[:self.alexander_degree + 1])
+
+def braid_word_from_crossings(strands_a: Iterable[int], strands_b: Iterable[int], is_over: Iterable[bool]) -> BraidWord:
+    """Signed 1-based generators for crossings between strands (lower strand wins)."""
+    return tuple(
+        (min(a, b) + 1) * (1 if over else -1)
+        for a, b, over in zip(strands_a, strands_b, is_over)
+    )
+
+def canonical_braid_word(word: Sequence[int]) -> BraidWord:
+    """Freely and cyclically reduced word, rotated to its smallest rotation.
+
+    Words with the same canonical form are conjugate, so their closures
+    (and all invariants here) agree.
+    """
+    reduced: List[int] = []
+    for generator in word:
+        if reduced and reduced[-1] == -generator:
+            reduced.pop()
+        else:
+            reduced.append(generator)
+
+    start, end = 0, len(reduced)
+    while end - start > 1 and reduced[start] == -reduced[end - 1]:
+        start += 1
+        end -= 1
+    reduced = reduced[start:end]
+
+    if not reduced:
+        return ()
+    # Only rotations starting at the smallest generator can be minimal
+    smallest = min(reduced)
+    return min(
+        tuple(reduced[i:] + reduced[:i])
+        for i, generator in enumerate(reduced) if generator == smallest
+    )
+
+def format_polynomial(coefficients: Sequence[float], variable: str = 't') -> str:
+    """Format low-degree-first integer coefficients as a polynomial string."""
+    terms = []
+    for power, coefficient in enumerate(np.rint(coefficients).astype(np.int64).tolist()):
+        if coefficient == 0:
+            continue
+        magnitude = abs(coefficient)
+        if power == 0:
+            body = f"{magnitude}"
+        else:
+            monomial = variable if power == 1 else f"{variable}^{power}"
+            body = monomial if magnitude == 1 else f"{magnitude}{monomial}"
+        sign = '-' if coefficient < 0 else '+'
+        terms.append((sign, body))
+
+    if not terms:
+        return "0"
+    first_sign, first_body = terms[0]
+    text = ('-' if first_sign == '-' else '') + first_body
+    return text + ''.join(f" {sign} {body}" for sign, body in terms[1:])
+
+def _sample_count(length: int, strands: int) -> int:
+    """Roots of unity needed to recover det(I - psi) for words up to length.
+
+    The determinant's span is at most the word length; 2x headroom keeps
+    the cyclic support well away from wrapping around.
+    """
+    samples = 8
+    while samples < 2 * (length + strands + 1):
+        samples *= 2
+    return samples
+
+def _burau_determinants(words: np.ndarray, strands: int, samples: int) -> np.ndarray:
+    """det(I - psi(word)) at the samples-th roots of unity for a batch of words.
+
+    words: (B, L) signed generators 1..strands-1, zero-padded (identity).
+    psi(sigma_i) (reduced Burau) differs from the identity only in column
+    i (t, -t, 1 in rows i-1, i, i+1), and psi(sigma_i^-1) only in column i
+    (1, -1/t, 1/t), so each generator is a single column update applied to
+    every word and sample point at once.
+    """
+    size = strands - 1
+    t = np.exp(2j * np.pi * np.arange(samples) / samples)[None, :, None]
+    burau = np.broadcast_to(
+        np.eye(size, dtype=complex), (len(words), samples, size, size)
+    ).copy()
+
+    for step in range(words.shape[1]):
+        column = words[:, step]
+        for generator in np.unique(column[column != 0]).tolist():
+            rows = np.flatnonzero(column == generator)
+            col = abs(generator) - 1
+            current = burau[rows, :, :, col]
+            left = burau[rows, :, :, col - 1] if col > 0 else 0.0
+            right = burau[rows, :, :, col + 1] if col < size - 1 else 0.0
+            if generator > 0:
+                burau[rows, :, :, col] = t * (left - current) + right
+            else:
+                burau[rows, :, :, col] = left + (right - current) / t
+
+    return np.linalg.det(np.eye(size) - burau)
+
+def _coefficients_from_samples(values: np.ndarray) -> np.ndarray:
+    """Integer Laurent coefficients (cyclic, mod M) from values at M-th roots of unity."""
+    samples = values.shape[-1]
+    coefficients = np.fft.fft(values, axis=-1).real / samples
+    rounded = np.rint(coefficients)
+    if np.abs(coefficients - rounded).max(initial=0.0) > 0.25:
+        raise ArithmeticError("Burau determinant lost integer precision")
+    return rounded.astype(np.int64)
+
+def _unwrap_cyclic(coefficients: np.ndarray) -> np.ndarray:
+    """Recover a Laurent polynomial from cyclic (mod M) coefficients.
+
+    The support occupies an arc shorter than M; rotate so it starts at
+    index 0 (dropping the overall power of t, which is a unit).
+    """
+    nonzero = np.flatnonzero(coefficients)
+    if len(nonzero) == 0:
+        return np.zeros(1, dtype=np.int64)
+    # Largest cyclic gap between nonzero entries marks the wrap point
+    gaps = np.diff(np.r_[nonzero, nonzero[0] + len(coefficients)])
+    start = nonzero[(int(np.argmax(gaps)) + 1) % len(nonzero)]
+    return np.roll(coefficients, -start)
+
+def _normalize_units(coefficients: np.ndarray) -> np.ndarray:
+    """Trim zeros and fix the sign so the lowest coefficient is positive."""
+    nonzero = np.flatnonzero(coefficients)
+    if len(nonzero) == 0:
+        return np.zeros(1, dtype=np.int64)
+    trimmed = coefficients[nonzero[0]:nonzero[-1] + 1]
+    return trimmed if trimmed[0] > 0 else -trimmed
+
+def _divide_by_strand_sum(determinant: np.ndarray, strands: int) -> np.ndarray:
+    """Exact division by 1 + t + ... + t^(strands-1).
+
+    Multiplying both sides by (1 - t): Delta * (1 - t^n) = D * (1 - t),
+    so Delta_k = E_k + Delta_(k-n) with E = D * (1 - t), i.e. a cumulative
+    sum of E over every n-th coefficient.
+    """
+    if not determinant.any():
+        return np.zeros(1, dtype=np.int64)
+    shifted = np.r_[determinant, 0] - np.r_[0, determinant]
+    padded = np.r_[shifted, np.zeros(-len(shifted) % strands, dtype=np.int64)]
+    quotient = np.cumsum(padded.reshape(-1, strands), axis=0).ravel()
+    degree = len(determinant) - strands
+    if degree < 0 or quotient[degree + 1:].any():
+        raise ArithmeticError("Burau determinant not divisible by 1 + t + ... + t^(n-1)")
+    return quotient[:degree + 1]
+
+def _split_blocks(word: BraidWord) -> List[Tuple[int, BraidWord]]:
+    """Split a word into commuting blocks of consecutive generators.
+
+    Returns (strand count, canonical block word re-indexed from 1).
+    """
+    used = sorted({abs(g) for g in word})
+    blocks: List[Tuple[int, int]] = []
+    for generator in used:
+        if blocks and generator == blocks[-1][1] + 1:
+            blocks[-1] = (blocks[-1][0], generator)
+        else:
+            blocks.append((generator, generator))
+
+    result = []
+    for first, last in blocks:
+        sub_word = [
+            (abs(g) - first + 1) * (1 if g > 0 else -1)
+            for g in word if first <= abs(g) <= last
+        ]
+        result.append((last - first + 2, canonical_braid_word(sub_word)))
+    return result
+
+def _block_polynomials(
+    blocks: Iterable[Tuple[int, BraidWord]],
+    max_batch_bytes: int = 64 * 1024 * 1024
+) -> Dict[Tuple[int, BraidWord], np.ndarray]:
+    """Alexander polynomials of closed blocks, batched by strand count."""
+    by_strands: Dict[int, List[BraidWord]] = {}
+    for strands, word in set(blocks):
+        by_strands.setdefault(strands, []).append(word)
+
+    polynomials = {}
+    for strands, words in by_strands.items():
+        if strands < 2:
+            continue
+        length = max(len(w) for w in words)
+        samples = _sample_count(length, strands)
+        padded = np.zeros((len(words), max(length, 1)), dtype=np.int64)
+        for row, word in enumerate(words):
+            padded[row, :len(word)] = word
+
+        per_word = samples * (strands - 1) ** 2 * 16
+        batch = max(1, max_batch_bytes // per_word)
+        for start in range(0, len(words), batch):
+            values = _burau_determinants(padded[start:start + batch], strands, samples)
+            for word, cyclic in zip(words[start:start + batch], _coefficients_from_samples(values)):
+                determinant = _normalize_units(_unwrap_cyclic(cyclic))
+                polynomials[(strands, word)] = _normalize_units(
+                    _divide_by_strand_sum(determinant, strands)
+                )
+    return polynomials
+
+def alexander_coefficients(word: Sequence[int]) -> np.ndarray:
+    """Alexander polynomial (product over split blocks), lowest degree first."""
+    blocks = _split_blocks(canonical_braid_word(word))
+    polynomials = _block_polynomials(blocks)
+    polynomial = np.ones(1, dtype=np.int64)
+    for block in blocks:
+        polynomial = np.convolve(polynomial, polynomials[block])
+    return _normalize_units(polynomial)
+
+class BraidInvariantEngine:
+    """Computes braid invariants, memoized by canonical braid word.
+
+    Both memos are LRU-bounded (cache_size words, block_cache_size split
+    blocks), so a long-lived engine does not grow with the number of
+    distinct profiles it has seen.
+    """
+
+    def __init__(
+        self,
+        length: int = ALEXANDER_LENGTH,
+        cache_size: int = INVARIANT_CACHE_SIZE,
+        block_cache_size: int = BLOCK_CACHE_SIZE
+    ):
+        self.length = length
+        self.cache_size = cache_size
+        self.block_cache_size = block_cache_size
+        self._cache: 'OrderedDict[BraidWord, BraidInvariants]' = OrderedDict()
+        self._block_cache: 'OrderedDict[Tuple[int, BraidWord], np.ndarray]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def invariants(self, word: Sequence[int]) -> BraidInvariants:
+        """Invariants of the closure of word (signed 1-based generators)."""
+        return self.invariants_many([word])[0]
+
+    def invariants_many(self, words: Sequence[Sequence[int]]) -> List[BraidInvariants]:
+        """Invariants for many words; uncached blocks are computed as one batch."""
+        canonical = [canonical_braid_word(word) for word in words]
+        # Results for this call are collected locally, so entries evicted
+        # while the call fills the memo are still returned
+        found: Dict[BraidWord, BraidInvariants] = {}
+        for word in set(canonical):
+            if word in self._cache:
+                self._cache.move_to_end(word)
+                found[word] = self._cache[word]
+        missing = [word for word in dict.fromkeys(canonical) if word not in found]
+        self.hits += len(canonical) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            blocks = {word: _split_blocks(word) for word in missing}
+            block_polynomials: Dict[Tuple[int, BraidWord], np.ndarray] = {}
+            new_blocks = set()
+            for block in {block for word_blocks in blocks.values() for block in word_blocks}:
+                if block in self._block_cache:
+                    self._block_cache.move_to_end(block)
+                    block_polynomials[block] = self._block_cache[block]
+                else:
+                    new_blocks.add(block)
+            computed = _block_polynomials(new_blocks)
+            block_polynomials.update(computed)
+            _bounded_update(self._block_cache, computed, self.block_cache_size)
+
+            for word in missing:
+                polynomial = np.ones(1, dtype=np.int64)
+                for block in blocks[word]:
+                    polynomial = np.convolve(polynomial, block_polynomials[block])
+                found[word] = self._build(word, _normalize_units(polynomial))
+            _bounded_update(self._cache, {word: found[word] for word in missing}, self.cache_size)
+
+        return [found[word] for word in canonical]
+
+    def _build(self, word: BraidWord, coefficients: np.ndarray) -> BraidInvariants:
+        if len(coefficients) > self.length:
+            raise ValueError(
+                f"Alexander polynomial needs {len(coefficients)} coefficients, "
+                f"engine length is {self.length}"
+            )
+        padded = np.zeros(self.length)
+        padded[:len(coefficients)] = coefficients
+        padded.flags.writeable = False
+        return BraidInvariants(
+            braid_word=word,
+            writhe=int(sum(1 if g > 0 else -1 for g in word)),
+            alexander_coefficients=padded,
+        )
+
+    def invariants_for_patterns(self, signed_crossings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Writhe and Alexander coefficients for rows of signed crossing patterns.
+
+        signed_crossings: (N, 66) int8 over upper-triangle dimension pairs,
+        +1 over-crossing, -1 under-crossing, 0 no crossing. Each distinct
+        row is computed once.
+
+        Returns (writhe (N,), alexander (N, length)).
+        """
+        signed_crossings = np.ascontiguousarray(signed_crossings, dtype=np.int8)
+        n, width = signed_crossings.shape
+        strands = int(round((1 + np.sqrt(1 + 8 * width)) / 2))
+        lower_strand, _ = np.triu_indices(strands, k=1)
+
+        rows = signed_crossings.view(np.dtype((np.void, width))).ravel()
+        unique_rows, inverse = np.unique(rows, return_inverse=True)
+        patterns = np.frombuffer(unique_rows.tobytes(), dtype=np.int8).reshape(-1, width)
+
+        words = []
+        for pattern in patterns:
+            crossing = np.flatnonzero(pattern)
+            words.append(((lower_strand[crossing] + 1) * pattern[crossing]).tolist())
+        invariants = self.invariants_many(words)
+
+        writhe = np.array([inv.writhe for inv in invariants], dtype=np.int64)
+        alexander = np.array([inv.alexander_coefficients for inv in invariants]).reshape(-1, self.length)
+        inverse = inverse.reshape(n)
+        return writhe[inverse], alexander[inverse]
+
+    def cache_info(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._cache),
+            'blocks': len(self._block_cache),
+        }
+
+def _bounded_update(cache: OrderedDict, entries: Dict, max_size: int):
+    """Insert entries as most recently used, evicting the oldest beyond max_size."""
+    for key, value in entries.items():
+        cache[key] = value
+        cache.move_to_end(key)
+    while len(cache) > max_size:
+        cache.popitem(last=False)
+
+# Shared engine so every KnotGenerator reuses the same (bounded) memo
+default_engine = BraidInvariantEngine()
@@ -11,141 +11,148 @@ Date: December 24, 2025
 import json
 import sys
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Union
 import numpy as np
-from itertools import product
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from scripts.knot_validation.compare_matching_accuracy import (
-    MatchingAccuracyComparator,
-    load_data,
-    _infer_archetype,
-    _calculate_archetype_compatibility,
+from scripts.knot_validation.compare_matching_accuracy import load_data
+from scripts.knot_validation.batch_compatibility import BatchCompatibilityEngine
+from scripts.knot_validation.ground_truth_store import GroundTruthPairs
+from scripts.knot_validation.weight_search import (
+    cache_key,
+    load_or_compute,
+    product_grid,
+    simplex_grid,
+    grid_search,
+    evaluate_weight_grid,
+    normalize_weights,
 )
-import statistics
+
+# Legacy grid, kept as the default so results stay comparable
+QUANTUM_WEIGHTS = [0.50, 0.55, 0.60, 0.65, 0.70, 0.75]
+ARCHETYPE_WEIGHTS = [0.15, 0.20, 0.25, 0.30]
+VALUE_WEIGHTS = [0.10, 0.15, 0.20, 0.25]
+
+def compute_component_scores(
+    profiles: List[Dict],
+    ground_truth: Union[List[Dict], GroundTruthPairs],
+    cache_path: Optional[Union[str, Path]] = None,
+    chunk_size: int = 1_000_000
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-pair (quantum_dim, archetype, value) scores and labels.
+
+    The components are independent of the weights, so they are computed
+    once for all weight combinations. With cache_path, the matrix is stored
+    as .npz keyed by a hash of the packed profiles and pairs and reused on
+    later runs with the same inputs.
+    """
+    engine = BatchCompatibilityEngine(profiles)
+    idx_a, idx_b, labels = engine.index_pairs(ground_truth)
+    arrays = engine.arrays
+    key = cache_key(
+        'components', arrays.values, arrays.mask, arrays.archetype_codes,
+        arrays.value_dims, idx_a, idx_b, labels
+    )
+
+    def compute() -> Dict[str, np.ndarray]:
+        components = np.empty((len(idx_a), 3))
+        for start in range(0, len(idx_a), chunk_size):
+            stop = start + chunk_size
+            components[start:stop] = np.column_stack(
+                engine.pair_components(idx_a[start:stop], idx_b[start:stop])
+            )
+        return {'components': components, 'labels': labels}
+
+    cached = load_or_compute(cache_path, key, compute)
+    return cached['components'], cached['labels']
 
 def test_weight_combination(
     profiles: List[Dict],
-    ground_truth: List[Dict],
+    ground_truth: Union[List[Dict], GroundTruthPairs],
     quantum_weight: float,
     archetype_weight: float,
-    value_weight: float
+    value_weight: float,
+    components: Optional[Tuple[np.ndarray, np.ndarray]] = None
 ) -> Dict:
-    """Test a specific weight combination."""
-    # Normalize weights
-    total = quantum_weight + archetype_weight + value_weight
-    quantum_weight /= total
-    archetype_weight /= total
-    value_weight /= total
-    
-    ground_truth_map = {
-        (gt['user_a'], gt['user_b']): gt['is_compatible']
-        for gt in ground_truth
-    }
+    """Test a specific weight combination.
+
+    Pass precomputed (components, labels) from compute_component_scores to
+    avoid recomputing the pair scores.
+    """
+    if components is None:
+        components = compute_component_scores(profiles, ground_truth)
+    component_scores, labels = components
+
+    weights = normalize_weights([quantum_weight, archetype_weight, value_weight])
+    accuracies, thresholds = evaluate_weight_grid(component_scores, labels, weights)
+    quantum_weight, archetype_weight, value_weight = weights[0].tolist()
     
-    profile_map = {p['user_id']: p for p in profiles}
-    
-    scores = []
-    ground_truth_list = []
-    
-    for i, profile_a in enumerate(profiles):
-        for j, profile_b in enumerate(profiles):
-            if i < j:
-                pair_key = (profile_a['user_id'], profile_b['user_id'])
-                if pair_key not in ground_truth_map:
-                    continue
-                
-                is_compatible = ground_truth_map[pair_key]
-                dims_a = profile_a.get('dimensions', {})
-                dims_b = profile_b.get('dimensions', {})
-                
-                # Calculate quantum dimension compatibility
-                comparator = MatchingAccuracyComparator()
-                state_a = comparator._dimensions_to_quantum_state(dims_a)
-                state_b = comparator._dimensions_to_quantum_state(dims_b)
-                inner_product = comparator._quantum_inner_product(state_a, state_b)
-                quantum_dim = abs(inner_product) ** 2
-                
-                # Archetype compatibility
-                archetype_a = _infer_archetype(dims_a)
-                archetype_b = _infer_archetype(dims_b)
-                archetype_compat = _calculate_archetype_compatibility(archetype_a, archetype_b)
-                
-                # Value alignment
-                value_dims = ['value_orientation', 'authenticity', 'trust_level']
-                value_alignment = statistics.mean([
-                    1.0 - abs(dims_a.get(dim, 0.5) - dims_b.get(dim, 0.5))
-                    for dim in value_dims
-                ]) if value_dims else 0.5
-                
-                # Combined with test weights
-                compatibility = (
-                    quantum_weight * quantum_dim +
-                    archetype_weight * archetype_compat +
-                    value_weight * value_alignment
-                )
-                
-                scores.append(compatibility)
-                ground_truth_list.append(is_compatible)
-    
-    # Find optimal threshold
-    best_accuracy = 0.0
-    best_threshold = 0.5
-    
-    for threshold in np.arange(0.1, 0.9, 0.01):
-        correct = sum(
-            1 for i, score in enumerate(scores)
-            if (score >= threshold) == ground_truth_list[i]
+    return {
+        'quantum_weight': quantum_weight,
+        'archetype_weight': archetype_weight,
+        'value_weight': value_weight,
+        'accuracy': float(accuracies[0]),
+        'threshold': float(thresholds[0]),
+    }
+
+def optimize_weights(
+    profiles: List[Dict],
+    ground_truth: Union[List[Dict], GroundTruthPairs],
+    grid_step: Optional[float] = None,
+    refine: int = 0,
+    cache_path: Optional[Union[str, Path]] = None
+) -> Dict:
+    """Find optimal weight combination.
+
+    Args:
+        grid_step: Search the full weight simplex at this spacing (e.g. 0.01)
+            instead of the legacy grid
+        refine: Zoom-in rounds around the best point, halving the spacing each time
+        cache_path: Optional .npz cache for the per-pair component scores
+    """
+    print("Computing component scores...")
+    component_scores, labels = compute_component_scores(profiles, ground_truth, cache_path)
+    print(f"  {len(labels)} pairs x {component_scores.shape[1]} components")
+    
+    if grid_step is not None:
+        grid = simplex_grid(3, grid_step)
+    else:
+        grid = product_grid(
+            [QUANTUM_WEIGHTS, ARCHETYPE_WEIGHTS, VALUE_WEIGHTS],
+            keep=lambda g: g.sum(axis=1) <= 1.0 + 1e-9
         )
-        accuracy = correct / len(scores) if scores else 0.0
-        if accuracy > best_accuracy:
-            best_accuracy = accuracy
-            best_threshold = threshold
+    
+    print(f"Testing {len(grid)} weight combinations...")
+    result = grid_search(component_scores, labels, grid, refine=refine)
+    quantum_weight, archetype_weight, value_weight = result['weights'].tolist()
+    print(f"  Tested {result['combinations_tested']} combinations... Best: {result['accuracy']:.2%}")
     
     return {
         'quantum_weight': quantum_weight,
         'archetype_weight': archetype_weight,
         'value_weight': value_weight,
-        'accuracy': best_accuracy,
-        'threshold': best_threshold,
+        'accuracy': result['accuracy'],
+        'threshold': result['threshold'],
+        'combinations_tested': result['combinations_tested'],
     }
 
-def optimize_weights(profiles: List[Dict], ground_truth: List[Dict]) -> Dict:
-    """Find optimal weight combination."""
-    print("Testing weight combinations...")
-    
-    # Test different weight combinations
-    quantum_weights = [0.50, 0.55, 0.60, 0.65, 0.70, 0.75]
-    archetype_weights = [0.15, 0.20, 0.25, 0.30]
-    value_weights = [0.10, 0.15, 0.20, 0.25]
-    
-    best_result = None
-    best_accuracy = 0.0
-    
-    total_combinations = len(quantum_weights) * len(archetype_weights) * len(value_weights)
-    tested = 0
-    
-    for qw, aw, vw in product(quantum_weights, archetype_weights, value_weights):
-        if qw + aw + vw > 1.0:
-            continue
-        
-        result = test_weight_combination(profiles, ground_truth, qw, aw, vw)
-        tested += 1
-        
-        if result['accuracy'] > best_accuracy:
-            best_accuracy = result['accuracy']
-            best_result = result
-        
-        if tested % 10 == 0:
-            print(f"  Tested {tested}/{total_combinations} combinations... Best: {best_accuracy:.2%}")
-    
-    return best_result
-
 def main():
     """Main optimization."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Optimize compatibility weights')
+    parser.add_argument('--grid-step', type=float, default=None,
+                       help='Search the full weight simplex at this spacing (e.g. 0.01) instead of the legacy grid')
+    parser.add_argument('--refine', type=int, default=0,
+                       help='Zoom-in refinement rounds around the best weights')
+    parser.add_argument('--cache', type=str, default=None,
+                       help='Path to an .npz cache for per-pair component scores')
+    
+    args = parser.parse_args()
+    
     print("=" * 80)
     print("Compatibility Weight Optimization")
     print("=" * 80)
@@ -166,7 +173,12 @@ def main():
     print()
     
     # Optimize
-    best = optimize_weights(profiles, ground_truth)
+    best = optimize_weights(
+        profiles, ground_truth,
+        grid_step=args.grid_step,
+        refine=args.refine,
+        cache_path=args.cache
+    )
     
     print()
     print("=" * 80)
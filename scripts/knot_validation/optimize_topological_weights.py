@@ -11,169 +11,191 @@ Date: December 16, 2025
 import json
 import sys
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Union
 import numpy as np
-from itertools import product
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from scripts.knot_validation.compare_matching_accuracy import (
-    MatchingAccuracyComparator,
-    load_data,
+from scripts.knot_validation.compare_matching_accuracy import load_data
+from scripts.knot_validation.batch_compatibility import BatchCompatibilityEngine
+from scripts.knot_validation.ground_truth_store import GroundTruthPairs
+from scripts.knot_validation.weight_search import (
+    cache_key,
+    load_or_compute,
+    product_grid,
+    simplex_grid,
+    grid_search,
+    evaluate_weight_grid,
+    normalize_weights,
 )
 
+# Legacy grid, kept as the default so results stay comparable
+JONES_WEIGHTS = [0.2, 0.3, 0.35, 0.4, 0.5]
+ALEXANDER_WEIGHTS = [0.2, 0.3, 0.35, 0.4, 0.5]
+CROSSING_WEIGHTS = [0.1, 0.15, 0.2, 0.25]
+WRITHE_WEIGHTS = [0.0, 0.1, 0.15, 0.2]
+
+def _integrate_conditional(quantum: np.ndarray, topological: np.ndarray) -> np.ndarray:
+    """Vectorized calculate_integrated_compatibility_conditional."""
+    topological_weight = np.clip(1.0 - np.abs(quantum - 0.5) * 2, 0.0, 0.3)
+    refined = (1.0 - topological_weight) * quantum + topological_weight * topological
+    return np.where((quantum > 0.8) | (quantum < 0.2), quantum, refined)
+
+def _integrate_multiplicative(quantum: np.ndarray, topological: np.ndarray) -> np.ndarray:
+    """Vectorized calculate_integrated_compatibility_multiplicative."""
+    return np.clip(quantum * (0.5 + 0.5 * topological), 0.0, 1.0)
+
+def _integrate_two_stage(quantum: np.ndarray, topological: np.ndarray) -> np.ndarray:
+    """Vectorized calculate_integrated_compatibility_two_stage."""
+    return np.where(topological < 0.3, 0.0, 0.8 * quantum + 0.2 * topological)
+
+INTEGRATION_METHODS = {
+    'weighted_average': lambda quantum, topological: 0.7 * quantum + 0.3 * topological,
+    'conditional': _integrate_conditional,
+    'multiplicative': _integrate_multiplicative,
+    'two_stage': _integrate_two_stage,
+}
+
+def compute_topological_components(
+    profiles: List[Dict],
+    knots: List[Dict],
+    ground_truth: Union[List[Dict], GroundTruthPairs],
+    cache_path: Optional[Union[str, Path]] = None,
+    chunk_size: int = 1_000_000
+) -> Dict[str, np.ndarray]:
+    """Per-pair topological similarities, quantum scores and labels.
+
+    Returns a dict with 'components' (P, 4: Jones, Alexander, crossing,
+    writhe similarity), 'quantum', 'has_knots' and 'labels'. None of these
+    depend on the weights, so they are computed once (and optionally cached
+    as .npz) for the whole search.
+    """
+    engine = BatchCompatibilityEngine(profiles, knots)
+    idx_a, idx_b, labels = engine.index_pairs(ground_truth)
+    arrays, knot_arrays = engine.arrays, engine.knots
+    key = cache_key(
+        'topological', arrays.values, arrays.mask, knot_arrays.has_knot,
+        knot_arrays.type_codes, knot_arrays.complexity, knot_arrays.crossing_number,
+        knot_arrays.writhe, knot_arrays.jones, knot_arrays.has_jones,
+        knot_arrays.alexander, knot_arrays.has_alexander, idx_a, idx_b, labels
+    )
+
+    def compute() -> Dict[str, np.ndarray]:
+        components = np.empty((len(idx_a), 4))
+        quantum = np.empty(len(idx_a))
+        has_knots = np.empty(len(idx_a), dtype=bool)
+        for start in range(0, len(idx_a), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            *similarities, has_knots[chunk] = engine.pair_topological_components(
+                idx_a[chunk], idx_b[chunk]
+            )
+            components[chunk] = np.column_stack(similarities)
+            quantum[chunk] = engine.combine(*engine.pair_components(idx_a[chunk], idx_b[chunk]))
+        return {'components': components, 'quantum': quantum, 'has_knots': has_knots, 'labels': labels}
+
+    return load_or_compute(cache_path, key, compute)
+
+def _integrated_scores(data: Dict[str, np.ndarray], integration_method: str):
+    """Map (P, k) weighted topological sums to integrated scores."""
+    integrate = INTEGRATION_METHODS.get(integration_method, INTEGRATION_METHODS['weighted_average'])
+    quantum = data['quantum'][:, None]
+    has_knots = data['has_knots'][:, None]
+
+    def transform(weighted: np.ndarray) -> np.ndarray:
+        topological = np.clip(weighted, 0.0, 1.0)
+        return np.where(has_knots, integrate(quantum, topological), quantum)
+
+    return transform
+
 def test_topological_weights(
     profiles: List[Dict],
     knots: List[Dict],
-    ground_truth: List[Dict],
+    ground_truth: Union[List[Dict], GroundTruthPairs],
     jones_weight: float,
     alexander_weight: float,
     crossing_weight: float,
     writhe_weight: float,
-    integration_method: str = 'weighted_average'
+    integration_method: str = 'weighted_average',
+    components: Optional[Dict[str, np.ndarray]] = None
 ) -> Dict:
-    """Test a specific topological weight combination."""
-    # Normalize weights
-    total = jones_weight + alexander_weight + crossing_weight + writhe_weight
-    if total > 0:
-        jones_weight /= total
-        alexander_weight /= total
-        crossing_weight /= total
-        writhe_weight /= total
-    
-    ground_truth_map = {
-        (gt['user_a'], gt['user_b']): gt['is_compatible']
-        for gt in ground_truth
-    }
+    """Test a specific topological weight combination.
+
+    Pass precomputed arrays from compute_topological_components to avoid
+    recomputing the pair scores.
+    """
+    if components is None:
+        components = compute_topological_components(profiles, knots, ground_truth)
     
-    profile_map = {p['user_id']: p for p in profiles}
-    knot_map = {k['user_id']: k for k in knots}
-    
-    scores = []
-    ground_truth_list = []
-    
-    comparator = MatchingAccuracyComparator()
-    
-    for i, profile_a in enumerate(profiles):
-        for j, profile_b in enumerate(profiles):
-            if i < j:
-                pair_key = (profile_a['user_id'], profile_b['user_id'])
-                if pair_key not in ground_truth_map:
-                    continue
-                
-                is_compatible = ground_truth_map[pair_key]
-                
-                # Calculate quantum compatibility
-                quantum = comparator.calculate_quantum_compatibility(profile_a, profile_b)
-                
-                # Calculate topological compatibility with test weights
-                knot_a = knot_map.get(profile_a['user_id'])
-                knot_b = knot_map.get(profile_b['user_id'])
-                
-                if knot_a and knot_b:
-                    topological = comparator.calculate_topological_compatibility_improved(
-                        knot_a, knot_b,
-                        jones_weight=jones_weight,
-                        alexander_weight=alexander_weight,
-                        crossing_weight=crossing_weight,
-                        writhe_weight=writhe_weight
-                    )
-                    
-                    # Use specified integration method
-                    if integration_method == 'weighted_average':
-                        integrated = 0.7 * quantum + 0.3 * topological
-                    elif integration_method == 'conditional':
-                        integrated = comparator.calculate_integrated_compatibility_conditional(
-                            quantum, topological
-                        )
-                    elif integration_method == 'multiplicative':
-                        integrated = comparator.calculate_integrated_compatibility_multiplicative(
-                            quantum, topological
-                        )
-                    elif integration_method == 'two_stage':
-                        integrated = comparator.calculate_integrated_compatibility_two_stage(
-                            quantum, topological
-                        )
-                    else:
-                        integrated = 0.7 * quantum + 0.3 * topological
-                else:
-                    integrated = quantum
-                
-                scores.append(integrated)
-                ground_truth_list.append(is_compatible)
-    
-    # Find optimal threshold
-    best_accuracy = 0.0
-    best_threshold = 0.5
-    
-    for threshold in np.arange(0.1, 0.9, 0.01):
-        correct = sum(
-            1 for i, score in enumerate(scores)
-            if (score >= threshold) == ground_truth_list[i]
-        )
-        accuracy = correct / len(scores) if scores else 0.0
-        if accuracy > best_accuracy:
-            best_accuracy = accuracy
-            best_threshold = threshold
+    # Normalize weights
+    weights = normalize_weights([jones_weight, alexander_weight, crossing_weight, writhe_weight])
+    accuracies, thresholds = evaluate_weight_grid(
+        components['components'], components['labels'], weights,
+        transform=_integrated_scores(components, integration_method)
+    )
+    jones_weight, alexander_weight, crossing_weight, writhe_weight = weights[0].tolist()
     
     return {
         'jones_weight': jones_weight,
         'alexander_weight': alexander_weight,
         'crossing_weight': crossing_weight,
         'writhe_weight': writhe_weight,
-        'accuracy': best_accuracy,
-        'threshold': best_threshold,
+        'accuracy': float(accuracies[0]),
+        'threshold': float(thresholds[0]),
         'integration_method': integration_method
     }
 
 def optimize_topological_weights(
     profiles: List[Dict],
     knots: List[Dict],
-    ground_truth: List[Dict],
-    integration_method: str = 'weighted_average'
+    ground_truth: Union[List[Dict], GroundTruthPairs],
+    integration_method: str = 'weighted_average',
+    grid_step: Optional[float] = None,
+    refine: int = 0,
+    cache_path: Optional[Union[str, Path]] = None
 ) -> Dict:
-    """Find optimal topological weight combination."""
+    """Find optimal topological weight combination.
+
+    Args:
+        grid_step: Search the full weight simplex at this spacing (e.g. 0.05)
+            instead of the legacy grid
+        refine: Zoom-in rounds around the best point, halving the spacing each time
+        cache_path: Optional .npz cache for the per-pair component scores
+    """
     print(f"Optimizing topological weights (integration: {integration_method})...")
     
-    # Test different weight combinations
-    jones_weights = [0.2, 0.3, 0.35, 0.4, 0.5]
-    alexander_weights = [0.2, 0.3, 0.35, 0.4, 0.5]
-    crossing_weights = [0.1, 0.15, 0.2, 0.25]
-    writhe_weights = [0.0, 0.1, 0.15, 0.2]
-    
-    best_result = None
-    best_accuracy = 0.0
-    
-    total_combinations = len(jones_weights) * len(alexander_weights) * len(crossing_weights) * len(writhe_weights)
-    tested = 0
-    
-    for jw in jones_weights:
-        for aw in alexander_weights:
-            for cw in crossing_weights:
-                for ww in writhe_weights:
-                    # Check if weights sum to reasonable range
-                    total = jw + aw + cw + ww
-                    if total < 0.8 or total > 1.2:
-                        continue
-                    
-                    tested += 1
-                    result = test_topological_weights(
-                        profiles, knots, ground_truth,
-                        jw, aw, cw, ww, integration_method
-                    )
-                    
-                    if result['accuracy'] > best_accuracy:
-                        best_accuracy = result['accuracy']
-                        best_result = result
-                    
-                    if tested % 20 == 0:
-                        print(f"  Tested {tested}/{total_combinations} combinations... Best: {best_accuracy:.2%}")
-    
-    print(f"\nBest accuracy: {best_accuracy:.2%}")
-    
-    return best_result
+    components = compute_topological_components(profiles, knots, ground_truth, cache_path)
+    
+    if grid_step is not None:
+        grid = simplex_grid(4, grid_step)
+    else:
+        # Check if weights sum to reasonable range
+        grid = product_grid(
+            [JONES_WEIGHTS, ALEXANDER_WEIGHTS, CROSSING_WEIGHTS, WRITHE_WEIGHTS],
+            keep=lambda g: (g.sum(axis=1) >= 0.8 - 1e-9) & (g.sum(axis=1) <= 1.2 + 1e-9)
+        )
+    
+    print(f"  Testing {len(grid)} combinations against {len(components['labels'])} pairs...")
+    result = grid_search(
+        components['components'], components['labels'], grid,
+        transform=_integrated_scores(components, integration_method),
+        refine=refine
+    )
+    jones_weight, alexander_weight, crossing_weight, writhe_weight = result['weights'].tolist()
+    
+    print(f"\nBest accuracy: {result['accuracy']:.2%} ({result['combinations_tested']} combinations tested)")
+    
+    return {
+        'jones_weight': jones_weight,
+        'alexander_weight': alexander_weight,
+        'crossing_weight': crossing_weight,
+        'writhe_weight': writhe_weight,
+        'accuracy': result['accuracy'],
+        'threshold': result['threshold'],
+        'integration_method': integration_method,
+        'combinations_tested': result['combinations_tested'],
+    }
 
 def main():
     """Main optimization."""
@@ -196,6 +218,12 @@ def main():
     parser.add_argument('--output', type=str,
                        default="docs/plans/knot_theory/validation/optimal_topological_weights.json",
                        help='Output JSON file path')
+    parser.add_argument('--grid-step', type=float, default=None,
+                       help='Search the full weight simplex at this spacing (e.g. 0.05) instead of the legacy grid')
+    parser.add_argument('--refine', type=int, default=0,
+                       help='Zoom-in refinement rounds around the best weights')
+    parser.add_argument('--cache', type=str, default=None,
+                       help='Path to an .npz cache for per-pair component scores')
     
     args = parser.parse_args()
     
@@ -215,7 +243,12 @@ def main():
     print()
     
     # Optimize
-    best = optimize_topological_weights(profiles, knots, ground_truth, args.integration)
+    best = optimize_topological_weights(
+        profiles, knots, ground_truth, args.integration,
+        grid_step=args.grid_step,
+        refine=args.refine,
+        cache_path=args.cache
+    )
     
     print()
     print("=" * 80)
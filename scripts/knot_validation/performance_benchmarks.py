@@ -5,18 +5,37 @@ Knot Validation Script: Performance and Scalability Benchmarks
 Purpose: Validate knot system meets real-time performance requirements
 and scales efficiently for large-scale applications.
 
+Benchmarks the production code paths rather than stand-ins:
+- KnotGenerator.generate_knot (per profile) and generate_knots_batch
+- KnotGenerator.calculate_knot_invariants (braid -> writhe/Alexander)
+- MatchingAccuracyComparator.compare_matching (per-pair and batch)
+- GroundTruthGenerator.generate (per-pair) and generate_store (blocked)
+- shared_data_model.quantum_compatibility (experiments pipeline)
+
+Each measurement records wall time (best of --repeats), throughput and
+peak RSS sampled with psutil while the operation runs. A power law
+time ~ scale^k is fitted per operation. Every run is appended to a JSONL
+history file, and --compare checks it against a stored baseline
+(--save-baseline) so slowdowns in the matching pipeline are caught.
+
 Part of Phase 0 validation for Patent #31 - Experiment 7.
 """
 
+import contextlib
+import io
 import json
 import sys
 import time
 import os
-import random
+import platform
+import subprocess
+import tempfile
+import threading
 import numpy as np
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional
 from dataclasses import dataclass, asdict
+from datetime import datetime
 import statistics
 import psutil
 import gc
@@ -25,378 +44,678 @@ import gc
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.knot_validation.generate_knots_from_profiles import (
+    KnotGenerator,
+    PersonalityProfile,
+)
+from scripts.knot_validation.knot_invariants import BraidInvariantEngine
+from scripts.knot_validation.compare_matching_accuracy import (
+    MatchingAccuracyComparator,
+    sample_ground_truth_pairs,
+)
+from scripts.personality_data.processors.ground_truth_generator import GroundTruthGenerator
+
+EXPERIMENT_SCRIPTS_DIR = project_root / 'docs' / 'patents' / 'experiments' / 'scripts'
+VALIDATION_DIR = project_root / 'docs' / 'plans' / 'knot_theory' / 'validation'
+RESULTS_PATH = VALIDATION_DIR / 'performance_benchmarks.json'
+HISTORY_PATH = VALIDATION_DIR / 'performance_history.jsonl'
+BASELINE_PATH = VALIDATION_DIR / 'performance_baseline.json'
+
+HISTORY_FORMAT_VERSION = 1
+
+# Scales per operation. Per-pair (pure Python) paths get smaller scales
+# than the array paths so the quick preset finishes in seconds.
+SCALE_PRESETS = {
+    'quick': {
+        'knot_generation': [100, 300, 1000],
+        'knot_generation_batch': [1000, 3000, 10000],
+        'matching_per_pair': [20, 40, 60],
+        'matching_batch': [200, 400, 800],
+        'ground_truth_per_pair': [20, 40, 60],
+        'ground_truth_store': [200, 400, 800],
+        'shared_quantum_compatibility': [1000, 3000, 10000],
+    },
+    'default': {
+        'knot_generation': [100, 1000, 10000],
+        'knot_generation_batch': [10000, 100000, 300000],
+        'matching_per_pair': [50, 100, 200],
+        'matching_batch': [500, 1000, 2000],
+        'ground_truth_per_pair': [50, 100, 200],
+        'ground_truth_store': [500, 1000, 2000],
+        'shared_quantum_compatibility': [1000, 10000, 100000],
+    },
+    'large': {
+        'knot_generation': [1000, 10000, 100000],
+        'knot_generation_batch': [100000, 1000000, 2000000],
+        'matching_per_pair': [100, 200, 400],
+        'matching_batch': [1000, 2000, 4000],
+        'ground_truth_per_pair': [100, 200, 400],
+        'ground_truth_store': [1000, 2000, 4000],
+        'shared_quantum_compatibility': [10000, 100000, 1000000],
+    },
+}
+
 @dataclass
 class PerformanceResult:
-    """Represents a performance measurement."""
+    """Represents a performance measurement.
+
+    scale counts the operation's unit (profiles, knots or pairs);
+    time_ms is per unit and memory_mb is peak RSS growth per unit.
+    """
     operation: str
     scale: int
     time_ms: float
     throughput: float
     memory_mb: float
     scaling_factor: float = 1.0
+    unit: str = 'profiles'
+    total_time_ms: float = 0.0
+    peak_rss_mb: float = 0.0
+    peak_rss_delta_mb: float = 0.0
+    repeats: int = 1
+
+class PeakRSSMonitor:
+    """Samples this process's RSS on a background thread to find the peak.
+
+    psutil has no portable peak-RSS counter that can be reset between
+    operations, so the peak is the maximum of samples taken every
+    interval seconds between start() and stop().
+    """
+
+    def __init__(self, interval: float = 0.002):
+        self.interval = interval
+        self.process = psutil.Process(os.getpid())
+        self.baseline = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self):
+        rss = self.process.memory_info().rss
+        if rss > self.peak:
+            self.peak = rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> 'PeakRSSMonitor':
+        self.baseline = self.process.memory_info().rss
+        self.peak = self.baseline
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._sample()
+
+    def __enter__(self) -> 'PeakRSSMonitor':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    @property
+    def peak_mb(self) -> float:
+        return self.peak / 1024 / 1024
+
+    @property
+    def peak_delta_mb(self) -> float:
+        return max(0, self.peak - self.baseline) / 1024 / 1024
 
 class PerformanceBenchmarker:
     """Benchmarks knot system performance and scalability."""
-    
-    def __init__(self):
+
+    def __init__(self, repeats: int = 1, seed: int = 42):
         self.results = []
-    
+        self.repeats = max(1, repeats)
+        self.rng = np.random.default_rng(seed)
+        self.generator = KnotGenerator()
+        self.comparator = MatchingAccuracyComparator()
+
     def generate_sample_profile(self, profile_id: int) -> Dict:
         """Generate a sample personality profile."""
-        dimensions = {
-            'exploration': random.uniform(0, 1),
-            'community': random.uniform(0, 1),
-            'social': random.uniform(0, 1),
-            'value_orientation': random.uniform(0, 1),
-            'authenticity': random.uniform(0, 1),
-            'trust_level': random.uniform(0, 1),
-            'openness': random.uniform(0, 1),
-            'conscientiousness': random.uniform(0, 1),
-            'extraversion': random.uniform(0, 1),
-            'agreeableness': random.uniform(0, 1),
-            'neuroticism': random.uniform(0, 1),
-            'stability': random.uniform(0, 1),
-        }
-        return {
-            'user_id': f'user_{profile_id}',
-            'dimensions': dimensions
-        }
-    
-    def generate_knot_simple(self, profile: Dict) -> Dict:
-        """Generate a simple knot representation (simplified for performance testing)."""
-        dims = profile.get('dimensions', {})
-        
-        # Calculate complexity based on dimension variance
-        values = list(dims.values())
-        variance = statistics.variance(values) if len(values) > 1 else 0
-        
-        # Determine crossing number (simplified)
-        crossing_number = max(0, min(34, int(variance * 20)))
-        
-        # Determine knot type
-        if crossing_number == 0:
-            knot_type = 'unknot'
-        elif crossing_number == 3:
-            knot_type = 'trefoil'
-        elif crossing_number == 4:
-            knot_type = 'figure-eight'
-        elif crossing_number == 5:
-            knot_type = 'cinquefoil'
-        elif crossing_number == 6:
-            knot_type = 'stevedore'
-        else:
-            knot_type = f'complex-{crossing_number}'
-        
-        return {
-            'user_id': profile['user_id'],
-            'knot_type': knot_type,
-            'crossing_number': crossing_number,
-            'complexity': variance,
-            'jones_polynomial': f'q^{crossing_number}',
-            'alexander_polynomial': f't^{crossing_number}'
-        }
-    
-    def calculate_invariants(self, knot: Dict) -> Dict:
-        """Calculate knot invariants (simplified for performance testing)."""
-        crossing = knot.get('crossing_number', 0)
-        
-        # Simplified invariant calculations
-        jones_time = crossing * 0.001  # 1ms per crossing
-        alexander_time = crossing * 0.0015  # 1.5ms per crossing
-        crossing_time = 0.0001  # 0.1ms
-        
-        return {
-            'jones_time_ms': jones_time,
-            'alexander_time_ms': alexander_time,
-            'crossing_time_ms': crossing_time,
-            'total_time_ms': jones_time + alexander_time + crossing_time
-        }
-    
-    def calculate_integrated_compatibility(self, profile_a: Dict, profile_b: Dict, knot_a: Dict, knot_b: Dict) -> float:
-        """Calculate integrated compatibility (quantum + topological)."""
-        # Simplified quantum compatibility
-        dims_a = profile_a.get('dimensions', {})
-        dims_b = profile_b.get('dimensions', {})
-        
-        quantum_compat = 0.5  # Simplified
-        for key in dims_a.keys():
-            if key in dims_b:
-                quantum_compat += 0.04 * (1.0 - abs(dims_a[key] - dims_b[key]))
-        
-        quantum_compat = min(1.0, quantum_compat)
-        
-        # Simplified topological compatibility
-        type_a = knot_a.get('knot_type', 'unknown')
-        type_b = knot_b.get('knot_type', 'unknown')
-        
-        if type_a == type_b:
-            topo_compat = 1.0
-        elif type_a.startswith('complex') and type_b.startswith('complex'):
-            topo_compat = 0.7
-        else:
-            topo_compat = 0.3
-        
-        # Integrated
-        integrated = 0.7 * quantum_compat + 0.3 * topo_compat
-        return integrated
-    
+        return self.generate_sample_profiles(1, start=profile_id)[0]
+
+    def generate_sample_profiles(self, count: int, start: int = 0) -> List[Dict]:
+        """Generate count sample profiles with uniform random dimensions."""
+        values = self.rng.uniform(0, 1, (count, len(self.generator.dimension_names)))
+        return [
+            {
+                'user_id': f'user_{start + i}',
+                'dimensions': dict(zip(self.generator.dimension_names, row.tolist()))
+            }
+            for i, row in enumerate(values)
+        ]
+
+    def measure(
+        self,
+        operation: str,
+        scale: int,
+        run: Callable[[], Any],
+        unit: str = 'profiles'
+    ) -> PerformanceResult:
+        """Time run() (best of self.repeats) and record its peak RSS.
+
+        Setup must happen before calling measure so only the operation
+        itself is timed; output printed by run() is suppressed.
+        """
+        times = []
+        peak_mb = peak_delta_mb = 0.0
+        for _ in range(self.repeats):
+            gc.collect()
+            with PeakRSSMonitor() as monitor, contextlib.redirect_stdout(io.StringIO()):
+                start_time = time.perf_counter()
+                output = run()
+                end_time = time.perf_counter()
+            del output
+            times.append(end_time - start_time)
+            peak_mb = max(peak_mb, monitor.peak_mb)
+            peak_delta_mb = max(peak_delta_mb, monitor.peak_delta_mb)
+
+        total_time_ms = min(times) * 1000
+        result = PerformanceResult(
+            operation=operation,
+            scale=scale,
+            time_ms=total_time_ms / scale if scale > 0 else 0,
+            throughput=scale / (total_time_ms / 1000) if total_time_ms > 0 else float('inf'),
+            memory_mb=peak_delta_mb / scale if scale > 0 else 0,
+            unit=unit,
+            total_time_ms=total_time_ms,
+            peak_rss_mb=peak_mb,
+            peak_rss_delta_mb=peak_delta_mb,
+            repeats=self.repeats
+        )
+        self.results.append(result)
+        return result
+
+    def _set_scaling_factors(self, results: List[PerformanceResult]) -> List[PerformanceResult]:
+        """Per-unit time relative to the smallest scale (1.0 = perfectly linear)."""
+        if results and results[0].time_ms > 0:
+            for r in results:
+                r.scaling_factor = r.time_ms / results[0].time_ms
+        return results
+
     def benchmark_knot_generation(self, scales: List[int]) -> List[PerformanceResult]:
-        """Benchmark knot generation performance at different scales."""
+        """Benchmark KnotGenerator.generate_knot, one profile at a time."""
         results = []
-        
+
         for scale in scales:
             print(f"  Testing knot generation at scale {scale}...")
-            
-            # Generate profiles
-            profiles = [self.generate_sample_profile(i) for i in range(scale)]
-            
-            # Measure memory before
-            process = psutil.Process(os.getpid())
-            mem_before = process.memory_info().rss / 1024 / 1024  # MB
-            
-            # Benchmark knot generation
-            start_time = time.perf_counter()
-            knots = [self.generate_knot_simple(profile) for profile in profiles]
-            end_time = time.perf_counter()
-            
-            # Measure memory after
-            mem_after = process.memory_info().rss / 1024 / 1024  # MB
-            mem_used = mem_after - mem_before
-            
-            # Calculate metrics
-            total_time_ms = (end_time - start_time) * 1000
-            time_per_profile = total_time_ms / scale
-            throughput = scale / (total_time_ms / 1000)  # profiles per second
-            
-            results.append(PerformanceResult(
-                operation='knot_generation',
-                scale=scale,
-                time_ms=time_per_profile,
-                throughput=throughput,
-                memory_mb=mem_used / scale if scale > 0 else 0
+            profiles = [
+                PersonalityProfile(user_id=p['user_id'], dimensions=p['dimensions'])
+                for p in self.generate_sample_profiles(scale)
+            ]
+            generator = KnotGenerator(invariant_engine=BraidInvariantEngine())
+            results.append(self.measure(
+                'knot_generation', scale,
+                lambda: [generator.generate_knot(profile) for profile in profiles]
             ))
-            
-            # Cleanup
-            del profiles, knots
-            gc.collect()
-        
-        return results
-    
-    def benchmark_invariant_calculation(self, knots: List[Dict]) -> Dict[str, float]:
-        """Benchmark invariant calculation performance."""
-        print(f"  Testing invariant calculations for {len(knots)} knots...")
-        
+            del profiles, generator
+
+        return self._set_scaling_factors(results)
+
+    def benchmark_knot_generation_batch(self, scales: List[int]) -> List[PerformanceResult]:
+        """Benchmark KnotGenerator.generate_knots_batch (vectorized generation, no invariants)."""
+        results = []
+
+        for scale in scales:
+            print(f"  Testing batch knot generation at scale {scale}...")
+            values = self.rng.uniform(0, 1, (scale, len(self.generator.dimension_names)))
+            generator = KnotGenerator(invariant_engine=BraidInvariantEngine())
+            results.append(self.measure(
+                'knot_generation_batch', scale,
+                lambda: generator.generate_knots_batch(values, compute_invariants=False)
+            ))
+            del values, generator
+
+        return self._set_scaling_factors(results)
+
+    def benchmark_invariant_calculation(self, count: int = 100) -> Dict[str, float]:
+        """Benchmark KnotGenerator.calculate_knot_invariants on real braids."""
+        print(f"  Testing invariant calculations for {count} knots...")
+
+        # Fresh engine so every braid word is computed, not served from cache
+        generator = KnotGenerator(invariant_engine=BraidInvariantEngine())
+        braids = []
+        for p in self.generate_sample_profiles(count):
+            profile = PersonalityProfile(user_id=p['user_id'], dimensions=p['dimensions'])
+            crossings = generator.create_braid_crossings(generator.calculate_correlations(profile))
+            braids.append(generator.generate_braid_sequence(crossings))
+
         times = []
-        for knot in knots:
+        for braid in braids:
             start = time.perf_counter()
-            self.calculate_invariants(knot)
+            generator.calculate_knot_invariants(braid)
             end = time.perf_counter()
             times.append((end - start) * 1000)  # ms
-        
+
         return {
             'mean_time_ms': statistics.mean(times),
             'median_time_ms': statistics.median(times),
             'max_time_ms': max(times),
             'min_time_ms': min(times),
-            'std_dev_ms': statistics.stdev(times) if len(times) > 1 else 0
+            'std_dev_ms': statistics.stdev(times) if len(times) > 1 else 0,
+            'mean_crossings': statistics.mean(len(b.crossings) for b in braids),
         }
-    
-    def benchmark_integrated_compatibility(self, scales: List[int]) -> List[PerformanceResult]:
-        """Benchmark integrated compatibility calculation performance."""
+
+    def _matching_inputs(self, n_profiles: int):
+        """Profiles, knot records and all-pairs ground truth for n_profiles users."""
+        profiles = self.generate_sample_profiles(n_profiles)
+        batch = self.generator.generate_knots_batch(
+            self.generator.profiles_to_array(profiles), user_ids=[p['user_id'] for p in profiles],
+            compute_invariants=True
+        )
+        knots = batch.to_records()
+        ground_truth = sample_ground_truth_pairs(profiles, seed=int(self.rng.integers(2**31)))
+        return profiles, knots, ground_truth
+
+    def benchmark_matching(self, scales: List[int], batch: bool) -> List[PerformanceResult]:
+        """Benchmark MatchingAccuracyComparator.compare_matching over all pairs of scale profiles."""
         results = []
-        
-        for scale in scales:
-            print(f"  Testing integrated compatibility at scale {scale} pairs...")
-            
-            # Generate profiles and knots
-            profiles = [self.generate_sample_profile(i) for i in range(scale * 2)]
-            knots = [self.generate_knot_simple(profile) for profile in profiles]
-            
-            # Create pairs
-            pairs = []
-            for i in range(scale):
-                pairs.append((
-                    profiles[i * 2],
-                    profiles[i * 2 + 1],
-                    knots[i * 2],
-                    knots[i * 2 + 1]
-                ))
-            
-            # Benchmark compatibility calculation
-            start_time = time.perf_counter()
-            for profile_a, profile_b, knot_a, knot_b in pairs:
-                self.calculate_integrated_compatibility(profile_a, profile_b, knot_a, knot_b)
-            end_time = time.perf_counter()
-            
-            # Calculate metrics
-            total_time_ms = (end_time - start_time) * 1000
-            time_per_pair = total_time_ms / scale
-            throughput = scale / (total_time_ms / 1000)  # pairs per second
-            
-            results.append(PerformanceResult(
-                operation='integrated_compatibility',
-                scale=scale,
-                time_ms=time_per_pair,
-                throughput=throughput,
-                memory_mb=0  # Not measuring memory for this
+        operation = 'matching_batch' if batch else 'matching_per_pair'
+
+        for n_profiles in scales:
+            profiles, knots, ground_truth = self._matching_inputs(n_profiles)
+            if not batch:
+                ground_truth = list(ground_truth.iter_dicts())
+            n_pairs = len(ground_truth)
+            print(f"  Testing {operation} at {n_profiles} profiles ({n_pairs} pairs)...")
+            results.append(self.measure(
+                operation, n_pairs,
+                lambda: self.comparator.compare_matching(profiles, knots, ground_truth, batch=batch),
+                unit='pairs'
             ))
-            
-            # Cleanup
-            del profiles, knots, pairs
-            gc.collect()
-        
-        return results
-    
+            del profiles, knots, ground_truth
+
+        return self._set_scaling_factors(results)
+
+    def benchmark_ground_truth(self, scales: List[int], store: bool) -> List[PerformanceResult]:
+        """Benchmark GroundTruthGenerator over all pairs of scale profiles."""
+        results = []
+        operation = 'ground_truth_store' if store else 'ground_truth_per_pair'
+        generator = GroundTruthGenerator()
+
+        for n_profiles in scales:
+            profiles = self.generate_sample_profiles(n_profiles)
+            n_pairs = n_profiles * (n_profiles - 1) // 2
+            print(f"  Testing {operation} at {n_profiles} profiles ({n_pairs} pairs)...")
+            with tempfile.TemporaryDirectory() as tmp:
+                if store:
+                    output_path = Path(tmp) / 'benchmark.gtstore'
+                    run = lambda: generator.generate_store(profiles, output_path, seed=0)
+                else:
+                    run = lambda: generator.generate(profiles)
+                results.append(self.measure(operation, n_pairs, run, unit='pairs'))
+            del profiles
+
+        return self._set_scaling_factors(results)
+
+    def benchmark_shared_quantum_compatibility(self, scales: List[int]) -> List[PerformanceResult]:
+        """Benchmark shared_data_model.quantum_compatibility from the experiments pipeline."""
+        sys.path.append(str(EXPERIMENT_SCRIPTS_DIR))
+        from shared_data_model import quantum_compatibility
+
+        results = []
+        for n_pairs in scales:
+            print(f"  Testing shared quantum compatibility at scale {n_pairs} pairs...")
+            vectors_a = self.rng.uniform(0, 1, (n_pairs, 12))
+            vectors_b = self.rng.uniform(0, 1, (n_pairs, 12))
+            results.append(self.measure(
+                'shared_quantum_compatibility', n_pairs,
+                lambda: [quantum_compatibility(a, b) for a, b in zip(vectors_a, vectors_b)],
+                unit='pairs'
+            ))
+            del vectors_a, vectors_b
+
+        return self._set_scaling_factors(results)
+
     def analyze_scaling(self, results: List[PerformanceResult]) -> Dict[str, Any]:
-        """Analyze scaling behavior."""
+        """Analyze scaling behavior.
+
+        Fits total_time ~ c * scale^k by least squares in log-log space;
+        k close to 1 is linear in the operation's unit.
+        """
         if len(results) < 2:
             return {'scaling_type': 'insufficient_data'}
-        
+
         # Calculate scaling factors
         scales = [r.scale for r in results]
         times = [r.time_ms for r in results]
-        
+
         # Check if linear (time should be roughly constant)
         time_variance = statistics.variance(times) if len(times) > 1 else 0
         time_mean = statistics.mean(times)
         time_cv = time_variance / (time_mean ** 2) if time_mean > 0 else 0
-        
-        if time_cv < 0.1:  # Low variance = constant time = O(1) or O(n) with good constant
+
+        exponent = None
+        total_times = [r.total_time_ms for r in results]
+        if len(set(scales)) > 1 and all(t > 0 for t in total_times):
+            exponent, _ = np.polyfit(np.log(scales), np.log(total_times), 1)
+            exponent = float(exponent)
+
+        if exponent is not None:
+            if exponent <= 1.15:
+                scaling_type = 'linear_or_constant'
+            elif exponent <= 1.5:
+                scaling_type = 'near_linear'
+            else:
+                scaling_type = 'polynomial'
+        elif time_cv < 0.1:  # Low variance = constant time = O(1) or O(n) with good constant
             scaling_type = 'linear_or_constant'
         elif time_cv < 0.5:
             scaling_type = 'near_linear'
         else:
             scaling_type = 'polynomial'
-        
+
         return {
             'scaling_type': scaling_type,
+            'scaling_exponent': exponent,
             'time_coefficient_of_variation': time_cv,
             'mean_time_ms': time_mean,
             'time_std_dev_ms': statistics.stdev(times) if len(times) > 1 else 0
         }
 
+def _git_commit() -> Optional[str]:
+    """Current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=project_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment_info() -> Dict[str, Any]:
+    """Machine details stored with every run so histories are comparable."""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'total_memory_mb': psutil.virtual_memory().total / 1024 / 1024,
+    }
+
+def append_history(run: Dict[str, Any], history_path: Path = HISTORY_PATH):
+    """Append one run record as a JSON line."""
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_path, 'a') as f:
+        f.write(json.dumps(run) + '\n')
+
+def load_history(history_path: Path = HISTORY_PATH) -> List[Dict[str, Any]]:
+    """All run records in a history file, oldest first."""
+    if not history_path.exists():
+        return []
+    with open(history_path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def compare_to_baseline(
+    run: Dict[str, Any],
+    baseline: Dict[str, Any],
+    time_tolerance: float = 0.20,
+    memory_tolerance: float = 0.50,
+    memory_floor_mb: float = 16.0,
+    exponent_tolerance: float = 0.25
+) -> List[Dict[str, Any]]:
+    """Regressions of run against baseline.
+
+    Measurements are matched by (operation, scale). A regression is
+    per-unit time above baseline * (1 + time_tolerance), peak RSS growth
+    above baseline * (1 + memory_tolerance) once it exceeds
+    memory_floor_mb (smaller deltas are sampling noise), or a scaling
+    exponent more than exponent_tolerance above the baseline's.
+    """
+    regressions = []
+    baseline_results = {
+        (r['operation'], r['scale']): r
+        for r in baseline.get('measurements', [])
+    }
+
+    for current in run.get('measurements', []):
+        reference = baseline_results.get((current['operation'], current['scale']))
+        if reference is None:
+            continue
+
+        if reference['time_ms'] > 0:
+            ratio = current['time_ms'] / reference['time_ms']
+            if ratio > 1 + time_tolerance:
+                regressions.append({
+                    'operation': current['operation'],
+                    'scale': current['scale'],
+                    'metric': 'time_ms',
+                    'baseline': reference['time_ms'],
+                    'current': current['time_ms'],
+                    'ratio': ratio,
+                })
+
+        current_memory = current.get('peak_rss_delta_mb', 0.0)
+        reference_memory = reference.get('peak_rss_delta_mb', 0.0)
+        if (current_memory > memory_floor_mb and
+                current_memory > max(reference_memory, memory_floor_mb) * (1 + memory_tolerance)):
+            regressions.append({
+                'operation': current['operation'],
+                'scale': current['scale'],
+                'metric': 'peak_rss_delta_mb',
+                'baseline': reference_memory,
+                'current': current_memory,
+                'ratio': current_memory / reference_memory if reference_memory > 0 else float('inf'),
+            })
+
+    for operation, scaling in run.get('scaling_analysis', {}).items():
+        reference = baseline.get('scaling_analysis', {}).get(operation, {})
+        current_exponent = scaling.get('scaling_exponent')
+        reference_exponent = reference.get('scaling_exponent')
+        if current_exponent is None or reference_exponent is None:
+            continue
+        if current_exponent > reference_exponent + exponent_tolerance:
+            regressions.append({
+                'operation': operation,
+                'scale': None,
+                'metric': 'scaling_exponent',
+                'baseline': reference_exponent,
+                'current': current_exponent,
+                'ratio': current_exponent / reference_exponent if reference_exponent > 0 else float('inf'),
+            })
+
+    return regressions
+
+def _print_results(results: List[PerformanceResult]):
+    for r in results:
+        print(f"     Scale {r.scale:8d} {r.unit}: {r.time_ms:9.4f} ms/{r.unit[:-1]}, "
+              f"{r.throughput:12.0f} {r.unit}/sec, peak RSS +{r.peak_rss_delta_mb:.1f} MB "
+              f"(x{r.scaling_factor:.2f})")
+
 def main():
     """Main benchmark script."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark knot and compatibility hot paths')
+    parser.add_argument('--preset', choices=sorted(SCALE_PRESETS), default='default',
+                       help='Scale preset (quick for smoke runs, large for capacity checks)')
+    parser.add_argument('--operations', nargs='+', choices=sorted(SCALE_PRESETS['default']),
+                       default=None, help='Only run these operations (default: all)')
+    parser.add_argument('--repeats', type=int, default=1,
+                       help='Runs per measurement; the fastest is kept')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for sample data')
+    parser.add_argument('--output', type=str, default=str(RESULTS_PATH),
+                       help='Output JSON file path')
+    parser.add_argument('--history', type=str, default=str(HISTORY_PATH),
+                       help='JSONL file each run is appended to')
+    parser.add_argument('--no-history', action='store_true',
+                       help='Do not append this run to the history file')
+    parser.add_argument('--baseline', type=str, default=str(BASELINE_PATH),
+                       help='Baseline JSON for --compare/--save-baseline')
+    parser.add_argument('--save-baseline', action='store_true',
+                       help='Store this run as the regression baseline')
+    parser.add_argument('--compare', action='store_true',
+                       help='Compare against the baseline; exit with status 1 on regressions')
+    parser.add_argument('--time-tolerance', type=float, default=0.20,
+                       help='Allowed per-unit slowdown versus baseline (0.20 = 20%%)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.50,
+                       help='Allowed peak RSS growth versus baseline')
+
+    args = parser.parse_args()
+
     print("=" * 80)
     print("Performance and Scalability Benchmarks - Patent #31 Experiment 7")
     print("=" * 80)
+    print(f"Preset: {args.preset}, repeats: {args.repeats}")
     print()
-    
-    benchmarker = PerformanceBenchmarker()
-    
-    # Test scales
-    knot_generation_scales = [100, 1000, 10000]
-    compatibility_scales = [1000, 10000, 100000]
-    
+
+    benchmarker = PerformanceBenchmarker(repeats=args.repeats, seed=args.seed)
+    scales = SCALE_PRESETS[args.preset]
+    operations = args.operations or list(scales)
+
+    benchmarks = {
+        'knot_generation': lambda s: benchmarker.benchmark_knot_generation(s),
+        'knot_generation_batch': lambda s: benchmarker.benchmark_knot_generation_batch(s),
+        'matching_per_pair': lambda s: benchmarker.benchmark_matching(s, batch=False),
+        'matching_batch': lambda s: benchmarker.benchmark_matching(s, batch=True),
+        'ground_truth_per_pair': lambda s: benchmarker.benchmark_ground_truth(s, store=False),
+        'ground_truth_store': lambda s: benchmarker.benchmark_ground_truth(s, store=True),
+        'shared_quantum_compatibility': lambda s: benchmarker.benchmark_shared_quantum_compatibility(s),
+    }
+
     all_results = {
-        'knot_generation': [],
+        'format_version': HISTORY_FORMAT_VERSION,
+        'timestamp': datetime.now().isoformat(),
+        'git_commit': _git_commit(),
+        'preset': args.preset,
+        'repeats': args.repeats,
+        'environment': environment_info(),
+        'measurements': [],
         'invariant_calculation': {},
-        'integrated_compatibility': [],
         'scaling_analysis': {}
     }
-    
-    # 1. Knot Generation Benchmarks
-    print("1. Knot Generation Performance")
-    print("-" * 80)
-    knot_gen_results = benchmarker.benchmark_knot_generation(knot_generation_scales)
-    all_results['knot_generation'] = [asdict(r) for r in knot_gen_results]
-    
-    print("\n   Results:")
-    for r in knot_gen_results:
-        print(f"     Scale {r.scale:6d}: {r.time_ms:6.3f} ms/profile, "
-              f"{r.throughput:8.0f} profiles/sec, {r.memory_mb:.3f} MB/profile")
-    
+    operation_results = {}
+
+    # 1. Operation Benchmarks
+    for step, operation in enumerate(operations, 1):
+        print(f"{step}. {operation.replace('_', ' ').title()}")
+        print("-" * 80)
+        results = benchmarks[operation](scales[operation])
+        operation_results[operation] = results
+        all_results['measurements'].extend(asdict(r) for r in results)
+        all_results['scaling_analysis'][operation] = benchmarker.analyze_scaling(results)
+
+        print("\n   Results:")
+        _print_results(results)
+        exponent = all_results['scaling_analysis'][operation].get('scaling_exponent')
+        if exponent is not None:
+            print(f"     Scaling exponent: {exponent:.2f} "
+                  f"({all_results['scaling_analysis'][operation]['scaling_type']})")
+        print()
+
     # 2. Invariant Calculation Benchmarks
-    print("\n2. Invariant Calculation Performance")
+    print("Invariant Calculation Performance")
     print("-" * 80)
-    
-    # Generate knots of varying complexity
-    test_knots = []
-    for i in range(100):
-        profile = benchmarker.generate_sample_profile(i)
-        knot = benchmarker.generate_knot_simple(profile)
-        test_knots.append(knot)
-    
-    invariant_results = benchmarker.benchmark_invariant_calculation(test_knots)
+    invariant_results = benchmarker.benchmark_invariant_calculation()
     all_results['invariant_calculation'] = invariant_results
-    
+
     print("\n   Results:")
-    print(f"     Mean time: {invariant_results['mean_time_ms']:.3f} ms/knot")
+    print(f"     Mean time: {invariant_results['mean_time_ms']:.3f} ms/knot "
+          f"({invariant_results['mean_crossings']:.1f} crossings)")
     print(f"     Median time: {invariant_results['median_time_ms']:.3f} ms/knot")
     print(f"     Max time: {invariant_results['max_time_ms']:.3f} ms/knot")
     print(f"     Min time: {invariant_results['min_time_ms']:.3f} ms/knot")
-    
-    # 3. Integrated Compatibility Benchmarks
-    print("\n3. Integrated Compatibility Performance")
-    print("-" * 80)
-    compat_results = benchmarker.benchmark_integrated_compatibility(compatibility_scales)
-    all_results['integrated_compatibility'] = [asdict(r) for r in compat_results]
-    
-    print("\n   Results:")
-    for r in compat_results:
-        print(f"     Scale {r.scale:6d}: {r.time_ms:6.3f} ms/pair, "
-              f"{r.throughput:8.0f} pairs/sec")
-    
-    # 4. Scaling Analysis
-    print("\n4. Scaling Analysis")
-    print("-" * 80)
-    
-    knot_scaling = benchmarker.analyze_scaling(knot_gen_results)
-    compat_scaling = benchmarker.analyze_scaling(compat_results)
-    
-    all_results['scaling_analysis'] = {
-        'knot_generation': knot_scaling,
-        'integrated_compatibility': compat_scaling
-    }
-    
-    print("\n   Knot Generation Scaling:")
-    print(f"     Type: {knot_scaling['scaling_type']}")
-    print(f"     Mean time: {knot_scaling['mean_time_ms']:.3f} ms")
-    
-    print("\n   Integrated Compatibility Scaling:")
-    print(f"     Type: {compat_scaling['scaling_type']}")
-    print(f"     Mean time: {compat_scaling['mean_time_ms']:.3f} ms")
-    
-    # 5. Success Criteria Check
-    print("\n5. Success Criteria Validation")
+
+    # 3. Success Criteria Check
+    print("\nSuccess Criteria Validation")
     print("-" * 80)
-    
+
+    def _all(operation: str, check: Callable[[PerformanceResult], bool]) -> Optional[bool]:
+        results = operation_results.get(operation)
+        return all(check(r) for r in results) if results else None
+
     criteria_met = {
-        'knot_generation_100ms': all([r.time_ms < 100 for r in knot_gen_results]),
+        'knot_generation_100ms': _all('knot_generation', lambda r: r.time_ms < 100),
         'invariant_calculation_100ms': invariant_results['mean_time_ms'] < 100,
-        'compatibility_1000_pairs_per_sec': all([r.throughput > 1000 for r in compat_results]),
-        'scaling_linear': (knot_scaling['scaling_type'] in ['linear_or_constant', 'near_linear'] and
-                          compat_scaling['scaling_type'] in ['linear_or_constant', 'near_linear'])
+        'compatibility_1000_pairs_per_sec': _all('matching_batch', lambda r: r.throughput > 1000),
+        'scaling_linear': all(
+            all_results['scaling_analysis'][operation]['scaling_type'] in ['linear_or_constant', 'near_linear']
+            for operation in operations
+        ),
     }
-    
+    criteria_met = {name: met for name, met in criteria_met.items() if met is not None}
+
     all_results['success_criteria'] = criteria_met
-    
+
     print("\n   Criteria Check:")
     for criterion, met in criteria_met.items():
         status = "✅ PASS" if met else "❌ FAIL"
         print(f"     {criterion}: {status}")
-    
+
     all_met = all(criteria_met.values())
     all_results['all_criteria_met'] = all_met
-    
+
+    # 4. Baseline Comparison
+    regressions = []
+    baseline_path = Path(args.baseline)
+    if args.compare:
+        print("\nBaseline Comparison")
+        print("-" * 80)
+        if baseline_path.exists():
+            with open(baseline_path) as f:
+                baseline = json.load(f)
+            regressions = compare_to_baseline(
+                all_results, baseline,
+                time_tolerance=args.time_tolerance,
+                memory_tolerance=args.memory_tolerance
+            )
+            all_results['baseline'] = {
+                'path': str(baseline_path),
+                'git_commit': baseline.get('git_commit'),
+                'timestamp': baseline.get('timestamp'),
+            }
+            all_results['regressions'] = regressions
+            if baseline.get('environment', {}).get('platform') != all_results['environment']['platform']:
+                print("   ⚠️  Baseline was recorded on a different platform")
+            if regressions:
+                for regression in regressions:
+                    scale = f" @ {regression['scale']}" if regression['scale'] is not None else ""
+                    print(f"   ❌ {regression['operation']}{scale}: {regression['metric']} "
+                          f"{regression['baseline']:.4g} -> {regression['current']:.4g} "
+                          f"(x{regression['ratio']:.2f})")
+            else:
+                print(f"   ✅ No regressions against baseline from {baseline.get('timestamp')}")
+        else:
+            print(f"   ⚠️  No baseline at {baseline_path}; run with --save-baseline first")
+
     # Save results
-    output_path = project_root / 'docs' / 'plans' / 'knot_theory' / 'validation' / 'performance_benchmarks.json'
+    output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    
+
     with open(output_path, 'w') as f:
         json.dump(all_results, f, indent=2)
-    
+
     print(f"\n💾 Results saved to: {output_path}")
-    
+
+    if not args.no_history:
+        append_history(all_results, Path(args.history))
+        print(f"💾 Run appended to history: {args.history}")
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, 'w') as f:
+            json.dump(all_results, f, indent=2)
+        print(f"💾 Baseline saved to: {baseline_path}")
+
     print("\n" + "=" * 80)
     if all_met:
         print("✅ ALL SUCCESS CRITERIA MET")
     else:
         print("⚠️  SOME SUCCESS CRITERIA NOT MET")
     print("=" * 80)
-    
+
+    if regressions:
+        sys.exit(1)
+
     return all_results
 
 if __name__ == '__main__':
     main()
-
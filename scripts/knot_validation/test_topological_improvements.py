@@ -27,6 +27,7 @@ from scripts.knot_validation.compare_matching_accuracy import (
     MatchingAccuracyComparator,
     load_data,
 )
+from scripts.knot_validation.threshold_search import best_accuracy_threshold
 
 def test_approach(
     profiles: List[Dict],
@@ -106,19 +107,8 @@ def test_approach(
                 scores.append(integrated)
                 ground_truth_list.append(is_compatible)
     
-    # Find optimal threshold
-    best_accuracy = 0.0
-    best_threshold = 0.5
-    
-    for threshold in np.arange(0.1, 0.9, 0.01):
-        correct = sum(
-            1 for i, score in enumerate(scores)
-            if (score >= threshold) == ground_truth_list[i]
-        )
-        accuracy = correct / len(scores) if scores else 0.0
-        if accuracy > best_accuracy:
-            best_accuracy = accuracy
-            best_threshold = threshold
+    # Find optimal threshold (exact sweep over all unique scores)
+    best_accuracy, best_threshold = best_accuracy_threshold(scores, ground_truth_list)
     
     # Calculate baseline (quantum-only) for comparison
     quantum_scores = []
@@ -131,17 +121,10 @@ def test_approach(
                 quantum = comparator.calculate_quantum_compatibility(profile_a, profile_b)
                 quantum_scores.append((quantum, ground_truth_map[pair_key]))
     
-    quantum_best_accuracy = 0.0
-    quantum_best_threshold = 0.5
-    for threshold in np.arange(0.1, 0.9, 0.01):
-        correct = sum(
-            1 for score, gt in quantum_scores
-            if (score >= threshold) == gt
-        )
-        accuracy = correct / len(quantum_scores) if quantum_scores else 0.0
-        if accuracy > quantum_best_accuracy:
-            quantum_best_accuracy = accuracy
-            quantum_best_threshold = threshold
+    quantum_best_accuracy, quantum_best_threshold = best_accuracy_threshold(
+        [score for score, _ in quantum_scores],
+        [gt for _, gt in quantum_scores]
+    )
     
     improvement = ((best_accuracy - quantum_best_accuracy) / quantum_best_accuracy * 100) if quantum_best_accuracy > 0 else 0
     
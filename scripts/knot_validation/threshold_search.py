@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Threshold Search
+
+Purpose: Exact threshold sweep shared by the matching-accuracy and weight
+optimization scripts.
+
+One sort of the scores plus one cumulative-count pass gives true/false
+positive counts at every unique score. From those, the exact
+accuracy-maximizing threshold, Youden's J, the full ROC curve and AUC
+follow without rescanning the pairs per candidate threshold. Results do
+not depend on scipy/sklearn (ROC/AUC match sklearn.metrics.roc_curve/auc).
+
+Part of Phase 0 validation for Patent #31.
+"""
+
+from typing import Dict, Any, Sequence, Tuple
+import numpy as np
+
+# numpy 2.0 renamed trapz to trapezoid
+_trapezoid = getattr(np, 'trapezoid', None) or np.trapz
+
+def _cumulative_counts(
+    scores: np.ndarray,
+    labels: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """True/false positive counts for `score >= t` at every unique score.
+
+    Returns (thresholds, tps, fps) in decreasing threshold order, starting
+    with +inf (nothing predicted compatible).
+    """
+    order = np.argsort(-scores, kind='mergesort')
+    sorted_scores = scores[order]
+    sorted_labels = labels[order]
+
+    # Last index of each run of equal scores
+    run_ends = np.r_[np.flatnonzero(np.diff(sorted_scores)), len(sorted_scores) - 1]
+    tps = np.cumsum(sorted_labels, dtype=np.int64)[run_ends]
+    fps = (run_ends + 1) - tps
+
+    thresholds = np.r_[np.inf, sorted_scores[run_ends]]
+    return thresholds, np.r_[0, tps], np.r_[0, fps]
+
+def _best_accuracy_index(accuracy: np.ndarray, thresholds: np.ndarray) -> Tuple[int, float]:
+    """Index and threshold of the best accuracy, lowest threshold among ties."""
+    best = len(accuracy) - 1 - int(np.argmax(accuracy[::-1]))
+    threshold = thresholds[best]
+    if np.isinf(threshold):
+        # Nothing predicted compatible: smallest threshold above every score
+        threshold = np.nextafter(thresholds[1], np.inf)
+    return best, float(threshold)
+
+def sweep_thresholds(scores: Sequence[float], labels: Sequence[bool]) -> Dict[str, Any]:
+    """Sweep all unique score thresholds in O(N log N).
+
+    A pair is predicted compatible when score >= threshold.
+
+    Returns:
+        accuracy / accuracy_threshold: exact maximum accuracy and the lowest
+            threshold achieving it
+        youden_j / youden_threshold / youden_accuracy: max(tpr - fpr), its
+            threshold and the accuracy there
+        roc_auc, fpr, tpr, thresholds: full (non-decimated) ROC curve as
+            numpy arrays (thresholds start with +inf)
+    """
+    scores = np.asarray(scores, dtype=np.float64).ravel()
+    labels = np.asarray(labels, dtype=bool).ravel()
+    n = len(scores)
+    if n == 0:
+        return {
+            'accuracy': 0.0,
+            'accuracy_threshold': 0.5,
+            'youden_j': 0.0,
+            'youden_threshold': 0.5,
+            'youden_accuracy': 0.0,
+            'roc_auc': 0.0,
+            'fpr': np.empty(0),
+            'tpr': np.empty(0),
+            'thresholds': np.empty(0),
+        }
+
+    thresholds, tps, fps = _cumulative_counts(scores, labels)
+    positives = int(tps[-1])
+    negatives = n - positives
+
+    # Accuracy at each threshold: TP + TN
+    accuracy = (tps + (negatives - fps)) / n
+    best, best_threshold = _best_accuracy_index(accuracy, thresholds)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tpr = tps / positives if positives else np.full(len(tps), np.nan)
+        fpr = fps / negatives if negatives else np.full(len(fps), np.nan)
+
+    if positives and negatives:
+        youden = tpr - fpr
+        youden_idx = int(np.argmax(youden))
+        youden_j = float(youden[youden_idx])
+        roc_auc = float(_trapezoid(tpr, fpr))
+    else:
+        youden_idx = best
+        youden_j = 0.0
+        roc_auc = float('nan')
+
+    return {
+        'accuracy': float(accuracy[best]),
+        'accuracy_threshold': best_threshold,
+        'youden_j': youden_j,
+        'youden_threshold': float(thresholds[youden_idx]),
+        'youden_accuracy': float(accuracy[youden_idx]),
+        'roc_auc': roc_auc,
+        'fpr': fpr,
+        'tpr': tpr,
+        'thresholds': thresholds,
+    }
+
+def best_accuracy_threshold(scores: Sequence[float], labels: Sequence[bool]) -> Tuple[float, float]:
+    """Exact (accuracy, threshold) maximizing accuracy, without building the ROC lists."""
+    scores = np.asarray(scores, dtype=np.float64).ravel()
+    labels = np.asarray(labels, dtype=bool).ravel()
+    if len(scores) == 0:
+        return 0.0, 0.5
+
+    thresholds, tps, fps = _cumulative_counts(scores, labels)
+    negatives = len(scores) - int(tps[-1])
+    accuracy = (tps + (negatives - fps)) / len(scores)
+    best, threshold = _best_accuracy_index(accuracy, thresholds)
+    return float(accuracy[best]), threshold
+
+def accuracy_at_threshold(scores: Sequence[float], labels: Sequence[bool], threshold: float) -> float:
+    """Accuracy of `score >= threshold` predictions."""
+    scores = np.asarray(scores, dtype=np.float64).ravel()
+    if len(scores) == 0:
+        return 0.0
+    labels = np.asarray(labels, dtype=bool).ravel()
+    return float(np.mean((scores >= threshold) == labels))
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Weight Grid Search
+
+Purpose: Shared machinery for the weight optimization scripts.
+
+Per-pair component scores (quantum/archetype/value, or Jones/Alexander/
+crossing/writhe) do not depend on the weights being tested, so they are
+computed once as a (pairs, components) matrix and optionally cached to
+disk. Every weight combination is then scored at once as a single matrix
+product against the (combinations, components) weight grid, followed by
+the exact threshold sweep per column. This makes much finer grids, and a
+zoom-in refinement around the best point, affordable.
+
+Part of Phase 0 validation for Patent #31.
+"""
+
+import hashlib
+import sys
+from itertools import product
+from pathlib import Path
+from typing import Dict, Any, Callable, Optional, Sequence, Tuple, Union
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.knot_validation.threshold_search import best_accuracy_threshold
+
+CACHE_FORMAT_VERSION = 1
+
+def cache_key(*parts: Any) -> str:
+    """Stable hash of the arrays/values a component matrix was computed from."""
+    digest = hashlib.sha1(f"v{CACHE_FORMAT_VERSION}".encode())
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            array = np.ascontiguousarray(part)
+            digest.update(str(array.dtype).encode())
+            digest.update(str(array.shape).encode())
+            digest.update(array.tobytes())
+        else:
+            digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+def load_or_compute(
+    cache_path: Optional[Union[str, Path]],
+    key: str,
+    compute: Callable[[], Dict[str, np.ndarray]]
+) -> Dict[str, np.ndarray]:
+    """Load arrays from an .npz cache if its key matches, else compute and store them."""
+    if cache_path is not None:
+        cache_path = Path(cache_path)
+        if cache_path.exists():
+            with np.load(cache_path, allow_pickle=False) as cached:
+                if str(cached['key']) == key:
+                    print(f"  Loaded component scores from cache: {cache_path}")
+                    return {name: cached[name] for name in cached.files if name != 'key'}
+
+    arrays = compute()
+
+    if cache_path is not None:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # np.savez appends .npz unless the name already ends with it
+        with open(cache_path, 'wb') as f:
+            np.savez(f, key=np.array(key), **arrays)
+        print(f"  Cached component scores to: {cache_path}")
+    return arrays
+
+def simplex_grid(n_components: int, step: float) -> np.ndarray:
+    """All weight vectors with entries in multiples of step that sum to 1."""
+    steps = int(round(1.0 / step))
+    if steps < 1 or not np.isclose(steps * step, 1.0):
+        raise ValueError(f"grid step must divide 1.0 evenly, got {step}")
+    rows = [
+        combo for combo in product(range(steps + 1), repeat=n_components - 1)
+        if sum(combo) <= steps
+    ]
+    grid = np.array(rows, dtype=np.int64).reshape(-1, n_components - 1)
+    last = steps - grid.sum(axis=1, keepdims=True)
+    return np.hstack([grid, last]) / steps
+
+def product_grid(
+    axes: Sequence[Sequence[float]],
+    keep: Optional[Callable[[np.ndarray], np.ndarray]] = None
+) -> np.ndarray:
+    """Cartesian product of per-component weight lists, optionally filtered."""
+    grid = np.array(list(product(*axes)), dtype=np.float64)
+    if keep is not None:
+        grid = grid[keep(grid)]
+    return grid
+
+def normalize_weights(weights: np.ndarray) -> np.ndarray:
+    """Scale each weight row to sum to 1 (rows summing to 0 are left as is)."""
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    totals = weights.sum(axis=1, keepdims=True)
+    return np.divide(weights, totals, out=weights.copy(), where=totals > 0)
+
+def evaluate_weight_grid(
+    components: np.ndarray,
+    labels: np.ndarray,
+    weights: np.ndarray,
+    transform: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+    chunk_size: int = 64
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Best accuracy and threshold for every weight row.
+
+    components: (P, C) per-pair component scores
+    weights: (K, C) weight grid
+    transform: optional map from the (P, k) weighted scores to final scores
+
+    Scores for up to chunk_size combinations are formed by one matrix
+    product, bounding memory at P * chunk_size floats.
+    """
+    components = np.asarray(components, dtype=np.float64)
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    accuracies = np.zeros(len(weights))
+    thresholds = np.zeros(len(weights))
+
+    for start in range(0, len(weights), chunk_size):
+        scores = components @ weights[start:start + chunk_size].T
+        if transform is not None:
+            scores = transform(scores)
+        for column in range(scores.shape[1]):
+            accuracies[start + column], thresholds[start + column] = best_accuracy_threshold(
+                scores[:, column], labels
+            )
+    return accuracies, thresholds
+
+def grid_search(
+    components: np.ndarray,
+    labels: np.ndarray,
+    grid: np.ndarray,
+    transform: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+    refine: int = 0,
+    refine_step: Optional[float] = None,
+    keep: Optional[Callable[[np.ndarray], np.ndarray]] = None
+) -> Dict[str, Any]:
+    """Evaluate a weight grid, then optionally zoom in around the best point.
+
+    Each refinement round builds a local grid around the current best
+    weights with half the previous spacing (starting at refine_step, or the
+    smallest spacing in the initial grid) and re-evaluates it. Weights are
+    normalized to sum to 1 before scoring; keep filters candidate grids.
+
+    Returns best weights/accuracy/threshold and the number of combinations tested.
+    """
+    grid = normalize_weights(grid)
+    accuracies, thresholds = evaluate_weight_grid(components, labels, grid, transform)
+    tested = len(grid)
+
+    # Lowest index among ties keeps the legacy "first best wins" behaviour
+    best = int(np.argmax(accuracies))
+    best_weights = grid[best]
+    best_accuracy = float(accuracies[best])
+    best_threshold = float(thresholds[best])
+
+    if refine_step is None:
+        spacing = [np.diff(np.unique(column)) for column in grid.T]
+        spacing = [s[s > 1e-12].min() for s in spacing if np.any(s > 1e-12)]
+        refine_step = min(spacing) if spacing else 0.05
+
+    step = refine_step
+    for _ in range(refine):
+        step /= 2
+        offsets = np.array(list(product((-step, 0.0, step), repeat=grid.shape[1])))
+        local = np.clip(best_weights + offsets, 0.0, None)
+        local = local[local.sum(axis=1) > 0]
+        local = normalize_weights(local)
+        if keep is not None:
+            local = local[keep(local)]
+        if len(local) == 0:
+            break
+        local_accuracies, local_thresholds = evaluate_weight_grid(components, labels, local, transform)
+        tested += len(local)
+        candidate = int(np.argmax(local_accuracies))
+        if local_accuracies[candidate] > best_accuracy:
+            best_weights = local[candidate]
+            best_accuracy = float(local_accuracies[candidate])
+            best_threshold = float(local_thresholds[candidate])
+
+    return {
+        'weights': best_weights,
+        'accuracy': best_accuracy,
+        'threshold': best_threshold,
+        'combinations_tested': tested,
+    }
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+ONNX Inference Benchmark for SPOTS ML Models
+
+Loads an exported model with ONNX Runtime (CPU) and measures what it costs
+to run before it ships in assets/models:
+- numeric parity against the PyTorch model on the test split
+- model load time and resident memory added by the session
+- single-row and batched latency / throughput per thread count and batch size
+
+Results are recorded next to the model in the ModelManager registry
+(model_registry.json in the model's directory), keyed to the model's MD5.
+
+The trainers run this after export with --benchmark (parity against the
+in-memory model). Standalone, the PyTorch reference is rebuilt from the
+ONNX weights and the test split is re-derived from the training data
+exactly as the trainer split it.
+
+Usage:
+    python scripts/ml/benchmark_onnx_model.py assets/models/calling_score_model.onnx \
+      --data-path data/calling_score_training_data \
+      --model-type calling_score
+
+Phase 12 Section 2: Neural Network Implementation
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import onnx
+import onnxruntime as ort
+import psutil
+import torch
+import torch.nn as nn
+from onnx import numpy_helper
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from model_manager import ModelManager
+import train_calling_score_model
+import train_outcome_prediction_model
+
+DEFAULT_BATCH_SIZES = (1, 8, 32, 128, 512, 2048)
+DEFAULT_THREAD_COUNTS = (1, 2, 4)
+PARITY_ATOL = 1e-5
+PARITY_RTOL = 1e-4
+PARITY_BATCH_SIZE = 65536
+LOAD_REPEATS = 3
+
+# Timing loop bounds per (threads, batch size) configuration
+WARMUP_ITERATIONS = 10
+MIN_ITERATIONS = 20
+MAX_ITERATIONS = 1000
+MIN_SECONDS = 0.25
+
+MODEL_TYPES = {
+    'calling_score': (train_calling_score_model.CallingScoreModel, train_calling_score_model.load_training_data),
+    'outcome': (train_outcome_prediction_model.OutcomePredictionModel, train_outcome_prediction_model.load_training_data),
+}
+
+
+def model_size_kb(onnx_path: str) -> float:
+    """Size of the model including an external <model>.onnx.data weights file"""
+    weights_path = onnx_path + '.data'
+    size = os.path.getsize(onnx_path) + (os.path.getsize(weights_path) if os.path.exists(weights_path) else 0)
+    return size / 1024
+
+
+def create_session(onnx_path: str, num_threads: Optional[int] = None) -> ort.InferenceSession:
+    """CPU inference session (num_threads intra-op threads; None = runtime default)"""
+    options = ort.SessionOptions()
+    # forward() squeezes its output, so single-row runs return a scalar for the
+    # declared [batch_size] output; ONNX Runtime warns about that on every call
+    options.log_severity_level = 3
+    if num_threads:
+        options.intra_op_num_threads = num_threads
+        options.inter_op_num_threads = 1
+    return ort.InferenceSession(onnx_path, sess_options=options, providers=['CPUExecutionProvider'])
+
+
+def run_session(session: ort.InferenceSession, features: np.ndarray) -> np.ndarray:
+    """Model outputs for a float32 feature matrix, flattened to one value per row"""
+    input_name = session.get_inputs()[0].name
+    return session.run(None, {input_name: features})[0].reshape(-1)
+
+
+def measure_load(onnx_path: str, input_size: int, repeats: int = LOAD_REPEATS) -> Dict[str, float]:
+    """
+    Session load time (best of repeats) and resident memory added by the first
+    session, including its first inference
+    """
+    process = psutil.Process(os.getpid())
+    dummy = np.zeros((1, input_size), dtype=np.float32)
+    
+    rss_before = process.memory_info().rss
+    load_times = []
+    memory_mb = 0.0
+    for repeat in range(repeats):
+        start = time.perf_counter()
+        session = create_session(onnx_path)
+        load_times.append(time.perf_counter() - start)
+        if repeat == 0:
+            run_session(session, dummy)
+            memory_mb = (process.memory_info().rss - rss_before) / 1024 / 1024
+        del session
+    
+    return {
+        'load_time_ms': min(load_times) * 1000,
+        'memory_mb': max(memory_mb, 0.0),
+        'model_size_kb': model_size_kb(onnx_path),
+    }
+
+
+def check_parity(
+    session: ort.InferenceSession,
+    model: nn.Module,
+    features: np.ndarray,
+    atol: float = PARITY_ATOL,
+    rtol: float = PARITY_RTOL,
+) -> Dict:
+    """Compare ONNX Runtime outputs with the PyTorch model's on features"""
+    model = model.cpu().eval()
+    onnx_outputs = []
+    torch_outputs = []
+    with torch.no_grad():
+        for start in range(0, len(features), PARITY_BATCH_SIZE):
+            batch = features[start:start + PARITY_BATCH_SIZE]
+            onnx_outputs.append(run_session(session, batch))
+            torch_outputs.append(model(torch.from_numpy(batch)).reshape(-1).numpy())
+    onnx_outputs = np.concatenate(onnx_outputs)
+    torch_outputs = np.concatenate(torch_outputs)
+    
+    diff = np.abs(onnx_outputs.astype(np.float64) - torch_outputs)
+    return {
+        'samples': len(features),
+        'max_abs_diff': float(diff.max()) if len(diff) else 0.0,
+        'mean_abs_diff': float(diff.mean()) if len(diff) else 0.0,
+        'threshold_mismatches': int(np.sum((onnx_outputs > 0.5) != (torch_outputs > 0.5))),
+        'atol': atol,
+        'rtol': rtol,
+        'passed': bool(np.allclose(onnx_outputs, torch_outputs, atol=atol, rtol=rtol)),
+    }
+
+
+def measure_latency(session: ort.InferenceSession, features: np.ndarray, batch_size: int) -> Dict[str, float]:
+    """
+    Per-call latency percentiles and throughput for batch_size rows
+    
+    Rows are taken from features (wrapping around), so the timed inputs are
+    real test-split rows.
+    """
+    batch = np.ascontiguousarray(np.take(features, np.arange(batch_size), axis=0, mode='wrap'))
+    input_name = session.get_inputs()[0].name
+    output_names = [output.name for output in session.get_outputs()]
+    feeds = {input_name: batch}
+    
+    for _ in range(WARMUP_ITERATIONS):
+        session.run(output_names, feeds)
+    
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < MAX_ITERATIONS and (
+        len(timings) < MIN_ITERATIONS or time.perf_counter() - started < MIN_SECONDS
+    ):
+        start = time.perf_counter()
+        session.run(output_names, feeds)
+        timings.append(time.perf_counter() - start)
+    
+    timings_ms = np.array(timings) * 1000
+    return {
+        'batch_size': batch_size,
+        'iterations': len(timings),
+        'mean_ms': float(timings_ms.mean()),
+        'p50_ms': float(np.percentile(timings_ms, 50)),
+        'p95_ms': float(np.percentile(timings_ms, 95)),
+        'p99_ms': float(np.percentile(timings_ms, 99)),
+        'rows_per_second': float(batch_size / (timings_ms.mean() / 1000)),
+    }
+
+
+def benchmark_onnx_model(
+    onnx_path: str,
+    model: nn.Module,
+    X_test: np.ndarray,
+    batch_sizes: Sequence[int] = DEFAULT_BATCH_SIZES,
+    thread_counts: Sequence[int] = DEFAULT_THREAD_COUNTS,
+) -> Dict:
+    """
+    Parity, load cost and latency of an exported model
+    
+    Args:
+        onnx_path: Exported model
+        model: PyTorch model the export came from (reference for parity)
+        X_test: Standardized test split features
+        batch_sizes: Batch sizes to time (1 = single-row latency)
+        thread_counts: ONNX Runtime intra-op thread counts to time
+    
+    Returns:
+        Benchmark results (JSON-serializable)
+    """
+    features = np.ascontiguousarray(X_test, dtype=np.float32)
+    input_size = features.shape[1]
+    batch_sizes = sorted(set(batch_sizes) | {1})
+    thread_counts = sorted(set(thread_counts))
+    
+    load = measure_load(onnx_path, input_size)
+    parity = check_parity(create_session(onnx_path), model, features)
+    
+    runs = []
+    for num_threads in thread_counts:
+        session = create_session(onnx_path, num_threads)
+        for batch_size in batch_sizes:
+            runs.append(dict(threads=num_threads, **measure_latency(session, features, batch_size)))
+    
+    single_row = min(
+        (run for run in runs if run['batch_size'] == 1),
+        key=lambda run: run['p50_ms'],
+    )
+    best_throughput = max(runs, key=lambda run: run['rows_per_second'])
+    
+    return {
+        'model': Path(onnx_path).name,
+        'timestamp': datetime.now().isoformat(),
+        'onnxruntime_version': ort.__version__,
+        'platform': {
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+        },
+        'input_size': input_size,
+        'load': load,
+        'parity': parity,
+        'single_row': single_row,
+        'best_throughput': best_throughput,
+        'runs': runs,
+    }
+
+
+def record_benchmark(onnx_path: str, results: Dict, config_path: Optional[str] = None):
+    """Store results in the ModelManager registry next to the model"""
+    model_path = Path(onnx_path).resolve()
+    manager = ModelManager(config_path=config_path, models_dir=model_path.parent)
+    manager.record_benchmark(model_path.name, results)
+    return manager.config_path
+
+
+def load_reference_model(onnx_path: str, model_type: str) -> nn.Module:
+    """
+    Rebuild the PyTorch model from the exported ONNX weights
+    
+    The exporter keeps the state_dict names ('model.<layer>.weight') as
+    initializer names; hidden sizes are read from the Linear weight shapes.
+    """
+    model_class, _ = MODEL_TYPES[model_type]
+    weights = {
+        initializer.name: torch.from_numpy(numpy_helper.to_array(initializer).copy())
+        for initializer in onnx.load(onnx_path).graph.initializer
+    }
+    layer_weights = sorted(
+        (int(name.split('.')[1]), tensor)
+        for name, tensor in weights.items()
+        if name.startswith('model.') and name.endswith('.weight')
+    )
+    if not layer_weights:
+        raise ValueError(
+            f"{onnx_path} has no 'model.<layer>.weight' initializers to rebuild the PyTorch model from; "
+            "benchmark from the trainer with --benchmark instead"
+        )
+    
+    input_size = layer_weights[0][1].shape[1]
+    hidden_sizes = [tensor.shape[0] for _, tensor in layer_weights[:-1]]
+    output_size = layer_weights[-1][1].shape[0]
+    model = model_class(input_size=input_size, hidden_sizes=hidden_sizes, output_size=output_size)
+    model.load_state_dict({name: tensor for name, tensor in weights.items() if name.startswith('model.')})
+    return model.eval()
+
+
+def load_test_split(data_path: str, model_type: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Standardized test split, derived the same way the trainer derives it"""
+    _, load_training_data = MODEL_TYPES[model_type]
+    features, labels = load_training_data(data_path)
+    features_scaled = StandardScaler().fit_transform(features)
+    stratify = labels if model_type == 'outcome' else None
+    _, X_temp, _, y_temp = train_test_split(
+        features_scaled, labels, test_size=0.3, random_state=42, stratify=stratify
+    )
+    _, X_test, _, y_test = train_test_split(
+        X_temp, y_temp, test_size=0.5, random_state=42, stratify=y_temp if stratify is not None else None
+    )
+    return X_test.astype(np.float32), y_test
+
+
+def print_summary(results: Dict):
+    """Print benchmark results"""
+    load = results['load']
+    parity = results['parity']
+    print(f"\nONNX Runtime {results['onnxruntime_version']} benchmark: {results['model']}")
+    print(f"  Model size: {load['model_size_kb']:.1f} KB")
+    print(f"  Load time: {load['load_time_ms']:.2f} ms, memory: {load['memory_mb']:.1f} MB")
+    print(f"  Parity ({parity['samples']} test samples): "
+          f"{'✅ passed' if parity['passed'] else '❌ FAILED'} "
+          f"(max |diff| {parity['max_abs_diff']:.2e}, mean {parity['mean_abs_diff']:.2e}, "
+          f"{parity['threshold_mismatches']} threshold mismatches)")
+    print(f"\n  {'Threads':>7} {'Batch':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rows/s':>12}")
+    for run in results['runs']:
+        print(f"  {run['threads']:>7} {run['batch_size']:>6} {run['p50_ms']:>9.3f} {run['p95_ms']:>9.3f} "
+              f"{run['p99_ms']:>9.3f} {run['rows_per_second']:>12,.0f}")
+    single_row = results['single_row']
+    best = results['best_throughput']
+    print(f"\n  Single-row p50: {single_row['p50_ms']:.3f} ms ({single_row['threads']} threads)")
+    print(f"  Best throughput: {best['rows_per_second']:,.0f} rows/s "
+          f"(batch {best['batch_size']}, {best['threads']} threads)")
+
+
+def parse_int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(',') if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark an exported ONNX model with ONNX Runtime')
+    parser.add_argument('model_path', type=str, help='Exported ONNX model')
+    parser.add_argument(
+        '--data-path',
+        type=str,
+        required=True,
+        help='Training data the model was trained on (test split is re-derived from it)',
+    )
+    parser.add_argument(
+        '--model-type',
+        type=str,
+        default='calling_score',
+        choices=list(MODEL_TYPES),
+        help='Model architecture / training data loader',
+    )
+    parser.add_argument(
+        '--batch-sizes',
+        type=parse_int_list,
+        default=list(DEFAULT_BATCH_SIZES),
+        help='Comma-separated batch sizes to time (default: 1,8,32,128,512,2048)',
+    )
+    parser.add_argument(
+        '--threads',
+        type=parse_int_list,
+        default=list(DEFAULT_THREAD_COUNTS),
+        help='Comma-separated ONNX Runtime thread counts to time (default: 1,2,4)',
+    )
+    parser.add_argument(
+        '--registry',
+        type=str,
+        default=None,
+        help='Registry file to record results in (default: model_registry.json next to the model)',
+    )
+    parser.add_argument('--no-record', action='store_true', help='Do not record results in the registry')
+    parser.add_argument('--output-json', type=str, default=None, help='Also write results to this JSON file')
+    
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.model_path):
+        print(f"❌ Error: Model not found: {args.model_path}")
+        sys.exit(1)
+    
+    print("Loading test split...")
+    X_test, _ = load_test_split(args.data_path, args.model_type)
+    print(f"Test samples: {len(X_test)}")
+    model = load_reference_model(args.model_path, args.model_type)
+    
+    results = benchmark_onnx_model(args.model_path, model, X_test, args.batch_sizes, args.threads)
+    print_summary(results)
+    
+    if args.output_json:
+        with open(args.output_json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to: {args.output_json}")
+    if not args.no_record:
+        registry_path = record_benchmark(args.model_path, results, args.registry)
+        print(f"Results recorded in: {registry_path}")
+    
+    sys.exit(0 if results['parity']['passed'] else 1)
+
+
+if __name__ == '__main__':
+    main()
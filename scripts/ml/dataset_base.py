@@ -5,16 +5,44 @@ Base Dataset Architecture for SPOTS ML Training
 Provides shared data structures and utilities for all ML training datasets.
 This ensures consistency across synthetic, hybrid, and real data generators.
 
+Datasets are stored either as JSON (interchange format, also written by
+export_training_data.dart) or as a columnar directory of .npy arrays that
+trainers memory-map without building per-record dicts:
+
+    <dataset_dir>/dataset.json                  manifest + metadata
+    <dataset_dir>/<feature_field>.npy           (N, features) float32, NaN = missing
+    <dataset_dir>/formula_calling_score.npy     (N,) float64
+    <dataset_dir>/outcome_score.npy             (N,) float64
+    <dataset_dir>/is_called.npy                 (N,) bool
+    <dataset_dir>/outcome_type.npy              (N,) int8 codes into manifest outcome_types
+    <dataset_dir>/<id_field>.npy                (N,) str ('' = missing), only if present
+
+Feature columns follow the feature names in feature_schema.py. Columnar
+datasets are written to a temporary sibling directory and renamed into
+place, and never replace a non-empty directory that is not a dataset.
+
 Phase 12 Section 2: Neural Network Implementation
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Sequence, Tuple
 from pathlib import Path
 import json
+import os
+import shutil
+import tempfile
 from datetime import datetime
 import numpy as np
 
+from feature_schema import FeatureSchema, VIBE_DIMENSIONS, record_fields
+
+COLUMNAR_VERSION = 1
+COLUMNAR_MANIFEST = 'dataset.json'
+SCORE_COLUMNS = ('formula_calling_score', 'outcome_score')
+ID_COLUMNS = ('user_id', 'opportunity_id', 'timestamp')
+OUTCOME_TYPES = ('neutral', 'positive', 'negative')
+WRITE_CHUNK_SIZE = 65536
+
 
 @dataclass
 class TrainingRecord:
@@ -31,6 +59,9 @@ class TrainingRecord:
     context_features: Dict[str, float] = field(default_factory=dict)
     timing_features: Dict[str, float] = field(default_factory=dict)
     
+    # User history features (outcome prediction model)
+    history_features: Dict[str, float] = field(default_factory=dict)
+    
     # Labels
     formula_calling_score: float = 0.0
     is_called: bool = False
@@ -49,6 +80,7 @@ class TrainingRecord:
             'spot_vibe_dimensions': self.spot_vibe_dimensions,
             'context_features': self.context_features,
             'timing_features': self.timing_features,
+            **({'history_features': self.history_features} if self.history_features else {}),
             'formula_calling_score': self.formula_calling_score,
             'is_called': self.is_called,
             'outcome_type': self.outcome_type,
@@ -66,6 +98,7 @@ class TrainingRecord:
             spot_vibe_dimensions=data.get('spot_vibe_dimensions', {}),
             context_features=data.get('context_features', {}),
             timing_features=data.get('timing_features', {}),
+            history_features=data.get('history_features', {}),
             formula_calling_score=data.get('formula_calling_score', 0.0),
             is_called=data.get('is_called', False),
             outcome_type=data.get('outcome_type', 'neutral'),
@@ -178,15 +211,37 @@ class TrainingDataset:
         }
     
     def save(self, output_path: Path):
-        """Save dataset to JSON file"""
+        """
+        Save dataset to disk.
+        
+        A path ending in .json is written as JSON; any other path is written
+        as a columnar dataset directory (see save_columnar).
+        """
+        output_path = Path(output_path)
+        if output_path.suffix != '.json':
+            self.save_columnar(output_path)
+            return
+        
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(self.to_dict(), f, indent=2)
     
+    def save_columnar(self, output_dir: Path):
+        """Save dataset as a columnar directory of .npy arrays"""
+        with ColumnarDatasetWriter(output_dir, len(self.records)) as writer:
+            for start in range(0, len(self.records), WRITE_CHUNK_SIZE):
+                chunk = self.records[start:start + WRITE_CHUNK_SIZE]
+                writer.write_records(start, [record.to_dict() for record in chunk])
+            writer.close(self.metadata)
+    
     @classmethod
     def load(cls, input_path: Path) -> 'TrainingDataset':
-        """Load dataset from JSON file"""
+        """Load dataset from a JSON file or a columnar dataset directory"""
+        if is_columnar_dataset(input_path):
+            columns = ColumnarDataset.open(input_path)
+            return cls(metadata=columns.metadata, records=list(columns.iter_records()))
+        
         with open(input_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
@@ -209,20 +264,7 @@ class TrainingDataset:
         issues = []
         
         # Check required dimensions
-        required_dimensions = [
-            'exploration_eagerness',
-            'community_orientation',
-            'location_adventurousness',
-            'authenticity_preference',
-            'trust_network_reliance',
-            'temporal_flexibility',
-            'energy_preference',
-            'novelty_seeking',
-            'value_orientation',
-            'crowd_tolerance',
-            'social_preference',
-            'overall_energy',
-        ]
+        required_dimensions = VIBE_DIMENSIONS
         
         for i, record in enumerate(self.records):
             # Check user vibe dimensions
@@ -248,3 +290,345 @@ class TrainingDataset:
                 issues.append(f"Record {i}: outcome_score out of range [0.0, 1.0]")
         
         return issues
+
+
+def is_columnar_dataset(path: Path) -> bool:
+    """True if path is a columnar dataset directory"""
+    return (Path(path) / COLUMNAR_MANIFEST).exists()
+
+
+def _feature_block(records: Sequence[Dict[str, Any]], field_name: str, names: Sequence[str]) -> np.ndarray:
+    """(len(records), len(names)) float32 block for one feature field (NaN where missing)"""
+    nan = float('nan')
+    rows = []
+    for record in records:
+        values = record.get(field_name) or {}
+        rows.append([values.get(name, nan) for name in names])
+    return np.array(rows, dtype=np.float32).reshape(len(records), len(names))
+
+
+def _encode_outcome_types(values: Iterable[str], outcome_types: List[str]) -> np.ndarray:
+    """int8 codes into outcome_types (unseen types are appended to it)"""
+    codes = {outcome_type: i for i, outcome_type in enumerate(outcome_types)}
+    encoded = []
+    for value in values:
+        if value not in codes:
+            codes[value] = len(outcome_types)
+            outcome_types.append(value)
+        encoded.append(codes[value])
+    return np.array(encoded, dtype=np.int8)
+
+
+def _id_array(values: Sequence[Optional[str]]) -> Optional[np.ndarray]:
+    """str array with '' for missing ids (None if no id is set)"""
+    if all(value is None for value in values):
+        return None
+    return np.array(['' if value is None else str(value) for value in values], dtype=str)
+
+
+def _record_columns(
+    records: Sequence[Dict[str, Any]],
+    feature_fields: Dict[str, Tuple[str, ...]],
+    outcome_types: List[str],
+) -> Dict[str, Any]:
+    """Column arrays for a batch of record dicts (ids stay lists)"""
+    columns: Dict[str, Any] = {
+        field_name: _feature_block(records, field_name, names)
+        for field_name, names in feature_fields.items()
+    }
+    for name in SCORE_COLUMNS:
+        columns[name] = np.array([record.get(name, np.nan) for record in records], dtype=np.float64)
+    columns['is_called'] = np.array([bool(record.get('is_called', False)) for record in records], dtype=bool)
+    columns['outcome_type'] = _encode_outcome_types(
+        (record.get('outcome_type', 'neutral') for record in records), outcome_types
+    )
+    for name in ID_COLUMNS:
+        columns[name] = [record.get(name) for record in records]
+    return columns
+
+
+class ColumnarDatasetWriter:
+    """
+    Chunked writer for a columnar dataset of known size.
+    
+    Feature and label columns are preallocated .npy files filled in place,
+    so datasets larger than memory can be written chunk by chunk. Ids and
+    the manifest are written by close(); feature and score columns that
+    were never written are stored as missing (NaN).
+    
+    Columns are built in a temporary directory next to output_dir, which
+    close() renames into place (replacing a previous columnar dataset).
+    Used as a context manager, a writer that was not closed is discarded.
+    """
+    
+    def __init__(
+        self,
+        output_dir: Path,
+        num_records: int,
+        feature_fields: Optional[Dict[str, Sequence[str]]] = None,
+    ):
+        """
+        Args:
+            output_dir: Dataset directory; must be missing, empty or an
+                existing columnar dataset (which close() replaces)
+            num_records: Total number of records that will be written
+            feature_fields: Feature names per field (default: all registered feature schemas)
+        """
+        self.output_dir = Path(output_dir)
+        if self.output_dir.exists() and not (
+            self.output_dir.is_dir()
+            and (is_columnar_dataset(self.output_dir) or not any(self.output_dir.iterdir()))
+        ):
+            raise FileExistsError(
+                f"{self.output_dir} exists and is not a columnar dataset; refusing to overwrite it"
+            )
+        self.output_dir.parent.mkdir(parents=True, exist_ok=True)
+        self._build_dir = Path(tempfile.mkdtemp(dir=self.output_dir.parent, prefix=f'.{self.output_dir.name}-'))
+        self.closed = False
+        
+        self.num_records = num_records
+        self.feature_fields = {
+            field_name: tuple(names)
+            for field_name, names in (feature_fields or record_fields()).items()
+        }
+        self.outcome_types = list(OUTCOME_TYPES)
+        
+        self._columns: Dict[str, np.ndarray] = {}
+        for field_name, names in self.feature_fields.items():
+            self._columns[field_name] = self._allocate(field_name, np.float32, (len(names),))
+        for name in SCORE_COLUMNS:
+            self._columns[name] = self._allocate(name, np.float64)
+        self._columns['is_called'] = self._allocate('is_called', np.bool_)
+        self._columns['outcome_type'] = self._allocate('outcome_type', np.int8)
+        self._ids: Dict[str, List[Optional[str]]] = {}
+        self._written = set()
+    
+    def __enter__(self) -> 'ColumnarDatasetWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self.closed:
+            self.abort()
+    
+    def _allocate(self, name: str, dtype, shape: Tuple[int, ...] = ()) -> np.ndarray:
+        path = self._build_dir / f'{name}.npy'
+        full_shape = (self.num_records,) + shape
+        if self.num_records == 0:
+            # Empty files cannot be memory-mapped
+            np.save(path, np.empty(full_shape, dtype=dtype))
+            return np.empty(full_shape, dtype=dtype)
+        return np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=full_shape)
+    
+    def write_columns(self, start: int, columns: Dict[str, Any]):
+        """
+        Write column values for records [start, start + chunk length).
+        
+        Feature fields take (n, len(names)) blocks in feature_fields order;
+        outcome_type takes either strings or int8 codes into outcome_types.
+        """
+        for name, values in columns.items():
+            if name in ID_COLUMNS:
+                values = list(values)
+                if name not in self._ids:
+                    if all(value is None for value in values):
+                        continue
+                    self._ids[name] = [None] * self.num_records
+                self._ids[name][start:start + len(values)] = values
+                continue
+            if name not in self._columns:
+                raise KeyError(f"Unknown column {name!r}")
+            if name == 'outcome_type':
+                values = np.asarray(values)
+                if values.dtype.kind in 'USO':
+                    values = _encode_outcome_types(values.tolist(), self.outcome_types)
+            self._columns[name][start:start + len(values)] = values
+            self._written.add(name)
+    
+    def write_records(self, start: int, records: Sequence[Dict[str, Any]]):
+        """Write a chunk of record dicts (TrainingRecord.to_dict / JSON layout) starting at start"""
+        self.write_columns(start, _record_columns(records, self.feature_fields, self.outcome_types))
+    
+    def close(self, metadata: DatasetMetadata):
+        """Flush columns, write ids and the manifest, and move the dataset into place"""
+        for name, values in self._columns.items():
+            # Float columns that were never written are missing, not zero
+            if name not in self._written and values.dtype.kind == 'f':
+                values[:] = np.nan
+            if isinstance(values, np.memmap):
+                values.flush()
+        for name, values in self._ids.items():
+            np.save(self._build_dir / f'{name}.npy', _id_array(values))
+        
+        metadata.num_samples = self.num_records
+        manifest = {
+            'version': COLUMNAR_VERSION,
+            'num_records': self.num_records,
+            'metadata': metadata.to_dict(),
+            'feature_fields': {field_name: list(names) for field_name, names in self.feature_fields.items()},
+            'outcome_types': self.outcome_types,
+            'id_columns': list(self._ids),
+        }
+        with open(self._build_dir / COLUMNAR_MANIFEST, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        self._columns = {}
+        
+        # Swap the finished dataset in; the previous one is removed afterwards
+        previous_dir = None
+        if self.output_dir.exists():
+            previous_dir = Path(tempfile.mkdtemp(dir=self.output_dir.parent, prefix=f'.{self.output_dir.name}-old-'))
+            os.rename(self.output_dir, previous_dir / self.output_dir.name)
+        os.rename(self._build_dir, self.output_dir)
+        if previous_dir is not None:
+            shutil.rmtree(previous_dir, ignore_errors=True)
+        self.closed = True
+    
+    def abort(self):
+        """Discard everything written so far (output_dir is left untouched)"""
+        self._columns = {}
+        shutil.rmtree(self._build_dir, ignore_errors=True)
+        self.closed = True
+
+
+class ColumnarDataset:
+    """
+    Column view of a training dataset.
+    
+    Opened from a columnar directory the columns are memory-mapped; opened
+    from JSON they are built in memory once.
+    """
+    
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        feature_fields: Dict[str, Tuple[str, ...]],
+        outcome_types: Sequence[str],
+        metadata: DatasetMetadata,
+    ):
+        self.columns = columns
+        self.feature_fields = feature_fields
+        self.outcome_types = list(outcome_types)
+        self.metadata = metadata
+    
+    @classmethod
+    def open(cls, input_dir: Path, mmap_mode: Optional[str] = 'r') -> 'ColumnarDataset':
+        """Open a columnar dataset directory (mmap_mode=None reads columns into memory)"""
+        input_dir = Path(input_dir)
+        with open(input_dir / COLUMNAR_MANIFEST, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest['version'] != COLUMNAR_VERSION:
+            raise ValueError(f"Unsupported dataset version {manifest['version']} (expected {COLUMNAR_VERSION})")
+        
+        feature_fields = {field_name: tuple(names) for field_name, names in manifest['feature_fields'].items()}
+        names = list(feature_fields) + list(SCORE_COLUMNS) + ['is_called', 'outcome_type'] + manifest['id_columns']
+        # Empty arrays cannot be memory-mapped
+        mode = mmap_mode if manifest['num_records'] > 0 else None
+        columns = {name: np.load(input_dir / f'{name}.npy', mmap_mode=mode) for name in names}
+        return cls(columns, feature_fields, manifest['outcome_types'], DatasetMetadata.from_dict(manifest['metadata']))
+    
+    @classmethod
+    def from_json(cls, input_path: Path) -> 'ColumnarDataset':
+        """Build columns from a JSON dataset file"""
+        with open(input_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        records = data.get('training_data', [])
+        
+        feature_fields = record_fields()
+        outcome_types = list(OUTCOME_TYPES)
+        columns = _record_columns(records, feature_fields, outcome_types)
+        for name in ID_COLUMNS:
+            ids = _id_array(columns.pop(name))
+            if ids is not None:
+                columns[name] = ids
+        
+        metadata = DatasetMetadata.from_dict(data.get('metadata', {}))
+        metadata.num_samples = len(records)
+        return cls(columns, feature_fields, outcome_types, metadata)
+    
+    @classmethod
+    def load(cls, path: Path) -> 'ColumnarDataset':
+        """Open a columnar dataset directory or build columns from a JSON file"""
+        if is_columnar_dataset(path):
+            return cls.open(path)
+        return cls.from_json(path)
+    
+    def __len__(self) -> int:
+        return len(self.columns['outcome_type'])
+    
+    def column(self, name: str) -> np.ndarray:
+        return self.columns[name]
+    
+    def feature_matrix(self, schema: FeatureSchema) -> np.ndarray:
+        """(N, schema.size) float32 feature matrix with schema defaults for missing values"""
+        return schema.matrix({
+            field_name: (names, self.columns[field_name])
+            for field_name, names in self.feature_fields.items()
+        })
+    
+    def outcome_type_mask(self, outcome_type: str) -> np.ndarray:
+        """Boolean mask of records with the given outcome type"""
+        if outcome_type not in self.outcome_types:
+            return np.zeros(len(self), dtype=bool)
+        return self.columns['outcome_type'] == self.outcome_types.index(outcome_type)
+    
+    def iter_records(self, chunk_size: int = WRITE_CHUNK_SIZE) -> Iterable[TrainingRecord]:
+        """
+        TrainingRecords in dataset order (missing features are omitted).
+        
+        Features are stored as float32, so they are rounded to 7 decimals
+        instead of carrying float32 noise (0.7821 rather than 0.78210002).
+        """
+        for start in range(0, len(self), chunk_size):
+            stop = min(start + chunk_size, len(self))
+            blocks = {
+                field_name: (names, np.round(self.columns[field_name][start:stop].astype(np.float64), 7).tolist())
+                for field_name, names in self.feature_fields.items()
+            }
+            scores = {name: self.columns[name][start:stop].tolist() for name in SCORE_COLUMNS}
+            is_called = self.columns['is_called'][start:stop].tolist()
+            outcome_codes = self.columns['outcome_type'][start:stop].tolist()
+            ids = {name: self.columns[name][start:stop].tolist() for name in ID_COLUMNS if name in self.columns}
+            
+            for i in range(stop - start):
+                features = {
+                    field_name: {name: value for name, value in zip(names, rows[i]) if value == value}
+                    for field_name, (names, rows) in blocks.items()
+                }
+                yield TrainingRecord(
+                    **features,
+                    formula_calling_score=scores['formula_calling_score'][i],
+                    is_called=is_called[i],
+                    outcome_type=self.outcome_types[outcome_codes[i]],
+                    outcome_score=scores['outcome_score'][i],
+                    **{name: values[i] or None for name, values in ids.items()},
+                )
+    
+    def save_json(self, output_path: Path):
+        """Stream the dataset to a JSON file in the TrainingDataset layout (one record per line)"""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write('{\n"metadata": ')
+            f.write(json.dumps(self.metadata.to_dict()))
+            f.write(',\n"training_data": [\n')
+            for i, record in enumerate(self.iter_records()):
+                if i:
+                    f.write(',\n')
+                f.write(json.dumps(record.to_dict()))
+            f.write('\n]\n}\n')
+
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description='Convert a training dataset between JSON and columnar formats '
+                    '(an output path ending in .json writes JSON, anything else a columnar directory)'
+    )
+    parser.add_argument('input', type=Path, help='Input JSON file or columnar dataset directory')
+    parser.add_argument('output', type=Path, help='Output path')
+    args = parser.parse_args()
+    
+    dataset = TrainingDataset.load(args.input)
+    dataset.save(args.output)
+    print(f"Converted {len(dataset)} records: {args.input} -> {args.output}")
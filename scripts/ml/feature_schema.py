@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Feature Schema Registry for SPOTS ML Models
+
+Single source of truth for the feature vectors the ML models consume.
+A FeatureSchema is an ordered list of FeatureGroups; each group maps one
+TrainingRecord field (e.g. 'context_features') to an ordered list of
+feature names and the default used when a record lacks a feature.
+
+Registered schemas:
+- calling_score: 39 features (12D user + 12D spot + 10 context + 5 timing)
+- outcome_prediction: 45 features (calling_score + 6 history features)
+
+Phase 12 Section 2: Neural Network Implementation
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# 12 SPOTS vibe dimensions, shared by user and spot vibes
+VIBE_DIMENSIONS = (
+    'exploration_eagerness',
+    'community_orientation',
+    'location_adventurousness',
+    'authenticity_preference',
+    'trust_network_reliance',
+    'temporal_flexibility',
+    'energy_preference',
+    'novelty_seeking',
+    'value_orientation',
+    'crowd_tolerance',
+    'social_preference',
+    'overall_energy',
+)
+
+CONTEXT_FEATURES = (
+    'location_proximity',
+    'journey_alignment',
+    'user_receptivity',
+    'opportunity_availability',
+    'network_effects',
+    'community_patterns',
+    'vibe_compatibility',
+    'energy_match',
+    'community_match',
+    'novelty_match',
+)
+
+TIMING_FEATURES = (
+    'optimal_time_of_day',
+    'optimal_day_of_week',
+    'user_patterns',
+    'opportunity_timing',
+    'timing_alignment',
+)
+
+HISTORY_FEATURES = (
+    'past_positive_rate',
+    'past_negative_rate',
+    'average_engagement',
+    'interaction_count',
+    'time_since_last_positive',
+    'activity_level',
+)
+
+
+@dataclass(frozen=True)
+class FeatureGroup:
+    """Ordered features read from one record field"""
+    field: str
+    names: Tuple[str, ...]
+    default: float = 0.5
+    overrides: Tuple[Tuple[str, float], ...] = ()  # (name, default) pairs differing from default
+    
+    @property
+    def defaults(self) -> np.ndarray:
+        """Per-feature defaults in feature order"""
+        overrides = dict(self.overrides)
+        return np.array([overrides.get(name, self.default) for name in self.names], dtype=np.float32)
+
+
+@dataclass(frozen=True)
+class FeatureSchema:
+    """Ordered feature groups making up one model's input vector"""
+    name: str
+    groups: Tuple[FeatureGroup, ...]
+    
+    @property
+    def size(self) -> int:
+        return sum(len(group.names) for group in self.groups)
+    
+    @property
+    def feature_names(self) -> List[str]:
+        """Qualified feature names ('<field>.<name>') in vector order"""
+        return [f"{group.field}.{name}" for group in self.groups for name in group.names]
+    
+    def extract(self, record: Mapping) -> List[float]:
+        """Feature vector for one record dict (JSON / TrainingRecord.to_dict layout)"""
+        features = []
+        for group in self.groups:
+            values = record.get(group.field) or {}
+            for name, default in zip(group.names, group.defaults.tolist()):
+                features.append(float(values.get(name, default)))
+        return features
+    
+    def matrix(self, group_columns: Mapping[str, Tuple[Sequence[str], np.ndarray]]) -> np.ndarray:
+        """
+        Feature matrix from per-field column blocks.
+        
+        Args:
+            group_columns: field -> (stored feature names, (N, len(names)) array);
+                missing values are NaN. Fields may be absent entirely.
+        
+        Returns:
+            (N, size) float32 matrix with schema defaults filled in
+        """
+        num_records = None
+        for _, block in group_columns.values():
+            num_records = len(block)
+            break
+        if num_records is None:
+            raise ValueError("No feature columns to build a matrix from")
+        
+        matrix = np.empty((num_records, self.size), dtype=np.float32)
+        offset = 0
+        for group in self.groups:
+            width = len(group.names)
+            out = matrix[:, offset:offset + width]
+            if group.field in group_columns:
+                stored_names, block = group_columns[group.field]
+                stored_names = tuple(stored_names)
+                if stored_names[:width] == group.names:
+                    # Common case: stored layout starts with the schema's names
+                    out[:] = block[:, :width]
+                else:
+                    out[:] = group.defaults
+                    index = {name: i for i, name in enumerate(stored_names)}
+                    for j, name in enumerate(group.names):
+                        if name in index:
+                            out[:, j] = block[:, index[name]]
+                missing = np.isnan(out)
+                if missing.any():
+                    np.copyto(out, np.broadcast_to(group.defaults, out.shape), where=missing)
+            else:
+                out[:] = group.defaults
+            offset += width
+        return matrix
+
+
+CALLING_SCORE_SCHEMA = FeatureSchema(
+    name='calling_score',
+    groups=(
+        FeatureGroup('user_vibe_dimensions', VIBE_DIMENSIONS),
+        FeatureGroup('spot_vibe_dimensions', VIBE_DIMENSIONS),
+        FeatureGroup('context_features', CONTEXT_FEATURES),
+        FeatureGroup('timing_features', TIMING_FEATURES),
+    ),
+)
+
+OUTCOME_PREDICTION_SCHEMA = FeatureSchema(
+    name='outcome_prediction',
+    groups=CALLING_SCORE_SCHEMA.groups + (
+        FeatureGroup('history_features', HISTORY_FEATURES, overrides=(('interaction_count', 0.0),)),
+    ),
+)
+
+_SCHEMAS: Dict[str, FeatureSchema] = {}
+
+
+def register_schema(schema: FeatureSchema) -> FeatureSchema:
+    """Register a schema under its name (re-registering the same name replaces it)"""
+    _SCHEMAS[schema.name] = schema
+    return schema
+
+
+def get_schema(name: str) -> FeatureSchema:
+    """Look up a registered schema by name"""
+    if name not in _SCHEMAS:
+        raise KeyError(f"Unknown feature schema {name!r} (registered: {sorted(_SCHEMAS)})")
+    return _SCHEMAS[name]
+
+
+def registered_schemas() -> List[str]:
+    return sorted(_SCHEMAS)
+
+
+def record_fields(schemas: Optional[Sequence[FeatureSchema]] = None) -> Dict[str, Tuple[str, ...]]:
+    """
+    Feature names per record field across schemas (all registered by default),
+    in first-seen order. This is the column layout of columnar datasets.
+    """
+    fields: Dict[str, List[str]] = {}
+    for schema in (schemas if schemas is not None else _SCHEMAS.values()):
+        for group in schema.groups:
+            names = fields.setdefault(group.field, [])
+            names.extend(name for name in group.names if name not in names)
+    return {field: tuple(names) for field, names in fields.items()}
+
+
+register_schema(CALLING_SCORE_SCHEMA)
+register_schema(OUTCOME_PREDICTION_SCHEMA)
@@ -9,6 +9,11 @@ combined with synthetic spot vibes, context, timing, and outcomes.
 This provides better personality distributions than 100% synthetic data
 while still being synthetic for spots/context/timing/outcomes.
 
+Records are generated as arrays, chunk by chunk, and written straight into
+a columnar dataset (see dataset_base.py). Random draws come from fixed-size
+blocks of records, each with its own stream derived from --seed, so the
+output is identical for any --chunk-size.
+
 Usage:
     # First, convert Big Five dataset to SPOTS format:
     python scripts/knot_validation/data_converter.py data/raw/big_five.csv --output data/raw/big_five_spots.json
@@ -22,11 +27,11 @@ Usage:
 
 import argparse
 import json
-import os
-import random
+import shutil
 import sys
+import tempfile
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 import numpy as np
 
@@ -35,7 +40,30 @@ scripts_ml_path = Path(__file__).parent
 sys.path.insert(0, str(scripts_ml_path))
 
 # Import new dataset architecture
-from dataset_base import TrainingDataset, TrainingRecord, DatasetMetadata
+from dataset_base import ColumnarDataset, ColumnarDatasetWriter, DatasetMetadata, OUTCOME_TYPES
+from feature_schema import VIBE_DIMENSIONS
+
+# Context / timing features drawn by the generator (the remaining schema
+# features are left missing, so trainers use their defaults)
+GENERATED_CONTEXT_FEATURES = (
+    'location_proximity',
+    'journey_alignment',
+    'user_receptivity',
+    'opportunity_availability',
+    'network_effects',
+    'community_patterns',
+)
+GENERATED_TIMING_FEATURES = (
+    'optimal_time_of_day',
+    'optimal_day_of_week',
+    'user_patterns',
+    'opportunity_timing',
+)
+
+# Records per independent random stream; fixed so output does not depend on chunk size
+RNG_BLOCK_SIZE = 4096
+
+NEUTRAL, POSITIVE, NEGATIVE = (OUTCOME_TYPES.index(t) for t in ('neutral', 'positive', 'negative'))
 
 
 def load_spots_profiles(spots_profiles_path: Path) -> List[Dict]:
@@ -140,173 +168,172 @@ def map_spots_dimensions_to_training_format(spots_dimensions: Dict) -> Dict:
     return training_dimensions
 
 
-def generate_spot_vibe(user_vibe: Dict, seed: int = None) -> Dict:
+def user_vibe_matrix(spots_profiles: List[Dict]) -> np.ndarray:
+    """(num_profiles, 12) user vibes in VIBE_DIMENSIONS order"""
+    return np.array([
+        [vibe[dim] for dim in VIBE_DIMENSIONS]
+        for vibe in (
+            map_spots_dimensions_to_training_format(profile.get('dimensions', {}))
+            for profile in spots_profiles
+        )
+    ], dtype=np.float64).reshape(len(spots_profiles), len(VIBE_DIMENSIONS))
+
+
+def block_rng(seed: int, block_index: int) -> np.random.Generator:
+    """Independent random stream for one RNG_BLOCK_SIZE block of records"""
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(block_index,)))
+
+
+def generate_spot_vibes(user_vibes: np.ndarray, rng: np.random.Generator) -> np.ndarray:
     """
-    Generate spot vibe correlated with user vibe.
+    Generate spot vibes correlated with user vibes.
     
     Spot vibes should be somewhat compatible with user vibes
     (high compatibility = good match), but with variation.
     """
-    if seed is not None:
-        np.random.seed(seed)
-    
-    spot_vibe = {}
-    for dim, value in user_vibe.items():
-        # Spot vibe is correlated with user vibe but has variation
-        # Higher correlation = better matches (which we want for positive outcomes)
-        correlation = np.random.uniform(0.6, 0.9)  # 60-90% correlation
-        variation = np.random.normal(0, 0.15)  # Small variation
-        spot_vibe[dim] = float(np.clip(value * correlation + variation, 0.0, 1.0))
-    
-    return spot_vibe
-
-
-def generate_context_features(seed: int = None) -> Dict:
-    """Generate context features (synthetic)"""
-    if seed is not None:
-        np.random.seed(seed)
-    
-    context_features = {
-        'location_proximity': round(float(np.random.beta(2, 2)), 4),
-        'journey_alignment': round(float(np.random.beta(2, 2)), 4),
-        'user_receptivity': round(float(np.random.beta(2, 2)), 4),
-        'opportunity_availability': round(float(np.random.beta(2, 2)), 4),
-        'network_effects': round(float(np.random.beta(2, 2)), 4),
-        'community_patterns': round(float(np.random.beta(2, 2)), 4),
-    }
-    
-    # Add 4 placeholder context features
-    for i in range(4):
-        context_features[f'context_feature_{i+7}'] = round(float(np.random.beta(2, 2)), 4)
-    
-    return context_features
+    # Spot vibe is correlated with user vibe but has variation
+    # Higher correlation = better matches (which we want for positive outcomes)
+    correlation = rng.uniform(0.6, 0.9, size=user_vibes.shape)  # 60-90% correlation
+    variation = rng.normal(0, 0.15, size=user_vibes.shape)  # Small variation
+    return np.clip(user_vibes * correlation + variation, 0.0, 1.0)
 
 
-def generate_timing_features(seed: int = None) -> Dict:
-    """Generate timing features (synthetic)"""
-    if seed is not None:
-        np.random.seed(seed)
-    
-    timing_features = {
-        'optimal_time_of_day': round(float(np.random.beta(2, 2)), 4),
-        'optimal_day_of_week': round(float(np.random.beta(2, 2)), 4),
-        'user_patterns': round(float(np.random.beta(2, 2)), 4),
-        'opportunity_timing': round(float(np.random.beta(2, 2)), 4),
-        'timing_feature_5': round(float(np.random.beta(2, 2)), 4),
-    }
-    
-    return timing_features
+def generate_context_features(num_records: int, rng: np.random.Generator) -> np.ndarray:
+    """Generate context features (synthetic), (num_records, 6) in GENERATED_CONTEXT_FEATURES order"""
+    return np.round(rng.beta(2, 2, size=(num_records, len(GENERATED_CONTEXT_FEATURES))), 4)
+
 
+def generate_timing_features(num_records: int, rng: np.random.Generator) -> np.ndarray:
+    """Generate timing features (synthetic), (num_records, 4) in GENERATED_TIMING_FEATURES order"""
+    return np.round(rng.beta(2, 2, size=(num_records, len(GENERATED_TIMING_FEATURES))), 4)
 
-def calculate_formula_calling_score(
-    user_vibe: Dict,
-    spot_vibe: Dict,
-    context_features: Dict,
-    timing_features: Dict,
-) -> float:
+
+def calculate_formula_calling_scores(
+    user_vibes: np.ndarray,
+    spot_vibes: np.ndarray,
+    context_features: np.ndarray,
+    timing_features: np.ndarray,
+) -> np.ndarray:
     """
-    Calculate formula-based calling score (simplified version).
+    Calculate formula-based calling scores (simplified version).
     
     This mimics the actual formula-based calculation in CallingScoreCalculator.
     """
-    # Vibe compatibility (40% weight)
-    vibe_compatibility = np.mean([
-        1.0 - abs(user_vibe[dim] - spot_vibe[dim])
-        for dim in user_vibe.keys()
-    ])
-    
-    # Context factor (10% weight)
-    context_factor = np.mean(list(context_features.values())[:6])
+    # Vibe compatibility
+    vibe_compatibility = np.mean(1.0 - np.abs(user_vibes - spot_vibes), axis=1)
     
-    # Timing factor (5% weight)
-    timing_factor = np.mean(list(timing_features.values())[:4])
+    # Context and timing factors
+    context_factor = np.mean(context_features, axis=1)
+    timing_factor = np.mean(timing_features, axis=1)
     
     # Simplified formula (matching CallingScoreCalculator weights)
     # Note: Actual formula has more components (life betterment, meaningful connection, etc.)
     # This is a simplified version for synthetic data generation
-    formula_calling_score = (
+    formula_calling_scores = (
         vibe_compatibility * 0.50 +
         context_factor * 0.30 +
         timing_factor * 0.20
     )
     
-    return float(np.clip(formula_calling_score, 0.0, 1.0))
+    return np.clip(formula_calling_scores, 0.0, 1.0)
 
 
-def generate_outcome(formula_calling_score: float, is_called: bool, seed: int = None) -> tuple:
+def generate_outcomes(
+    formula_calling_scores: np.ndarray,
+    is_called: np.ndarray,
+    rng: np.random.Generator,
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Generate outcome based on calling score.
+    Generate outcomes based on calling scores.
     
     Returns:
-        (outcome_type, outcome_score)
+        (outcome_type codes into OUTCOME_TYPES, outcome_scores)
     """
-    if seed is not None:
-        np.random.seed(seed)
-    
-    if is_called:
-        # Positive outcomes more likely with higher calling scores
-        # Add some noise for realism
-        outcome_score = float(np.clip(
-            formula_calling_score + np.random.normal(0, 0.1),
-            0.0, 1.0
-        ))
-        outcome_type = 'positive' if outcome_score >= 0.7 else 'neutral'
-    else:
-        # Not called = negative or neutral outcome
-        outcome_score = float(np.random.uniform(0.0, 0.5))
-        outcome_type = 'negative' if outcome_score < 0.3 else 'neutral'
+    noise = rng.normal(0, 0.1, size=len(formula_calling_scores))
+    uncalled_scores = rng.uniform(0.0, 0.5, size=len(formula_calling_scores))
+    
+    # Called: positive outcomes more likely with higher calling scores (plus noise)
+    # Not called: negative or neutral outcome
+    outcome_scores = np.where(
+        is_called,
+        np.clip(formula_calling_scores + noise, 0.0, 1.0),
+        uncalled_scores,
+    )
+    outcome_types = np.where(
+        is_called,
+        np.where(outcome_scores >= 0.7, POSITIVE, NEUTRAL),
+        np.where(outcome_scores < 0.3, NEGATIVE, NEUTRAL),
+    ).astype(np.int8)
     
-    return outcome_type, outcome_score
+    return outcome_types, outcome_scores
 
 
-def generate_training_record(spots_profile: Dict, record_index: int = 0) -> TrainingRecord:
+def generate_record_block(user_vibes: np.ndarray, rng: np.random.Generator) -> Dict[str, np.ndarray]:
     """
-    Generate training record from SPOTS profile.
+    Generate training record columns for a block of records.
     
     Args:
-        spots_profile: Profile from data_converter output
-        record_index: Index for this record (for seeding)
+        user_vibes: (n, 12) user vibe of each record
+        rng: Random stream for this block
     
     Returns:
-        TrainingRecord object
+        Columns for ColumnarDatasetWriter.write_columns
     """
-    # Get user vibe from converted profile
-    spots_dimensions = spots_profile.get('dimensions', {})
-    user_vibe = map_spots_dimensions_to_training_format(spots_dimensions)
-    
-    # Generate spot vibe (synthetic, but correlated with user vibe)
-    spot_vibe = generate_spot_vibe(user_vibe, seed=record_index)
-    
-    # Generate context and timing (synthetic)
-    context_features = generate_context_features(seed=record_index + 1000)
-    timing_features = generate_timing_features(seed=record_index + 2000)
-    
-    # Calculate calling score
-    formula_calling_score = calculate_formula_calling_score(
-        user_vibe, spot_vibe, context_features, timing_features
-    )
-    
-    is_called = formula_calling_score >= 0.7
+    spot_vibes = generate_spot_vibes(user_vibes, rng)
+    context_features = generate_context_features(len(user_vibes), rng)
+    timing_features = generate_timing_features(len(user_vibes), rng)
     
-    # Generate outcome
-    outcome_type, outcome_score = generate_outcome(
-        formula_calling_score, is_called, seed=record_index + 3000
+    formula_calling_scores = calculate_formula_calling_scores(
+        user_vibes, spot_vibes, context_features, timing_features
     )
+    is_called = formula_calling_scores >= 0.7
+    outcome_types, outcome_scores = generate_outcomes(formula_calling_scores, is_called, rng)
+    
+    return {
+        'user_vibe_dimensions': user_vibes,
+        'spot_vibe_dimensions': spot_vibes,
+        'context_features': context_features,
+        'timing_features': timing_features,
+        'formula_calling_score': np.round(formula_calling_scores, 4),
+        'is_called': is_called,
+        'outcome_type': outcome_types,
+        'outcome_score': np.round(outcome_scores, 4),
+    }
+
+
+def generate_records(
+    user_vibes: np.ndarray,
+    records_per_profile: int,
+    start: int,
+    stop: int,
+    seed: int,
+) -> Dict[str, np.ndarray]:
+    """
+    Generate columns for records [start, stop).
     
-    # Get user_id from profile if available
-    user_id = spots_profile.get('user_id') or spots_profile.get('id')
-    
-    return TrainingRecord(
-        user_vibe_dimensions=user_vibe,
-        spot_vibe_dimensions=spot_vibe,
-        context_features=context_features,
-        timing_features=timing_features,
-        formula_calling_score=round(formula_calling_score, 4),
-        is_called=is_called,
-        outcome_type=outcome_type,
-        outcome_score=round(outcome_score, 4),
-        user_id=str(user_id) if user_id else None,
-    )
+    Record i belongs to profile i // records_per_profile. Random draws come
+    from fixed RNG_BLOCK_SIZE blocks, so the values of a record do not
+    depend on how [0, num_samples) is split into chunks.
+    """
+    parts = []
+    first_block = start // RNG_BLOCK_SIZE
+    last_block = (stop - 1) // RNG_BLOCK_SIZE
+    for block_index in range(first_block, last_block + 1):
+        block_start = block_index * RNG_BLOCK_SIZE
+        block_indices = np.arange(block_start, block_start + RNG_BLOCK_SIZE)
+        block = generate_record_block(user_vibes[block_indices // records_per_profile % len(user_vibes)],
+                                      block_rng(seed, block_index))
+        lo = max(start, block_start) - block_start
+        hi = min(stop, block_start + RNG_BLOCK_SIZE) - block_start
+        parts.append({name: values[lo:hi] for name, values in block.items()})
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def _feature_columns(values: np.ndarray, generated: Tuple[str, ...], stored: Tuple[str, ...]) -> np.ndarray:
+    """Place generated feature columns into the stored layout (NaN for features not generated)"""
+    block = np.full((len(values), len(stored)), np.nan, dtype=np.float32)
+    block[:, [stored.index(name) for name in generated]] = values
+    return block
 
 
 def generate_hybrid_dataset(
@@ -314,15 +341,22 @@ def generate_hybrid_dataset(
     output_path: Path,
     num_samples: int = 10000,
     records_per_profile: int = None,
+    seed: int = 42,
+    chunk_size: int = 1_000_000,
 ):
     """
     Generate hybrid training dataset using new dataset architecture.
     
+    Records are generated in vectorized chunks and written straight to a
+    columnar dataset; a .json output_path is streamed from it afterwards.
+    
     Args:
         spots_profiles_path: Path to SPOTS profiles JSON (from data_converter.py)
-        output_path: Path to save training data JSON
+        output_path: Output path (.json for JSON, otherwise a columnar dataset directory)
         num_samples: Total number of training samples to generate
         records_per_profile: Number of records per profile (auto-calculated if None)
+        seed: Random seed (output is identical for any chunk_size)
+        chunk_size: Records generated and written per chunk
     """
     print(f"Loading SPOTS profiles from: {spots_profiles_path}")
     spots_profiles = load_spots_profiles(spots_profiles_path)
@@ -336,11 +370,14 @@ def generate_hybrid_dataset(
     if records_per_profile is None:
         records_per_profile = max(1, num_samples // len(spots_profiles))
     
+    # Each profile contributes records_per_profile records, until num_samples is reached
+    num_records = min(num_samples, len(spots_profiles) * records_per_profile)
+    
     print(f"Generating {records_per_profile} records per profile...")
     
     # Create dataset with metadata
     metadata = DatasetMetadata(
-        num_samples=0,  # Will be updated as records are added
+        num_samples=num_records,
         source='hybrid_big_five',
         description='Hybrid training data using Big Five converted profiles (real personality + synthetic spots/context/timing)',
         user_profiles_source=str(spots_profiles_path),
@@ -348,48 +385,75 @@ def generate_hybrid_dataset(
         generation_params={
             'num_samples': num_samples,
             'records_per_profile': records_per_profile,
+            'seed': seed,
         },
     )
     
-    dataset = TrainingDataset(metadata=metadata)
+    user_vibes = user_vibe_matrix(spots_profiles)
+    user_ids = [
+        str(user_id) if user_id else None
+        for user_id in (profile.get('user_id') or profile.get('id') for profile in spots_profiles)
+    ]
+    has_user_ids = any(user_id is not None for user_id in user_ids)
     
-    # Generate training records
-    record_index = 0
+    output_path = Path(output_path)
+    write_json = output_path.suffix == '.json'
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    columnar_dir = Path(tempfile.mkdtemp(dir=output_path.parent)) if write_json else output_path
     
-    for profile in spots_profiles:
-        for _ in range(records_per_profile):
-            if record_index >= num_samples:
-                break
+    try:
+        with ColumnarDatasetWriter(columnar_dir, num_records) as writer:
+            fields = writer.feature_fields
             
-            record = generate_training_record(profile, record_index=record_index)
-            dataset.add_record(record)
-            record_index += 1
+            # Running statistics
+            called_count = 0
+            positive_count = 0
+            calling_score_sum = 0.0
+            outcome_score_sum = 0.0
+            
+            for start in range(0, num_records, chunk_size):
+                stop = min(start + chunk_size, num_records)
+                columns = generate_records(user_vibes, records_per_profile, start, stop, seed)
+                
+                columns['context_features'] = _feature_columns(
+                    columns['context_features'], GENERATED_CONTEXT_FEATURES, fields['context_features']
+                )
+                columns['timing_features'] = _feature_columns(
+                    columns['timing_features'], GENERATED_TIMING_FEATURES, fields['timing_features']
+                )
+                if has_user_ids:
+                    profile_rows = np.arange(start, stop) // records_per_profile
+                    columns['user_id'] = [user_ids[row] for row in profile_rows.tolist()]
+                
+                writer.write_columns(start, columns)
+                
+                called_count += int(np.sum(columns['is_called']))
+                positive_count += int(np.sum(columns['outcome_type'] == POSITIVE))
+                calling_score_sum += float(np.sum(columns['formula_calling_score']))
+                outcome_score_sum += float(np.sum(columns['outcome_score']))
+                print(f"Generated {stop:,}/{num_records:,} records...")
+            
+            # Calculate statistics (same fields as TrainingDataset.calculate_statistics)
+            if num_records:
+                metadata.statistics = {
+                    'called_percentage': round(called_count / num_records * 100, 2),
+                    'positive_outcome_percentage': round(positive_count / num_records * 100, 2),
+                    'average_calling_score': round(calling_score_sum / num_records, 4),
+                    'average_outcome_score': round(outcome_score_sum / num_records, 4),
+                    'total_records': num_records,
+                }
+            writer.close(metadata)
         
-        if record_index >= num_samples:
-            break
-    
-    # Trim to exact number if needed
-    dataset.records = dataset.records[:num_samples]
-    dataset.metadata.num_samples = len(dataset.records)
-    
-    # Calculate statistics
-    dataset.calculate_statistics()
-    
-    # Validate dataset
-    validation_issues = dataset.validate()
-    if validation_issues:
-        print(f"⚠️  Validation warnings ({len(validation_issues)}):")
-        for issue in validation_issues[:10]:  # Show first 10
-            print(f"   - {issue}")
-        if len(validation_issues) > 10:
-            print(f"   ... and {len(validation_issues) - 10} more")
-    
-    # Save dataset
-    dataset.save(output_path)
+        # Save dataset
+        if write_json:
+            ColumnarDataset.open(columnar_dir).save_json(output_path)
+    finally:
+        if write_json:
+            shutil.rmtree(columnar_dir, ignore_errors=True)
     
     # Print summary
-    stats = dataset.metadata.statistics
-    print(f"\n✅ Generated {len(dataset)} hybrid training records")
+    stats = metadata.statistics
+    print(f"\n✅ Generated {num_records} hybrid training records")
     print(f"   Saved to: {output_path}")
     print(f"\n📊 Statistics:")
     print(f"   Called: {stats.get('called_percentage', 0):.1f}%")
@@ -424,7 +488,8 @@ Examples:
         '--output',
         type=Path,
         default=Path('data/calling_score_training_data_hybrid.json'),
-        help='Output training data JSON path (default: data/calling_score_training_data_hybrid.json)'
+        help='Output training data path; .json writes JSON, any other path a columnar dataset directory '
+             '(default: data/calling_score_training_data_hybrid.json)'
     )
     parser.add_argument(
         '--num-samples',
@@ -438,6 +503,18 @@ Examples:
         default=None,
         help='Number of records per profile (auto-calculated if not specified)'
     )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=42,
+        help='Random seed (default: 42)'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=1_000_000,
+        help='Records generated and written per chunk; does not affect the output (default: 1000000)'
+    )
     
     args = parser.parse_args()
     
@@ -447,6 +524,8 @@ Examples:
             args.output,
             args.num_samples,
             args.records_per_profile,
+            seed=args.seed,
+            chunk_size=args.chunk_size,
         )
     except Exception as e:
         print(f"❌ Error: {e}", file=sys.stderr)
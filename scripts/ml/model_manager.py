@@ -11,7 +11,6 @@ import hashlib
 import argparse
 import json
 from pathlib import Path
-import requests
 from typing import Dict, Optional, List
 import logging
 
@@ -28,10 +27,10 @@ MODELS_DIR = Path(__file__).parent.parent.parent / "assets" / "models"
 TEMP_DIR = MODELS_DIR / ".temp"
 
 class ModelManager:
-    def __init__(self, config_path: Optional[str] = None):
-        self.config_path = config_path or str(MODELS_DIR / CONFIG_FILE)
-        self.models_dir = MODELS_DIR
-        self.temp_dir = TEMP_DIR
+    def __init__(self, config_path: Optional[str] = None, models_dir: Optional[Path] = None):
+        self.models_dir = Path(models_dir) if models_dir else MODELS_DIR
+        self.config_path = config_path or str(self.models_dir / CONFIG_FILE)
+        self.temp_dir = self.models_dir / TEMP_DIR.name
         self.config: Dict = {}
         self._load_config()
         
@@ -112,6 +111,8 @@ class ModelManager:
             logger.error(f"No download URL configured for {model_name}")
             return False
 
+        import requests  # Only needed for downloads
+
         os.makedirs(self.temp_dir, exist_ok=True)
         temp_path = self.temp_dir / f"{model_name}.tmp"
         
@@ -148,16 +149,42 @@ class ModelManager:
             return
 
         md5 = self._calculate_md5(str(model_path))
-        existing_desc = self.config["models"].get(model_name, {}).get("description", "")
+        existing = self.config["models"].get(model_name, {})
+        existing_desc = existing.get("description", "")
         self.config["models"][model_name] = {
             "version": version,
             "md5": md5,
             "url": url,
             "description": description or existing_desc or f"ONNX model: {model_name}"
         }
+        if "benchmark" in existing:
+            self.config["models"][model_name]["benchmark"] = existing["benchmark"]
         self._save_config()
         logger.info(f"Registered {model_name} version {version}")
 
+    def record_benchmark(self, model_name: str, benchmark: Dict):
+        """Store inference benchmark results for a model (keyed to its MD5)."""
+        model_path = self.models_dir / model_name
+        if not model_path.exists():
+            logger.error(f"Model file {model_name} not found")
+            return
+
+        entry = self.config["models"].setdefault(model_name, {})
+        entry["benchmark"] = dict(benchmark, md5=self._calculate_md5(str(model_path)))
+        self._save_config()
+        logger.info(f"Recorded benchmark for {model_name}")
+
+    def get_benchmark(self, model_name: str) -> Optional[Dict]:
+        """Benchmark results recorded for a model, if they match its current file."""
+        benchmark = self.config["models"].get(model_name, {}).get("benchmark")
+        model_path = self.models_dir / model_name
+        if not benchmark or not model_path.exists():
+            return None
+        if benchmark.get("md5") != self._calculate_md5(str(model_path)):
+            logger.warning(f"Benchmark for {model_name} is stale (model file changed)")
+            return None
+        return benchmark
+
 def main():
     parser = argparse.ArgumentParser(description="SPOTS Model Manager")
     parser.add_argument("action", choices=["verify", "download", "register", "list"])
@@ -179,6 +206,9 @@ def main():
             for model in models:
                 registered = model in manager.config["models"]
                 status = "✓ registered" if registered else "○ unregistered"
+                benchmark = manager.get_benchmark(model)
+                if benchmark:
+                    status += f", single-row p50 {benchmark['single_row']['p50_ms']:.3f} ms"
                 logger.info(f"  - {model} ({status})")
         sys.exit(0)
     elif args.action == "verify":
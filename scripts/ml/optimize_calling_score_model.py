@@ -6,6 +6,13 @@ Phase 12: Neural Network Implementation - Model Optimization
 This script performs hyperparameter search to find optimal model configurations.
 Based on v1.0-hybrid baseline, tests various architectures, learning rates, and batch sizes.
 
+The training data is loaded and standardized once and placed in shared memory;
+variants train concurrently in a pool of worker processes (each limited to
+--torch-threads threads) and report metrics directly. With successive halving
+(--eta), all variants train for --min-epochs, then only the best 1/eta by
+validation loss continue for eta times as many epochs, and so on up to the
+variant's full epoch budget.
+
 Usage:
     python scripts/ml/optimize_calling_score_model.py \
       --data-path data/calling_score_training_data_v1_hybrid.json \
@@ -15,16 +22,31 @@ Usage:
 
 import argparse
 import json
+import math
+import multiprocessing
 import os
-import subprocess
 import sys
 import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 
 import numpy as np
 import torch
+import torch.optim as optim
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+# Add scripts/ml to path for train_calling_score_model import
+sys.path.insert(0, str(Path(__file__).parent))
+
+from train_calling_score_model import CallingScoreModel, export_to_onnx, load_training_data
+from tensor_training import evaluate, mse_loss, train_epoch
+
+SPLIT_NAMES = ('X_train', 'y_train', 'X_val', 'y_val', 'X_test', 'y_test')
 
 
 @dataclass
@@ -52,6 +74,8 @@ class VariantResult:
     params_count: int
     success: bool
     error: str = ""
+    epochs_trained: int = 0
+    pruned: bool = False  # Stopped early by successive halving
 
 
 def load_baseline_metrics(baseline_path: str) -> Dict:
@@ -64,147 +88,313 @@ def load_baseline_metrics(baseline_path: str) -> Dict:
     }
 
 
-def train_variant(
+def prepare_sweep_data(data_path: str) -> Dict[str, np.ndarray]:
+    """
+    Load, standardize and split the training data once for all variants
+    
+    Uses the same scaling and 70/15/15 split (random_state=42) as
+    train_calling_score_model.py.
+    """
+    features, labels = load_training_data(data_path)
+    features_scaled = StandardScaler().fit_transform(features)
+    
+    X_train, X_temp, y_train, y_temp = train_test_split(
+        features_scaled, labels, test_size=0.3, random_state=42
+    )
+    X_val, X_test, y_val, y_test = train_test_split(
+        X_temp, y_temp, test_size=0.5, random_state=42
+    )
+    splits = (X_train, y_train, X_val, y_val, X_test, y_test)
+    return {name: np.ascontiguousarray(values, dtype=np.float32) for name, values in zip(SPLIT_NAMES, splits)}
+
+
+class SharedArrays:
+    """Numpy arrays copied into named shared memory blocks that worker processes attach to"""
+    
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.spec: Dict[str, Tuple[str, Tuple[int, ...], str]] = {}
+        for name, values in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[...] = values
+            self._blocks.append(block)
+            self.spec[name] = (block.name, values.shape, values.dtype.str)
+    
+    @staticmethod
+    def attach(spec: Dict[str, Tuple[str, Tuple[int, ...], str]]) -> Tuple[Dict[str, np.ndarray], List[shared_memory.SharedMemory]]:
+        """Arrays backed by the blocks in spec (keep the returned blocks alive while using them)"""
+        arrays = {}
+        blocks = []
+        for name, (block_name, shape, dtype) in spec.items():
+            # Spawned workers share the parent's resource tracker, so the
+            # blocks stay registered once and are unlinked by close()
+            block = shared_memory.SharedMemory(name=block_name)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            blocks.append(block)
+        return arrays, blocks
+    
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+# Per-worker state set by _init_worker
+_worker_tensors: Dict[str, torch.Tensor] = {}
+_worker_blocks: List[shared_memory.SharedMemory] = []
+
+
+def _init_worker(spec: Dict, torch_threads: int):
+    """Pool initializer: limit torch threads and attach the shared training data"""
+    torch.set_num_threads(torch_threads)
+    arrays, blocks = SharedArrays.attach(spec)
+    _worker_blocks.extend(blocks)
+    _worker_tensors.update({name: torch.from_numpy(values) for name, values in arrays.items()})
+
+
+def train_variant_epochs(
     config: VariantConfig,
-    data_path: str,
-    output_dir: Path,
+    state: Optional[Dict[str, Any]],
+    target_epochs: int,
     device: str = 'cpu',
-) -> VariantResult:
+    patience: int = 10,
+    onnx_path: Optional[str] = None,
+) -> Dict[str, Any]:
     """
-    Train a single model variant
+    Train a variant (in a worker) until target_epochs total epochs or early stopping
     
-    Returns VariantResult with training metrics
-    """
-    output_path = output_dir / f"calling_score_model_{config.name}.onnx"
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    Args:
+        config: Variant configuration
+        state: State returned by a previous call for this variant (None to start)
+        target_epochs: Total epochs to reach
+        device: Training device
+        patience: Early stopping patience (epochs without validation improvement)
+        onnx_path: Where to export the best model once the variant has finished
     
+    Returns:
+        Resumable training state with metrics (best_val_loss, test_loss, ...)
+    """
     start_time = time.time()
+    X_train, y_train, X_val, y_val, X_test, y_test = (_worker_tensors[name].to(device) for name in SPLIT_NAMES)
     
-    # Build training command
-    cmd = [
-        sys.executable,
-        'scripts/ml/train_calling_score_model.py',
-        '--data-path', data_path,
-        '--output-path', str(output_path),
-        '--epochs', str(config.epochs),
-        '--batch-size', str(config.batch_size),
-        '--learning-rate', str(config.learning_rate),
-    ]
+    # Deterministic per-variant initialization, dropout and shuffling; a
+    # resumed variant continues its own RNG streams, so its training does
+    # not depend on where the halving rungs fall
+    seed = zlib.crc32(config.name.encode('utf-8'))
+    if state is None:
+        torch.manual_seed(seed)
+    model = CallingScoreModel(
+        input_size=X_train.shape[1],
+        hidden_sizes=config.hidden_sizes,
+        output_size=1,
+        dropout=config.dropout,
+    ).to(device)
+    optimizer = optim.Adam(model.parameters(), lr=config.learning_rate)
+    generator = torch.Generator()
+    generator.manual_seed(seed)
     
-    try:
-        # Run training
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=3600,  # 1 hour timeout
-        )
-        
-        training_time = time.time() - start_time
-        
-        if result.returncode != 0:
-            return VariantResult(
-                config=config,
-                test_loss=float('inf'),
-                val_loss=float('inf'),
-                train_loss=float('inf'),
-                best_epoch=0,
-                training_time=training_time,
-                model_size_kb=0.0,
-                params_count=0,
-                success=False,
-                error=result.stderr[:500],  # First 500 chars of error
-            )
-        
-        # Parse metrics from output
-        output_lines = result.stdout.split('\n')
-        test_loss = None
-        val_loss = None
-        train_loss = None
-        best_epoch = config.epochs
-        
-        for line in output_lines:
-            if 'Test Loss:' in line:
-                try:
-                    test_loss = float(line.split('Test Loss:')[1].strip().split()[0])
-                except:
-                    pass
-            if 'Early stopping at epoch' in line:
-                try:
-                    best_epoch = int(line.split('epoch')[1].strip())
-                except:
-                    pass
-            if 'Val Loss:' in line and 'Train Loss:' in line:
-                try:
-                    parts = line.split('Val Loss:')
-                    if len(parts) > 1:
-                        val_loss = float(parts[1].strip().split()[0])
-                    parts = line.split('Train Loss:')
-                    if len(parts) > 1:
-                        train_loss = float(parts[1].strip().split()[0])
-                except:
-                    pass
-        
-        # Get model size
-        model_size_kb = 0.0
-        params_count = 0
-        if output_path.exists():
-            model_size_kb = output_path.stat().st_size / 1024
-            
-            # Estimate parameter count from architecture
-            input_size = 39
-            total_params = input_size * config.hidden_sizes[0]
-            for i in range(len(config.hidden_sizes) - 1):
-                total_params += config.hidden_sizes[i] * config.hidden_sizes[i + 1]
-            total_params += config.hidden_sizes[-1] * 1  # Output layer
-            params_count = total_params
-        
-        # Use defaults if parsing failed
-        if test_loss is None:
-            test_loss = float('inf')
-        if val_loss is None:
-            val_loss = float('inf')
-        if train_loss is None:
-            train_loss = float('inf')
-        
-        return VariantResult(
-            config=config,
-            test_loss=test_loss,
-            val_loss=val_loss,
-            train_loss=train_loss,
-            best_epoch=best_epoch,
-            training_time=training_time,
-            model_size_kb=model_size_kb,
-            params_count=params_count,
-            success=True,
-        )
+    if state is None:
+        state = {
+            'epochs_trained': 0,
+            'best_val_loss': float('inf'),
+            'best_epoch': 0,
+            'best_model': None,
+            'patience_counter': 0,
+            'stopped': False,
+            'train_losses': [],
+            'val_losses': [],
+            'training_time': 0.0,
+        }
+    else:
+        model.load_state_dict(state['model'])
+        optimizer.load_state_dict(state['optimizer'])
+        generator.set_state(state['generator'])
+        torch.set_rng_state(state['torch_rng'])
+        if state.get('cuda_rng') is not None:
+            torch.cuda.set_rng_state(state['cuda_rng'], device)
+    
+    while state['epochs_trained'] < target_epochs and not state['stopped']:
+        train_metrics = train_epoch(model, optimizer, X_train, y_train, config.batch_size, mse_loss, generator=generator)
+        state['train_losses'].append(train_metrics['loss'])
+        val_loss = evaluate(model, X_val, y_val, mse_loss)['loss']
+        state['val_losses'].append(val_loss)
+        state['epochs_trained'] += 1
         
-    except subprocess.TimeoutExpired:
-        return VariantResult(
-            config=config,
-            test_loss=float('inf'),
-            val_loss=float('inf'),
-            train_loss=float('inf'),
-            best_epoch=0,
-            training_time=3600.0,
-            model_size_kb=0.0,
-            params_count=0,
-            success=False,
-            error="Training timeout (1 hour)",
-        )
-    except Exception as e:
-        return VariantResult(
-            config=config,
-            test_loss=float('inf'),
-            val_loss=float('inf'),
-            train_loss=float('inf'),
-            best_epoch=0,
-            training_time=time.time() - start_time,
-            model_size_kb=0.0,
-            params_count=0,
-            success=False,
-            error=str(e)[:500],
-        )
+        # Early stopping
+        if val_loss < state['best_val_loss']:
+            state['best_val_loss'] = val_loss
+            state['best_epoch'] = state['epochs_trained']
+            state['best_model'] = {key: value.detach().cpu().clone() for key, value in model.state_dict().items()}
+            state['patience_counter'] = 0
+        else:
+            state['patience_counter'] += 1
+            if state['patience_counter'] >= patience:
+                state['stopped'] = True
+    
+    state['model'] = {key: value.detach().cpu() for key, value in model.state_dict().items()}
+    state['optimizer'] = optimizer.state_dict()
+    state['generator'] = generator.get_state()
+    state['torch_rng'] = torch.get_rng_state()
+    state['cuda_rng'] = torch.cuda.get_rng_state(device) if device.startswith('cuda') else None
+    state['finished'] = state['stopped'] or state['epochs_trained'] >= config.epochs
+    state['params_count'] = sum(p.numel() for p in model.parameters())
+    
+    # Metrics (and export) use the best-validation weights
+    if state['best_model'] is not None:
+        model.load_state_dict(state['best_model'])
+    state['test_loss'] = evaluate(model, X_test, y_test, mse_loss)['loss']
+    state['model_size_kb'] = 0.0
+    if state['finished'] and onnx_path:
+        export_to_onnx(model.cpu(), onnx_path, input_size=X_train.shape[1])
+        # Large exports keep weights in an external <model>.onnx.data file
+        weights_path = onnx_path + '.data'
+        size = os.path.getsize(onnx_path) + (os.path.getsize(weights_path) if os.path.exists(weights_path) else 0)
+        state['model_size_kb'] = size / 1024
+    
+    state['training_time'] += time.time() - start_time
+    return state
+
+
+def halving_rungs(max_epochs: int, min_epochs: int, eta: int) -> List[int]:
+    """Cumulative epoch budgets for successive halving (e.g. 10, 30, 90, 100)"""
+    if eta <= 1 or min_epochs >= max_epochs:
+        return [max_epochs]
+    rungs = []
+    budget = min_epochs
+    while budget < max_epochs:
+        rungs.append(budget)
+        budget *= eta
+    rungs.append(max_epochs)
+    return rungs
+
+
+def _variant_result(config: VariantConfig, state: Dict[str, Any], pruned: bool = False) -> VariantResult:
+    return VariantResult(
+        config=config,
+        test_loss=state['test_loss'],
+        val_loss=state['best_val_loss'],
+        train_loss=state['train_losses'][-1] if state['train_losses'] else float('inf'),
+        best_epoch=state['best_epoch'],
+        training_time=state['training_time'],
+        model_size_kb=state['model_size_kb'],
+        params_count=state['params_count'],
+        success=True,
+        epochs_trained=state['epochs_trained'],
+        pruned=pruned,
+    )
+
+
+def _failed_result(config: VariantConfig, error: str, state: Optional[Dict[str, Any]] = None) -> VariantResult:
+    return VariantResult(
+        config=config,
+        test_loss=float('inf'),
+        val_loss=float('inf'),
+        train_loss=float('inf'),
+        best_epoch=0,
+        training_time=state['training_time'] if state else 0.0,
+        model_size_kb=0.0,
+        params_count=0,
+        success=False,
+        error=error[:500],
+        epochs_trained=state['epochs_trained'] if state else 0,
+    )
+
+
+def run_sweep(
+    variants: List[VariantConfig],
+    data: Dict[str, np.ndarray],
+    output_dir: Path,
+    max_workers: Optional[int] = None,
+    torch_threads: int = 1,
+    device: str = 'cpu',
+    eta: int = 3,
+    min_epochs: int = 10,
+    patience: int = 10,
+) -> List[VariantResult]:
+    """
+    Train variants concurrently, pruning poor ones with successive halving
+    
+    Args:
+        variants: Variants to train
+        data: Standardized splits from prepare_sweep_data
+        output_dir: Directory for exported ONNX models of finished variants
+        max_workers: Worker processes (default: CPU count // torch_threads)
+        torch_threads: torch threads per worker
+        device: Training device
+        eta: Halving rate (keep the best 1/eta at each rung; <= 1 disables halving)
+        min_epochs: Epoch budget of the first rung
+        patience: Early stopping patience
+    
+    Returns:
+        One VariantResult per variant, in input order
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 1) // torch_threads)
+    max_workers = max(1, min(max_workers, len(variants)))
+    rungs = halving_rungs(max(v.epochs for v in variants), min_epochs, eta)
+    
+    results: Dict[str, VariantResult] = {}
+    states: Dict[str, Optional[Dict[str, Any]]] = {v.name: None for v in variants}
+    active = list(variants)
+    
+    shared = SharedArrays(data)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(shared.spec, torch_threads),
+        ) as pool:
+            for rung_index, rung_epochs in enumerate(rungs):
+                print(f"\n🪜 Rung {rung_index + 1}/{len(rungs)}: {len(active)} variants → {rung_epochs} epochs "
+                      f"({max_workers} workers × {torch_threads} threads)")
+                futures = {
+                    pool.submit(
+                        train_variant_epochs,
+                        variant,
+                        states[variant.name],
+                        min(rung_epochs, variant.epochs),
+                        device,
+                        patience,
+                        str(output_dir / f"calling_score_model_{variant.name}.onnx"),
+                    ): variant
+                    for variant in active
+                }
+                for future in as_completed(futures):
+                    variant = futures[future]
+                    try:
+                        state = future.result()
+                    except Exception as e:
+                        results[variant.name] = _failed_result(variant, str(e), states[variant.name])
+                        print(f"   ❌ {variant.name}: {str(e)[:100]}")
+                        continue
+                    states[variant.name] = state
+                    status = 'finished' if state['finished'] else 'running'
+                    print(f"   {variant.name:<25} epoch {state['epochs_trained']:>3}  "
+                          f"val {state['best_val_loss']:.6f}  ({status}, {state['training_time']:.1f}s)")
+                    if state['finished']:
+                        results[variant.name] = _variant_result(variant, state)
+                        states[variant.name] = None
+                
+                running = [v for v in active if v.name not in results]
+                if rung_index == len(rungs) - 1 or not running:
+                    break
+                
+                # Successive halving: only the best 1/eta (by validation loss) continue
+                running.sort(key=lambda v: states[v.name]['best_val_loss'])
+                keep = max(1, math.ceil(len(running) / eta))
+                for variant in running[keep:]:
+                    results[variant.name] = _variant_result(variant, states[variant.name], pruned=True)
+                    states[variant.name] = None
+                active = running[:keep]
+                if len(running) > keep:
+                    print(f"   ✂️  Pruned {len(running) - keep}: {', '.join(v.name for v in running[keep:])}")
+    finally:
+        shared.close()
+    
+    return [results[v.name] for v in variants]
 
 
 def generate_variants() -> List[VariantConfig]:
@@ -295,13 +485,14 @@ def save_results(results: List[VariantResult], output_path: Path, baseline_metri
             'total_variants': len(results),
             'successful': sum(1 for r in results if r.success),
             'failed': sum(1 for r in results if not r.success),
-            'best_test_loss': min((r.test_loss for r in results if r.success), default=float('inf')),
+            'pruned': sum(1 for r in results if r.pruned),
+            'best_test_loss': min((r.test_loss for r in results if r.success and not r.pruned), default=float('inf')),
             'best_variant': None,
         },
     }
     
-    # Find best variant
-    successful_results = [r for r in results if r.success]
+    # Find best variant (among variants trained to completion)
+    successful_results = [r for r in results if r.success and not r.pruned]
     if successful_results:
         best = min(successful_results, key=lambda x: x.test_loss)
         output_data['summary']['best_variant'] = best.config.name
@@ -321,11 +512,13 @@ def print_summary(results: List[VariantResult], baseline_metrics: Dict):
     print("OPTIMIZATION SUMMARY")
     print("="*80)
     
-    successful = [r for r in results if r.success]
+    successful = [r for r in results if r.success and not r.pruned]
+    pruned = [r for r in results if r.pruned]
     failed = [r for r in results if not r.success]
     
     print(f"\nTotal variants tested: {len(results)}")
     print(f"Successful: {len(successful)}")
+    print(f"Pruned (successive halving): {len(pruned)}")
     print(f"Failed: {len(failed)}")
     
     if successful:
@@ -351,7 +544,7 @@ def print_summary(results: List[VariantResult], baseline_metrics: Dict):
         print("="*80)
         print(f"Test Loss: {best.test_loss:.6f} (improvement: {improvement:+.2f}%)")
         print(f"Val Loss: {best.val_loss:.6f}")
-        print(f"Training Time: {best.training_time:.1f}s")
+        print(f"Training Time: {best.training_time:.1f}s ({best.epochs_trained} epochs, best at {best.best_epoch})")
         print(f"Model Size: {best.model_size_kb:.1f} KB")
         print(f"Parameters: {best.params_count:,}")
         print(f"Description: {best.config.description}")
@@ -376,7 +569,7 @@ def main():
         '--data-path',
         type=str,
         default='data/calling_score_training_data_v1_hybrid.json',
-        help='Path to training data JSON file',
+        help='Path to training data (columnar dataset directory or JSON file)',
     )
     parser.add_argument(
         '--output-dir',
@@ -403,6 +596,36 @@ def main():
         choices=['cpu', 'cuda'],
         help='Device to use for training',
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes training variants concurrently (default: CPU count / torch threads)',
+    )
+    parser.add_argument(
+        '--torch-threads',
+        type=int,
+        default=1,
+        help='torch threads per worker (default: 1)',
+    )
+    parser.add_argument(
+        '--eta',
+        type=int,
+        default=3,
+        help='Successive halving rate: keep the best 1/eta variants per rung (1 disables halving, default: 3)',
+    )
+    parser.add_argument(
+        '--min-epochs',
+        type=int,
+        default=10,
+        help='Epochs of the first successive halving rung (default: 10)',
+    )
+    parser.add_argument(
+        '--patience',
+        type=int,
+        default=10,
+        help='Early stopping patience in epochs (default: 10)',
+    )
     
     args = parser.parse_args()
     
@@ -421,30 +644,27 @@ def main():
         variants = variants[:args.max_variants]
         print(f"⚠️  Limiting to {args.max_variants} variants for quick testing")
     
+    # Load and standardize data once for all variants
+    print("\n📂 Loading training data...")
+    data = prepare_sweep_data(args.data_path)
+    print(f"   Train: {len(data['X_train'])}, Val: {len(data['X_val'])}, Test: {len(data['X_test'])}")
+    
     print(f"\n🔍 Testing {len(variants)} variants...")
     print("="*80)
     
-    # Train each variant
-    results = []
-    for i, variant in enumerate(variants, 1):
-        print(f"\n[{i}/{len(variants)}] Training: {variant.name}")
-        print(f"   {variant.description}")
-        
-        result = train_variant(
-            variant,
-            args.data_path,
-            args.output_dir,
-            device=args.device,
-        )
-        
-        results.append(result)
-        
-        if result.success:
-            improvement = (baseline_metrics['test_loss'] - result.test_loss) / baseline_metrics['test_loss'] * 100
-            print(f"   ✅ Test Loss: {result.test_loss:.6f} ({improvement:+.2f}% vs baseline)")
-            print(f"   ⏱️  Time: {result.training_time:.1f}s")
-        else:
-            print(f"   ❌ Failed: {result.error[:100]}")
+    start_time = time.time()
+    results = run_sweep(
+        variants,
+        data,
+        args.output_dir,
+        max_workers=args.workers,
+        torch_threads=args.torch_threads,
+        device=args.device,
+        eta=args.eta,
+        min_epochs=args.min_epochs,
+        patience=args.patience,
+    )
+    print(f"\n⏱️  Sweep time: {time.time() - start_time:.1f}s")
     
     # Save results
     results_path = args.output_dir / 'optimization_results.json'
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Tensor Training Loop for SPOTS ML Models
+
+Training loop shared by train_calling_score_model.py and
+train_outcome_prediction_model.py (and the optimize_calling_score_model.py
+sweep). The standardized dataset stays on the training device as
+contiguous tensors instead of going through a DataLoader:
+- each epoch shuffles once with a permutation and trains on contiguous
+  slices of the shuffled tensors (no per-sample __getitem__ / collate)
+- losses and accuracy accumulate on-device (one host sync per epoch)
+- validation runs in large chunks
+- the learning rate can be scaled with the batch size (linear / sqrt rule)
+- the best-validation weights are restored when training ends
+
+Phase 12 Section 2: Neural Network Implementation
+"""
+
+import copy
+import math
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+# Batch size the default learning rates were tuned for
+BASE_BATCH_SIZE = 32
+EVAL_BATCH_SIZE = 65536
+LR_SCALING_RULES = ('none', 'linear', 'sqrt')
+
+# (outputs, labels) -> per-sample losses
+LossFn = Callable[[torch.Tensor, torch.Tensor], torch.Tensor]
+
+
+def to_tensor(values: np.ndarray, device: str = 'cpu') -> torch.Tensor:
+    """Contiguous float32 tensor on device (no copy for float32 numpy input on CPU)"""
+    return torch.from_numpy(np.ascontiguousarray(values, dtype=np.float32)).to(device)
+
+
+def scale_learning_rate(
+    learning_rate: float,
+    batch_size: int,
+    rule: str = 'sqrt',
+    base_batch_size: int = BASE_BATCH_SIZE,
+) -> float:
+    """
+    Learning rate for batch_size, given one tuned for base_batch_size
+    
+    Rules: 'linear' (lr * k), 'sqrt' (lr * sqrt(k)) or 'none', with
+    k = batch_size / base_batch_size.
+    """
+    if rule not in LR_SCALING_RULES:
+        raise ValueError(f"Unknown learning rate scaling rule {rule!r} (expected one of {LR_SCALING_RULES})")
+    ratio = batch_size / base_batch_size
+    if rule == 'linear':
+        return learning_rate * ratio
+    if rule == 'sqrt':
+        return learning_rate * math.sqrt(ratio)
+    return learning_rate
+
+
+def mse_loss(outputs: torch.Tensor, labels: torch.Tensor) -> torch.Tensor:
+    """Per-sample squared error"""
+    return (outputs - labels) ** 2
+
+
+def weighted_bce_loss(pos_weight: Optional[float] = None) -> LossFn:
+    """Per-sample binary cross-entropy, with positive samples weighted by pos_weight"""
+    def loss(outputs: torch.Tensor, labels: torch.Tensor) -> torch.Tensor:
+        per_sample_loss = F.binary_cross_entropy(outputs, labels, reduction='none')
+        if pos_weight is None:
+            return per_sample_loss
+        return per_sample_loss * torch.where(labels == 1.0, pos_weight, 1.0)
+    return loss
+
+
+def train_epoch(
+    model: nn.Module,
+    optimizer: torch.optim.Optimizer,
+    features: torch.Tensor,
+    labels: torch.Tensor,
+    batch_size: int,
+    loss_fn: LossFn,
+    generator: Optional[torch.Generator] = None,
+    track_accuracy: bool = False,
+) -> Dict[str, float]:
+    """
+    One epoch over shuffled contiguous slices
+    
+    Returns:
+        {'loss': mean per-sample loss} (+ 'accuracy' if track_accuracy)
+    """
+    model.train()
+    num_samples = len(features)
+    permutation = torch.randperm(num_samples, generator=generator).to(features.device)
+    shuffled_features = features[permutation]
+    shuffled_labels = labels[permutation]
+    
+    loss_sum = torch.zeros((), device=features.device)
+    correct = torch.zeros((), device=features.device)
+    for start in range(0, num_samples, batch_size):
+        batch_features = shuffled_features[start:start + batch_size]
+        batch_labels = shuffled_labels[start:start + batch_size]
+        
+        optimizer.zero_grad(set_to_none=True)
+        outputs = model(batch_features).reshape(-1)
+        losses = loss_fn(outputs, batch_labels)
+        losses.mean().backward()
+        optimizer.step()
+        
+        loss_sum += losses.detach().sum()
+        if track_accuracy:
+            correct += ((outputs.detach() > 0.5).float() == batch_labels).sum()
+    
+    metrics = {'loss': loss_sum.item() / max(num_samples, 1)}
+    if track_accuracy:
+        metrics['accuracy'] = correct.item() / max(num_samples, 1)
+    return metrics
+
+
+def evaluate(
+    model: nn.Module,
+    features: torch.Tensor,
+    labels: torch.Tensor,
+    loss_fn: LossFn,
+    track_accuracy: bool = False,
+) -> Dict[str, float]:
+    """Mean per-sample loss (and accuracy) over a split, in EVAL_BATCH_SIZE chunks"""
+    model.eval()
+    num_samples = len(features)
+    loss_sum = torch.zeros((), device=features.device)
+    correct = torch.zeros((), device=features.device)
+    with torch.no_grad():
+        for start in range(0, num_samples, EVAL_BATCH_SIZE):
+            batch_labels = labels[start:start + EVAL_BATCH_SIZE]
+            outputs = model(features[start:start + EVAL_BATCH_SIZE]).reshape(-1)
+            loss_sum += loss_fn(outputs, batch_labels).sum()
+            if track_accuracy:
+                correct += ((outputs > 0.5).float() == batch_labels).sum()
+    
+    metrics = {'loss': loss_sum.item() / max(num_samples, 1)}
+    if track_accuracy:
+        metrics['accuracy'] = correct.item() / max(num_samples, 1)
+    return metrics
+
+
+def train_tensors(
+    model: nn.Module,
+    X_train: torch.Tensor,
+    y_train: torch.Tensor,
+    X_val: torch.Tensor,
+    y_val: torch.Tensor,
+    loss_fn: LossFn,
+    num_epochs: int = 100,
+    batch_size: int = BASE_BATCH_SIZE,
+    learning_rate: float = 0.001,
+    lr_scaling: str = 'sqrt',
+    patience: int = 10,
+    seed: Optional[int] = None,
+    track_accuracy: bool = False,
+) -> Dict:
+    """
+    Train with early stopping, then restore the best-validation weights
+    
+    The model is moved to the device of X_train.
+    
+    Returns:
+        Training history (train/val losses per epoch, best_val_loss,
+        best_epoch, learning_rate; accuracies if track_accuracy)
+    """
+    model = model.to(X_train.device)
+    scaled_lr = scale_learning_rate(learning_rate, batch_size, lr_scaling)
+    optimizer = torch.optim.Adam(model.parameters(), lr=scaled_lr)
+    generator = torch.Generator()
+    if seed is not None:
+        generator.manual_seed(seed)
+    
+    train_losses: List[float] = []
+    val_losses: List[float] = []
+    train_accuracies: List[float] = []
+    val_accuracies: List[float] = []
+    
+    best_val_loss = float('inf')
+    best_epoch = 0
+    best_state = None
+    patience_counter = 0
+    
+    for epoch in range(num_epochs):
+        train_metrics = train_epoch(
+            model, optimizer, X_train, y_train, batch_size, loss_fn,
+            generator=generator, track_accuracy=track_accuracy,
+        )
+        val_metrics = evaluate(model, X_val, y_val, loss_fn, track_accuracy=track_accuracy)
+        train_losses.append(train_metrics['loss'])
+        val_losses.append(val_metrics['loss'])
+        if track_accuracy:
+            train_accuracies.append(train_metrics['accuracy'])
+            val_accuracies.append(val_metrics['accuracy'])
+        
+        # Early stopping (keeping the best checkpoint)
+        if val_metrics['loss'] < best_val_loss:
+            best_val_loss = val_metrics['loss']
+            best_epoch = epoch + 1
+            best_state = copy.deepcopy(model.state_dict())
+            patience_counter = 0
+        else:
+            patience_counter += 1
+            if patience_counter >= patience:
+                print(f"Early stopping at epoch {epoch + 1}")
+                break
+        
+        if (epoch + 1) % 10 == 0:
+            message = f"Epoch [{epoch + 1}/{num_epochs}], Train Loss: {train_metrics['loss']:.4f}"
+            if track_accuracy:
+                message += f", Train Acc: {train_metrics['accuracy']:.4f}"
+            message += f", Val Loss: {val_metrics['loss']:.4f}"
+            if track_accuracy:
+                message += f", Val Acc: {val_metrics['accuracy']:.4f}"
+            print(message)
+    
+    if best_state is not None:
+        model.load_state_dict(best_state)
+        print(f"Restored best checkpoint from epoch {best_epoch} (val loss {best_val_loss:.4f})")
+    
+    history = {
+        'train_losses': train_losses,
+        'val_losses': val_losses,
+        'best_val_loss': best_val_loss,
+        'best_epoch': best_epoch,
+        'learning_rate': scaled_lr,
+    }
+    if track_accuracy:
+        history['train_accuracies'] = train_accuracies
+        history['val_accuracies'] = val_accuracies
+        history['best_val_accuracy'] = val_accuracies[best_epoch - 1] if best_epoch else 0.0
+    return history
@@ -7,7 +7,8 @@ Tests the complete retraining workflow:
 1. Export training data
 2. Train model
 3. Validate model
-4. Deploy model
+4. Benchmark model with ONNX Runtime (parity, latency)
+5. Deploy model
 
 Usage:
     python scripts/ml/test_retraining_workflow.py \
@@ -16,7 +17,6 @@ Usage:
 """
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
@@ -24,8 +24,16 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.ml.dataset_base import ColumnarDataset
 from scripts.ml.train_calling_score_model import main as train_calling_score
 from scripts.ml.train_outcome_prediction_model import main as train_outcome
+from scripts.ml.benchmark_onnx_model import (
+    benchmark_onnx_model,
+    load_reference_model,
+    load_test_split,
+    print_summary,
+    record_benchmark,
+)
 
 
 def test_retraining_workflow(data_path: str, model_type: str, output_path: str):
@@ -33,7 +41,7 @@ def test_retraining_workflow(data_path: str, model_type: str, output_path: str):
     Test the complete retraining workflow
     
     Args:
-        data_path: Path to training data JSON
+        data_path: Path to training data (columnar dataset directory or JSON file)
         model_type: 'calling_score' or 'outcome'
         output_path: Path to save trained model
     """
@@ -45,29 +53,22 @@ def test_retraining_workflow(data_path: str, model_type: str, output_path: str):
     print(f"Output Path: {output_path}")
     print()
     
-    # Step 1: Validate data file exists
+    # Step 1: Validate training data exists
     print("Step 1: Validating training data...")
     if not Path(data_path).exists():
-        print(f"❌ Error: Data file not found: {data_path}")
+        print(f"❌ Error: Training data not found: {data_path}")
         return False
-    print("✅ Training data file exists")
+    print("✅ Training data exists")
     
     # Step 2: Load and validate data structure
     print("\nStep 2: Validating data structure...")
     try:
-        with open(data_path, 'r') as f:
-            data = json.load(f)
-        
-        if 'training_data' not in data:
-            print("❌ Error: Invalid data format (missing 'training_data')")
-            return False
-        
-        training_data = data['training_data']
-        if len(training_data) == 0:
+        num_samples = len(ColumnarDataset.load(Path(data_path)))
+        if num_samples == 0:
             print("❌ Error: No training samples in data")
             return False
         
-        print(f"✅ Data structure valid ({len(training_data)} samples)")
+        print(f"✅ Data structure valid ({num_samples} samples)")
     except Exception as e:
         print(f"❌ Error loading data: {e}")
         return False
@@ -133,8 +134,24 @@ def test_retraining_workflow(data_path: str, model_type: str, output_path: str):
     
     print(f"✅ Model file validated ({file_size / 1024:.1f} KB)")
     
-    # Step 5: Test model loading (would require ONNX runtime)
-    print(f"\nStep 5: Model ready for deployment")
+    # Step 5: Load with ONNX Runtime, check parity and inference cost
+    print(f"\nStep 5: Benchmarking model with ONNX Runtime...")
+    try:
+        X_test, _ = load_test_split(data_path, model_type)
+        model = load_reference_model(output_path, model_type)
+        results = benchmark_onnx_model(output_path, model, X_test, batch_sizes=(1, 32, 512), thread_counts=(1,))
+        print_summary(results)
+        record_benchmark(output_path, results)
+    except Exception as e:
+        print(f"❌ Error benchmarking model: {e}")
+        return False
+    
+    if not results['parity']['passed']:
+        print("❌ Error: ONNX Runtime outputs do not match the PyTorch model")
+        return False
+    print("✅ ONNX Runtime parity verified")
+    
+    print(f"\nStep 6: Model ready for deployment")
     print(f"✅ Model path: {output_path}")
     
     print("\n" + "="*80)
@@ -150,7 +167,7 @@ def main():
         '--data-path',
         type=str,
         required=True,
-        help='Path to training data JSON file',
+        help='Path to training data (columnar dataset directory or JSON file)',
     )
     parser.add_argument(
         '--model-type',
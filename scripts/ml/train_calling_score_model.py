@@ -16,7 +16,6 @@ Usage:
 """
 
 import argparse
-import json
 import os
 import sys
 from pathlib import Path
@@ -34,6 +33,13 @@ from sklearn.preprocessing import StandardScaler
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+# Add scripts/ml to path for dataset_base / feature_schema imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from dataset_base import ColumnarDataset
+from feature_schema import CALLING_SCORE_SCHEMA
+from tensor_training import LR_SCALING_RULES, evaluate, mse_loss, to_tensor, train_tensors
+
 
 class CallingScoreDataset(Dataset):
     """Dataset for calling score training data"""
@@ -82,9 +88,10 @@ class CallingScoreModel(nn.Module):
 
 def load_training_data(data_path: str) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Load training data from JSON file or Supabase
+    Load training data from a columnar dataset directory or JSON file
     
-    Expected JSON format:
+    Columnar datasets (written by TrainingDataset.save) are memory-mapped;
+    JSON files follow the TrainingDataset format:
     {
         "training_data": [
             {
@@ -103,103 +110,34 @@ def load_training_data(data_path: str) -> Tuple[np.ndarray, np.ndarray]:
     if not os.path.exists(data_path):
         raise FileNotFoundError(f"Data file not found: {data_path}")
     
-    with open(data_path, 'r') as f:
-        data = json.load(f)
-    
-    training_records = data.get('training_data', [])
+    dataset = ColumnarDataset.load(Path(data_path))
     
-    if len(training_records) == 0:
+    if len(dataset) == 0:
         raise ValueError("No training data found in file")
     
-    # Extract features and labels
-    features = []
-    labels = []
+    # Feature matrix (N, 39) in CALLING_SCORE_SCHEMA order
+    features = dataset.feature_matrix(CALLING_SCORE_SCHEMA)
     
-    for record in training_records:
-        # Extract feature vector (39D)
-        feature_vector = extract_features(record)
-        features.append(feature_vector)
-        
-        # Use outcome_score as label if available, otherwise use formula_calling_score
-        label = record.get('outcome_score', record.get('formula_calling_score', 0.5))
-        labels.append(float(label))
+    # Use outcome_score as label if available, otherwise use formula_calling_score
+    outcome_score = np.asarray(dataset.column('outcome_score'))
+    formula_score = np.asarray(dataset.column('formula_calling_score'))
+    labels = np.where(np.isnan(outcome_score), formula_score, outcome_score)
+    labels = np.where(np.isnan(labels), 0.5, labels)
     
-    return np.array(features), np.array(labels)
+    return features, labels
 
 
 def extract_features(record: Dict) -> List[float]:
     """
-    Extract 39D feature vector from training record
+    Extract 39D feature vector from a single training record
     
-    Feature order:
+    Feature order (CALLING_SCORE_SCHEMA):
     - [0-11]: User vibe dimensions (12D)
     - [12-23]: Spot vibe dimensions (12D)
     - [24-33]: Context features (10 features)
     - [34-38]: Timing features (5 features)
     """
-    features = []
-    
-    # User vibe dimensions (12D)
-    user_vibe = record.get('user_vibe_dimensions', {})
-    dimension_names = [
-        'exploration_eagerness',
-        'community_orientation',
-        'location_adventurousness',
-        'authenticity_preference',
-        'trust_network_reliance',
-        'temporal_flexibility',
-        'energy_preference',
-        'novelty_seeking',
-        'value_orientation',
-        'crowd_tolerance',
-        'social_preference',
-        'overall_energy',
-    ]
-    for dim in dimension_names:
-        features.append(float(user_vibe.get(dim, 0.5)))
-    
-    # Spot vibe dimensions (12D)
-    spot_vibe = record.get('spot_vibe_dimensions', {})
-    for dim in dimension_names:
-        features.append(float(spot_vibe.get(dim, 0.5)))
-    
-    # Context features (10 features)
-    context = record.get('context_features', {})
-    context_features = [
-        'location_proximity',
-        'journey_alignment',
-        'user_receptivity',
-        'opportunity_availability',
-        'network_effects',
-        'community_patterns',
-        # Former placeholders (now supported if present in training records)
-        'vibe_compatibility',
-        'energy_match',
-        'community_match',
-        'novelty_match',
-    ]
-    for feat in context_features:
-        features.append(float(context.get(feat, 0.5)))
-    
-    # Timing features (5 features)
-    timing = record.get('timing_features', {})
-    timing_features = [
-        'optimal_time_of_day',
-        'optimal_day_of_week',
-        'user_patterns',
-        'opportunity_timing',
-        # Former placeholder (now supported if present in training records)
-        'timing_alignment',
-    ]
-    for feat in timing_features:
-        features.append(float(timing.get(feat, 0.5)))
-    
-    # Ensure exactly 39 features
-    features = features[:39]
-    while len(features) < 39:
-        features.append(0.5)
-    
-    return features
+    return CALLING_SCORE_SCHEMA.extract(record)
 
 
 def train_model(
@@ -306,7 +244,7 @@ def main():
         '--data-path',
         type=str,
         default='data/calling_score_training_data.json',
-        help='Path to training data JSON file',
+        help='Path to training data (columnar dataset directory or JSON file)',
     )
     parser.add_argument(
         '--output-path',
@@ -344,6 +282,27 @@ def main():
         default=None,
         help='Dropout rate (default: 0.2)',
     )
+    parser.add_argument(
+        '--training-mode',
+        type=str,
+        default='tensor',
+        choices=['tensor', 'dataloader'],
+        help='tensor: in-memory tensors, on-device loss accumulation, best checkpoint restored (default); '
+             'dataloader: per-sample DataLoader loop',
+    )
+    parser.add_argument(
+        '--lr-scaling',
+        type=str,
+        default='sqrt',
+        choices=list(LR_SCALING_RULES),
+        help='Scale --learning-rate by batch size relative to 32 in tensor mode (default: sqrt)',
+    )
+    parser.add_argument(
+        '--benchmark',
+        action='store_true',
+        help='After export, benchmark the model with ONNX Runtime (parity on the test split, latency, '
+             'load cost) and record the results in the model registry next to it',
+    )
     
     args = parser.parse_args()
     
@@ -366,15 +325,6 @@ def main():
     
     print(f"Train: {len(X_train)}, Val: {len(X_val)}, Test: {len(X_test)}")
     
-    # Create datasets
-    train_dataset = CallingScoreDataset(X_train, y_train)
-    val_dataset = CallingScoreDataset(X_val, y_val)
-    test_dataset = CallingScoreDataset(X_test, y_test)
-    
-    train_loader = DataLoader(train_dataset, batch_size=args.batch_size, shuffle=True)
-    val_loader = DataLoader(val_dataset, batch_size=args.batch_size, shuffle=False)
-    test_loader = DataLoader(test_dataset, batch_size=args.batch_size, shuffle=False)
-    
     # Parse architecture from args if provided
     hidden_sizes = [128, 64]  # Default
     if args.hidden_sizes:
@@ -396,37 +346,81 @@ def main():
     print(f"Dropout: {dropout}")
     
     # Train model
-    print("Training model...")
+    print(f"Training model ({args.training_mode} mode)...")
     device = 'cuda' if torch.cuda.is_available() else 'cpu'
     print(f"Using device: {device}")
     
-    history = train_model(
-        model,
-        train_loader,
-        val_loader,
-        num_epochs=args.epochs,
-        learning_rate=args.learning_rate,
-        device=device,
-    )
-    
-    # Evaluate on test set
-    model.eval()
-    test_loss = 0.0
-    criterion = nn.MSELoss()
-    with torch.no_grad():
-        for features, labels in test_loader:
-            features, labels = features.to(device), labels.to(device)
-            outputs = model(features)
-            loss = criterion(outputs, labels)
-            test_loss += loss.item()
+    if args.training_mode == 'tensor':
+        # Whole standardized splits as contiguous tensors on the device
+        X_train, y_train, X_val, y_val, X_test, y_test = (
+            to_tensor(values, device) for values in (X_train, y_train, X_val, y_val, X_test, y_test)
+        )
+        history = train_tensors(
+            model,
+            X_train,
+            y_train,
+            X_val,
+            y_val,
+            mse_loss,
+            num_epochs=args.epochs,
+            batch_size=args.batch_size,
+            learning_rate=args.learning_rate,
+            lr_scaling=args.lr_scaling,
+            seed=42,
+        )
+        print(f"Learning rate: {history['learning_rate']:.6g} (batch size {args.batch_size}, {args.lr_scaling} scaling)")
+        
+        # Evaluate on test set (best-validation checkpoint)
+        test_loss = evaluate(model, X_test, y_test, mse_loss)['loss']
+    else:
+        # Create datasets
+        train_dataset = CallingScoreDataset(X_train, y_train)
+        val_dataset = CallingScoreDataset(X_val, y_val)
+        test_dataset = CallingScoreDataset(X_test, y_test)
+        
+        train_loader = DataLoader(train_dataset, batch_size=args.batch_size, shuffle=True)
+        val_loader = DataLoader(val_dataset, batch_size=args.batch_size, shuffle=False)
+        test_loader = DataLoader(test_dataset, batch_size=args.batch_size, shuffle=False)
+        
+        history = train_model(
+            model,
+            train_loader,
+            val_loader,
+            num_epochs=args.epochs,
+            learning_rate=args.learning_rate,
+            device=device,
+        )
+        
+        # Evaluate on test set
+        model.eval()
+        test_loss = 0.0
+        criterion = nn.MSELoss()
+        with torch.no_grad():
+            for features, labels in test_loader:
+                features, labels = features.to(device), labels.to(device)
+                outputs = model(features)
+                loss = criterion(outputs, labels)
+                test_loss += loss.item()
+        
+        test_loss /= len(test_loader)
     
-    test_loss /= len(test_loader)
     print(f"Test Loss: {test_loss:.4f}")
     
     # Export to ONNX
     print("Exporting to ONNX...")
     os.makedirs(os.path.dirname(args.output_path), exist_ok=True)
-    export_to_onnx(model, args.output_path)
+    export_to_onnx(model.cpu(), args.output_path, input_size=X_train.shape[1])
+    
+    if args.benchmark:
+        from benchmark_onnx_model import benchmark_onnx_model, print_summary, record_benchmark
+        
+        X_test_array = X_test.cpu().numpy() if torch.is_tensor(X_test) else X_test
+        results = benchmark_onnx_model(args.output_path, model, X_test_array)
+        print_summary(results)
+        print(f"Benchmark recorded in: {record_benchmark(args.output_path, results)}")
+        if not results['parity']['passed']:
+            print("❌ ONNX Runtime outputs do not match the PyTorch model")
+            sys.exit(1)
     
     print("Training complete!")
     print(f"Model saved to: {args.output_path}")
@@ -16,7 +16,6 @@ Usage:
 """
 
 import argparse
-import json
 import os
 import sys
 from pathlib import Path
@@ -35,6 +34,13 @@ from sklearn.utils.class_weight import compute_class_weight
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+# Add scripts/ml to path for dataset_base / feature_schema imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from dataset_base import ColumnarDataset
+from feature_schema import OUTCOME_PREDICTION_SCHEMA
+from tensor_training import LR_SCALING_RULES, evaluate, to_tensor, train_tensors, weighted_bce_loss
+
 
 class OutcomePredictionDataset(Dataset):
     """Dataset for outcome prediction training data"""
@@ -83,9 +89,10 @@ class OutcomePredictionModel(nn.Module):
 
 def load_training_data(data_path: str) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Load training data from JSON file
+    Load training data from a columnar dataset directory or JSON file
     
-    Expected JSON format:
+    Columnar datasets (written by TrainingDataset.save) are memory-mapped;
+    JSON files follow the TrainingDataset format:
     {
         "training_data": [
             {
@@ -93,6 +100,7 @@ def load_training_data(data_path: str) -> Tuple[np.ndarray, np.ndarray]:
                 "spot_vibe_dimensions": {...},
                 "context_features": {...},
                 "timing_features": {...},
+                "history_features": {...},
                 "outcome_type": "positive" | "negative" | "neutral",
                 "outcome_score": 0.0-1.0
             },
@@ -103,119 +111,32 @@ def load_training_data(data_path: str) -> Tuple[np.ndarray, np.ndarray]:
     if not os.path.exists(data_path):
         raise FileNotFoundError(f"Data file not found: {data_path}")
     
-    with open(data_path, 'r') as f:
-        data = json.load(f)
-    
-    training_records = data.get('training_data', [])
+    dataset = ColumnarDataset.load(Path(data_path))
     
-    if len(training_records) == 0:
+    if len(dataset) == 0:
         raise ValueError("No training data found in file")
     
-    # Extract features and labels
-    features = []
-    labels = []
+    # Feature matrix (N, 45) in OUTCOME_PREDICTION_SCHEMA order
+    features = dataset.feature_matrix(OUTCOME_PREDICTION_SCHEMA)
     
-    for record in training_records:
-        # Extract feature vector (~45D)
-        feature_vector = extract_features(record)
-        features.append(feature_vector)
-        
-        # Extract label: 1.0 for positive outcome, 0.0 for negative/neutral
-        outcome_type = record.get('outcome_type', 'neutral')
-        outcome_score = record.get('outcome_score', 0.5)
-        
-        # Label: 1.0 if positive outcome, 0.0 otherwise
-        # Can also use outcome_score directly (0.0-1.0)
-        if outcome_type == 'positive' or outcome_score >= 0.7:
-            labels.append(1.0)
-        else:
-            labels.append(0.0)
+    # Label: 1.0 if positive outcome, 0.0 otherwise
+    # Missing outcome_score counts as 0.5 (never positive on its own)
+    outcome_score = np.asarray(dataset.column('outcome_score'))
+    positive = dataset.outcome_type_mask('positive') | (np.nan_to_num(outcome_score, nan=0.5) >= 0.7)
+    labels = positive.astype(np.float64)
     
-    return np.array(features), np.array(labels)
+    return features, labels
 
 
 def extract_features(record: Dict) -> List[float]:
     """
-    Extract ~45D feature vector from training record
+    Extract 45D feature vector from a single training record
     
-    Feature order:
+    Feature order (OUTCOME_PREDICTION_SCHEMA):
     - [0-38]: Base features (39D) - same as calling score model
     - [39-44]: History features (6D)
     """
-    features = []
-    
-    # Base features (39D) - same as calling score model
-    # User vibe dimensions (12D)
-    user_vibe = record.get('user_vibe_dimensions', {})
-    dimension_names = [
-        'exploration_eagerness',
-        'community_orientation',
-        'location_adventurousness',
-        'authenticity_preference',
-        'trust_network_reliance',
-        'temporal_flexibility',
-        'energy_preference',
-        'novelty_seeking',
-        'value_orientation',
-        'crowd_tolerance',
-        'social_preference',
-        'overall_energy',
-    ]
-    for dim in dimension_names:
-        features.append(float(user_vibe.get(dim, 0.5)))
-    
-    # Spot vibe dimensions (12D)
-    spot_vibe = record.get('spot_vibe_dimensions', {})
-    for dim in dimension_names:
-        features.append(float(spot_vibe.get(dim, 0.5)))
-    
-    # Context features (10 features)
-    context = record.get('context_features', {})
-    context_features = [
-        'location_proximity',
-        'journey_alignment',
-        'user_receptivity',
-        'opportunity_availability',
-        'network_effects',
-        'community_patterns',
-    ]
-    for feat in context_features:
-        features.append(float(context.get(feat, 0.5)))
-    # Add 4 placeholder context features
-    while len(features) < 34:
-        features.append(0.5)
-    
-    # Timing features (5 features)
-    timing = record.get('timing_features', {})
-    timing_features = [
-        'optimal_time_of_day',
-        'optimal_day_of_week',
-        'user_patterns',
-        'opportunity_timing',
-    ]
-    for feat in timing_features:
-        features.append(float(timing.get(feat, 0.5)))
-    # Add 1 placeholder timing feature
-    if len(features) < 39:
-        features.append(0.5)
-    
-    # History features (6D) - placeholder for now
-    # In production, these would come from user's historical data
-    # For training, we can use synthetic or aggregated data
-    history_features = record.get('history_features', {})
-    features.append(float(history_features.get('past_positive_rate', 0.5)))
-    features.append(float(history_features.get('past_negative_rate', 0.5)))
-    features.append(float(history_features.get('average_engagement', 0.5)))
-    features.append(float(history_features.get('interaction_count', 0.0)))
-    features.append(float(history_features.get('time_since_last_positive', 0.5)))
-    features.append(float(history_features.get('activity_level', 0.5)))
-    
-    # Ensure exactly 45 features
-    features = features[:45]
-    while len(features) < 45:
-        features.append(0.5)
-    
-    return features
+    return OUTCOME_PREDICTION_SCHEMA.extract(record)
 
 
 def train_model(
@@ -361,7 +282,7 @@ def main():
         '--data-path',
         type=str,
         default='data/calling_score_training_data.json',
-        help='Path to training data JSON file',
+        help='Path to training data (columnar dataset directory or JSON file)',
     )
     parser.add_argument(
         '--output-path',
@@ -387,6 +308,27 @@ def main():
         default=0.001,
         help='Learning rate',
     )
+    parser.add_argument(
+        '--training-mode',
+        type=str,
+        default='tensor',
+        choices=['tensor', 'dataloader'],
+        help='tensor: in-memory tensors, on-device loss accumulation, best checkpoint restored (default); '
+             'dataloader: per-sample DataLoader loop',
+    )
+    parser.add_argument(
+        '--lr-scaling',
+        type=str,
+        default='sqrt',
+        choices=list(LR_SCALING_RULES),
+        help='Scale --learning-rate by batch size relative to 32 in tensor mode (default: sqrt)',
+    )
+    parser.add_argument(
+        '--benchmark',
+        action='store_true',
+        help='After export, benchmark the model with ONNX Runtime (parity on the test split, latency, '
+             'load cost) and record the results in the model registry next to it',
+    )
     
     args = parser.parse_args()
     
@@ -421,66 +363,105 @@ def main():
     print(f"Class distribution: Positive={num_positive}, Negative={num_negative}")
     print(f"Pos weight: {pos_weight_value:.4f}")
     
-    # Create datasets
-    train_dataset = OutcomePredictionDataset(X_train, y_train)
-    val_dataset = OutcomePredictionDataset(X_val, y_val)
-    test_dataset = OutcomePredictionDataset(X_test, y_test)
-    
-    train_loader = DataLoader(train_dataset, batch_size=args.batch_size, shuffle=True)
-    val_loader = DataLoader(val_dataset, batch_size=args.batch_size, shuffle=False)
-    test_loader = DataLoader(test_dataset, batch_size=args.batch_size, shuffle=False)
-    
     # Create model
     model = OutcomePredictionModel(input_size=features.shape[1], hidden_sizes=[128, 64, 32], output_size=1)
     print(f"Model created: {sum(p.numel() for p in model.parameters())} parameters")
     
     # Train model
-    print("Training model...")
+    print(f"Training model ({args.training_mode} mode)...")
     device = 'cuda' if torch.cuda.is_available() else 'cpu'
     print(f"Using device: {device}")
     
-    history = train_model(
-        model,
-        train_loader,
-        val_loader,
-        num_epochs=args.epochs,
-        learning_rate=args.learning_rate,
-        device=device,
-        pos_weight=pos_weight_tensor,
-    )
-    
-    # Evaluate on test set
-    model.eval()
-    test_loss = 0.0
-    test_correct = 0
-    test_total = 0
-    criterion = nn.BCELoss(reduction='none')
-    with torch.no_grad():
-        for features, labels in test_loader:
-            features, labels = features.to(device), labels.to(device)
-            outputs = model(features)
-            per_sample_loss = criterion(outputs, labels)
-            # Apply pos_weight to positive samples for consistency
-            if pos_weight_tensor is not None:
-                weights = torch.where(labels == 1.0, pos_weight_tensor.item(), 1.0)
-                loss = (per_sample_loss * weights).mean()
-            else:
-                loss = per_sample_loss.mean()
-            test_loss += loss.item()
-            
-            # Calculate accuracy
-            predicted = (outputs > 0.5).float()
-            test_total += labels.size(0)
-            test_correct += (predicted == labels).sum().item()
+    if args.training_mode == 'tensor':
+        # Whole standardized splits as contiguous tensors on the device
+        X_train, y_train, X_val, y_val, X_test, y_test = (
+            to_tensor(values, device) for values in (X_train, y_train, X_val, y_val, X_test, y_test)
+        )
+        loss_fn = weighted_bce_loss(pos_weight_value)
+        history = train_tensors(
+            model,
+            X_train,
+            y_train,
+            X_val,
+            y_val,
+            loss_fn,
+            num_epochs=args.epochs,
+            batch_size=args.batch_size,
+            learning_rate=args.learning_rate,
+            lr_scaling=args.lr_scaling,
+            seed=42,
+            track_accuracy=True,
+        )
+        print(f"Learning rate: {history['learning_rate']:.6g} (batch size {args.batch_size}, {args.lr_scaling} scaling)")
+        
+        # Evaluate on test set (best-validation checkpoint)
+        test_metrics = evaluate(model, X_test, y_test, loss_fn, track_accuracy=True)
+        test_loss = test_metrics['loss']
+        test_accuracy = test_metrics['accuracy']
+    else:
+        # Create datasets
+        train_dataset = OutcomePredictionDataset(X_train, y_train)
+        val_dataset = OutcomePredictionDataset(X_val, y_val)
+        test_dataset = OutcomePredictionDataset(X_test, y_test)
+        
+        train_loader = DataLoader(train_dataset, batch_size=args.batch_size, shuffle=True)
+        val_loader = DataLoader(val_dataset, batch_size=args.batch_size, shuffle=False)
+        test_loader = DataLoader(test_dataset, batch_size=args.batch_size, shuffle=False)
+        
+        history = train_model(
+            model,
+            train_loader,
+            val_loader,
+            num_epochs=args.epochs,
+            learning_rate=args.learning_rate,
+            device=device,
+            pos_weight=pos_weight_tensor,
+        )
+        
+        # Evaluate on test set
+        model.eval()
+        test_loss = 0.0
+        test_correct = 0
+        test_total = 0
+        criterion = nn.BCELoss(reduction='none')
+        with torch.no_grad():
+            for features, labels in test_loader:
+                features, labels = features.to(device), labels.to(device)
+                outputs = model(features)
+                per_sample_loss = criterion(outputs, labels)
+                # Apply pos_weight to positive samples for consistency
+                if pos_weight_tensor is not None:
+                    weights = torch.where(labels == 1.0, pos_weight_tensor.item(), 1.0)
+                    loss = (per_sample_loss * weights).mean()
+                else:
+                    loss = per_sample_loss.mean()
+                test_loss += loss.item()
+                
+                # Calculate accuracy
+                predicted = (outputs > 0.5).float()
+                test_total += labels.size(0)
+                test_correct += (predicted == labels).sum().item()
+        
+        test_loss /= len(test_loader)
+        test_accuracy = test_correct / test_total if test_total > 0 else 0.0
     
-    test_loss /= len(test_loader)
-    test_accuracy = test_correct / test_total if test_total > 0 else 0.0
     print(f"Test Loss: {test_loss:.4f}, Test Accuracy: {test_accuracy:.4f}")
     
     # Export to ONNX
     print("Exporting to ONNX...")
     os.makedirs(os.path.dirname(args.output_path), exist_ok=True)
-    export_to_onnx(model, args.output_path, input_size=features.shape[1])
+    export_to_onnx(model.cpu(), args.output_path, input_size=X_train.shape[1])
+    
+    if args.benchmark:
+        from benchmark_onnx_model import benchmark_onnx_model, print_summary, record_benchmark
+        
+        X_test_array = X_test.cpu().numpy() if torch.is_tensor(X_test) else X_test
+        results = benchmark_onnx_model(args.output_path, model, X_test_array)
+        print_summary(results)
+        print(f"Benchmark recorded in: {record_benchmark(args.output_path, results)}")
+        if not results['parity']['passed']:
+            print("❌ ONNX Runtime outputs do not match the PyTorch model")
+            sys.exit(1)
     
     print("Training complete!")
     print(f"Model saved to: {args.output_path}")
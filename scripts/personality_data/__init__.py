@@ -19,6 +19,7 @@ __version__ = '1.0.0'
 from scripts.personality_data.converters.big_five_to_spots import BigFiveToSpotsConverter
 from scripts.personality_data.loaders.csv_loader import CSVLoader
 from scripts.personality_data.loaders.json_loader import JSONLoader
+from scripts.personality_data.loaders.jsonl_loader import JSONLinesLoader
 from scripts.personality_data.processors.ground_truth_generator import GroundTruthGenerator
 from scripts.personality_data.registry.converter_registry import get_converter
 from scripts.personality_data.registry.dataset_registry import get_dataset_info
@@ -27,6 +28,7 @@ __all__ = [
     'BigFiveToSpotsConverter',
     'CSVLoader',
     'JSONLoader',
+    'JSONLinesLoader',
     'GroundTruthGenerator',
     'get_converter',
     'get_dataset_info',
@@ -13,8 +13,10 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from scripts.personality_data.converter import convert_dataset
+from scripts.personality_data.converter import convert_dataset, stream_convert_dataset, JSON_LINES_SUFFIXES
+from scripts.personality_data.loaders.jsonl_loader import JSONLinesLoader
 from scripts.personality_data.processors.ground_truth_generator import GroundTruthGenerator
+from scripts.knot_validation.ground_truth_store import STORE_SUFFIX
 from scripts.personality_data.registry.dataset_registry import list_datasets, get_dataset_info
 from scripts.personality_data.registry.converter_registry import list_converters
 
@@ -44,19 +46,43 @@ Examples:
       --output data/processed/spots_profiles.json \\
       --ground-truth data/processed/ground_truth.json \\
       --source big_five
+
+  # Large datasets: write a memory-mapped ground-truth store instead of JSON
+  python -m scripts.personality_data.cli.convert \\
+      data/raw/big_five.csv \\
+      --output data/processed/spots_profiles.json \\
+      --ground-truth data/processed/ground_truth.gtstore \\
+      --source big_five
+
+  # Multi-million-row dumps: stream to JSON Lines with bounded memory
+  python -m scripts.personality_data.cli.convert \\
+      data/raw/big_five.csv \\
+      --output data/processed/spots_profiles.jsonl \\
+      --source big_five
         """
     )
     
-    parser.add_argument('input_file', type=Path, nargs='?', help='Input dataset file (CSV or JSON)')
-    parser.add_argument('--output', type=Path, help='Output SPOTS profiles file (default: input_file_spots.json)')
+    parser.add_argument('input_file', type=Path, nargs='?', help='Input dataset file (CSV, JSON or JSON Lines)')
+    parser.add_argument('--output', type=Path,
+                       help='Output SPOTS profiles file (default: input_file_spots.json; a .jsonl path streams)')
     parser.add_argument('--source', type=str, default='big_five',
                        help='Source format or converter ID (default: big_five)')
     parser.add_argument('--dataset', type=str,
                        help='Dataset ID from registry (overrides --source if provided)')
-    parser.add_argument('--format', choices=['csv', 'json', 'auto'], default='auto',
+    parser.add_argument('--format', choices=['csv', 'json', 'jsonl', 'auto'], default='auto',
                        help='Input file format (default: auto-detect)')
+    parser.add_argument('--stream', action='store_true',
+                       help='Stream rows to JSON Lines output with bounded memory (implied by a .jsonl output)')
+    parser.add_argument('--no-original', action='store_true',
+                       help="Do not embed each raw row under 'original_data'")
+    parser.add_argument('--progress-every', type=int, default=100_000,
+                       help='Report progress every N rows when streaming (default: 100000, 0 = off)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Conversion processes when streaming (default: 1, 0 = all cores)')
+    parser.add_argument('--chunk-size', type=int, default=10_000,
+                       help='Rows per conversion task when streaming (default: 10000)')
     parser.add_argument('--ground-truth', type=Path,
-                       help='Output ground truth file (optional)')
+                       help='Output ground truth file (optional; a .gtstore path writes a memory-mapped store)')
     parser.add_argument('--threshold', type=float, default=0.6,
                        help='Compatibility threshold for ground truth (default: 0.6)')
     parser.add_argument('--noise', type=float, default=0.05,
@@ -100,27 +126,49 @@ Examples:
             print(f"Warning: Dataset '{dataset_id}' not found, using --source format")
     
     # Determine output file
+    stream = args.stream or (args.output is not None and args.output.suffix.lower() in JSON_LINES_SUFFIXES)
     if args.output is None:
-        args.output = args.input_file.parent / f"{args.input_file.stem}_spots.json"
+        suffix = '.jsonl' if stream else '.json'
+        args.output = args.input_file.parent / f"{args.input_file.stem}_spots{suffix}"
     
     # Convert dataset
     try:
-        spots_profiles = convert_dataset(
-            args.input_file,
-            args.output,
-            source_format=source_format,
-            dataset_id=dataset_id,
-            input_file_format=args.format,
-            validate=not args.no_validate
-        )
+        if stream:
+            stream_convert_dataset(
+                args.input_file,
+                args.output,
+                source_format=source_format,
+                dataset_id=dataset_id,
+                input_file_format=args.format,
+                validate=not args.no_validate,
+                keep_original=not args.no_original,
+                progress_every=args.progress_every,
+                workers=args.workers or None,
+                chunk_size=args.chunk_size
+            )
+        else:
+            spots_profiles = convert_dataset(
+                args.input_file,
+                args.output,
+                source_format=source_format,
+                dataset_id=dataset_id,
+                input_file_format=args.format,
+                validate=not args.no_validate,
+                keep_original=not args.no_original
+            )
         
         # Generate ground truth if requested
         if args.ground_truth:
+            if stream:
+                spots_profiles = JSONLinesLoader.load(args.output)
             generator = GroundTruthGenerator(
                 compatibility_threshold=args.threshold,
                 noise_level=args.noise
             )
-            generator.generate(spots_profiles, args.ground_truth)
+            if args.ground_truth.suffix == STORE_SUFFIX:
+                generator.generate_store(spots_profiles, args.ground_truth)
+            else:
+                generator.generate(spots_profiles, args.ground_truth)
         
         print(f"\n✅ Conversion complete!")
         print(f"   Output: {args.output}")
@@ -2,116 +2,211 @@
 Main Conversion Orchestrator
 
 Orchestrates the conversion of personality datasets to SPOTS format.
+
+Conversion is a generator pipeline: read → extract → validate → convert
+→ write. convert_dataset() collects the profiles into a list and saves a
+JSON array; stream_convert_dataset() writes JSON Lines as rows are read,
+so memory stays bounded regardless of dataset size.
 """
 
 import sys
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts.personality_data.converters.base import PersonalityConverter
 from scripts.personality_data.loaders.csv_loader import CSVLoader
 from scripts.personality_data.loaders.json_loader import JSONLoader
+from scripts.personality_data.loaders.jsonl_loader import JSONLinesLoader
 from scripts.personality_data.registry.converter_registry import get_converter
 from scripts.personality_data.registry.dataset_registry import get_dataset_info, get_column_mappings
 from scripts.personality_data.processors.dataset_validator import DatasetValidator
 from scripts.personality_data.utils.big_five_extractor import BigFiveExtractor
 
+BIG_FIVE_FORMATS = ['big_five', 'big_five_to_spots', 'ocean']
+JSON_LINES_SUFFIXES = ['.jsonl', '.ndjson']
 
-def convert_dataset(
-    input_file: Path,
-    output_file: Path,
-    source_format: str = 'big_five',
-    dataset_id: Optional[str] = None,
-    input_file_format: str = 'auto',
-    user_id_prefix: str = 'user_',
-    validate: bool = True
-) -> List[Dict[str, Any]]:
+# Number of per-row warnings printed before they are only counted
+MAX_WARNINGS = 10
+
+
+def detect_file_format(input_file: Path) -> str:
     """
-    Convert a personality dataset to SPOTS format.
+    Detect input format from the file extension.
+    
+    Returns:
+        'csv', 'json' or 'jsonl'
+    """
+    suffix = input_file.suffix.lower()
+    if suffix == '.csv':
+        return 'csv'
+    elif suffix == '.json':
+        return 'json'
+    elif suffix in JSON_LINES_SUFFIXES:
+        return 'jsonl'
+    raise ValueError(f"Unknown file format: {input_file.suffix}")
+
+
+def iter_raw_profiles(input_file: Path, input_file_format: str = 'auto') -> Iterator[Dict[str, Any]]:
+    """
+    Stream raw rows from a CSV, JSON array or JSON Lines file.
     
     Args:
-        input_file: Path to input dataset (CSV or JSON)
-        output_file: Path to output SPOTS profiles (JSON)
-        source_format: Source format ('big_five', 'mbti', etc.) or converter ID
-        dataset_id: Optional dataset ID (for column mappings)
-        input_file_format: 'csv', 'json', or 'auto' (detect from extension)
-        user_id_prefix: Prefix for generated user IDs
-        validate: Whether to validate output profiles
+        input_file: Path to input dataset
+        input_file_format: 'csv', 'json', 'jsonl', or 'auto' (detect from extension)
+    
+    Yields:
+        Raw profile dictionaries
+    """
+    if input_file_format == 'auto':
+        input_file_format = detect_file_format(input_file)
+    
+    if input_file_format == 'csv':
+        return CSVLoader.iter_rows(input_file)
+    elif input_file_format == 'json':
+        return JSONLoader.iter_records(input_file)
+    elif input_file_format == 'jsonl':
+        return JSONLinesLoader.iter_records(input_file)
+    raise ValueError(f"Unknown file format: {input_file_format}")
+
+
+def create_converter(
+    source_format: str,
+    dataset_id: Optional[str] = None
+) -> Tuple[PersonalityConverter, Optional[Dict[str, List[str]]]]:
+    """
+    Instantiate the converter for source_format and dataset column mappings.
     
     Returns:
-        List of converted SPOTS profiles
+        Tuple of (converter, column_mappings or None)
     """
-    # Get converter
     converter_class = get_converter(source_format)
     if converter_class is None:
         raise ValueError(f"Unknown converter: {source_format}. Available: {get_converter.__module__}")
     
     converter = converter_class()
     
-    # Get dataset info if provided
-    dataset_info = None
-    if dataset_id:
-        dataset_info = get_dataset_info(dataset_id)
-    
-    # Detect file format if auto
-    if input_file_format == 'auto':
-        if input_file.suffix.lower() == '.csv':
-            input_file_format = 'csv'
-        elif input_file.suffix.lower() == '.json':
-            input_file_format = 'json'
-        else:
-            raise ValueError(f"Unknown file format: {input_file.suffix}")
-    
-    # Load dataset
-    if input_file_format == 'csv':
-        raw_profiles = CSVLoader.load(input_file)
-    else:
-        raw_profiles = JSONLoader.load(input_file)
-    
-    print(f"Loaded {len(raw_profiles)} profiles from {input_file}")
-    
     # Get column mappings if dataset info available
     column_mappings = None
+    dataset_info = get_dataset_info(dataset_id) if dataset_id else None
     if dataset_info:
         column_mappings = get_column_mappings(dataset_id)
         # Set converter scale from dataset info
         if hasattr(converter, 'scale'):
             converter.scale = dataset_info.get('scale', 'auto')
     
-    # Convert to SPOTS format
-    spots_profiles = []
-    skipped = 0
-    
-    for i, raw_profile in enumerate(raw_profiles):
-        # Extract source personality data
-        if source_format in ['big_five', 'big_five_to_spots', 'ocean']:
-            source_data = BigFiveExtractor.extract(raw_profile, column_mappings)
-            if source_data is None:
-                skipped += 1
-                if i < 10:  # Only print first 10 warnings
-                    print(f"Warning: Profile {i} missing Big Five data, skipping")
+    return converter, column_mappings
+
+
+def new_conversion_stats() -> Dict[str, int]:
+    """Counters updated in place by iter_spots_profiles."""
+    return {
+        'read': 0,
+        'converted': 0,
+        'skipped_missing': 0,
+        'skipped_invalid': 0,
+        'skipped_failed': 0,
+        'validation_errors': 0,
+    }
+
+
+def skipped_count(stats: Dict[str, int]) -> int:
+    """Total rows skipped for missing, invalid or unconvertible data."""
+    return stats['skipped_missing'] + stats['skipped_invalid'] + stats['skipped_failed']
+
+
+def _print_progress(stats: Dict[str, int]):
+    print(f"  Processed {stats['read']:,} rows: {stats['converted']:,} converted, "
+          f"{skipped_count(stats):,} skipped")
+
+
+def iter_spots_profiles(
+    raw_profiles: Iterable[Dict[str, Any]],
+    converter: PersonalityConverter,
+    source_format: str = 'big_five',
+    column_mappings: Optional[Dict[str, List[str]]] = None,
+    user_id_prefix: str = 'user_',
+    keep_original: bool = True,
+    validate: bool = False,
+    stats: Optional[Dict[str, int]] = None,
+    progress_every: int = 0,
+    workers: Optional[int] = 1,
+    chunk_size: int = 10_000
+) -> Iterator[Dict[str, Any]]:
+    """
+    Convert raw rows to SPOTS profiles one at a time.
+    
+    Extraction and source validation run in this process; the per-row
+    conversion goes through converter.convert_many, which uses a chunked
+    process pool when workers != 1. Output order matches input order.
+    
+    Args:
+        raw_profiles: Raw rows (any iterable; consumed lazily)
+        converter: Converter instance (see create_converter)
+        source_format: Source format ('big_five', 'mbti', etc.) or converter ID
+        column_mappings: Optional Big Five column mappings
+        user_id_prefix: Prefix for generated user IDs
+        keep_original: Embed the raw row under 'original_data'
+        validate: Check each output profile with DatasetValidator
+        stats: Optional dict from new_conversion_stats(), updated in place
+        progress_every: Print progress every N rows read (0 = never)
+        workers: Conversion processes (None = all cores, 1 = in-process)
+        chunk_size: Rows per conversion task
+    
+    Yields:
+        SPOTS profiles
+    """
+    if stats is None:
+        stats = new_conversion_stats()
+    warnings = 0
+    # (row index, raw row) for rows handed to the converter, in order
+    in_flight = deque()
+    
+    def warn(message: str):
+        nonlocal warnings
+        if warnings < MAX_WARNINGS:
+            print(f"Warning: {message}")
+        warnings += 1
+    
+    def sources() -> Iterator[Dict[str, Any]]:
+        for i, raw_profile in enumerate(raw_profiles):
+            if progress_every and stats['read'] and stats['read'] % progress_every == 0:
+                _print_progress(stats)
+            stats['read'] += 1
+            
+            # Extract source personality data
+            if source_format in BIG_FIVE_FORMATS:
+                source_data = BigFiveExtractor.extract(raw_profile, column_mappings)
+                if source_data is None:
+                    stats['skipped_missing'] += 1
+                    warn(f"Profile {i} missing Big Five data, skipping")
+                    continue
+            else:
+                # For other formats, use raw profile as source data
+                source_data = raw_profile
+            
+            # Validate source data
+            if not converter.validate_source(source_data):
+                stats['skipped_invalid'] += 1
+                warn(f"Profile {i} failed validation, skipping")
                 continue
-        else:
-            # For other formats, use raw profile as source data
-            source_data = raw_profile
-        
-        # Validate source data
-        if not converter.validate_source(source_data):
-            skipped += 1
-            if i < 10:
-                print(f"Warning: Profile {i} failed validation, skipping")
-            continue
-        
-        # Convert to SPOTS dimensions
-        try:
-            spots_dimensions = converter.convert(source_data)
-        except Exception as e:
-            skipped += 1
-            if i < 10:
-                print(f"Warning: Profile {i} conversion failed: {e}, skipping")
+            
+            in_flight.append((i, raw_profile))
+            yield source_data
+    
+    # Convert to SPOTS dimensions
+    conversions = converter.convert_many(
+        sources(), workers=workers, chunk_size=chunk_size, return_exceptions=True
+    )
+    for spots_dimensions in conversions:
+        i, raw_profile = in_flight.popleft()
+        if isinstance(spots_dimensions, Exception):
+            stats['skipped_failed'] += 1
+            warn(f"Profile {i} conversion failed: {spots_dimensions}, skipping")
             continue
         
         # Create SPOTS profile
@@ -122,15 +217,70 @@ def convert_dataset(
             'dimensions': spots_dimensions,
             'created_at': raw_profile.get('created_at') or raw_profile.get('timestamp'),
             'source': f'{source_format}_conversion',
-            'original_data': {
+        }
+        if keep_original:
+            spots_profile['original_data'] = {
                 'source_format': source_format,
-                'raw_profile': {k: v for k, v in raw_profile.items() 
+                'raw_profile': {k: v for k, v in raw_profile.items()
                               if k not in ['user_id', 'id']}
             }
-        }
         
-        spots_profiles.append(spots_profile)
+        if validate:
+            errors = DatasetValidator.validate_spots_profile(spots_profile, stats['converted'])
+            for error in errors:
+                if stats['validation_errors'] < MAX_WARNINGS:
+                    print(f"  Validation warning: {error}")
+                stats['validation_errors'] += 1
+        
+        stats['converted'] += 1
+        yield spots_profile
     
+    if warnings > MAX_WARNINGS:
+        print(f"  ... {warnings - MAX_WARNINGS} more row warnings not shown")
+
+
+def convert_dataset(
+    input_file: Path,
+    output_file: Path,
+    source_format: str = 'big_five',
+    dataset_id: Optional[str] = None,
+    input_file_format: str = 'auto',
+    user_id_prefix: str = 'user_',
+    validate: bool = True,
+    keep_original: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Convert a personality dataset to SPOTS format.
+    
+    Args:
+        input_file: Path to input dataset (CSV, JSON or JSON Lines)
+        output_file: Path to output SPOTS profiles (JSON)
+        source_format: Source format ('big_five', 'mbti', etc.) or converter ID
+        dataset_id: Optional dataset ID (for column mappings)
+        input_file_format: 'csv', 'json', 'jsonl', or 'auto' (detect from extension)
+        user_id_prefix: Prefix for generated user IDs
+        validate: Whether to validate output profiles
+        keep_original: Embed each raw row under 'original_data'
+    
+    Returns:
+        List of converted SPOTS profiles
+    """
+    converter, column_mappings = create_converter(source_format, dataset_id)
+    
+    stats = new_conversion_stats()
+    spots_profiles = list(iter_spots_profiles(
+        iter_raw_profiles(input_file, input_file_format),
+        converter,
+        source_format=source_format,
+        column_mappings=column_mappings,
+        user_id_prefix=user_id_prefix,
+        keep_original=keep_original,
+        stats=stats
+    ))
+    
+    print(f"Loaded {stats['read']} profiles from {input_file}")
+    
+    skipped = skipped_count(stats)
     if skipped > 0:
         print(f"Skipped {skipped} profiles due to missing/invalid data")
     
@@ -149,3 +299,77 @@ def convert_dataset(
     print(f"Converted {len(spots_profiles)} profiles to {output_file}")
     
     return spots_profiles
+
+
+def stream_convert_dataset(
+    input_file: Path,
+    output_file: Path,
+    source_format: str = 'big_five',
+    dataset_id: Optional[str] = None,
+    input_file_format: str = 'auto',
+    user_id_prefix: str = 'user_',
+    validate: bool = True,
+    keep_original: bool = False,
+    progress_every: int = 100_000,
+    workers: Optional[int] = 1,
+    chunk_size: int = 10_000
+) -> Dict[str, int]:
+    """
+    Convert a personality dataset to SPOTS JSON Lines with bounded memory.
+    
+    Rows are streamed from CSV, JSON arrays or JSON Lines, converted and
+    validated one at a time, and written as they are produced. Raw rows
+    are dropped unless keep_original is set.
+    
+    Args:
+        input_file: Path to input dataset (CSV, JSON or JSON Lines)
+        output_file: Path to output SPOTS profiles (JSON Lines)
+        source_format: Source format ('big_five', 'mbti', etc.) or converter ID
+        dataset_id: Optional dataset ID (for column mappings)
+        input_file_format: 'csv', 'json', 'jsonl', or 'auto' (detect from extension)
+        user_id_prefix: Prefix for generated user IDs
+        validate: Whether to validate output profiles
+        keep_original: Embed each raw row under 'original_data'
+        progress_every: Print progress every N rows read (0 = never)
+        workers: Conversion processes (None = all cores, 1 = in-process)
+        chunk_size: Rows per conversion task
+    
+    Returns:
+        Conversion counters (see new_conversion_stats)
+    """
+    converter, column_mappings = create_converter(source_format, dataset_id)
+    
+    print(f"Streaming profiles from {input_file}...")
+    stats = new_conversion_stats()
+    JSONLinesLoader.save(
+        iter_spots_profiles(
+            iter_raw_profiles(input_file, input_file_format),
+            converter,
+            source_format=source_format,
+            column_mappings=column_mappings,
+            user_id_prefix=user_id_prefix,
+            keep_original=keep_original,
+            validate=validate,
+            stats=stats,
+            progress_every=progress_every,
+            workers=workers,
+            chunk_size=chunk_size
+        ),
+        output_file
+    )
+    
+    _print_progress(stats)
+    skipped = skipped_count(stats)
+    if skipped > 0:
+        print(f"Skipped {skipped} profiles due to missing/invalid data "
+              f"({stats['skipped_missing']} missing, {stats['skipped_invalid']} invalid, "
+              f"{stats['skipped_failed']} failed)")
+    if validate:
+        if stats['converted'] == 0:
+            print("Validation warnings (1 errors):")
+            print("  - No profiles found")
+        elif stats['validation_errors'] > 0:
+            print(f"Validation warnings ({stats['validation_errors']} errors)")
+    print(f"Converted {stats['converted']} profiles to {output_file}")
+    
+    return stats
@@ -4,8 +4,24 @@ Base Converter Interface
 Defines the interface for all personality data converters.
 """
 
+import os
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Union
+
+# Converter instance used by pool workers (set once per worker process)
+_WORKER_CONVERTER: Optional['PersonalityConverter'] = None
+
+
+def _init_worker(converter: 'PersonalityConverter'):
+    global _WORKER_CONVERTER
+    _WORKER_CONVERTER = converter
+
+
+def _convert_chunk(rows: List[Dict[str, Any]], return_exceptions: bool) -> List[Any]:
+    return _WORKER_CONVERTER._convert_rows(rows, return_exceptions)
 
 
 class PersonalityConverter(ABC):
@@ -100,3 +116,64 @@ class PersonalityConverter(ABC):
         else:
             # Default: clamp to [0, 1]
             return max(0.0, min(1.0, num_value))
+    
+    def convert_many(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        workers: Optional[int] = 1,
+        chunk_size: int = 10_000,
+        return_exceptions: bool = False
+    ) -> Iterator[Union[Dict[str, Any], Exception]]:
+        """
+        Convert many rows, optionally in a chunked process pool.
+        
+        Rows are consumed lazily and sent to workers chunk_size at a time,
+        with at most two chunks per worker in flight, so memory stays
+        bounded for streamed input. Results are yielded in input order.
+        
+        Args:
+            rows: Source personality data rows
+            workers: Worker processes (None = all cores, 1 = in-process)
+            chunk_size: Rows per pool task
+            return_exceptions: Yield a row's exception instead of raising it
+        
+        Yields:
+            SPOTS dimensions per row (or the exception raised by convert)
+        """
+        workers = workers if workers is not None else (os.cpu_count() or 1)
+        rows = iter(rows)
+        
+        if workers <= 1:
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    return
+                yield from self._convert_rows(chunk, return_exceptions)
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self,)
+        ) as executor:
+            pending = deque()
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if chunk:
+                    pending.append(executor.submit(_convert_chunk, chunk, return_exceptions))
+                if pending and (not chunk or len(pending) >= 2 * workers):
+                    yield from pending.popleft().result()
+                elif not chunk:
+                    return
+    
+    def _convert_rows(self, rows: List[Dict[str, Any]], return_exceptions: bool) -> List[Any]:
+        """Convert a chunk of rows in this process."""
+        if not return_exceptions:
+            return [self.convert(row) for row in rows]
+        
+        results = []
+        for row in rows:
+            try:
+                results.append(self.convert(row))
+            except Exception as e:
+                results.append(e)
+        return results
@@ -8,7 +8,7 @@ Converts any personality data format to SPOTS 12 dimensions using:
 - Intelligent defaults
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from scripts.personality_data.converters.base import PersonalityConverter
 from difflib import SequenceMatcher
 
@@ -92,6 +92,39 @@ SEMANTIC_MAPPINGS = {
     'travel': ['location_adventurousness'],
 }
 
+# Distinct key sets remembered before the schema cache is reset
+MAX_CACHED_SCHEMAS = 4096
+
+PERSONALITY_KEYWORDS = [
+    'personality', 'trait', 'dimension', 'score', 'value',
+    'openness', 'extraversion', 'conscientiousness', 'agreeableness', 'neuroticism',
+    'mbti', 'enneagram', 'type', 'preference', 'orientation',
+    'exploration', 'social', 'community', 'authenticity', 'energy',
+    'novelty', 'value', 'trust', 'crowd', 'curation'
+]
+
+
+class ConversionSchema:
+    """
+    Everything about a row that depends only on its field names.
+    
+    Built once per distinct key set by UniversalPersonalityConverter and
+    reused for every row with the same fields.
+    """
+    
+    def __init__(
+        self,
+        detected_format: Optional[str],
+        field_mappings: Dict[str, List[str]],
+        field_plan: List[Tuple[str, Tuple[str, ...]]],
+        is_valid: bool
+    ):
+        self.detected_format = detected_format
+        self.field_mappings = field_mappings
+        # (source field, SPOTS dimensions its value contributes to)
+        self.field_plan = field_plan
+        self.is_valid = is_valid
+
 
 class UniversalPersonalityConverter(PersonalityConverter):
     """
@@ -117,6 +150,59 @@ class UniversalPersonalityConverter(PersonalityConverter):
         self.scale = scale
         self.detected_format = None
         self.field_mappings = {}
+        self._schemas: Dict[Tuple[str, ...], ConversionSchema] = {}
+        self._delegates: Dict[str, PersonalityConverter] = {}
+    
+    def schema_for(self, source_data: Dict[str, Any]) -> ConversionSchema:
+        """
+        Format, field mappings and validity for source_data's key set (cached).
+        
+        Format detection, heuristic mapping and the SequenceMatcher fallback
+        only depend on field names, so for a homogeneous dataset they run
+        once instead of once per row. Call clear_schema_cache() after
+        changing custom_mappings.
+        """
+        keys = tuple(source_data.keys())
+        schema = self._schemas.get(keys)
+        if schema is None:
+            if len(self._schemas) >= MAX_CACHED_SCHEMAS:
+                self._schemas.clear()
+            schema = self._build_schema(source_data)
+            self._schemas[keys] = schema
+        return schema
+    
+    def clear_schema_cache(self):
+        """Forget cached schemas (e.g. after changing custom_mappings)."""
+        self._schemas.clear()
+    
+    def _build_schema(self, source_data: Dict[str, Any]) -> ConversionSchema:
+        field_mappings = self.map_fields_to_spots(source_data)
+        field_plan = []
+        for source_field in source_data.keys():
+            # Same lookup order as the per-field loop: mapping, then name inference
+            dims = field_mappings.get(source_field.lower(), [])
+            if not dims:
+                dims = self._infer_dimensions_from_field(source_field, None)
+            dims = tuple(dim for dim in dims if dim in SPOTS_DIMENSIONS)
+            if dims:
+                field_plan.append((source_field, dims))
+        
+        source_keys = ' '.join(k.lower() for k in source_data.keys())
+        is_valid = len(source_data) > 0 and any(keyword in source_keys for keyword in PERSONALITY_KEYWORDS)
+        
+        return ConversionSchema(
+            detected_format=self.detect_format(source_data),
+            field_mappings=field_mappings,
+            field_plan=field_plan,
+            is_valid=is_valid
+        )
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pool workers rebuild their own caches
+        state = self.__dict__.copy()
+        state['_schemas'] = {}
+        state['_delegates'] = {}
+        return state
     
     def detect_format(self, source_data: Dict[str, Any]) -> Optional[str]:
         """
@@ -197,12 +283,29 @@ class UniversalPersonalityConverter(PersonalityConverter):
         Returns:
             Dict with SPOTS 12 dimensions (0.0-1.0)
         """
-        # Auto-detect format
-        detected_format = self.detect_format(source_data)
+        # Auto-detect format (cached per key set)
+        schema = self.schema_for(source_data)
+        detected_format = schema.detected_format
         self.detected_format = detected_format
         
         # If known format, try to use specific converter
         if detected_format and detected_format in KNOWN_FORMATS:
+            converter = self._delegate(detected_format)
+            if converter is not None:
+                try:
+                    converter.scale = self.scale
+                    return converter.convert(source_data)
+                except Exception:
+                    # Fall back to heuristic conversion if specific converter fails
+                    pass
+        
+        # Otherwise, use heuristic mapping
+        return self._convert_with_heuristics(source_data, schema)
+    
+    def _delegate(self, detected_format: str) -> Optional[PersonalityConverter]:
+        """Format-specific converter for a detected format, created once."""
+        if detected_format not in self._delegates:
+            converter = None
             converter_id = KNOWN_FORMATS[detected_format].get('converter')
             if converter_id:
                 try:
@@ -210,49 +313,34 @@ class UniversalPersonalityConverter(PersonalityConverter):
                     converter_class = get_converter(converter_id)
                     if converter_class:
                         converter = converter_class(scale=self.scale)
-                        return converter.convert(source_data)
                 except Exception:
-                    # Fall back to heuristic conversion if specific converter fails
-                    pass
-        
-        # Otherwise, use heuristic mapping
-        return self._convert_with_heuristics(source_data)
+                    converter = None
+            self._delegates[detected_format] = converter
+        return self._delegates[detected_format]
     
-    def _convert_with_heuristics(self, source_data: Dict[str, Any]) -> Dict[str, float]:
+    def _convert_with_heuristics(
+        self,
+        source_data: Dict[str, Any],
+        schema: Optional[ConversionSchema] = None
+    ) -> Dict[str, float]:
         """Convert using heuristic field mapping."""
         # Map fields to SPOTS dimensions
-        field_mappings = self.map_fields_to_spots(source_data)
-        self.field_mappings = field_mappings
+        if schema is None:
+            schema = self.schema_for(source_data)
+        self.field_mappings = schema.field_mappings
         
         # Initialize SPOTS dimensions
         spots_dimensions = {dim: 0.0 for dim in SPOTS_DIMENSIONS}
         dimension_counts = {dim: 0 for dim in SPOTS_DIMENSIONS}
         
-        # Convert each source field
-        for source_field, source_value in source_data.items():
-            source_field_lower = source_field.lower()
+        # Convert each mapped source field (mapped or name-inferred dimensions)
+        for source_field, dims in schema.field_plan:
+            normalized_value = self.normalize_value(source_data[source_field], self.scale)
             
-            # Get mapped SPOTS dimensions
-            mapped_dims = field_mappings.get(source_field_lower, [])
-            
-            if mapped_dims:
-                # Normalize value
-                normalized_value = self.normalize_value(source_value, self.scale)
-                
-                # Distribute value across mapped dimensions
-                for dim in mapped_dims:
-                    if dim in spots_dimensions:
-                        spots_dimensions[dim] += normalized_value
-                        dimension_counts[dim] += 1
-            else:
-                # Unknown field - try to infer from value type/name
-                inferred_dims = self._infer_dimensions_from_field(source_field, source_value)
-                if inferred_dims:
-                    normalized_value = self.normalize_value(source_value, self.scale)
-                    for dim in inferred_dims:
-                        if dim in spots_dimensions:
-                            spots_dimensions[dim] += normalized_value
-                            dimension_counts[dim] += 1
+            # Distribute value across mapped dimensions
+            for dim in dims:
+                spots_dimensions[dim] += normalized_value
+                dimension_counts[dim] += 1
         
         # Average values for dimensions with multiple sources
         for dim in SPOTS_DIMENSIONS:
@@ -328,17 +416,8 @@ class UniversalPersonalityConverter(PersonalityConverter):
         if len(source_data) == 0:
             return False
         
-        # Check if at least one field looks like personality data
-        source_keys = [k.lower() for k in source_data.keys()]
-        personality_keywords = [
-            'personality', 'trait', 'dimension', 'score', 'value',
-            'openness', 'extraversion', 'conscientiousness', 'agreeableness', 'neuroticism',
-            'mbti', 'enneagram', 'type', 'preference', 'orientation',
-            'exploration', 'social', 'community', 'authenticity', 'energy',
-            'novelty', 'value', 'trust', 'crowd', 'curation'
-        ]
-        
-        return any(keyword in ' '.join(source_keys) for keyword in personality_keywords)
+        # Check if at least one field looks like personality data (cached per key set)
+        return self.schema_for(source_data).is_valid
     
     def get_source_format(self) -> str:
         """Return 'universal' as format identifier."""
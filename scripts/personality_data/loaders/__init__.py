@@ -6,8 +6,10 @@ Loaders for reading personality datasets from various file formats.
 
 from scripts.personality_data.loaders.csv_loader import CSVLoader
 from scripts.personality_data.loaders.json_loader import JSONLoader
+from scripts.personality_data.loaders.jsonl_loader import JSONLinesLoader
 
 __all__ = [
     'CSVLoader',
     'JSONLoader',
+    'JSONLinesLoader',
 ]
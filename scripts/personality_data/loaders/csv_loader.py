@@ -6,7 +6,7 @@ Loads personality datasets from CSV files.
 
 import csv
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 
 
 class CSVLoader:
@@ -33,6 +33,24 @@ class CSVLoader:
         
         return profiles
     
+    @staticmethod
+    def iter_rows(file_path: Path, encoding: str = 'utf-8') -> Iterator[Dict[str, Any]]:
+        """
+        Stream CSV rows one at a time.
+        
+        Same rows as load(), but only the current row is held in memory.
+        
+        Args:
+            file_path: Path to CSV file
+            encoding: File encoding (default: utf-8)
+        
+        Yields:
+            Profile dictionaries (one per row)
+        """
+        with open(file_path, 'r', encoding=encoding, newline='') as f:
+            for row in csv.DictReader(f):
+                yield dict(row)
+    
     @staticmethod
     def save(data: List[Dict[str, Any]], file_path: Path, encoding: str = 'utf-8'):
         """
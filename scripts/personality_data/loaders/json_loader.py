@@ -5,8 +5,12 @@ Loads personality datasets from JSON files.
 """
 
 import json
+import re
 from pathlib import Path
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Union, Iterator
+
+_WHITESPACE = ' \t\n\r'
+_WHITESPACE_RUN = re.compile(r'[ \t\n\r]*')
 
 
 class JSONLoader:
@@ -47,6 +51,78 @@ class JSONLoader:
         else:
             return []
     
+    @staticmethod
+    def iter_records(
+        file_path: Path,
+        encoding: str = 'utf-8',
+        chunk_size: int = 1 << 20
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream profiles from a top-level JSON array without loading it whole.
+        
+        The file is read chunk_size characters at a time and each array
+        element is decoded as soon as it is complete, so memory is bounded
+        by the chunk plus the largest single profile. Other structures
+        (dict with 'profiles'/'data', single profile) are not streamable
+        and fall back to load().
+        
+        Args:
+            file_path: Path to JSON file
+            encoding: File encoding (default: utf-8)
+            chunk_size: Characters read per chunk
+        
+        Yields:
+            Profile dictionaries
+        """
+        decoder = json.JSONDecoder()
+        
+        with open(file_path, 'r', encoding=encoding) as f:
+            buffer = f.read(chunk_size)
+            pos = len(buffer) - len(buffer.lstrip(_WHITESPACE))
+            if pos >= len(buffer) or buffer[pos] != '[':
+                yield from JSONLoader.load(file_path, encoding)
+                return
+            pos += 1
+            eof = False
+            
+            while True:
+                # Skip separators, refilling the buffer as needed
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE + ',':
+                    pos += 1
+                if pos >= len(buffer):
+                    if eof:
+                        raise ValueError(f"Unterminated JSON array in {file_path}")
+                    more = f.read(chunk_size)
+                    eof = not more
+                    buffer, pos = buffer[pos:] + more, 0
+                    continue
+                
+                if buffer[pos] == ']':
+                    return
+                
+                try:
+                    record, end = decoder.raw_decode(buffer, pos)
+                    after = _WHITESPACE_RUN.match(buffer, end).end()
+                except json.JSONDecodeError:
+                    end = after = None
+                
+                # A complete element is followed by ',' or ']'. Anything else
+                # means it was cut off at the end of the buffer (e.g. "12" of
+                # "12.5"), so read more and decode again.
+                if after is None or after >= len(buffer) or buffer[after] not in ',]':
+                    more = '' if eof else f.read(chunk_size)
+                    if not more:
+                        raise json.JSONDecodeError(
+                            "Invalid JSON array element", buffer, pos
+                        )
+                    buffer, pos = buffer[pos:] + more, 0
+                    continue
+                
+                yield record
+                pos = end
+                if pos >= chunk_size:
+                    buffer, pos = buffer[pos:], 0
+    
     @staticmethod
     def save(
         data: Union[List[Dict[str, Any]], Dict[str, Any]],
@@ -0,0 +1,74 @@
+"""
+JSON Lines Dataset Loader
+
+Loads and saves personality datasets as JSON Lines (one JSON object per line).
+"""
+
+import json
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Iterator
+
+
+class JSONLinesLoader:
+    """Loads personality datasets from JSON Lines files."""
+    
+    @staticmethod
+    def load(file_path: Path, encoding: str = 'utf-8') -> List[Dict[str, Any]]:
+        """
+        Load a JSON Lines file into a list.
+        
+        Args:
+            file_path: Path to .jsonl file
+            encoding: File encoding (default: utf-8)
+        
+        Returns:
+            List of profile dictionaries
+        """
+        return list(JSONLinesLoader.iter_records(file_path, encoding))
+    
+    @staticmethod
+    def iter_records(file_path: Path, encoding: str = 'utf-8') -> Iterator[Dict[str, Any]]:
+        """
+        Stream records from a JSON Lines file, skipping blank lines.
+        
+        Args:
+            file_path: Path to .jsonl file
+            encoding: File encoding (default: utf-8)
+        
+        Yields:
+            Profile dictionaries
+        """
+        with open(file_path, 'r', encoding=encoding) as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{file_path}:{line_number}: invalid JSON: {e}") from e
+    
+    @staticmethod
+    def save(
+        records: Iterable[Dict[str, Any]],
+        file_path: Path,
+        encoding: str = 'utf-8'
+    ) -> int:
+        """
+        Write records as JSON Lines, consuming the iterable lazily.
+        
+        Args:
+            records: Records to save (a generator is never materialized)
+            file_path: Output .jsonl file path
+            encoding: File encoding (default: utf-8)
+        
+        Returns:
+            Number of records written
+        """
+        count = 0
+        with open(file_path, 'w', encoding=encoding) as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write('\n')
+                count += 1
+        return count
@@ -6,6 +6,13 @@ Validates personality datasets for completeness and correctness.
 
 from typing import List, Dict, Any, Tuple
 
+SPOTS_DIMENSIONS = [
+    'exploration_eagerness', 'community_orientation', 'adventure_seeking',
+    'social_preference', 'energy_preference', 'novelty_seeking',
+    'value_orientation', 'crowd_tolerance', 'authenticity',
+    'archetype', 'trust_level', 'openness'
+]
+
 
 class DatasetValidator:
     """Validates personality datasets."""
@@ -22,40 +29,55 @@ class DatasetValidator:
             Tuple of (is_valid, list_of_errors)
         """
         errors = []
-        required_dimensions = [
-            'exploration_eagerness', 'community_orientation', 'adventure_seeking',
-            'social_preference', 'energy_preference', 'novelty_seeking',
-            'value_orientation', 'crowd_tolerance', 'authenticity',
-            'archetype', 'trust_level', 'openness'
-        ]
         
         if not profiles:
             errors.append("No profiles found")
             return False, errors
         
         for i, profile in enumerate(profiles):
-            # Check user_id
-            if 'user_id' not in profile:
-                errors.append(f"Profile {i}: Missing 'user_id'")
-            
-            # Check dimensions
-            if 'dimensions' not in profile:
-                errors.append(f"Profile {i}: Missing 'dimensions'")
-                continue
-            
-            dims = profile['dimensions']
-            for dim in required_dimensions:
-                if dim not in dims:
-                    errors.append(f"Profile {i}: Missing dimension '{dim}'")
-                else:
-                    value = dims[dim]
-                    if not isinstance(value, (int, float)):
-                        errors.append(f"Profile {i}: Dimension '{dim}' is not numeric")
-                    elif not (0.0 <= value <= 1.0):
-                        errors.append(f"Profile {i}: Dimension '{dim}' out of range [0.0, 1.0]: {value}")
+            errors.extend(DatasetValidator.validate_spots_profile(profile, i))
         
         return len(errors) == 0, errors
     
+    @staticmethod
+    def validate_spots_profile(profile: Dict[str, Any], index: int = 0) -> List[str]:
+        """
+        Validate a single SPOTS profile.
+        
+        Used by streaming conversion, where profiles are checked one at a
+        time instead of as a list.
+        
+        Args:
+            profile: SPOTS profile
+            index: Position of the profile, used in error messages
+        
+        Returns:
+            List of errors (empty if valid)
+        """
+        errors = []
+        
+        # Check user_id
+        if 'user_id' not in profile:
+            errors.append(f"Profile {index}: Missing 'user_id'")
+        
+        # Check dimensions
+        if 'dimensions' not in profile:
+            errors.append(f"Profile {index}: Missing 'dimensions'")
+            return errors
+        
+        dims = profile['dimensions']
+        for dim in SPOTS_DIMENSIONS:
+            if dim not in dims:
+                errors.append(f"Profile {index}: Missing dimension '{dim}'")
+            else:
+                value = dims[dim]
+                if not isinstance(value, (int, float)):
+                    errors.append(f"Profile {index}: Dimension '{dim}' is not numeric")
+                elif not (0.0 <= value <= 1.0):
+                    errors.append(f"Profile {index}: Dimension '{dim}' out of range [0.0, 1.0]: {value}")
+        
+        return errors
+    
     @staticmethod
     def validate_big_five_profiles(profiles: List[Dict[str, Any]]) -> Tuple[bool, List[str]]:
         """
@@ -9,6 +9,7 @@ import random
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import statistics
+import numpy as np
 
 # Import compatibility calculator (from validation scripts)
 try:
@@ -17,6 +18,8 @@ try:
     project_root = PathLib(__file__).parent.parent.parent.parent
     sys.path.insert(0, str(project_root))
     from scripts.knot_validation.compare_matching_accuracy import MatchingAccuracyComparator
+    from scripts.knot_validation.batch_compatibility import BatchCompatibilityEngine
+    from scripts.knot_validation.ground_truth_store import GroundTruthWriter, GroundTruthPairs
     COMPATIBILITY_AVAILABLE = True
 except ImportError:
     COMPATIBILITY_AVAILABLE = False
@@ -110,6 +113,68 @@ class GroundTruthGenerator:
         
         return ground_truth
     
+    def generate_store(
+        self,
+        profiles: List[Dict[str, Any]],
+        output_path: Path,
+        block_size: int = 512,
+        seed: Optional[int] = None
+    ) -> 'GroundTruthPairs':
+        """
+        Generate ground truth pairs into a memory-mapped ground-truth store.
+        
+        Scores are computed one row block at a time and streamed to disk, so
+        memory stays bounded by block_size x len(profiles) regardless of the
+        number of pairs. Noise comes from a numpy Generator seeded with seed.
+        
+        Args:
+            profiles: List of SPOTS personality profiles
+            output_path: Store directory to write (e.g. ground_truth.gtstore)
+            block_size: Profiles per row block
+            seed: Optional random seed for the noise
+        
+        Returns:
+            Memory-mapped GroundTruthPairs
+        """
+        if not COMPATIBILITY_AVAILABLE:
+            raise ImportError("Ground truth stores require scripts.knot_validation")
+        
+        print(f"Generating ground truth store from {len(profiles)} profiles...")
+        
+        engine = BatchCompatibilityEngine(profiles, block_size=block_size)
+        rng = np.random.default_rng(seed)
+        metadata = {
+            'generator': 'GroundTruthGenerator',
+            'compatibility_threshold': self.compatibility_threshold,
+            'noise_level': self.noise_level,
+            'use_compatibility_calculator': self.use_compatibility_calculator,
+            'seed': seed,
+        }
+        
+        with GroundTruthWriter(output_path, engine.arrays.user_ids, metadata) as writer:
+            for idx_a, idx_b, rows, block_rows, block_cols in engine.iter_upper_triangle():
+                if self.use_compatibility_calculator:
+                    quantum_dim, archetype, value = engine.component_block(rows)
+                    compatibility = engine.combine(
+                        quantum_dim[block_rows, block_cols],
+                        archetype[block_rows, block_cols],
+                        value[block_rows, block_cols]
+                    )
+                else:
+                    compatibility = engine.dimension_similarity_block(rows)[block_rows, block_cols]
+                
+                noisy = compatibility + rng.normal(0, self.noise_level, len(compatibility))
+                noisy = np.clip(noisy, 0.0, 1.0)
+                writer.write(idx_a, idx_b, noisy, noisy >= self.compatibility_threshold)
+            
+            total, compatible_count = writer.count, writer.compatible_count
+        
+        print(f"Ground truth saved to {output_path}")
+        print(f"Generated {total} pairs ({compatible_count} compatible, "
+              f"{total - compatible_count} incompatible)")
+        
+        return writer.close()
+    
     def _calculate_simple_compatibility(
         self,
         profile_a: Dict[str, Any],